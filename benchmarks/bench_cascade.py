@@ -0,0 +1,52 @@
+"""Benchmark: wall time of `get_cascades` and `level_populations` for heavy
+nuclei with large decay schemes.
+
+The first call on a nucleus, from a fresh interpreter, includes the import
+of pandas and the build of its gamma table; later calls are reported as the
+best of `repeat`.
+
+Usage:
+    python benchmarks/bench_cascade.py
+    python benchmarks/bench_cascade.py --residuals Au198 Er168 Gd158 --top 10 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import pyEGAF as egaf
+
+
+def wall_times(function, repeat):
+    """Wall time (s) of the first call of `function()` and best-of-`repeat`
+    wall time of the later calls."""
+    times = []
+    for _ in range(repeat + 1):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times[0], min(times[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--residuals", nargs="+", default=["Au198", "Er168"])
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+
+    print("{0:>10} {1:>8} {2:>20} {3:>12} {4:>12}".format("residual", "gammas", "method", "first (ms)", "best (ms)"))
+    for residual in opts.residuals:
+        gammas = len(e.nucleus_gamma_table(edata, edata.find_residual(residual)))
+        for name, function in [("get_cascades", lambda: e.get_cascades(edata, residual, top=opts.top)),
+                               ("level_populations", lambda: e.level_populations(edata, residual))]:
+            first, best = wall_times(function, opts.repeat)
+            print("{0:>10} {1:>8d} {2:>20} {3:>12.1f} {4:>12.1f}".format(residual, gammas, name, 1e3*first, 1e3*best))
+
+
+if __name__ == "__main__":
+    main()
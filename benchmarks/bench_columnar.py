@@ -0,0 +1,78 @@
+"""Benchmark: loading the EGAF data sets from the columnar tables against the
+JSON files, and peak memory of the streamed export.
+
+Usage:
+    python benchmarks/bench_columnar.py
+    python benchmarks/bench_columnar.py --formats parquet hdf5 --repeat 3
+"""
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+import tracemalloc
+
+import pyEGAF as egaf
+from pyEGAF import columnar
+
+
+def best_time(function, repeat):
+    """Best-of-`repeat` wall time (s) of a call of `function`."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory(function):
+    """Peak memory (MB) allocated by a call of `function`."""
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def stream_frames(datasets):
+    """Builds the tables one data set at a time, as `export_tables` does,
+    discarding each data set's frames once they are built."""
+    for n, jdict in enumerate(datasets):
+        columnar.dataset_frames(jdict, n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", default=list(columnar.COLUMNAR_FORMATS))
+    parser.add_argument("--repeat", type=int, default=3)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+
+    print("{0:>24} {1:>12}".format("source", "wall (s)"))
+    print("{0:>24} {1:>12.3f}".format("JSON", best_time(lambda: e.load_egaf(cache=False), opts.repeat)))
+    print("{0:>24} {1:>12.3f}".format("binary cache", best_time(lambda: e.load_egaf(), opts.repeat)))
+    tables = columnar.datasets_to_tables(edata)
+    print("{0:>24} {1:>12.3f}".format("rebuild from DataFrames", best_time(lambda: columnar.tables_to_datasets(tables), opts.repeat)))
+    for format in opts.formats:
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    e.export_egaf(edata, tmp, format=format)
+            except ImportError as error:
+                print("{0:>24} {1}".format(format, error))
+                continue
+            print("{0:>24} {1:>12.3f}".format(format + " DataFrames", best_time(lambda: columnar.read_tables(tmp), opts.repeat)))
+            print("{0:>24} {1:>12.3f}".format(format + " catalog", best_time(lambda: e.load_egaf_tables(tmp), opts.repeat)))
+
+    print("\n{0:>24} {1:>12}".format("export", "peak (MB)"))
+    print("{0:>24} {1:>12.1f}".format("all tables in memory", peak_memory(lambda: columnar.datasets_to_tables(edata))))
+    print("{0:>24} {1:>12.1f}".format("one data set at a time", peak_memory(lambda: stream_frames(edata))))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark: wall time of `load_egaf` against the number of workers.
+
+The binary cache is bypassed (`cache=False`), so that every run parses the
+JSON files.
+
+Usage:
+    python benchmarks/bench_load_egaf.py
+    python benchmarks/bench_load_egaf.py --workers 1 2 4 8 --repeat 3
+"""
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import pyEGAF as egaf
+
+
+def time_load(e, workers, executor, repeat):
+    """Best-of-`repeat` wall time (s) for a single `load_egaf` call."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            edata = e.load_egaf(workers=workers, executor=executor, cache=False)
+        elapsed = time.perf_counter() - start
+        assert len(edata) == 245
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    print("CPUs available: {0}".format(os.cpu_count()))
+    print("{0:>10} {1:>8} {2:>12}".format("executor", "workers", "wall (s)"))
+    for executor in ("thread", "process"):
+        for workers in opts.workers:
+            wall = time_load(e, workers, executor, opts.repeat)
+            print("{0:>10} {1:>8d} {2:>12.3f}".format(executor, workers, wall))
+
+
+if __name__ == "__main__":
+    main()
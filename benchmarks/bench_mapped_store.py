@@ -0,0 +1,68 @@
+"""Benchmark: memory held by each of many worker processes that load the EGAF
+data sets into memory or map them from the `.npy` store.
+
+Each worker loads the data sets, runs the gamma-table queries of
+`find_gammas` and reports its resident set size (RSS), split into the
+private (anonymous) memory and the file pages shared with the other workers.
+The split is read from /proc/self/status and is only available on Linux.
+
+Usage:
+    python benchmarks/bench_mapped_store.py
+    python benchmarks/bench_mapped_store.py --workers 32
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import time
+
+import pyEGAF as egaf
+
+
+def memory_status():
+    """Resident set size of the current process, as (total, private, file)
+    in MB; None where /proc/self/status is not available."""
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name.startswith(("VmRSS", "Rss")):
+                    fields[name] = value.split()[0]
+    except OSError:
+        return None, None, None
+    return tuple(int(fields[name]) / 1024 if name in fields else None for name in ("VmRSS", "RssAnon", "RssFile"))
+
+
+def worker(mmap):
+    """Loads the data sets in a fresh process and queries the gamma table."""
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        edata = e.load_egaf(mmap=mmap)
+        load = time.perf_counter() - start
+        e.find_gammas(edata, [1273.4, 2223.2, 6110.8, 7723.8], 1.0, intensity='elemental')
+    return (load,) + memory_status()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Build the binary cache and the store before timing the workers
+        e.load_egaf(mmap=True)
+
+    context = multiprocessing.get_context("spawn")
+    print("{0:>10} {1:>10} {2:>12} {3:>14} {4:>12}".format("mode", "load (s)", "RSS (MB)", "private (MB)", "file (MB)"))
+    for mode, mmap in (("memory", False), ("mmap", True)):
+        with context.Pool(opts.workers) as pool:
+            results = pool.map(worker, [mmap]*opts.workers)
+        load = sum(r[0] for r in results) / len(results)
+        columns = [sum(r[i] for r in results) / len(results) if results[0][i] is not None else float("nan") for i in (1, 2, 3)]
+        print("{0:>10} {1:>10.3f} {2:>12.1f} {3:>14.1f} {4:>12.1f}".format(mode, load, *columns))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: wall time of the Monte Carlo sampler against the number of
+draws and the chunk size.
+
+Each row samples the ground-state feeding, sigma0 and level populations of
+the 393-gamma decay scheme of 35Cl(n,g)36Cl with `MonteCarlo.sample`.
+
+Usage:
+    python benchmarks/bench_monte_carlo.py
+    python benchmarks/bench_monte_carlo.py --samples 10000 100000 --chunk-size 1000 10000 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import pyEGAF as egaf
+
+
+def time_sample(mc, samples, feeding, repeat):
+    """Best-of-`repeat` wall time (s) for a single `sample` call."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        mc.sample(samples, feeding, p0=0.05, d_p0=0.01)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--residual", default="Cl36")
+    parser.add_argument("--samples", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+    jdict = edata.find_residual(opts.residual)
+
+    print("{0:>10} {1:>10} {2:>12}".format("samples", "chunk", "wall (ms)"))
+    for chunk_size in opts.chunk_size:
+        mc = e.monte_carlo(edata, jdict, seed=1, chunk_size=chunk_size)
+        table = mc.graph.table
+        for samples in opts.samples:
+            wall = time_sample(mc, samples, table.level_f == 0, opts.repeat)
+            print("{0:>10d} {1:>10d} {2:>12.1f}".format(samples, chunk_size, 1e3*wall))
+
+
+if __name__ == "__main__":
+    main()
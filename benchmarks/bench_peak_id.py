@@ -0,0 +1,48 @@
+"""Benchmark: wall time of `identify_peaks` against the number of peaks.
+
+Usage:
+    python benchmarks/bench_peak_id.py
+    python benchmarks/bench_peak_id.py --peaks 100 2000 20000 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+import pyEGAF as egaf
+
+
+def time_identify(e, edata, peaks, repeat):
+    """Best-of-`repeat` wall time (s) for a single `identify_peaks` call."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        e.identify_peaks(edata, peaks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--peaks", type=int, nargs="+", default=[100, 2000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+    # Build the gamma table outside the timed region
+    edata.gamma_table()
+
+    rng = np.random.default_rng(0)
+    print("{0:>8} {1:>12}".format("peaks", "wall (ms)"))
+    for n in opts.peaks:
+        peaks = np.column_stack((rng.uniform(50.0, 9000.0, n), rng.uniform(0.05, 0.5, n), rng.uniform(1e2, 1e5, n)))
+        wall = time_identify(e, edata, peaks, opts.repeat)
+        print("{0:>8d} {1:>12.2f}".format(n, 1e3*wall))
+
+
+if __name__ == "__main__":
+    main()
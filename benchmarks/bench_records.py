@@ -0,0 +1,72 @@
+"""Benchmark: memory of the 245 EGAF data sets held as parsed JSON objects
+against the compact `__slots__` records of `pyEGAF.records`, and the time of
+typical queries on each.
+
+Usage:
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --repeat 5
+"""
+import argparse
+import contextlib
+import gc
+import glob
+import io
+import time
+import tracemalloc
+
+import pyEGAF as egaf
+from pyEGAF.catalog import parse_json_file
+from pyEGAF.gamma_table import GammaTable
+from pyEGAF.records import compact_datasets
+
+
+def best_time(function, repeat):
+    """Best-of-`repeat` wall time (s) of a call of `function`."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    opts = parser.parse_args()
+
+    json_files = sorted(glob.glob("%s/*.json" % egaf.get_data("EGAF_JSON")))
+    tracemalloc.start()
+    datasets = [parse_json_file(f) for f in json_files]
+    json_memory = tracemalloc.get_traced_memory()[0]
+    records = compact_datasets(datasets)
+    del datasets
+    gc.collect()
+    records_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    num_gammas = sum(nucleus.totalNumberGammas for nucleus in records)
+    num_levels = sum(nucleus.totalNumberLevels for nucleus in records)
+    print("{0} data sets, {1} levels, {2} gamma rays\n".format(len(records), num_levels, num_gammas))
+    print("{0:>16} {1:>12} {2:>16}".format("representation", "memory (MB)", "bytes per gamma"))
+    print("{0:>16} {1:>12.1f} {2:>16.0f}".format("JSON objects", json_memory / 2**20, json_memory / num_gammas))
+    print("{0:>16} {1:>12.1f} {2:>16.0f}".format("records", records_memory / 2**20, records_memory / num_gammas))
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+    datasets = list(edata)
+    cdata = egaf.EGAFCatalog(records)
+    print("\n{0:>24} {1:>12} {2:>12}".format("wall (s)", "JSON", "records"))
+    print("{0:>24} {1:>12} {2:>12.3f}".format("build records", "", best_time(lambda: compact_datasets(datasets), opts.repeat)))
+    print("{0:>24} {1:>12.3f} {2:>12.3f}".format("GammaTable", best_time(lambda: GammaTable.from_datasets(edata), opts.repeat), best_time(lambda: GammaTable.from_datasets(cdata), opts.repeat)))
+    for name, args, kwargs in (("get_residual_levels", ("Gd158",), {}),
+                               ("get_gammas", ("Gd158",), {"intensity": "isotopic"}),
+                               ("find_isomers", ("Na24",), {"units": "best"})):
+        method = getattr(e, name)
+        print("{0:>24} {1:>12.5f} {2:>12.5f}".format(name, best_time(lambda: method(edata, *args, **kwargs), opts.repeat), best_time(lambda: method(cdata, *args, **kwargs), opts.repeat)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark: wall time of the vectorized RIPL reader `parse_ripl_bytes`
+against line-by-line parsing with `parse_ripl_lines`, over all bundled RIPL
+data sets.
+
+Usage:
+    python benchmarks/bench_ripl.py
+    python benchmarks/bench_ripl.py --repeat 10
+"""
+import argparse
+import time
+
+from pyEGAF.ripl import ripl_index, parse_ripl_bytes, parse_ripl_lines
+
+
+def best_time(function, repeat):
+    """Best-of-`repeat` wall time (s) of `function()`."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    # Read the files outside the timed region
+    index = ripl_index()
+    keys = sorted(index.entries)
+    data = b"".join(index.read_bytes(A, Z) for A, Z in keys)
+    datasets = [index.read_bytes(A, Z).decode().splitlines(True) for A, Z in keys]
+
+    def by_line():
+        for n, lines in enumerate(datasets):
+            parse_ripl_lines(lines, n)
+
+    naive = best_time(by_line, opts.repeat)
+    vectorized = best_time(lambda: parse_ripl_bytes(data), opts.repeat)
+    print("{0} data sets, {1:.1f} MB".format(len(keys), len(data) / 1e6))
+    print("{0:>12} {1:>12}".format("reader", "wall (ms)"))
+    print("{0:>12} {1:>12.1f}".format("line", 1e3*naive))
+    print("{0:>12} {1:>12.1f}".format("vectorized", 1e3*vectorized))
+    print("speed-up: {0:.2f}x".format(naive / vectorized))
+
+
+if __name__ == "__main__":
+    main()
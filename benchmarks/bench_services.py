@@ -0,0 +1,51 @@
+"""Benchmark: per-call overhead of constructing pyEGAF objects.
+
+Reports the cost of building an `EGAF` instance and of the `Gammas()` and
+`Analysis()` objects that the analysis methods used to construct inside
+their loops, against the reuse of the cached sub-services returned by
+`EGAF.service`, and the per-call time of methods that make nested calls.
+Run the script against two checkouts to compare them.
+
+Usage:
+    python benchmarks/bench_services.py
+    python benchmarks/bench_services.py --number 2000 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import timeit
+
+import pyEGAF as egaf
+
+
+def per_call(statement, number, repeat):
+    """Best-of-`repeat` time (us) of one call of `statement`."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    opts = parser.parse_args()
+
+    e = egaf.EGAF()
+    with contextlib.redirect_stdout(io.StringIO()):
+        edata = e.load_egaf()
+
+    print("{0:>40} {1:>12}".format("call", "time (us)"))
+    rows = [("EGAF()", egaf.EGAF),
+            ("Gammas()", egaf.Gammas),
+            ("Analysis()", egaf.Analysis)]
+    if hasattr(e, "service"):
+        rows += [("e.service(Analysis)", lambda: e.service(egaf.Analysis))]
+    rows += [("modeled_sigma0_ecrit(edata, 11, ...)", lambda: e.modeled_sigma0_ecrit(edata, 11, 0.02256, 0.00064, "Si29")),
+             ("modeled_sigma0_ecrit_scan(edata, ...)", lambda: e.modeled_sigma0_ecrit_scan(edata, [1, 5, 11], 0.02256, 0.00064, "Si29")),
+             ("get_strongest_gammas(edata, 'Cl36')", lambda: e.get_strongest_gammas(edata, "Cl36", intensity="isotopic"))]
+    for name, statement in rows:
+        number = opts.number if "(edata" not in name else max(1, opts.number // 10)
+        print("{0:>40} {1:>12.2f}".format(name, per_call(statement, number, opts.repeat)))
+
+if __name__ == "__main__":
+    main()
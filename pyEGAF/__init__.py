@@ -1,5 +1,10 @@
 from .pyEGAF import *
 from .base_egaf import *
+from .catalog import EGAFCatalog, LazyEGAFCatalog
+from .mapped_store import MappedEGAFCatalog
+from .records import Nucleus, Level, Gamma
+from .dicebox import DiceboxOutput, read_dicebox
+from .errors import set_error_mode, get_error_mode, error_mode
 from .separation import Separation
 from .cross_section import CrossSection
 from .decay import Levels, Gammas
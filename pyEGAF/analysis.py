@@ -2,6 +2,20 @@ from .base_egaf import *
 from .separation import Separation
 from .cross_section import CrossSection
 from .decay import Levels, Gammas
+from .gamma_table import PRIMARY
+from .level_graph import LevelGraph
+from .cascade import CascadeEngine, CASCADE_COLUMNS
+from .monte_carlo import MonteCarlo, percentile_summary
+from .dicebox import DiceboxOutput, read_dicebox
+
+# Columns of the DataFrame returned by `Analysis.balance_sweep`.
+SWEEP_COLUMNS = ('Target', 'Residual (CN)', 'Level index', 'Energy (keV)', 'Depopulation', 'dDepopulation', 'Feeding', 'dFeeding', 'Difference', 'dDifference', 'Residual (sigma)', 'Outside threshold', 'Capture state', 'GS feeding', 'dGS feeding', 'CS depopulation', 'dCS depopulation', 'Dead-end ratio', 'Dead-end difference (%)', 'Dead-end (sigma)')
+
+# Columns of the DataFrame returned by `Analysis.modeled_sigma0_ecrit_scan`.
+ECRIT_SCAN_COLUMNS = ('Level index', 'Ecrit (keV)', 'P0', 'dP0', 'GS feeding', 'dGS feeding', 'sigma0', 'dsigma0')
+
+# Columns of the DataFrame returned by `Analysis.compare_dicebox`.
+DICEBOX_COLUMNS = ('Ecrit index', 'Ecrit (keV)', 'P0', 'dP0', 'sigma0', 'dsigma0', 'Level index', 'Energy (keV)', 'Population', 'dPopulation', 'Depopulation', 'dDepopulation', 'Residual (sigma)')
 
 class Analysis(Gammas):
     __doc__="""Class to perform analysis of EGAF observables."""
@@ -46,11 +60,52 @@ class Analysis(Gammas):
 
         except TypeError:
             # Missing number of positional arguments
-            print("Missing positional arguments!")
-            print("Four arguments are required:")
-            print("intensity_conversion(<float>, <float>, <float>, <float>)")
+            report_error(InvalidArguments, "Missing positional arguments!\n"
+                                           "Four arguments are required:\n"
+                                           "intensity_conversion(<float>, <float>, <float>, <float>)")
             return
 
+
+    def intensity_conversions(self,I,dI,alpha,d_alpha):
+        """Array version of `intensity_conversion`: total transition 
+        intensities corrected for internal conversion, calculated in a single 
+        vectorized pass.  Missing values (NaN) are taken as zero.
+
+        Arguments:
+            I = Gamma-ray intensities (NumPy array);
+            dI = Associated uncertainties gamma-ray intensities (NumPy array);
+            alpha = Internal-conversion coefficients (NumPy array);
+            d_alpha = Associated uncertainties internal-conversion 
+                      coefficients (NumPy array).
+
+        Returns:
+            A tuple object with the following elements:
+
+            [0]: Total-transition intensities corrected for conversion (NumPy
+                 array);
+            [1]: Associated uncertainties for total-transition intensities 
+                 (NumPy array).
+
+        Example:
+            table = edata.gamma_table()
+            intensity_conversions(table.isotopic, table.d_isotopic, table.icc, table.d_icc)
+        """
+        I, dI, alpha, d_alpha = [np.where(np.isnan(v), 0.0, v) for v in [np.asarray(v, dtype=np.float64) for v in (I, dI, alpha, d_alpha)]]
+        total_intensity = I * (1.0 + alpha)
+        d_total_intensity = self.quad_errors(total_intensity, I, dI, (1.0 + alpha), d_alpha)
+        return (total_intensity, d_total_intensity)
+
+    def level_sums(self,levels,total,d_total,num_levels=0):
+        """Internal function: Sums of the intensities `total` grouped by level
+        index, with the uncertainties `d_total` combined in quadrature.
+
+        Returns:
+            A tuple of NumPy arrays (sums, uncertainties) indexed by level 
+            index, with at least `num_levels` elements.
+        """
+        sums = np.bincount(levels, weights=total, minlength=num_levels)
+        d_sums = np.sqrt(np.bincount(levels, weights=np.asarray(d_total)**2, minlength=num_levels))
+        return (sums, d_sums)
     
     def modeled_sigma0(self, float1, float2, float3, float4):
         """Determination of the total radiative thermal neutron-capture cross 
@@ -97,6 +152,7 @@ class Analysis(Gammas):
 
         return (sigma_0, d_sigma_0)
 
+    @cached_result
     def modeled_sigma0_ecrit(self,list,int,float1,float2,*args):
         """Determination of the total radiative thermal neutron-capture cross 
         section using the sum of experimental partial gamma-ray cross sections, 
@@ -165,7 +221,7 @@ class Analysis(Gammas):
             WRONG_INPUTS = True
 
         modeled_expt_cs = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and args[0] == jdict["nucleusZ"] and args[1] == jdict["nucleusA"]):
                     DECAY_SCHEME_EXISTS = True
@@ -175,7 +231,7 @@ class Analysis(Gammas):
                     expt_feeding_gs = []
                     d_expt_feeding_gs = []
                     
-                    g = Gammas()
+                    g = self.service(Gammas)
                     gammas = g.find_all_gammas_feeding_gs(self.list, compound_nucleus, intensity="isotopic")
                     capture_state_level = max([g[0] for g in gammas])
                     Ecrit = None
@@ -193,9 +249,8 @@ class Analysis(Gammas):
                         for gdata in gammas:
                             if gdata[0] <= self.int and gdata[1] == 0:
                                 DIRECT_FEEDING_GS = True
-                                a = Analysis()
-                                converted_cs = a.intensity_conversion(gdata[6],gdata[7],gdata[8],gdata[9])[0]
-                                d_converted_cs = a.intensity_conversion(gdata[6],gdata[7],gdata[8],gdata[9])[1]
+                                a = self.service(Analysis)
+                                converted_cs, d_converted_cs = a.intensity_conversion(gdata[6],gdata[7],gdata[8],gdata[9])
                                 expt_feeding_gs.append(converted_cs)
                                 d_expt_feeding_gs.append(d_converted_cs**2)
 
@@ -209,9 +264,8 @@ class Analysis(Gammas):
                                 for pgamma in primaries:
                                     if pgamma[10] == "primary":
                                         if pgamma[0] == capture_state_level and pgamma[1] == 0:
-                                            a = Analysis()
-                                            converted_primary = a.intensity_conversion(pgamma[6],pgamma[7],pgamma[8],pgamma[9])[0]
-                                            d_converted_primary = a.intensity_conversion(pgamma[6],pgamma[7],pgamma[8],pgamma[9])[1]
+                                            a = self.service(Analysis)
+                                            converted_primary, d_converted_primary = a.intensity_conversion(pgamma[6],pgamma[7],pgamma[8],pgamma[9])
                                             #expt_feeding_gs.append(converted_primary)
                                             #d_expt_feeding_gs.append(d_converted_primary**2)
 
@@ -220,38 +274,169 @@ class Analysis(Gammas):
                         sum_expt_feeding = sum(expt_feeding_gs)
                         d_sum_expt_feeding = np.sqrt(sum(d_expt_feeding_gs))
 
-                        a = Analysis()
-                        sigma_0 = a.modeled_sigma0(sum_expt_feeding, d_sum_expt_feeding, self.float1, self.float2)[0]
-                        d_sigma_0 = a.modeled_sigma0(sum_expt_feeding, d_sum_expt_feeding, self.float1, self.float2)[1]
+                        a = self.service(Analysis)
+                        sigma_0, d_sigma_0 = a.modeled_sigma0(sum_expt_feeding, d_sum_expt_feeding, self.float1, self.float2)
                         modeled_expt_cs.append([Ecrit, sum_expt_feeding, d_sum_expt_feeding, sigma_0, d_sigma_0])
 
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function using one of the below methods")
-            print(" modeled_sigma0_ecrit(edata,<int>,<float>,<float>,\"Si29\")")
-            print(" modeled_sigma0_ecrit(edata,<int>,<float>,<float>,14, 29)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function using one of the below methods\n"
+                                           " modeled_sigma0_ecrit(edata,<int>,<float>,<float>,\"Si29\")\n"
+                                           " modeled_sigma0_ecrit(edata,<int>,<float>,<float>,14, 29)")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
 
         if LEVEL_ABOVE_ECRIT == True:
-            print("Ecrit set too high!\nTry a lower value.")
+            report_error(InvalidArguments, "Ecrit set too high!\nTry a lower value.")
             return
         
         if DIRECT_FEEDING_GS == False:
-            print("No transitions feeding ground state directly.")
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
 
         if len(modeled_expt_cs) > 0:
             #print("Ecrit = {0}".format(Ecrit))
             return modeled_expt_cs[0]
         
+    @cached_result
+    def modeled_sigma0_ecrit_scan(self,list,ints,floats1,floats2,*args):
+        """Scan of `modeled_sigma0_ecrit` over several critical energies: the
+        total radiative thermal neutron-capture cross section is evaluated for
+        every Ecrit level index with the corresponding modeled population per
+        neutron capture P0.  The ground-state feeding transitions are 
+        extracted once and sorted by initial level, so that the sums of 
+        conversion-corrected partial gamma-ray cross sections below all 
+        cut-offs are read from a single cumulative sum.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            ints: Sequence of level indices corresponding to the levels at 
+                  Ecrit (int).
+            floats1: Sequence of calculated populations per neutron capture 
+                     feeding the ground state from the quasicontinuum, one per
+                     level index, or a single value for all (float).
+            floats2: Associated uncertainties for the populations per neutron
+                     capture (float).
+            args: Takes either 1 or 2 additional arguments:
+            
+                  (i) 1 args:
+                  residual: The residual ID must be passed as a string argument.
+
+                  (ii) 2 args:
+                  Z: Atomic number passed as an integer argument.
+                  A: Atomic mass of the residual compound nucleus passed as an 
+                     integer argument.
+
+        Returns:
+            A pandas DataFrame with one row per level index, in the order 
+            given, and the columns given in ECRIT_SCAN_COLUMNS:
+
+            Level index: Level index at Ecrit (int);
+            Ecrit (keV): Critical energy corresponding to the level index 
+                         (float);
+            P0, dP0: Modeled population per neutron capture and uncertainty 
+                     (float);
+            GS feeding: Sum of conversion-corrected partial gamma-ray cross 
+                        sections feeding the ground state directly up to 
+                        Ecrit (float);
+            dGS feeding: Associated uncertainty for the summation (float);
+            sigma0: Total radiative thermal neutron capture cross section 
+                    (float);
+            dsigma0: Associated uncertainty for the total cross section 
+                     (float).
+
+        Example:
+            Ecrit level indices 6 to 12 in 28Si(n,g)29Si with the 
+            corresponding DICEBOX values of P0:
+
+            modeled_sigma0_ecrit_scan(edata, range(6,13), P0, dP0, "Si29")
+            modeled_sigma0_ecrit_scan(edata, range(6,13), P0, dP0, 14, 29)
+        """
+        import pandas as pd
+        self.list = list
+        self.args = args
+
+        DECAY_SCHEME_EXISTS = False
+        DIRECT_FEEDING_GS = False
+        LEVEL_ABOVE_ECRIT = False
+        WRONG_INPUTS = False
+        if len(args) == 0 or len(args) > 2:
+            WRONG_INPUTS = True
+
+        scan = None
+        for jdict in self.select_datasets(self.list, args):
+            try:
+                if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and args[0] == jdict["nucleusZ"] and args[1] == jdict["nucleusA"]):
+                    DECAY_SCHEME_EXISTS = True
+
+                    levels = np.atleast_1d(np.asarray(ints, dtype=np.int64)).ravel()
+                    P0, dP0 = [np.broadcast_to(np.asarray(v, dtype=np.float64), levels.shape) for v in (floats1, floats2)]
+
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    feeding = table.select(table.feeds_gs)
+                    if len(feeding) == 0 or len(levels) == 0:
+                        continue
+                    if (levels >= feeding.level_i.max()).any():
+                        LEVEL_ABOVE_ECRIT = True
+                        continue
+
+                    # Cumulative sums over the feeders in order of initial level
+                    order = np.argsort(feeding.level_i, kind='stable')
+                    converted_cs, d_converted_cs = self.intensity_conversions(feeding.isotopic[order], feeding.d_isotopic[order], feeding.icc[order], feeding.d_icc[order])
+                    cum_cs = np.cumsum(converted_cs)
+                    cum_d_cs = np.cumsum(d_converted_cs**2)
+                    num_feeders = np.searchsorted(feeding.level_i[order], levels, side='right')
+                    if (num_feeders == 0).any():
+                        continue
+                    DIRECT_FEEDING_GS = True
+
+                    sum_expt_feeding = cum_cs[num_feeders - 1]
+                    d_sum_expt_feeding = np.sqrt(cum_d_cs[num_feeders - 1])
+                    sigma_0 = sum_expt_feeding / (1.0 - P0)
+                    d_sigma_0 = self.quad_errors(sigma_0, sum_expt_feeding, d_sum_expt_feeding, (1.0 - P0), dP0)
+
+                    level_energies = {}
+                    for eachl in jdict["levelScheme"]:
+                        try:
+                            level_energies[eachl["levelIndex"]] = float(eachl["levelEnergy"])
+                        except TypeError:
+                            level_energies[eachl["levelIndex"]] = eachl["levelEnergy"]
+                    Ecrit = [level_energies.get(level) for level in levels.tolist()]
+
+                    scan = pd.DataFrame(dict(zip(ECRIT_SCAN_COLUMNS, [levels, Ecrit, P0, dP0, sum_expt_feeding, d_sum_expt_feeding, sigma_0, d_sigma_0])))
+
+            except (ValueError, TypeError):
+                WRONG_INPUTS = True
+
+        if WRONG_INPUTS == True:
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function using one of the below methods\n"
+                                           " modeled_sigma0_ecrit_scan(edata,<ints>,<floats>,<floats>,\"Si29\")\n"
+                                           " modeled_sigma0_ecrit_scan(edata,<ints>,<floats>,<floats>,14, 29)")
+            return
+
+        if DECAY_SCHEME_EXISTS == False:
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            return
+
+        if LEVEL_ABOVE_ECRIT == True:
+            report_error(InvalidArguments, "Ecrit set too high!\nTry a lower value.")
+            return
+        
+        if DIRECT_FEEDING_GS == False:
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
+            return
+
+        return scan
+
     
+    @cached_result
     def sum_feeding_gs(self,list,bool,*args,**kwargs):
         """Calculates the sum of all internal-conversion-corrected intensities
         (defined as isotopic partial gamma-ray cross sections or populations 
@@ -334,70 +519,35 @@ class Analysis(Gammas):
             
         feeding_gs = []
         d_feeding_gs = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     DECAY_SCHEME_EXISTS = True
-                    for each_l in jdict["levelScheme"]:
-                        if each_l["numberOfGammas"] > 0:
-                            for each_g in each_l["gammaDecay"]:
-                                if USE_PRIMARY == True:
-                                    if each_g["gammaFeedsGroundState"] == True:
-                                        DIRECT_FEEDING_GS = True
-                                        alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                        d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                        cs, d_cs = None, None
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            for intensity in kwargs.values():
-                                                if intensity.lower() == str("isotopic"):
-                                                    cs = each_i["partialIsotopicCrossSection"]
-                                                    d_cs = each_i["dPartialIsotopicCrossSection"]
-                                                elif intensity.lower() == str("population"):
-                                                    cs = each_i["populationPerNeutronCapture"]
-                                                    d_cs = each_i["dPopulationPerNeutronCapture"]
-                                                else:
-                                                    UNSPECIFIED_INTENSITY = True
-
-                                        if alpha == None: alpha = 0.0
-                                        if d_alpha == None: d_alpha = 0.0
-                                        if cs == None: cs = 0.0
-                                        if d_cs == None: d_cs = 0.0
-
-                                        converted_cs = float(cs)*(1+float(alpha))
-                                        d_converted_cs = Uncertainties.quad_error(self,converted_cs, cs, d_cs, (1+alpha), d_alpha)
-
-                                        feeding_gs.append(converted_cs)
-                                        d_feeding_gs.append(d_converted_cs)
-                                elif USE_PRIMARY == False:
-                                    if each_g["gammaFeedsGroundState"] == True and each_g["gammaTransitionType"] != "primary":
-                                        # Don't include the primary
-                                        DIRECT_FEEDING_GS = True
-                                        alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                        d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                        cs, d_cs = None, None
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            for intensity in kwargs.values():
-                                                if intensity.lower() == str("isotopic"):
-                                                    cs = each_i["partialIsotopicCrossSection"]
-                                                    d_cs = each_i["dPartialIsotopicCrossSection"]
-                                                elif intensity.lower() == str("population"):
-                                                    cs = each_i["populationPerNeutronCapture"]
-                                                    d_cs = each_i["dPopulationPerNeutronCapture"]
-                                                else:
-                                                    UNSPECIFIED_INTENSITY = True
-
-                                        if alpha == None: alpha = 0.0
-                                        if d_alpha == None: d_alpha = 0.0
-                                        if cs == None: cs = 0.0
-                                        if d_cs == None: d_cs = 0.0
-
-                                        converted_cs = float(cs)*(1+float(alpha))
-                                        d_converted_cs = Uncertainties.quad_error(self,converted_cs, cs, d_cs, (1+alpha), d_alpha)
-
-                                        feeding_gs.append(converted_cs)
-                                        d_feeding_gs.append(d_converted_cs)
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    if USE_PRIMARY == True:
+                        feeding = table.feeds_gs
+                    elif USE_PRIMARY == False:
+                        # Don't include the primary
+                        feeding = table.feeds_gs & (table.transition_type != PRIMARY)
+
+                    if feeding.any():
+                        DIRECT_FEEDING_GS = True
+                        cs, d_cs = None, None
+                        for intensity in kwargs.values():
+                            if intensity.lower() == str("isotopic"):
+                                cs, d_cs = table.isotopic, table.d_isotopic
+                            elif intensity.lower() == str("population"):
+                                cs, d_cs = table.population, table.d_population
+                            else:
+                                UNSPECIFIED_INTENSITY = True
+
+                        if cs is None:
+                            cs, d_cs = np.zeros(len(table)), np.zeros(len(table))
+
+                        converted_cs, d_converted_cs = self.intensity_conversions(cs[feeding], d_cs[feeding], table.icc[feeding], table.d_icc[feeding])
+                        feeding_gs.extend(converted_cs.tolist())
+                        d_feeding_gs.extend(d_converted_cs.tolist())
 
-                                    
             except ValueError:
                 WRONG_INPUTS = True
                                     
@@ -405,42 +555,43 @@ class Analysis(Gammas):
         d_tot_feeding_gs = np.sqrt(sum([dx**2 for dx in d_feeding_gs]))
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as, for example:")
-            print(" sum_feeding_gs(edata, True, \"Fe57\", intensity=\"isotopic\")")
-            print("or:")
-            print(" sum_feeding_gs(edata, False, 26, 57, intensity=\"population\")")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as, for example:\n"
+                                           " sum_feeding_gs(edata, True, \"Fe57\", intensity=\"isotopic\")\n"
+                                           "or:\n"
+                                           " sum_feeding_gs(edata, False, 26, 57, intensity=\"population\")")
             return
 
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "Incorrect intensity specified.\n"
+                                               "Only the following keyword arguments are accepted:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
         
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
         
         if DIRECT_FEEDING_GS == False:
-            print("No transitions feeding ground state directly.")
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
 
         if feeding_gs == []:
-            print("No transitions feeding ground state directly.")
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
         else:
             return (tot_feeding_gs, d_tot_feeding_gs)
 
 
+    @cached_result
     def sum_primaries(self,list,*args,**kwargs):
         """Calculates the sum of all internal-conversion-corrected intensities 
         from the associated primary gamma-ray transitions deexciting the capture
@@ -497,39 +648,29 @@ class Analysis(Gammas):
         
         primary_cs = []
         d_primary_cs = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     DECAY_SCHEME_EXISTS = True
-                    for each_l in jdict["levelScheme"]:
-                        if each_l["numberOfGammas"] > 0:
-                            for each_g in each_l["gammaDecay"]:
-                                if each_g["gammaTransitionType"] == "primary":
-                                    HAS_PRIMARIES = True
-                                    alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                    d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                    cs, d_cs = None, None
-                                    for each_i in each_g["gammaAbsoluteIntensities"]:
-                                        for intensity in kwargs.values():
-                                            if intensity.lower() == str("isotopic"):
-                                                cs = each_i["partialIsotopicCrossSection"]
-                                                d_cs = each_i["dPartialIsotopicCrossSection"]
-                                            elif intensity.lower() == str("population"):
-                                                cs = each_i["populationPerNeutronCapture"]
-                                                d_cs = each_i["dPopulationPerNeutronCapture"]
-                                            else:
-                                                UNSPECIFIED_INTENSITY = True
-
-                                    if alpha == None: alpha = 0.0
-                                    if d_alpha == None: d_alpha = 0.0
-                                    if cs == None: cs = 0.0
-                                    if d_cs == None: d_cs = 0.0
-
-                                    converted_cs = float(cs)*(1+float(alpha))
-                                    d_converted_cs = Uncertainties.quad_error(self,converted_cs, cs, d_cs, (1+alpha), d_alpha)
-
-                                    primary_cs.append(converted_cs)
-                                    d_primary_cs.append(d_converted_cs)
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    primary = table.transition_type == PRIMARY
+                    if primary.any():
+                        HAS_PRIMARIES = True
+                        cs, d_cs = None, None
+                        for intensity in kwargs.values():
+                            if intensity.lower() == str("isotopic"):
+                                cs, d_cs = table.isotopic, table.d_isotopic
+                            elif intensity.lower() == str("population"):
+                                cs, d_cs = table.population, table.d_population
+                            else:
+                                UNSPECIFIED_INTENSITY = True
+
+                        if cs is None:
+                            cs, d_cs = np.zeros(len(table)), np.zeros(len(table))
+
+                        converted_cs, d_converted_cs = self.intensity_conversions(cs[primary], d_cs[primary], table.icc[primary], table.d_icc[primary])
+                        primary_cs.extend(converted_cs.tolist())
+                        d_primary_cs.extend(d_converted_cs.tolist())
             except ValueError:
                 WRONG_INPUTS = True
                             
@@ -537,42 +678,61 @@ class Analysis(Gammas):
         d_tot_primary_cs = np.sqrt(sum([dx**2 for dx in d_primary_cs]))
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" sum_primaries(edata, \"C13\", intensity=<str>)")
-            print("or:")
-            print(" sum_primaries(edata, 6, 13, intensity=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " sum_primaries(edata, \"C13\", intensity=<str>)\n"
+                                           "or:\n"
+                                           " sum_primaries(edata, 6, 13, intensity=<str>)")
             return
 
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "Incorrect intensity specified.\n"
+                                               "Only the following keyword arguments are accepted:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return            
         
         if HAS_PRIMARIES == False:
-            print("No primary gamma rays in compound-nucleus decay scheme.")
+            report_error(DataNotFound, "No primary gamma rays in compound-nucleus decay scheme.")
             return
 
         if primary_cs == []:
-            print("No primary gamma rays in defined compound nucleus.")
+            report_error(DataNotFound, "No primary gamma rays in defined compound nucleus.")
             return
         else:
             return (tot_primary_cs, d_tot_primary_cs)
         
 
+    def num_level_indices(self,jdict):
+        """Internal function: Number of level indices spanned by the level 
+        scheme of a data set (int)."""
+        return max([each_l["levelIndex"] for each_l in jdict["levelScheme"]], default=-1) + 1
+
+    def level_cross_sections(self,list,jdict):
+        """Internal function: Summed conversion-corrected isotopic partial 
+        gamma-ray cross sections depopulating each level of a data set, and 
+        their uncertainties, computed in one vectorized pass.
+
+        Returns:
+            A tuple of NumPy arrays (sums, uncertainties) indexed by level 
+            index.
+        """
+        table = self.nucleus_gamma_table(list, jdict)
+        converted_cs, d_converted_cs = self.intensity_conversions(table.isotopic, table.d_isotopic, table.icc, table.d_icc)
+        return self.level_sums(table.level_i, converted_cs, d_converted_cs, self.num_level_indices(jdict))
+
+    @cached_result
     def normalise_intensities(self,list,*args):
         """Calculates the sum of the level depopulation cross sections and 
         normalises the summed-level cross section to the total thermal-neutron 
@@ -644,16 +804,19 @@ class Analysis(Gammas):
         self.list = list
         self.args = args
         DECAY_SCHEME_EXISTS = False
+        DIRECT_FEEDING_GS = True
         UNSPECIFIED_UNIT = False
         WRONG_INPUTS = False
-        if len(args) == 0 or len(args) > 5:
+        if len(args) not in (1, 2, 4, 5):
             WRONG_INPUTS = True
 
-        if type(args[-1]) != int:
+        # Level index of Ecrit in the P0 forms
+        if len(args) in (4, 5) and type(args[-1]) != int:
             WRONG_INPUTS = True
             
         levels = []
-        for jdict in self.list:
+        nucleus_args = args[:1] if len(args) in (1, 4) else args[:2]
+        for jdict in self.select_datasets(self.list, nucleus_args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
 
@@ -670,41 +833,16 @@ class Analysis(Gammas):
                                 d_adopted_total_cs = each_r["dAdoptedTotalThermalCaptureCrossSection"]
                             else:
                                 UNSPECIFIED_UNIT = True
-                                print("Adopted cross section units: {0}".format(each_r["unitAdoptedCrossSection"]))
-
-                    for each_l in jdict["levelScheme"]:
-                        level_index = each_l["levelIndex"]
-                        level_energy = each_l["levelEnergy"]
-                        d_level_energy = each_l["dLevelEnergy"]
+                                report_warning("Adopted cross section units: %s", each_r["unitAdoptedCrossSection"])
 
-                        sum_level_cs = 0
-                        d_sum_level_cs = 0
-                        if each_l["numberOfGammas"] > 0:                            
-                            for each_g in each_l["gammaDecay"]:
-                                alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                for each_i in each_g["gammaAbsoluteIntensities"]:
-                                    gamma_intensity = each_i["partialIsotopicCrossSection"]
-                                    d_gamma_intensity = each_i["dPartialIsotopicCrossSection"]
+                    sum_level_cs, d_sum_level_cs = self.level_cross_sections(self.list, jdict)
 
+                    normalised_cs = sum_level_cs/adopted_total_cs
+                    d_normalised_cs = self.quad_errors(normalised_cs, sum_level_cs, d_sum_level_cs, adopted_total_cs, d_adopted_total_cs)
 
-                                    if alpha == None: alpha = 0.0
-                                    if d_alpha == None: d_alpha = 0.0
-                                    if gamma_intensity == None: gamma_intensity = 0.0
-                                    if d_gamma_intensity == None: d_gamma_intensity = 0.0
-
-                                    converted_cs = float(gamma_intensity)*(1.0+float(alpha))
-                                    d_converted_cs = Uncertainties.quad_error(self,converted_cs, gamma_intensity, d_gamma_intensity, (1.0+alpha), d_alpha)
-
-                                    sum_level_cs += converted_cs
-                                    d_sum_level_cs += d_converted_cs**2
-
-                        d_sum_level_cs = np.sqrt(d_sum_level_cs)
-
-                        normalised_cs = sum_level_cs/adopted_total_cs
-                        d_normalised_cs = Uncertainties.quad_error(self,normalised_cs, sum_level_cs, d_sum_level_cs, adopted_total_cs, d_adopted_total_cs)
-
-                        levels.append([level_index, level_energy, d_level_energy, sum_level_cs, d_sum_level_cs, normalised_cs, d_normalised_cs])
+                    for each_l in jdict["levelScheme"]:
+                        level_index = each_l["levelIndex"]
+                        levels.append([level_index, each_l["levelEnergy"], each_l["dLevelEnergy"], sum_level_cs[level_index], d_sum_level_cs[level_index], normalised_cs[level_index], d_normalised_cs[level_index]])
 
 
                 elif (len(args)==4 and str(args[0]) == jdict["nucleusID"]) or (len(args)==5 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
@@ -723,74 +861,336 @@ class Analysis(Gammas):
                         dP0 = float(args[3])
                         Ecrit = int(args[4])
 
-                    a = Analysis()
-                    sigma_0 = a.modeled_sigma0_ecrit(self.list, Ecrit, P0, dP0, jdict["nucleusID"])[3]
-                    d_sigma_0 = a.modeled_sigma0_ecrit(self.list, Ecrit, P0, dP0, jdict["nucleusID"])[4]
+                    # Taken from the results cache, if enabled
+                    modeled_expt_cs = self.modeled_sigma0_ecrit(self.list, Ecrit, P0, dP0, jdict["nucleusID"])
+                    if modeled_expt_cs is None:
+                        # Error already reported by modeled_sigma0_ecrit
+                        return
+                    sigma_0 = modeled_expt_cs[3]
+                    d_sigma_0 = modeled_expt_cs[4]
+                    if sigma_0 == 0:
+                        DIRECT_FEEDING_GS = False
+                        continue
+
+                    sum_level_cs, d_sum_level_cs = self.level_cross_sections(self.list, jdict)
+
+                    #sigma_0 = a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[0]/(1-P0)
+                    #d_sigma_0 = Uncertainties.quad_error(self, sigma_0, a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[0], a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[1], P0, dP0)
+
+                    normalised_cs = sum_level_cs/sigma_0
+                    d_normalised_cs = self.quad_errors(normalised_cs, sum_level_cs, d_sum_level_cs, sigma_0, d_sigma_0)
 
                     for each_l in jdict["levelScheme"]:
                         level_index = each_l["levelIndex"]
-                        level_energy = each_l["levelEnergy"]
-                        d_level_energy = each_l["dLevelEnergy"]
-
-                        sum_level_cs = 0
-                        d_sum_level_cs = 0
-                        if each_l["numberOfGammas"] > 0:                            
-                            for each_g in each_l["gammaDecay"]:
-                                alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                for each_i in each_g["gammaAbsoluteIntensities"]:
-                                    gamma_intensity = each_i["partialIsotopicCrossSection"]
-                                    d_gamma_intensity = each_i["dPartialIsotopicCrossSection"]
-
-                                    if alpha == None: alpha = 0.0
-                                    if d_alpha == None: d_alpha = 0.0
-                                    if gamma_intensity == None: gamma_intensity = 0.0
-                                    if d_gamma_intensity == None: d_gamma_intensity = 0.0
-
-                                    converted_cs = float(gamma_intensity)*(1.0+float(alpha))
-                                    d_converted_cs = Uncertainties.quad_error(self,converted_cs, gamma_intensity, d_gamma_intensity, (1.0+alpha), d_alpha)
-
-                                    sum_level_cs += converted_cs
-                                    d_sum_level_cs += d_converted_cs**2
-
-                        d_sum_level_cs = np.sqrt(d_sum_level_cs)
-
-                        #sigma_0 = a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[0]/(1-P0)
-                        #d_sigma_0 = Uncertainties.quad_error(self, sigma_0, a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[0], a.sum_feeding_gs(self.list, False, jdict["nucleusID"],intensity='isotopic')[1], P0, dP0)
-                        
-                        normalised_cs = sum_level_cs/sigma_0
-                        d_normalised_cs = Uncertainties.quad_error(self,normalised_cs, sum_level_cs, d_sum_level_cs, sigma_0, d_sigma_0)
-
-                        levels.append([level_index, level_energy, d_level_energy, sum_level_cs, d_sum_level_cs, normalised_cs, d_normalised_cs])
+                        levels.append([level_index, each_l["levelEnergy"], each_l["dLevelEnergy"], sum_level_cs[level_index], d_sum_level_cs[level_index], normalised_cs[level_index], d_normalised_cs[level_index]])
                 
                         
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function using one of the below methods:")
-            print(" normalise_intensities(edata, \"C13\")")
-            print(" normalise_intensities(edata, 6, 13)")
-            print(" normalise_intensities(edata, \"C13\", <float>, <float>, <int>)")
-            print(" normalise_intensities(edata, 6, 13, <float>, <float>, <int>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function using one of the below methods:\n"
+                                           " normalise_intensities(edata, \"C13\")\n"
+                                           " normalise_intensities(edata, 6, 13)\n"
+                                           " normalise_intensities(edata, \"C13\", <float>, <float>, <int>)\n"
+                                           " normalise_intensities(edata, 6, 13, <float>, <float>, <int>)")
             return
 
         if UNSPECIFIED_UNIT == True:
-            print("Not currently handling the adopted cross section units.")
+            report_error(InvalidArguments, "Not currently handling the adopted cross section units.")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            return
+
+        if DIRECT_FEEDING_GS == False:
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
 
         if len(levels) > 0:
             return levels
         else:
-            print("No depopulation data available.")
+            report_error(DataNotFound, "No depopulation data available.")
+            return
+
+    def modeled_sigma0_mc(self, float1, float2, float3, float4, samples=100000, seed=None):
+        """Monte Carlo version of `modeled_sigma0`: the sum of experimental 
+        partial gamma-ray cross sections and the modeled population per 
+        neutron capture are sampled from normal distributions and the 
+        uncertainty of the total radiative thermal neutron-capture cross 
+        section is taken from the percentiles of the draws instead of 
+        first-order quadrature.
+
+        Arguments:
+            float1 = Sum of experimental cross-sections of direct ground-state 
+                     feeding transitions up to the critical energy (float);
+            float2 = Associated uncertainty of the gamma-ray cross section 
+                     summation (float);
+            float3 = Calculated population per neutron capture feeding to the 
+                     ground state from the quasicontinuum (float);
+            float4 = Associated uncertainty for the popultion per neutron 
+                     capture (float).
+            samples: Number of draws (int); by default 100000.
+            seed: Seed of the random numbers; by default fresh entropy is 
+                  used.
+
+        Returns:
+            A tuple object with the following elements:
+
+            [0]: Median total radiative thermal neutron-capture cross section
+                 (float);
+            [1]: Lower uncertainty: distance from the median to the 15.87th 
+                 percentile (float);
+            [2]: Upper uncertainty: distance from the median to the 84.13th 
+                 percentile (float).
+
+        Example:
+            modeled_sigma0_mc(0.1827, 0.0027, 0.02314, 0.00080, seed=1)
+        """
+        rng = np.random.default_rng(seed)
+        sum_expt_feeding = float(float1) + float(float2) * rng.standard_normal(int(samples))
+        P0 = float(float3) + float(float4) * rng.standard_normal(int(samples))
+        return tuple(v.item() for v in percentile_summary(sum_expt_feeding / (1.0 - P0)))
+
+    def monte_carlo(self,list,jdict,seed=None,chunk_size=10000):
+        """Internal function: MonteCarlo sampler of the conversion-corrected
+        isotopic partial gamma-ray cross sections of a data set."""
+        table = self.nucleus_gamma_table(list, jdict)
+        graph = LevelGraph(table, self.num_level_indices(jdict))
+        return MonteCarlo(graph, table.isotopic, table.d_isotopic, table.icc, table.d_icc, seed=seed, chunk_size=chunk_size)
+
+    def modeled_sigma0_ecrit_mc(self,list,int,float1,float2,*args,samples=100000,seed=None,chunk_size=10000):
+        """Monte Carlo version of `modeled_sigma0_ecrit`.  The partial 
+        gamma-ray cross sections and internal-conversion coefficients of all 
+        transitions feeding the ground state up to the critical energy, and
+        the modeled population per neutron capture P0, are sampled from 
+        normal distributions in draws vectorized over the transitions.  The 
+        uncertainties are taken from the percentiles of the draws.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            int : Integer index corresponding to the level at Ecrit.
+            float1 = Calculated population per neutron capture feeding to the 
+                     ground state from the quasicontinuum (float).
+            float2 = Associated uncertainty for the popultion per neutron 
+                     capture (float).
+            args: Takes either 1 or 2 additional arguments:
+            
+                  (i) 1 args:
+                  residual: The residual ID must be passed as a string argument.
+
+                  (ii) 2 args:
+                  Z: Atomic number passed as an integer argument.
+                  A: Atomic mass of the residual compound nucleus passed as an 
+                     integer argument.
+
+            samples: Number of draws (int); by default 100000.
+            seed: Seed of the random numbers; by default fresh entropy is 
+                  used.
+            chunk_size: Number of draws sampled at once, bounding the memory 
+                        used (int); by default 10000.
+
+        Returns:
+            A list object containing the following elements:
+
+            [0]: Critical energy corresponding to the input level index (float);
+            [1]: Median sum of conversion-corrected partial gamma-ray cross 
+                 sections feeding the ground state directly (float);
+            [2]: Lower uncertainty for the cross section summation (float);
+            [3]: Upper uncertainty for the cross section summation (float);
+            [4]: Median total radiative thermal neutron capture cross section 
+                 (float);
+            [5]: Lower uncertainty for the total cross section (float);
+            [6]: Upper uncertainty for the total cross section (float).
+
+            The lower and upper uncertainties are the distances from the 
+            median to the 15.87th and 84.13th percentiles of the draws.
+
+        Examples:
+            modeled_sigma0_ecrit_mc(edata, 11, 0.02256, 0.00064, "Si29")
+            modeled_sigma0_ecrit_mc(edata, 11, 0.02256, 0.00064, 14, 29, samples=10000, seed=1)
+        """
+        # Input checks and error messages of the first-order calculation
+        modeled_expt_cs = self.modeled_sigma0_ecrit(list, int, float1, float2, *args)
+        if modeled_expt_cs is None:
+            return
+
+        for jdict in self.select_datasets(list, args):
+            if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and args[0] == jdict["nucleusZ"] and args[1] == jdict["nucleusA"]):
+                mc = self.monte_carlo(list, jdict, seed, chunk_size)
+                table = mc.graph.table
+                draws = mc.sample(samples, (table.level_f == 0) & (table.level_i <= int), p0=float1, d_p0=float2)
+                sum_expt_feeding = percentile_summary(draws["feeding_gs"])
+                sigma_0 = percentile_summary(draws["sigma0"])
+                return [modeled_expt_cs[0]] + [v.item() for v in sum_expt_feeding + sigma_0]
+
+    def normalise_intensities_mc(self,list,*args,samples=100000,seed=None,chunk_size=10000):
+        """Monte Carlo version of `normalise_intensities`.  The partial 
+        gamma-ray cross sections and internal-conversion coefficients of all 
+        transitions, and either the adopted total capture cross section or 
+        the modeled population per neutron capture P0, are sampled from 
+        normal distributions.  Each draw normalises the level depopulations 
+        to the total capture cross section of the same draw, so that the 
+        correlations between them are kept, and the uncertainties are taken
+        from the percentiles of the draws.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            args: Takes either 1, 2, 4, or 5 additional arguments, as for 
+                  `normalise_intensities`.
+            samples: Number of draws (int); by default 100000.
+            seed: Seed of the random numbers; by default fresh entropy is 
+                  used.
+            chunk_size: Number of draws sampled at once, bounding the memory 
+                        used (int); by default 10000.
+
+        Returns:
+            A list containing the following elements:
+
+            [0]: Level index (int);
+            [1]: Associated level energy (float);
+            [2]: Associated level energy uncertainty (float);
+            [3]: Median summed conversion-corrected total level-depopulation
+                 cross section (float);
+            [4]: Lower uncertainty level-depopulation cross section (float);
+            [5]: Upper uncertainty level-depopulation cross section (float);
+            [6]: Median normalised conversion-corrected total 
+                 level-depopulation intensity (float);
+            [7]: Lower uncertainty normalised level-depopulation intensity 
+                 (float);
+            [8]: Upper uncertainty normalised level-depopulation intensity 
+                 (float).
+
+            The lower and upper uncertainties are the distances from the 
+            median to the 15.87th and 84.13th percentiles of the draws.
+
+        Examples:
+            normalise_intensities_mc(edata, "Si29")
+            normalise_intensities_mc(edata, "Si29", 0.02217, 0.00051, 12, seed=1)
+            normalise_intensities_mc(edata, 14, 29, 0.02217, 0.00051, 12, samples=10000)
+        """
+        # Input checks and error messages of the first-order calculation
+        if self.normalise_intensities(list, *args) is None:
+            return
+
+        nucleus_args = args[:1] if len(args) in (1, 4) else args[:2]
+        for jdict in self.select_datasets(list, nucleus_args):
+            if (len(nucleus_args)==1 and str(nucleus_args[0]) == jdict["nucleusID"]) or (len(nucleus_args)==2 and int(nucleus_args[0]) == jdict["nucleusZ"] and int(nucleus_args[1]) == jdict["nucleusA"]):
+                mc = self.monte_carlo(list, jdict, seed, chunk_size)
+                table = mc.graph.table
+                if len(args) in (1, 2):
+                    each_r = CrossSection.normalization_record(jdict)
+                    draws = mc.sample(samples, table.level_f == 0, sigma0=each_r["adoptedTotalThermalCaptureCrossSection"], d_sigma0=each_r["dAdoptedTotalThermalCaptureCrossSection"])
+                else:
+                    P0, dP0, Ecrit = float(args[-3]), float(args[-2]), args[-1]
+                    draws = mc.sample(samples, (table.level_f == 0) & (table.level_i <= Ecrit), p0=P0, d_p0=dP0)
+
+                sum_level_cs = percentile_summary(draws["depopulation"])
+                normalised_cs = percentile_summary(draws["populations"])
+                levels = []
+                for each_l in jdict["levelScheme"]:
+                    level_index = each_l["levelIndex"]
+                    levels.append([level_index, each_l["levelEnergy"], each_l["dLevelEnergy"]] + [v[level_index].item() for v in sum_level_cs + normalised_cs])
+                return levels
+
+    def compare_dicebox(self,list,dicebox,*args):
+        """Compares the level populations per neutron capture of DICEBOX 
+        statistical-model calculations with the experimental EGAF level 
+        depopulations normalised to the total capture cross section, for 
+        several critical energies at once.  Each DICEBOX run provides the 
+        critical energy and the modeled ground-state feeding P0 from the 
+        quasicontinuum; the EGAF data are read once, and the total capture 
+        cross sections of all runs are evaluated in one pass with 
+        `modeled_sigma0_ecrit_scan`, so that the normalised depopulations 
+        are those of `normalise_intensities` with the P0 of each run.  The 
+        ground state, populated by every cascade, is not compared.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            dicebox: A DICEBOX run directory, a directory of run directories 
+                     (e.g. one per critical energy), or a list of run 
+                     directories or DiceboxOutput objects.
+            args: Takes either 1 or 2 additional arguments:
+            
+                  (i) 1 args:
+                  residual: The residual ID must be passed as a string argument.
+
+                  (ii) 2 args:
+                  Z: Atomic number passed as an integer argument.
+                  A: Atomic mass of the residual compound nucleus passed as an 
+                     integer argument.
+
+        Returns:
+            A pandas DataFrame with one row per run and excited level below 
+            the critical energy, and the columns given in DICEBOX_COLUMNS:
+
+            Ecrit index: Level index at the critical energy (int);
+            Ecrit (keV): Critical energy of the run (float);
+            P0, dP0: Modeled population per neutron capture feeding the 
+                     ground state from the quasicontinuum (float);
+            sigma0, dsigma0: Total capture cross section from the EGAF 
+                             ground-state feeding and P0 (float);
+            Level index: Level index (int);
+            Energy (keV): EGAF level energy (float);
+            Population, dPopulation: DICEBOX population per neutron capture
+                                     (float);
+            Depopulation, dDepopulation: Normalised EGAF level depopulation
+                                         (float);
+            Residual (sigma): |Population - Depopulation| in units of the
+                              combined uncertainty (float).
+
+        Examples:
+            compare_dicebox(edata, "notebook/dicebox_results", "Si29")
+            compare_dicebox(edata, ["Ecrit_levels_10", "Ecrit_levels_12"], 14, 29)
+        """
+        import pandas as pd
+        self.list = list
+        self.args = args
+        try:
+            runs = read_dicebox(dicebox)
+        except (OSError, ValueError, IndexError):
+            runs = None
+        if runs is None or len(runs) == 0:
+            report_error(DataNotFound, "No DICEBOX output (DICE.PRO) found in: %s", dicebox)
             return
+
+        # Total capture cross section of all runs in one pass
+        scan = self.modeled_sigma0_ecrit_scan(self.list, [run.ecrit_index for run in runs], [run.p0 for run in runs], [run.d_p0 for run in runs], *args)
+        if scan is None:
+            return
+
+        for jdict in self.select_datasets(self.list, args):
+            if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and args[0] == jdict["nucleusZ"] and args[1] == jdict["nucleusA"]):
+                sum_level_cs, d_sum_level_cs = self.level_cross_sections(self.list, jdict)
+                sigma_0 = scan['sigma0'].to_numpy()
+                d_sigma_0 = scan['dsigma0'].to_numpy()
+                normalised_cs = sum_level_cs[None,:]/sigma_0[:,None]
+                d_normalised_cs = self.quad_errors(normalised_cs, sum_level_cs[None,:], d_sum_level_cs[None,:], sigma_0[:,None], d_sigma_0[:,None])
+
+                level_energies = np.full(len(sum_level_cs), np.nan)
+                for each_l in jdict["levelScheme"]:
+                    try:
+                        level_energies[each_l["levelIndex"]] = float(each_l["levelEnergy"])
+                    except (TypeError, ValueError):
+                        pass
+
+                columns = {name: [] for name in DICEBOX_COLUMNS[:-1]}
+                for k, run in enumerate(runs):
+                    excited = (run.level > 0) & (run.level < len(sum_level_cs))
+                    level = run.level[excited]
+                    values = [np.full(len(level), scan[name].iloc[k]) for name in ('Level index', 'Ecrit (keV)', 'P0', 'dP0', 'sigma0', 'dsigma0')]
+                    values += [level, level_energies[level], run.population[excited], run.d_population[excited], normalised_cs[k][level], d_normalised_cs[k][level]]
+                    for name, value in zip(DICEBOX_COLUMNS, values):
+                        columns[name].append(value)
+                columns = {name: np.concatenate(value) for name, value in columns.items()}
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    columns['Residual (sigma)'] = np.abs(columns['Population'] - columns['Depopulation'])/np.sqrt(columns['dPopulation']**2 + columns['dDepopulation']**2)
+                return pd.DataFrame(columns, columns=DICEBOX_COLUMNS)
         
 
+    @cached_result
     def level_depopulations(self,list,*args):
         """Calculates the sum of the level depopulation intensities.  These 
         normalised level intensities are effectively level depopulation 
@@ -831,63 +1231,42 @@ class Analysis(Gammas):
             WRONG_INPUTS = True
 
         levels = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
 
                     DECAY_SCHEME_EXISTS = True
                     
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    converted_depop, d_converted_depop = self.intensity_conversions(table.population, table.d_population, table.icc, table.d_icc)
+                    sum_level_depop, d_sum_level_depop = self.level_sums(table.level_i, converted_depop, d_converted_depop, self.num_level_indices(jdict))
+
                     for each_l in jdict["levelScheme"]:
                         level_index = each_l["levelIndex"]
-                        level_energy = each_l["levelEnergy"]
-                        d_level_energy = each_l["dLevelEnergy"]
-
-                        sum_level_depop = 0
-                        d_sum_level_depop = 0
-                        if each_l["numberOfGammas"] > 0:                            
-                            for each_g in each_l["gammaDecay"]:
-                                alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                for each_i in each_g["gammaAbsoluteIntensities"]:
-                                    gamma_intensity = each_i["populationPerNeutronCapture"]
-                                    d_gamma_intensity = each_i["dPopulationPerNeutronCapture"]
-
-                                    if alpha == None: alpha = 0.0
-                                    if d_alpha == None: d_alpha = 0.0
-                                    if gamma_intensity == None: gamma_intensity = 0.0
-                                    if d_gamma_intensity == None: d_gamma_intensity = 0.0
-
-                                    converted_depop = float(gamma_intensity)*(1.0+float(alpha))
-                                    d_converted_depop = Uncertainties.quad_error(self,converted_depop, gamma_intensity, d_gamma_intensity, (1.0+alpha), d_alpha)
-
-                                    sum_level_depop += converted_depop
-                                    d_sum_level_depop += d_converted_depop**2
-                                    
-                        d_sum_level_depop = np.sqrt(d_sum_level_depop)
-
-                        levels.append([level_index, level_energy, d_level_energy, sum_level_depop, d_sum_level_depop])
+                        levels.append([level_index, each_l["levelEnergy"], each_l["dLevelEnergy"], sum_level_depop[level_index], d_sum_level_depop[level_index]])
 
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" level_depopulations(edata, \"C13\")")
-            print(" level_depopulations(edata, 6, 13)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " level_depopulations(edata, \"C13\")\n"
+                                           " level_depopulations(edata, 6, 13)")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
 
         if len(levels) > 0:
             return levels
         else:
-            print("No depopulation data available.")
+            report_error(DataNotFound, "No depopulation data available.")
             return
 
 
+    @cached_result
     def intensity_balance(self,list,*args,**kwargs):
         """Gamma-ray intensity balance corrected for internal conversion for 
         all transitions feeding and deexciting each level in the residual 
@@ -955,10 +1334,10 @@ class Analysis(Gammas):
             WRONG_INPUTS = True
         
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'")
             return
         else:
             for intensity in kwargs.values():
@@ -972,14 +1351,14 @@ class Analysis(Gammas):
                     UNSPECIFIED_INTENSITY = True
 
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity argument.")
-            print("Please pass one of the following keyword arguments:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
+            report_error(InvalidIntensityMode, "Incorrect intensity argument.\n"
+                                               "Please pass one of the following keyword arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'")
             return
         
         intensity_balance = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
 
@@ -995,89 +1374,62 @@ class Analysis(Gammas):
                                 if float(eachq["energyNeutronSeparationEGAF"]) > 0.0:
                                     CAPTURE_STATE = True
                             except ValueError:
-                                print("Check Sn data type in {0}(n,g){1} dataset".format(target, residual))
+                                report_warning("Check Sn data type in %s(n,g)%s dataset", target, residual)
                                 raise
                             
-                    g = Gammas()
-                    gammas_array = None
+                    table = self.nucleus_gamma_table(self.list, jdict)
                     if intensity_units == "ELEMENTAL":
-                        gammas_array = g.get_gammas(self.list, residual, intensity="elemental")
+                        I, dI = table.intensity("elemental")
                     elif intensity_units == "ISOTOPIC":
-                        gammas_array = g.get_gammas(self.list, residual, intensity="isotopic")
+                        I, dI = table.intensity("isotopic")
                     else:
                         break
 
-                    gammas = gammas_array.tolist()
-                    #max_level = max(list(set([int(gamma[0]) for gamma in gammas])))
-                    max_level = max(set([int(gamma[0]) for gamma in gammas]))
+                    if len(table) == 0:
+                        continue
+                    max_level = int(table.level_i.max())
 
                     if CAPTURE_STATE == False:
-                        highest_level_if_no_cs = set([gamma[2] for gamma in gammas if int(gamma[0]) == max_level])
-
-                    for level in range(0,max_level+1,1):
-                        level_energy = None
-                        level_depop = 0.0
-                        d_level_depop = 0.0
-                        LEVEL_IS_DEPOPULATED = False
-                        for gamma in gammas:
-                            if int(gamma[0]) == level:
-                                LEVEL_IS_DEPOPULATED = True
-                                level_energy = float(gamma[2])
-                                depop = float(gamma[6]) * (1+float(gamma[8]))
-                                level_depop += depop
-            
-                                #f,x,dx,y,dy
-                                d_depop = Uncertainties().quad_error(depop, float(gamma[6]), float(gamma[7]), (1+float(gamma[8])), float(gamma[9]))
-                                d_level_depop += float(d_depop)**2
-                        d_level_depop = np.sqrt(d_level_depop)
-
-                        level_pop = 0.0
-                        d_level_pop = 0.0
-                        for gamma in gammas:
-                            if int(gamma[1]) == level:
-                                pop = float(gamma[6]) * (1+float(gamma[8]))
-                                level_pop += pop
-                                if LEVEL_IS_DEPOPULATED == False:
-                                    level_energy = float(gamma[3])
-            
-                                #f,x,dx,y,dy
-                                d_pop = Uncertainties().quad_error(pop, float(gamma[6]), float(gamma[7]), (1+float(gamma[8])), float(gamma[9]))
-                                d_level_pop += float(d_pop)**2
-                        d_level_pop = np.sqrt(d_level_pop)
-
-                        diff = level_pop - level_depop
-                        d_diff = np.sqrt(d_level_depop**2 + d_level_pop**2)
-                        if d_diff > 0:
-                            res = diff / d_diff
-                            if level > 0 and level < max_level:
-                                intensity_balance.append([level, level_energy, level_depop, d_level_depop, level_pop, d_level_pop, diff, d_diff, res])
+                        highest_level_if_no_cs = set(table.energy_i[table.level_i == max_level].tolist())
+
+                    depop, d_depop = self.intensity_conversions(I, dI, table.icc, table.d_icc)
+                    graph = LevelGraph(table)
+                    b = graph.balance(depop, d_depop)
+                    level_energy = graph.level_energies()
+
+                    balanced = b["d_difference"] > 0
+                    balanced[0] = False
+                    balanced[max_level:] = False
+                    for level in np.nonzero(balanced)[0].tolist():
+                        intensity_balance.append([level, level_energy[level], b["depopulation"][level], b["d_depopulation"][level], b["feeding"][level], b["d_feeding"][level], b["difference"][level], b["d_difference"][level], b["residual"][level]])
 
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" intensity_balance(edata, \"S35\", intensity=<str>)")
-            print("or:")
-            print(" intensity_balance(edata, 16, 35, intensity=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " intensity_balance(edata, \"S35\", intensity=<str>)\n"
+                                           "or:\n"
+                                           " intensity_balance(edata, 16, 35, intensity=<str>)")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
         if len(intensity_balance) == 0:
-            print("No gammas in decay scheme")
+            report_error(DataNotFound, "No gammas in decay scheme")
             return
         else:
             if CAPTURE_STATE == True:
                 return np.array(intensity_balance)
             else:
-                print("Warning! Neutron-capture state not measured in EGAF.")
-                print("Highest level observed in residual nucleus: {0} keV.".format(highest_level_if_no_cs))
+                report_warning("Warning! Neutron-capture state not measured in EGAF.\n"
+                               "Highest level observed in residual nucleus: %s keV.", highest_level_if_no_cs)
                 return np.array(intensity_balance)
 
 
+    @cached_result
     def dead_ends(self,list,*args,**kwargs):
         """Finds difference between total internal-conversion corrected 
         intensity deexciting the neutron-capture state and the total internal-
@@ -1154,10 +1506,10 @@ class Analysis(Gammas):
             WRONG_INPUTS = True
         
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'")
             return
         else:
             for intensity in kwargs.values():
@@ -1171,14 +1523,14 @@ class Analysis(Gammas):
                     UNSPECIFIED_INTENSITY = True
 
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity argument.")
-            print("Please pass one of the following keyword arguments:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
+            report_error(InvalidIntensityMode, "Incorrect intensity argument.\n"
+                                               "Please pass one of the following keyword arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'")
             return
         
         deadends = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
 
@@ -1194,56 +1546,41 @@ class Analysis(Gammas):
                                 if float(eachq["energyNeutronSeparationEGAF"]) > 0.0:
                                     CAPTURE_STATE = True
                             except ValueError:
-                                print("Check Sn data type in {0}(n,g){1} dataset".format(target, residual))
+                                report_warning("Check Sn data type in %s(n,g)%s dataset", target, residual)
                                 raise
                     
-                    g = Gammas()
-                    gammas_array = None
+                    table = self.nucleus_gamma_table(self.list, jdict)
                     if intensity_units == "ELEMENTAL":
-                        gammas_array = g.get_gammas(self.list, residual, intensity="elemental")
+                        I, dI = table.intensity("elemental")
                     elif intensity_units == "ISOTOPIC":
-                        gammas_array = g.get_gammas(self.list, residual, intensity="isotopic")
+                        I, dI = table.intensity("isotopic")
                     else:
                         break
 
-                    gammas = gammas_array.tolist()
-                    level_index_cs = max(set([int(gamma[0]) for gamma in gammas]))
-                    level_energy_cs = None
+                    if len(table) == 0:
+                        continue
+                    level_index_cs = int(table.level_i.max())
 
                     if CAPTURE_STATE == False:
-                        highest_level_if_no_cs = set([gamma[2] for gamma in gammas if int(gamma[0]) == level_index_cs])
-                    
-                    level_depop_cs = 0.0
-                    d_level_depop_cs = 0.0                    
-                    for gamma in gammas:
-                        if int(gamma[0]) == level_index_cs:
-                            level_energy_cs = float(gamma[2])
-                            depop_cs = float(gamma[6]) * (1+float(gamma[8]))
-                            level_depop_cs += depop_cs
-
-                            #f,x,dx,y,dy
-                            d_depop_cs = Uncertainties().quad_error(depop_cs, float(gamma[6]), float(gamma[7]), (1+float(gamma[8])), float(gamma[9]))
-                            d_level_depop_cs += float(d_depop_cs)**2
-                    d_level_depop_cs = np.sqrt(d_level_depop_cs)
+                        highest_level_if_no_cs = set(table.energy_i[table.level_i == level_index_cs].tolist())
+
+                    intensity, d_intensity = self.intensity_conversions(I, dI, table.icc, table.d_icc)
+                    graph = LevelGraph(table)
+                    level_depop, d_level_depop = graph.depopulation(intensity, d_intensity)
+                    level_pop, d_level_pop = graph.feeding(intensity, d_intensity)
+                    level_energy = graph.level_energies()
+
+                    level_energy_cs = level_energy[level_index_cs].item()
+                    level_depop_cs = level_depop[level_index_cs].item()
+                    d_level_depop_cs = d_level_depop[level_index_cs]
 
                     level_index_gs = 0
-                    level_energy_gs = None
-                    level_pop_gs = 0.0
-                    d_level_pop_gs = 0.0
-                    GROUND_STATE_FEEDING = False
-                    for gamma in gammas:
-                        if int(gamma[1]) == level_index_gs:
-                            GROUND_STATE_FEEDING = True
-                            level_energy_gs = float(gamma[3])
-                            pop_gs = float(gamma[6]) * (1+float(gamma[8]))
-                            level_pop_gs += pop_gs
-
-                            #f,x,dx,y,dy
-                            d_pop_gs = Uncertainties().quad_error(pop_gs, float(gamma[6]), float(gamma[7]), (1+float(gamma[8])), float(gamma[9]))
-                            d_level_pop_gs += float(d_pop_gs)**2
-                    d_level_pop_gs = np.sqrt(d_level_pop_gs)
-
-                    if GROUND_STATE_FEEDING == False:
+                    level_pop_gs = level_pop[level_index_gs].item()
+                    d_level_pop_gs = d_level_pop[level_index_gs]
+                    feeding_gs = graph.predecessors(level_index_gs)
+                    if len(feeding_gs) > 0:
+                        level_energy_gs = table.energy_f[feeding_gs[-1]].item()
+                    else:
                         level_energy_gs = 0.0
 
                     diff = level_pop_gs - level_depop_cs
@@ -1261,23 +1598,323 @@ class Analysis(Gammas):
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" intensity_balance(edata, \"S35\", intensity=<str>)")
-            print("or:")
-            print(" intensity_balance(edata, 16, 35, intensity=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " intensity_balance(edata, \"S35\", intensity=<str>)\n"
+                                           "or:\n"
+                                           " intensity_balance(edata, 16, 35, intensity=<str>)")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
         if len(deadends) == 0:
-            print("No gammas in decay scheme")
+            report_error(DataNotFound, "No gammas in decay scheme")
             return
         else:
             if CAPTURE_STATE == True:
                 return deadends[0]
             else:
-                print("Warning! Neutron-capture state not measured in EGAF.")
-                print("Highest level observed in residual nucleus: {0} keV.".format(highest_level_if_no_cs))
+                report_warning("Warning! Neutron-capture state not measured in EGAF.\n"
+                               "Highest level observed in residual nucleus: %s keV.", highest_level_if_no_cs)
                 return deadends[0]
+
+    @cached_result
+    def balance_sweep(self,list,intensity='isotopic',threshold=3.0,workers=None,executor='thread'):
+        """Intensity balance of every level and capture-state to ground-state
+        dead ends of all residual compound nuclei, computed in a single 
+        vectorized pass over the gamma rays of the EGAF database.  The level 
+        balances agree with `intensity_balance` and the dead ends with 
+        `dead_ends`.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            intensity: Gamma-ray intensity units (str), either 'elemental' or 
+                       'isotopic' (default).
+            threshold: Levels whose balance residual exceeds `threshold` 
+                       standard deviations are flagged (float); by default 3.
+            workers: Number of concurrent workers (int); by default the sweep
+                     runs in the calling process.  The data sets are split 
+                     into one contiguous chunk per worker.  This only pays off
+                     for plain lists of data sets, since an EGAFCatalog 
+                     already holds its gamma-ray table.
+            executor: Type of worker pool used when `workers` > 1 (str), 
+                      'thread' (default) or 'process'.
+
+        Returns:
+            A pandas DataFrame with one row per nucleus and level, in data-set
+            and level order, and the columns given in SWEEP_COLUMNS:
+
+            Target, Residual (CN): Target and residual compound nucleus IDs;
+            Level index, Energy (keV): Level index and energy;
+            Depopulation, dDepopulation: Total conversion-corrected intensity 
+                                         deexciting the level;
+            Feeding, dFeeding: Total conversion-corrected intensity feeding 
+                               the level;
+            Difference, dDifference: `feeding - depopulation`;
+            Residual (sigma): Difference in units of its uncertainty; NaN for 
+                              the ground and capture states and for levels 
+                              without uncertainty, as these are not balanced 
+                              in `intensity_balance`;
+            Outside threshold: True if |Residual (sigma)| > threshold;
+            Capture state: True if the neutron-capture state is measured in 
+                           EGAF, else the capture state is the highest level
+                           observed;
+            GS feeding, dGS feeding: Intensity feeding the ground state;
+            CS depopulation, dCS depopulation: Intensity deexciting the 
+                                               capture state;
+            Dead-end ratio: `GS feeding / CS depopulation`;
+            Dead-end difference (%): Signed difference between ground-state 
+                                     feeding and capture-state depopulation 
+                                     relative to the capture-state 
+                                     depopulation;
+            Dead-end (sigma): The same difference in units of its 
+                              uncertainty.
+
+            The last eight columns are properties of the nucleus and repeat on
+            each of its levels.
+
+        Examples:
+            sweep = balance_sweep(edata, intensity='isotopic')
+            sweep[sweep['Outside threshold']]
+            balance_sweep(edata, intensity='elemental', threshold=5.0, workers=4, executor='process')
+        """
+        import pandas as pd
+        self.list = list
+        if str(intensity).lower() not in ("elemental", "isotopic"):
+            report_error(InvalidIntensityMode, "Incorrect intensity argument.\n"
+                                               "Please pass one of the following keyword arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'")
+            return
+        intensity = str(intensity).lower()
+
+        if workers == None or int(workers) <= 1:
+            return self.balance_frame(self.gamma_table(self.list), self.list, intensity, threshold)
+
+        datasets = [jdict for jdict in self.list]
+        size = max(1, -(-len(datasets)//int(workers)))
+        chunks = [datasets[i:i+size] for i in range(0, len(datasets), size)]
+        if executor.lower() == 'thread':
+            pool = ThreadPoolExecutor(max_workers=int(workers))
+        elif executor.lower() == 'process':
+            pool = ProcessPoolExecutor(max_workers=int(workers))
+        else:
+            report_error(InvalidArguments, "Unknown executor: %s\n"
+                                           "Only the following executors are accepted:\n"
+                                           "executor='thread'\n"
+                                           "executor='process'", executor)
+            return
+        with pool:
+            frames = [frame for frame in pool.map(balance_sweep_chunk, chunks, [intensity]*len(chunks), [threshold]*len(chunks))]
+        return pd.concat(frames, ignore_index=True)
+
+    def balance_frame(self,table,datasets,intensity,threshold):
+        """Internal function: DataFrame of `balance_sweep` for the data sets
+        of a GammaTable, computed in one vectorized pass over its gamma 
+        rays."""
+        import pandas as pd
+        I, dI = table.intensity(intensity)
+        total, d_total = self.intensity_conversions(I, dI, table.icc, table.d_icc)
+        graph = LevelGraph(table)
+        b = graph.balance(total, d_total)
+        nucleus, level = graph.node_nucleus, graph.node_level
+
+        # The capture state is the highest level deexcited by a gamma ray, as
+        # in `dead_ends`.
+        counts = np.diff(table.offsets)
+        level_cs = np.full(len(counts), -1, dtype=np.int64)
+        np.maximum.at(level_cs, np.repeat(np.arange(len(counts)), counts), table.level_i)
+        node_gs = graph.node_offsets[:-1]
+        node_cs = node_gs + np.maximum(level_cs, 0)
+        pop_gs, d_pop_gs = b["feeding"][node_gs[nucleus]], b["d_feeding"][node_gs[nucleus]]
+        depop_cs, d_depop_cs = b["depopulation"][node_cs[nucleus]], b["d_depopulation"][node_cs[nucleus]]
+        dead_end = pop_gs - depop_cs
+        d_dead_end = np.sqrt(d_depop_cs**2 + d_pop_gs**2)
+
+        balanced = (b["d_difference"] > 0) & (level > 0) & (level < level_cs[nucleus])
+        res = np.where(balanced, b["residual"], np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = pop_gs/depop_cs
+            percent = (dead_end/depop_cs)*100
+            res_dead_end = np.where(d_dead_end > 0, dead_end/d_dead_end, np.nan)
+
+        capture_state = []
+        for jdict in datasets:
+            Sn = Separation.q_record(jdict).get("energyNeutronSeparationEGAF")
+            capture_state.append(Sn != None and float(Sn) > 0.0)
+        targets = np.array([jdict["nucleusTargetID"] for jdict in datasets], dtype=object)
+        residuals = np.array([jdict["nucleusID"] for jdict in datasets], dtype=object)
+
+        columns = [targets[nucleus], residuals[nucleus], level, graph.level_energies(), b["depopulation"], b["d_depopulation"], b["feeding"], b["d_feeding"], b["difference"], b["d_difference"], res, np.abs(res) > threshold, np.array(capture_state, dtype=bool)[nucleus], pop_gs, d_pop_gs, depop_cs, d_depop_cs, ratio, percent, res_dead_end]
+        return pd.DataFrame(dict(zip(SWEEP_COLUMNS, columns)))
+
+
+    def cascade_engine(self,list,jdict):
+        """Internal function: CascadeEngine of a data set, with branching 
+        ratios from the conversion-corrected populations per neutron 
+        capture."""
+        table = self.nucleus_gamma_table(list, jdict)
+        weights, d_weights = self.intensity_conversions(table.population, table.d_population, table.icc, table.d_icc)
+        return CascadeEngine(LevelGraph(table, self.num_level_indices(jdict)), weights)
+
+    @cached_result
+    def level_populations(self,list,*args):
+        """Level populations per neutron capture obtained by propagating the 
+        gamma-ray branching ratios from the neutron-capture state down the 
+        decay scheme.  The branching ratios are derived from the populations
+        per neutron capture corrected for internal conversion, and the 
+        populations are found from a sparse triangular solve over the level 
+        graph.  The propagated populations can be compared to the measured 
+        level depopulations to locate missing or misplaced transitions.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            args: Takes either 1 or 2 additional arguments:
+            
+                  (i) 1 args:
+                  residual: The residual ID must be passed as a string argument.
+
+                  (ii) 2 args:
+                  Z: Atomic number passed as an integer argument.
+                  A: Atomic mass of the residual compound nucleus passed as an 
+                     integer argument.
+
+        Returns:
+            A pandas DataFrame with one row per level index and the columns:
+
+            Level index: Level index (int);
+            Energy (keV): Level energy from the gamma rays connecting the 
+                          level (float);
+            Population: Propagated probability per capture that a cascade 
+                        passes through the level (float);
+            Depopulation: Measured conversion-corrected population per 
+                          neutron capture deexciting the level (float).
+
+        Examples:
+            level_populations(edata, "Au198")
+            level_populations(edata, 79, 198)
+        """
+        import pandas as pd
+        self.list = list
+        self.args = args
+        DECAY_SCHEME_EXISTS = False
+        WRONG_INPUTS = False
+        if len(args) == 0 or len(args) > 2:
+            WRONG_INPUTS = True
+
+        populations = None
+        for jdict in self.select_datasets(self.list, args):
+            try:
+                if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
+
+                    DECAY_SCHEME_EXISTS = True
+                    engine = self.cascade_engine(self.list, jdict)
+                    table = engine.graph.table
+                    weights, d_weights = self.intensity_conversions(table.population, table.d_population, table.icc, table.d_icc)
+                    depop, d_depop = engine.graph.depopulation(weights, d_weights)
+                    populations = pd.DataFrame({'Level index': np.arange(len(engine.graph)), 'Energy (keV)': engine.graph.level_energies(), 'Population': engine.populations(), 'Depopulation': depop})
+
+            except ValueError:
+                WRONG_INPUTS = True
+
+        if WRONG_INPUTS == True:
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " level_populations(edata, \"Au198\")\n"
+                                           "or:\n"
+                                           " level_populations(edata, 79, 198)")
+            return
+
+        if DECAY_SCHEME_EXISTS == False:
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            return
+
+        if populations is None or len(populations) == 0:
+            report_error(DataNotFound, "No gammas in decay scheme")
+            return
+        return populations
+
+    @cached_result
+    def get_cascades(self,list,*args,top=10):
+        """Most probable gamma-ray cascades from the neutron-capture state to 
+        the ground state.  The probability of a cascade is the product of the 
+        branching ratios of its transitions, derived from the populations per
+        neutron capture corrected for internal conversion.  The cascades are
+        found by dynamic programming over the level graph, so that large 
+        decay schemes are handled without enumerating all paths.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            args: Takes either 1 or 2 additional arguments:
+            
+                  (i) 1 args:
+                  residual: The residual ID must be passed as a string argument.
+
+                  (ii) 2 args:
+                  Z: Atomic number passed as an integer argument.
+                  A: Atomic mass of the residual compound nucleus passed as an 
+                     integer argument.
+
+            top: Number of cascades returned (int); by default 10.
+
+        Returns:
+            A pandas DataFrame with one row per cascade, in order of 
+            decreasing probability, and the columns given in CASCADE_COLUMNS:
+
+            Rank: Rank of the cascade, starting at 1 (int);
+            Probability: Probability per neutron capture (float);
+            Multiplicity: Number of gamma rays in the cascade (int);
+            Levels: Level indices visited, from the capture state to the 
+                    ground state (tuple);
+            Gamma energies (keV): Gamma-ray energies in order of emission 
+                                  (tuple).
+
+        Examples:
+            get_cascades(edata, "Au198")
+            get_cascades(edata, 68, 168, top=25)
+        """
+        import pandas as pd
+        self.list = list
+        self.args = args
+        DECAY_SCHEME_EXISTS = False
+        WRONG_INPUTS = False
+        if len(args) == 0 or len(args) > 2:
+            WRONG_INPUTS = True
+
+        rows = []
+        for jdict in self.select_datasets(self.list, args):
+            try:
+                if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
+
+                    DECAY_SCHEME_EXISTS = True
+                    engine = self.cascade_engine(self.list, jdict)
+                    table = engine.graph.table
+                    for rank, (probability, edges) in enumerate(engine.top_cascades(top)):
+                        levels = tuple([int(engine.start)] + table.level_f[edges].tolist())
+                        rows.append((rank+1, probability, len(edges), levels, tuple(table.energy[edges].tolist())))
+
+            except ValueError:
+                WRONG_INPUTS = True
+
+        if WRONG_INPUTS == True:
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_cascades(edata, \"Au198\", top=<int>)\n"
+                                           "or:\n"
+                                           " get_cascades(edata, 79, 198, top=<int>)")
+            return
+
+        if DECAY_SCHEME_EXISTS == False:
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            return
+
+        if len(rows) == 0:
+            report_error(DataNotFound, "No cascades from the capture state to the ground state in decay scheme.")
+            return
+        return pd.DataFrame(rows, columns=CASCADE_COLUMNS)
+
+def balance_sweep_chunk(datasets, intensity, threshold):
+    """Internal function: `balance_sweep` of a chunk of data sets, run by the
+    worker pool."""
+    return Analysis().balance_frame(GammaTable.from_datasets(datasets), datasets, intensity, threshold)
@@ -1,58 +1,317 @@
 import numpy as np
-import pandas as pd
+# pandas is imported by the methods that build DataFrames, so that 
+# `import pyEGAF` does not pay for it.
 import json
 import glob
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from .catalog import EGAFCatalog, LazyEGAFCatalog, parse_json_file
+from .gamma_table import GammaTable
+from .results_cache import ResultsCache, cached_result
+from .errors import EGAFError, InvalidArguments, InvalidIntensityMode, NucleusNotFound, DataNotFound, report_error, report_warning, report_info
+from . import binary_cache
+from . import columnar
+from . import mapped_store
+from . import records
 
 class BaseEGAF(object):
     __doc__="""Base class to handle EGAF data sets."""
 
     def __init__(self,contents=None):
         self.contents = [] or None
+        self._results_cache = None
+        self._services = {}
+
+    def service(self,cls):
+        """Internal function: Instance of the pyEGAF class `cls`, e.g. Gammas
+        or Analysis, used by the methods of this instance for nested calls.  
+        The instance is built on first use and reused thereafter, so that 
+        loops over gamma rays or nuclei do not construct a new object per 
+        iteration.  It is a separate object from `self`, so that the nested
+        calls do not overwrite the arguments stored on this instance."""
+        instance = self._services.get(cls)
+        if instance is None:
+            instance = self._services[cls] = cls()
+        return instance
+
+    def enable_results_cache(self,maxsize=256):
+        """Enables memoization of the results of the analysis methods on this
+        instance.  Results are kept in a least-recently-used cache keyed by 
+        method, EGAF catalog, nucleus, intensity mode and numeric arguments, 
+        so that repeated sweeps over the same nuclei are not recomputed.  
+        Results computed from a catalog are discarded when the catalog is 
+        modified; plain lists of data sets are not cached.
 
-    def load_egaf(self):
+        Arguments:
+            maxsize: Maximum number of stored results (int); by default 256.
+
+        Example:
+            e.enable_results_cache()
+            e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12)
+        """
+        self._results_cache = ResultsCache(maxsize)
+
+    def disable_results_cache(self):
+        """Disables and discards the results cache of this instance."""
+        self._results_cache = None
+
+    def clear_results_cache(self,method=None):
+        """Removes all cached results, or only those of the named method.
+
+        Arguments:
+            method: Name of an analysis method (str); optional.
+
+        Example:
+            e.clear_results_cache()
+            e.clear_results_cache("intensity_balance")
+        """
+        if self._results_cache is not None:
+            self._results_cache.invalidate(method)
+
+    def results_cache_info(self):
+        """Statistics of the results cache.
+
+        Returns:
+            A CacheInfo named tuple (hits, misses, maxsize, currsize), or None
+            if the cache is not enabled.
+        """
+        if self._results_cache is None:
+            return None
+        return self._results_cache.info()
+
+    def load_egaf(self,workers=None,executor='thread',cache=True,lazy=False,mmap=False,compact=False):
         """Function to assign all 245 JSON-formatted EGAF thermal neutron 
         capture (n,g) data sets to a list object variable.
         
         Arguments:
-            No arguments are passed to this function.
+            workers: Number of concurrent workers used to parse the JSON 
+                     files (int).  By default (None) the files are parsed one 
+                     after another.
+            executor: Type of worker pool used when `workers` > 1 (str):
+
+                      executor='thread'  : Thread pool (default);
+                      executor='process' : Process pool.
+
+            cache: True: Read the data sets from the binary cache if it is 
+                         up to date with the JSON files, otherwise parse the 
+                         JSON files and (re)build the cache (default).
+                   False: Always parse the JSON files.
+            lazy: True: Return a LazyEGAFCatalog that parses each data set 
+                        only when it is first accessed.  The `workers` and 
+                        `cache` arguments are then ignored.
+                  False: Parse all data sets immediately (default).
+            mmap: True: Return a MappedEGAFCatalog backed by a store of `.npy` 
+                        files opened with `np.memmap`, which is built next to 
+                        the binary cache on first use and rebuilt when the 
+                        JSON files change.  The gamma tables used by the 
+                        analysis methods are read-only views of the mapped 
+                        files, shared by all processes that open the store, 
+                        and pickling the catalog only transfers the path of 
+                        the store.
+                  False: Hold the data sets in memory (default).
+            compact: True: Convert the parsed data sets to the `__slots__` 
+                           records of `pyEGAF.records` (Nucleus, Level, 
+                           Gamma, ...), which take less than half the memory
+                           of the JSON dictionaries and are accepted by all 
+                           pyEGAF methods.  Ignored if `lazy` or `mmap` is 
+                           True.
+                     False: Keep the JSON dictionaries (default).
+
+            The data sets are always returned in the same order, i.e., sorted
+            by JSON file name, regardless of the number of workers.  With the
+            default `cache=True` the binary cache (and the store of 
+            `mmap=True`) is written to the directory given by the environment 
+            variable PYEGAF_CACHE_DIR, or else to the user cache directory 
+            ($XDG_CACHE_HOME/pyEGAF or ~/.cache/pyEGAF).  Writing the cache is 
+            best-effort: if it fails, e.g. in a read-only directory, the data 
+            sets are still returned.
         
         Returns:
-            A list object containing all 3226 JSON-formatted ENSDF-decay data 
-            sets.
+            An EGAFCatalog object containing all 245 JSON-formatted EGAF data 
+            sets.  The catalog is a list object that also holds hash indexes 
+            of the data sets keyed by residual ID, target ID, residual (Z,A) 
+            and target (Z,A); it can be passed to all pyEGAF methods in place 
+            of a list of JSON objects.
 
         Example:
             
             import pyEGAF as egaf
             e = egaf.EGAF()
             edata = e.load_egaf()
+            edata = e.load_egaf(workers=4)
+            edata = e.load_egaf(workers=4, executor='process')
+            edata = e.load_egaf(cache=False)
+            edata = e.load_egaf(lazy=True)
+            edata = e.load_egaf(mmap=True)
+            edata = e.load_egaf(compact=True)
         """
-        print("Loading EGAF data sets, please wait...")
+        report_info("Loading EGAF data sets, please wait...")
         
         from . import get_data
         EGAF_JSON_PATH = get_data('EGAF_JSON')
-        json_egaf_list = [j for j in glob.glob("%s/*.json"%EGAF_JSON_PATH)]
-        json_egaf_data = []
+        json_egaf_list = sorted(glob.glob("%s/*.json"%EGAF_JSON_PATH))
+
+        if lazy == True:
+            json_egaf_data = LazyEGAFCatalog(json_egaf_list)
+            report_info("%s JSON-formatted EGAF data sets indexed for loading on first access.", len(json_egaf_data))
+            return json_egaf_data
+
+        if mmap == True:
+            store = mapped_store.store_path(EGAF_JSON_PATH)
+            if mapped_store.store_is_current(store, json_egaf_list):
+                json_egaf_data = mapped_store.MappedEGAFCatalog(store)
+                report_info("%s EGAF data sets mapped from %s.", len(json_egaf_data), store)
+                return json_egaf_data
+
+        cached_data = None
+        if cache == True:
+            cached_data = binary_cache.read_cache(EGAF_JSON_PATH, json_egaf_list)
+
+        if cached_data != None:
+            json_egaf_data = EGAFCatalog(cached_data)
+        elif workers == None or int(workers) <= 1:
+            json_egaf_data = EGAFCatalog(map(parse_json_file, json_egaf_list))
+        elif executor.lower() == 'thread':
+            with ThreadPoolExecutor(max_workers=int(workers)) as pool:
+                json_egaf_data = EGAFCatalog(pool.map(parse_json_file, json_egaf_list))
+        elif executor.lower() == 'process':
+            chunks = max(1, len(json_egaf_list)//(4*int(workers)))
+            with ProcessPoolExecutor(max_workers=int(workers)) as pool:
+                json_egaf_data = EGAFCatalog(pool.map(parse_json_file, json_egaf_list, chunksize=chunks))
+        else:
+            report_error(InvalidArguments, "Unknown executor: %s\n"
+                                           "Only the following executors are accepted:\n"
+                                           "executor='thread'\n"
+                                           "executor='process'", executor)
+            return
 
-        JSON_COUNT = 0
-        for json_file in json_egaf_list:
-            JSON_COUNT += 1
-            with open(json_file, mode='r') as jf:
-                json_egaf_dict = json.loads(jf.read())
-                json_egaf_data.append(json_egaf_dict)
-            jf.close()
+        if cache == True and cached_data == None:
+            binary_cache.write_cache(EGAF_JSON_PATH, json_egaf_list, json_egaf_data)
 
+        if mmap == True:
+            if mapped_store.write_store(store, json_egaf_data, binary_cache.build_manifest(json_egaf_list)) != None:
+                json_egaf_data = mapped_store.MappedEGAFCatalog(store)
+            else:
+                report_warning("The EGAF store could not be written to %s; the data sets are held in memory.", store)
+        elif compact == True:
+            json_egaf_data = EGAFCatalog(records.compact_datasets(json_egaf_data))
+
+        JSON_COUNT = len(json_egaf_data)
         if JSON_COUNT == 245:
-            print("All {0} JSON-formatted EGAF data sets loaded.".format(JSON_COUNT))
+            report_info("All %s JSON-formatted EGAF data sets loaded.", JSON_COUNT)
         elif (JSON_COUNT > 0) and (JSON_COUNT < 245):
-            print("{0} JSON-formatted EGAF data sets loaded.".format(JSON_COUNT))
-            print("{0} JSON-formatted EGAF data sets are missing.".format(245-int(JSON_COUNT)))
+            report_warning("%s JSON-formatted EGAF data sets loaded.\n"
+                           "%s JSON-formatted EGAF data sets are missing.", JSON_COUNT, 245-int(JSON_COUNT))
         else:
             if JSON_COUNT == 0:
-                print("{0} JSON-formatted EGAF data sets loaded.".format(JSON_COUNT))
+                report_info("%s JSON-formatted EGAF data sets loaded.", JSON_COUNT)
+        return json_egaf_data
+
+    def export_egaf(self,list,path,format='parquet'):
+        """Exports EGAF data sets as normalized columnar tables for use with
+        Spark, DuckDB or pandas: datasets, levels, spins, isomers, gammas, 
+        intensities and conversion_coefficients.  The data sets are written 
+        one at a time to keep the memory use low.
+
+        Arguments:
+            list: A list of EGAF (n,g) data JSON objects.
+            path: Output directory (str); created if needed.
+            format: Format of the tables (str):
+
+                    format='parquet' : One Parquet file per table (default);
+                    format='feather' : One Feather (Arrow IPC) file per table;
+                    format='hdf5'    : One HDF5 file with a key per table.
+
+            The Parquet and Feather formats require the optional `pyarrow` 
+            package and the HDF5 format the optional `tables` package.
+
+        Returns:
+            A sorted list of the paths of the written files.
+
+        Example:
+            e.export_egaf(edata, "egaf_parquet")
+            e.export_egaf(edata, "egaf_hdf5", format='hdf5')
+        """
+        if format not in columnar.COLUMNAR_FORMATS:
+            report_error(InvalidArguments, "Unknown format: %s\n"
+                                           "Only the following formats are accepted:\n"
+                                           "format='parquet'\n"
+                                           "format='feather'\n"
+                                           "format='hdf5'", format)
+            return
+        paths = columnar.export_tables(list, path, format)
+        report_info("%s EGAF data sets exported to %s.", len(list), path)
+        return paths
+
+    def load_egaf_tables(self,path,format=None):
+        """Loads the EGAF data sets from the columnar tables written by 
+        `export_egaf`.  Rebuilding the JSON objects from the tables takes 
+        about half the time of parsing the JSON-formatted data sets.
+
+        Arguments:
+            path: Directory of the tables (str).
+            format: 'parquet', 'feather' or 'hdf5' (str); by default the 
+                    format is inferred from the files in `path`.
+
+        Returns:
+            An EGAFCatalog object containing the exported data sets, equal to
+            the catalog returned by `load_egaf`.  The tables themselves can 
+            be read as pandas DataFrames with `pyEGAF.columnar.read_tables`.
+
+        Example:
+            edata = e.load_egaf_tables("egaf_parquet")
+        """
+        if columnar.columnar_format(path) == None and format == None:
+            report_error(DataNotFound, "No columnar EGAF tables found in %s.", path)
+            return
+        json_egaf_data = EGAFCatalog(columnar.tables_to_datasets(columnar.read_tables(path, format)))
+        report_info("%s EGAF data sets loaded from %s.", len(json_egaf_data), path)
         return json_egaf_data
     
+    def select_datasets(self,list,args,target=False):
+        """Internal function: Returns the data sets to be searched for the 
+        nucleus passed in args, either as an ID string or as (Z,A) integers.  
+        An EGAFCatalog resolves the nucleus through its hash indexes; any 
+        other list is returned in full for a linear search.  Residual nuclei 
+        are matched by default and target nuclei if `target` is True."""
+        if isinstance(list, EGAFCatalog):
+            return list.candidates(args, target)
+        return list
+
+    def nucleus_gamma_table(self,list,jdict):
+        """Internal function: Columnar GammaTable of the gamma rays of the 
+        data set `jdict`.  The table is taken from the catalog when `list` is 
+        an EGAFCatalog, otherwise it is built from `jdict`."""
+        if isinstance(list, EGAFCatalog):
+            return list.nucleus_gamma_table(jdict)
+        return GammaTable.from_datasets([jdict])
+
+    def gamma_table(self,list):
+        """Internal function: Columnar GammaTable of all gamma rays in list.
+        The table of an EGAFCatalog is built once and reused; any other list
+        is tabulated on each call."""
+        if isinstance(list, EGAFCatalog):
+            return list.gamma_table()
+        return GammaTable.from_datasets(list)
+
+    def dataset_values(self,list,key,record=None):
+        """Internal function: Values of a top-level key of every data set in
+        list, or of a key of the record returned by `record(jdict)`, e.g. 
+        CrossSection.normalization_record.  An EGAFCatalog may provide them 
+        without loading the data sets, any other list is read one data set 
+        at a time."""
+        if isinstance(list, EGAFCatalog):
+            return list.dataset_values(key, record)
+        if record is None:
+            return [jdict[key] for jdict in list]
+        return [record(jdict)[key] for jdict in list]
+
+    def sorted_positions(self,values):
+        """Internal function: Positions of `values` in their sorted order;
+        equal values keep their order, as in a sort of the data sets."""
+        return sorted(range(len(values)), key=values.__getitem__)
+
     def sort_by_json_key(list,str='nucleusTargetID'):
         """Internal function: Sorts list in alphabetical order of target 
         nucleus ID."""
@@ -77,11 +336,7 @@ class BaseEGAF(object):
             egaf_target_list(edata) 
         """
         self.list = list
-        egaf_targets = sorted(self.list, key=BaseEGAF.sort_by_json_key)
-        list_of_targets = []
-        for jdict in egaf_targets:
-            list_of_targets.append(jdict['nucleusTargetID'])
-        return list_of_targets
+        return sorted(self.dataset_values(self.list, 'nucleusTargetID'))
 
     def egaf_residual_list(self,list):
         """Residual nuclides (A+1) corresponding to each target (A) (n,g) data 
@@ -99,11 +354,8 @@ class BaseEGAF(object):
             egaf_residual_list(edata) 
         """
         self.list = list
-        egaf_targets = sorted(self.list, key=BaseEGAF.sort_by_json_key)
-        list_of_residuals = []
-        for jdict in egaf_targets:
-            list_of_residuals.append(jdict['nucleusID'])
-        return list_of_residuals
+        residuals = self.dataset_values(self.list, 'nucleusID')
+        return [residuals[pos] for pos in self.sorted_positions(self.dataset_values(self.list, 'nucleusTargetID'))]
 
     def egaf_target_residual_dict(self,list):
         """Residual (A+1) - target (A) pairs for each EGAF (n,g) data set.
@@ -125,10 +377,10 @@ class BaseEGAF(object):
             egaf_target_residual_dict(edata)
         """
         self.list = list
-        egaf_residuals = sorted(self.list, key=BaseEGAF.sort_by_residual_A)
+        residuals, targets, Z, A = [self.dataset_values(self.list, key) for key in ('nucleusID', 'nucleusTargetID', 'nucleusZ', 'nucleusA')]
         dict_of_residuals = {}
-        for jdict in egaf_residuals:
-            dict_of_residuals.update({jdict['nucleusID']:(jdict['nucleusTargetID'], jdict['nucleusZ'], jdict['nucleusA'])})
+        for pos in self.sorted_positions(A):
+            dict_of_residuals.update({residuals[pos]:(targets[pos], Z[pos], A[pos])})
         return dict_of_residuals
 
     
@@ -176,30 +428,30 @@ class Meta(BaseEGAF):
         num_primaries_gammas = None
         target = None
         residual = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     residual = jdict["nucleusID"]
                     target = jdict["nucleusTargetID"]
                     num_primaries_gammas = jdict["numberPrimaryGammas"]
 
-                    print("{0}(n,g){1}".format(target,residual))
-                    print("Number of primaries = {0}".format(num_primaries_gammas))
+                    report_info("%s(n,g)%s\n"
+                                "Number of primaries = %s", target, residual, num_primaries_gammas)
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" num_primaries(edata,\"Cl36\")")
-            print("or:")
-            print(" num_primaries(edata,17,36)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " num_primaries(edata,\"Cl36\")\n"
+                                           "or:\n"
+                                           " num_primaries(edata,17,36)")
             return
                 
         if num_primaries_gammas != None:
             return num_primaries_gammas
         else:
-            print("No (n,g) data for input residual nucleus.")
+            report_error(NucleusNotFound, "No (n,g) data for input residual nucleus.")
             return
         
     def num_secondaries(self,list,*args):
@@ -240,30 +492,30 @@ class Meta(BaseEGAF):
         num_secondaries_gammas = None
         target = None
         residual = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     residual = jdict["nucleusID"]
                     target = jdict["nucleusTargetID"]
                     num_secondaries_gammas = jdict["numberSecondaryGammas"]
 
-                    print("{0}(n,g){1}".format(target,residual))
-                    print("Number of secondaries = {0}".format(num_secondaries_gammas))
+                    report_info("%s(n,g)%s\n"
+                                "Number of secondaries = %s", target, residual, num_secondaries_gammas)
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" num_secondaries(edata,\"Cl36\")")
-            print("or:")
-            print(" num_secondaries(edata,17,36)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " num_secondaries(edata,\"Cl36\")\n"
+                                           "or:\n"
+                                           " num_secondaries(edata,17,36)")
             return
                 
         if num_secondaries_gammas != None:
             return num_secondaries_gammas
         else:
-            print("No (n,g) data for input residual nucleus.")
+            report_error(NucleusNotFound, "No (n,g) data for input residual nucleus.")
             return
 
     def num_gammas(self,list,*args):
@@ -303,31 +555,31 @@ class Meta(BaseEGAF):
         number_gammas = None
         target = None
         residual = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     residual = jdict["nucleusID"]
                     target = jdict["nucleusTargetID"]
                     number_gammas = jdict["totalNumberGammas"]
 
-                    print("{0}(n,g){1}".format(target,residual))
-                    print("Total number of gammas = {0}".format(number_gammas))
+                    report_info("%s(n,g)%s\n"
+                                "Total number of gammas = %s", target, residual, number_gammas)
 
             except ValueError:
                 WRONG_INPUTS = True
                 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" num_gammas(edata,\"Cl36\")")
-            print("or:")
-            print(" num_gammas(edata,17,36)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " num_gammas(edata,\"Cl36\")\n"
+                                           "or:\n"
+                                           " num_gammas(edata,17,36)")
             return
                 
         if number_gammas != None:
             return number_gammas
         else:
-            print("No (n,g) data for input residual nucleus.")
+            report_error(NucleusNotFound, "No (n,g) data for input residual nucleus.")
             return
 
     def num_levels(self,list,*args):
@@ -367,31 +619,31 @@ class Meta(BaseEGAF):
         number_levels = None
         target = None
         residual = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     residual = jdict["nucleusID"]
                     target = jdict["nucleusTargetID"]
                     number_levels = jdict["totalNumberLevels"]
 
-                    print("{0}(n,g){1}".format(target,residual))
-                    print("Total number of levels = {0}".format(number_levels))
+                    report_info("%s(n,g)%s\n"
+                                "Total number of levels = %s", target, residual, number_levels)
 
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" num_levels(edata,\"Cl36\")")
-            print("or:")
-            print(" num_levels(edata,17,36)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " num_levels(edata,\"Cl36\")\n"
+                                           "or:\n"
+                                           " num_levels(edata,17,36)")
             return
                 
         if number_levels != None:
             return number_levels
         else:
-            print("No (n,g) data for input residual nucleus.")
+            report_error(NucleusNotFound, "No (n,g) data for input residual nucleus.")
             return
 
     def get_stats(self,list,*args):
@@ -448,11 +700,11 @@ class Meta(BaseEGAF):
             else:
                 return meta_data
         else:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" num_levels(edata,\"Cl36\")")
-            print("or:")
-            print(" num_levels(edata,17,36)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " num_levels(edata,\"Cl36\")\n"
+                                           "or:\n"
+                                           " num_levels(edata,17,36)")
             return 
             
 
@@ -500,3 +752,38 @@ class Uncertainties(Meta):
                 return float(self.f)*float(dy)/float(self.y)
             else:
                 return 0
+
+    def quad_errors(self,f,x,dx,y,dy):
+        """Internal function: Array version of `quad_error` combining errors
+        in quadrature element by element for calculations of the type:
+
+        f = x*y
+        f = x/y
+
+        Missing values are passed as NaN (in place of None) and zero
+        denominators are masked, following the same rules as `quad_error`: if
+        either variable is zero or missing, only the relative uncertainty of
+        the other (positive) variable is propagated, and the uncertainty is 0
+        if neither applies.
+
+        Arguments:
+            f: Results (NumPy array or float).
+            x: First variables.
+            dx: First variable uncertainties.
+            y: Second variables.
+            dy: Second variable uncertainties.
+
+        Returns:
+            A NumPy array of the associated uncertainties.
+        """
+        f, x, dx, y, dy = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in (f, x, dx, y, dy)])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel_x = dx/x
+            rel_y = dy/y
+            both = ~np.isnan(x) & ~np.isnan(y) & (x != 0.0) & (y != 0.0)
+            x_only = ~both & (x > 0.0)
+            y_only = ~both & ~x_only & (y > 0.0)
+            err = np.where(both, f*np.sqrt(rel_x**2 + rel_y**2), 0.0)
+            err = np.where(x_only, f*rel_x, err)
+            err = np.where(y_only, f*rel_y, err)
+        return np.where(np.isnan(f), 0.0, err)
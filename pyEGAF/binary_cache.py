@@ -0,0 +1,145 @@
+"""Versioned binary cache of the parsed JSON-formatted EGAF data sets.
+
+The cache is a pickle file (protocol 5 where available, else the highest
+protocol of the interpreter) written by default to a user cache directory the
+first time the EGAF data sets are loaded.  It holds a manifest of the source
+JSON files (name, size, modification time and SHA-256 hash) followed by the
+parsed data sets.  The cache is only used if every source file still matches
+its manifest entry; otherwise it is rebuilt automatically.
+
+The cache directory is taken from the `PYEGAF_CACHE_DIR` environment variable
+if set, else `$XDG_CACHE_HOME/pyEGAF`, else `~/.cache/pyEGAF`.
+"""
+import hashlib
+import os
+import pickle
+from .catalog import gc_paused
+
+# Increment whenever the layout of the cache file changes.
+CACHE_VERSION = 1
+PICKLE_PROTOCOL = min(5, pickle.HIGHEST_PROTOCOL)
+
+
+def cache_directory():
+    """Directory holding the binary EGAF cache files."""
+    cache_dir = os.environ.get("PYEGAF_CACHE_DIR")
+    if cache_dir:
+        return cache_dir
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg, "pyEGAF")
+
+
+def cache_path(json_dir):
+    """Cache file associated with a directory of JSON-formatted data sets.
+
+    Arguments:
+        json_dir: Path of the EGAF_JSON directory (str).
+
+    Returns:
+        Path of the binary cache file (str).  Different data directories, e.g.
+        different installations, use different cache files.
+    """
+    tag = hashlib.sha256(os.path.abspath(json_dir).encode()).hexdigest()[:16]
+    return os.path.join(cache_directory(), "egaf_json_v{0}_{1}.pickle".format(CACHE_VERSION, tag))
+
+
+def file_hash(path):
+    """SHA-256 hash of a file's contents (str)."""
+    sha = hashlib.sha256()
+    with open(path, mode='rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def build_manifest(json_files):
+    """Manifest of the JSON files: a list of (name, size, mtime_ns, sha256)
+    tuples in the order of `json_files`."""
+    manifest = []
+    for path in json_files:
+        st = os.stat(path)
+        manifest.append((os.path.basename(path), st.st_size, st.st_mtime_ns, file_hash(path)))
+    return manifest
+
+
+def manifest_is_current(manifest, json_files):
+    """Checks a cached manifest against the JSON files on disk.  Files whose
+    size and modification time are unchanged are accepted without reading
+    them; a file whose modification time alone has changed is accepted only
+    if its contents hash is unchanged."""
+    if len(manifest) != len(json_files):
+        return False
+    for (name, size, mtime_ns, sha), path in zip(manifest, json_files):
+        if name != os.path.basename(path):
+            return False
+        st = os.stat(path)
+        if st.st_size != size:
+            return False
+        if st.st_mtime_ns != mtime_ns and file_hash(path) != sha:
+            return False
+    return True
+
+
+def read_cache(json_dir, json_files):
+    """Reads the parsed data sets from the binary cache.
+
+    Arguments:
+        json_dir: Path of the EGAF_JSON directory (str).
+        json_files: Sorted list of the JSON file paths in `json_dir`.
+
+    Returns:
+        A list of the parsed JSON objects, or None if there is no cache or
+        the cache is stale or unreadable.
+    """
+    path = cache_path(json_dir)
+    try:
+        with open(path, mode='rb') as f:
+            header = pickle.load(f)
+            if header.get("version") != CACHE_VERSION:
+                return None
+            if not manifest_is_current(header.get("manifest", []), json_files):
+                return None
+            with gc_paused():
+                return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return None
+
+
+def write_cache(json_dir, json_files, datasets):
+    """Writes the parsed data sets to the binary cache.  The file is written
+    to a temporary name and moved into place so that concurrent readers never
+    see a partial cache.
+
+    Arguments:
+        json_dir: Path of the EGAF_JSON directory (str).
+        json_files: Sorted list of the JSON file paths in `json_dir`.
+        datasets: List of parsed JSON objects, in the order of `json_files`.
+
+    Returns:
+        The path of the cache file (str), or None if it could not be written;
+        the cache is a best-effort optimisation and failures are not raised.
+    """
+    path = cache_path(json_dir)
+    tmp = "{0}.{1}.tmp".format(path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = {"version": CACHE_VERSION, "manifest": build_manifest(json_files)}
+        with open(tmp, mode='wb') as f:
+            pickle.dump(header, f, protocol=PICKLE_PROTOCOL)
+            pickle.dump(list(datasets), f, protocol=PICKLE_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+    except (OSError, ValueError, TypeError, AttributeError, pickle.PicklingError):
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return None
+
+
+def clear_cache(json_dir):
+    """Removes the binary cache file of a JSON directory, if it exists."""
+    try:
+        os.remove(cache_path(json_dir))
+    except OSError:
+        pass
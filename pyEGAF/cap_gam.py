@@ -57,9 +57,10 @@ class CapGam(Analysis):
             capgam(egaf_data, "Si29")
             capgam(egaf_data, "Si29", "more")
         """
+        import pandas as pd
         self.list = list
         self.str = str
-        decay_instance = Gammas()
+        decay_instance = self.service(Gammas)
         spe = decay_instance.get_gammas(self.list,self.str,intensity='isotopic')
         try:
             if len(spe) > 0:
@@ -71,7 +72,7 @@ class CapGam(Analysis):
                 adopted_cs, d_adopted_cs = None, None
                 unit_adopted_cs, ref_adopted_cs = None, None
                 target_nucleus, residual_nucleus = None, None
-                for jdict in self.list:
+                for jdict in self.select_datasets(self.list, (self.str,)):
                     if self.str == jdict["nucleusID"]:
                         residual_nucleus = jdict["nucleusID"]
                         target_nucleus = jdict["nucleusTargetID"]
@@ -82,11 +83,11 @@ class CapGam(Analysis):
                                 unit_adopted_cs = each_nr["unitAdoptedCrossSection"]
                                 ref_adopted_cs = each_nr["keyNumber"]
 
-                print("Target nucleus: {0}".format(target_nucleus))
-                print("Residual (compound nucleus): {0}".format(residual_nucleus))
-                print("{0}(n,g){1}".format(target_nucleus,residual_nucleus))
-                print("Total radiative thermal neutron-capture cross section = {0} {1} \xb1 {2}".format(adopted_cs, unit_adopted_cs, d_adopted_cs))
-                print("Reference: {0}".format(ref_adopted_cs))
+                report_info("Target nucleus: %s\n"
+                            "Residual (compound nucleus): %s\n"
+                            "%s(n,g)%s\n"
+                            "Total radiative thermal neutron-capture cross section = %s %s \xb1 %s\n"
+                            "Reference: %s", target_nucleus, residual_nucleus, target_nucleus, residual_nucleus, adopted_cs, unit_adopted_cs, d_adopted_cs, ref_adopted_cs)
                 #print("\n")
 
                 # Extract maximum gamma intensity from a DataFrame object
@@ -99,7 +100,7 @@ class CapGam(Analysis):
                 max_I = df['I'].loc[df['I'].idxmax()]
                 E_at_max_I = df['E'].loc[df['I'].idxmax()]
 
-                print("Maximum I = {0} b at E = {1} keV; RI = 100.".format(max_I, E_at_max_I))
+                report_info("Maximum I = %s b at E = %s keV; RI = 100.", max_I, E_at_max_I)
 
                 cg_data = []
                 for s in spe:
@@ -163,9 +164,9 @@ class CapGam(Analysis):
                         if args[0].lower() == "more":
                             df_cg = pd.DataFrame({'Type':cg_gtype, 'i': cg_i, 'f': cg_f, 'E(i)': cg_Ei, 'E(f)': cg_Ef, 'E': cg_E, 'dE': cg_dE, 'RI': cg_RI, 'dRI': cg_dRI})
                         else:
-                            print("Wrong argument!")
-                            print("Do you want more output?")
-                            print("The only optional argument accepted is \"more\".")
+                            report_error(InvalidArguments, "Wrong argument!\n"
+                                                           "Do you want more output?\n"
+                                                           "The only optional argument accepted is \"more\".")
                             return
 
                     df_cg = df_cg.sort_values('E')
@@ -174,5 +175,5 @@ class CapGam(Analysis):
         
         except TypeError:
             if spe == None:
-                print("No thermal neutron-capture gamma rays for defined input.")
+                report_error(NucleusNotFound, "No thermal neutron-capture gamma rays for defined input.")
                 return
@@ -0,0 +1,117 @@
+import numpy as np
+
+# Columns of the DataFrame returned by `Analysis.get_cascades`.
+CASCADE_COLUMNS = ("Rank", "Probability", "Multiplicity", "Levels", "Gamma energies (keV)")
+
+
+class CascadeEngine(object):
+    __doc__="""Gamma-ray cascades from the neutron-capture state to the
+    ground state of a residual compound nucleus.
+
+    The branching ratio of each gamma ray is its conversion-corrected
+    transition intensity divided by the total intensity deexciting its
+    initial level.  Since every transition connects a higher to a lower level
+    the LevelGraph is acyclic, so that
+
+        p = e_cs + B^T p,
+
+    where B holds the branching ratios and e_cs starts the cascades at the
+    capture state, is a triangular sparse system.  It is solved by forward
+    substitution over the CSR out-edges in order of decreasing level, and the
+    most probable cascades are found by dynamic programming over the same
+    order, keeping the `k` most probable partial cascades of each level.
+
+    Arguments:
+        graph: LevelGraph of one EGAF data set.
+        weights: NumPy array of conversion-corrected transition intensities,
+                 one per gamma ray (e.g. populations per neutron capture
+                 times 1 + ICC).
+        start: Level index where the cascades start (int); by default the
+               highest level deexcited by a gamma ray, i.e. the capture state
+               when it is measured.
+
+    Example:
+        table = edata.nucleus_gamma_table(edata.find_residual("Au198"))
+        weights, _ = e.intensity_conversions(table.population, table.d_population, table.icc, table.d_icc)
+        engine = CascadeEngine(LevelGraph(table), weights)
+        engine.populations()
+        engine.top_cascades(10)
+    """
+
+    def __init__(self, graph, weights, start=None):
+        self.graph = graph
+        weights = np.where(np.isnan(weights), 0.0, np.asarray(weights, dtype=np.float64))
+        if start is None:
+            start = int(graph.source.max()) if graph.num_edges() > 0 else 0
+        self.start = int(start)
+        out_total = np.bincount(graph.source, weights=weights, minlength=graph.num_levels)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.branching = np.where(out_total[graph.source] > 0.0, weights/out_total[graph.source], 0.0)
+
+    def populations(self):
+        """Probability per neutron capture that a cascade passes through each
+        level.
+
+        Returns:
+            A NumPy array indexed by level.  The ground-state element is the
+            probability that a cascade reaches the ground state; cascades
+            ending at levels without observed deexcitation are lost.
+        """
+        graph = self.graph
+        p = np.zeros(graph.num_levels)
+        if graph.num_levels == 0:
+            return p
+        p[self.start] = 1.0
+        for level in range(self.start, 0, -1):
+            if p[level] > 0.0:
+                edges = graph.successors(level)
+                np.add.at(p, graph.target[edges], p[level]*self.branching[edges])
+        return p
+
+    def top_cascades(self, k=10):
+        """Most probable cascades from the starting level to the ground state.
+
+        Arguments:
+            k: Number of cascades (int); by default 10.
+
+        Returns:
+            A list of at most `k` tuples (probability, edges) in order of
+            decreasing probability, where `edges` is a NumPy array with the
+            rows (in the GammaTable) of the gamma rays of the cascade, from
+            the starting level down to the ground state.
+        """
+        graph = self.graph
+        k = int(k)
+        if graph.num_levels == 0 or k < 1:
+            return []
+        # For each level the probabilities of its best partial cascades and
+        # back-pointers (last edge, rank of the partial cascade at its source)
+        prob = [None]*graph.num_levels
+        back = [None]*graph.num_levels
+        prob[self.start] = np.ones(1)
+        back[self.start] = (np.full(1, -1), np.full(1, -1))
+        for level in range(self.start - 1, -1, -1):
+            edges = graph.predecessors(level)
+            edges = edges[(graph.source[edges] <= self.start) & (self.branching[edges] > 0.0)]
+            edges = [edge for edge in edges.tolist() if prob[graph.source[edge]] is not None]
+            if len(edges) == 0:
+                continue
+            p = np.concatenate([prob[graph.source[edge]]*self.branching[edge] for edge in edges])
+            last = np.concatenate([np.full(len(prob[graph.source[edge]]), edge) for edge in edges])
+            rank = np.concatenate([np.arange(len(prob[graph.source[edge]])) for edge in edges])
+            best = np.argsort(-p, kind='stable')[:k]
+            prob[level] = p[best]
+            back[level] = (last[best], rank[best])
+
+        cascades = []
+        if prob[0] is None:
+            return cascades
+        for r in range(len(prob[0])):
+            path = []
+            level, rank = 0, r
+            while level != self.start:
+                edge = back[level][0][rank]
+                path.append(edge)
+                level, rank = int(graph.source[edge]), back[level][1][rank]
+            cascades.append((prob[0][r].item(), np.array(path[::-1], dtype=np.int64)))
+        return cascades
@@ -0,0 +1,379 @@
+import contextlib
+import gc
+import json
+import os
+import re
+from .gamma_table import GammaTable
+
+try:
+    # Optional faster JSON parser
+    import orjson
+except ImportError:
+    orjson = None
+
+# Chemical-element symbols indexed by atomic number Z.
+ELEMENT_SYMBOLS = (
+    "n", "H", "He", "Li", "Be", "B", "C", "N", "O", "F", "Ne", "Na", "Mg",
+    "Al", "Si", "P", "S", "Cl", "Ar", "K", "Ca", "Sc", "Ti", "V", "Cr", "Mn",
+    "Fe", "Co", "Ni", "Cu", "Zn", "Ga", "Ge", "As", "Se", "Br", "Kr", "Rb",
+    "Sr", "Y", "Zr", "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd", "In",
+    "Sn", "Sb", "Te", "I", "Xe", "Cs", "Ba", "La", "Ce", "Pr", "Nd", "Pm",
+    "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm", "Yb", "Lu", "Hf", "Ta",
+    "W", "Re", "Os", "Ir", "Pt", "Au", "Hg", "Tl", "Pb", "Bi", "Po", "At",
+    "Rn", "Fr", "Ra", "Ac", "Th", "Pa", "U",
+)
+ELEMENT_Z = {symbol: Z for Z, symbol in enumerate(ELEMENT_SYMBOLS)}
+
+# JSON file names: j_EGAF_<target>_NG_<residual>.json
+JSON_FILENAME = re.compile(r"j_EGAF_([A-Za-z]+)(\d+)_NG_([A-Za-z]+)(\d+)\.json$")
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Internal function: Context manager that disables the cyclic garbage
+    collector while many small containers are built, e.g. the JSON objects 
+    of the data sets, which is much faster, and restores its state 
+    afterwards."""
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def parse_json_file(json_file):
+    """Internal function: Parses a single JSON-formatted EGAF data set.  The 
+    `orjson` parser is used when it is installed, otherwise the standard 
+    library `json` module."""
+    with open(json_file, mode='rb') as jf:
+        contents = jf.read()
+    if orjson is not None:
+        return orjson.loads(contents)
+    return json.loads(contents)
+
+
+class EGAFCatalog(list):
+    __doc__="""List of JSON-formatted EGAF (n,g) data sets with hash indexes
+    for direct look-up of a data set by residual ID, target ID, residual (Z,A)
+    or target (Z,A).
+
+    The catalog is a `list` subclass so that it can be passed to every pyEGAF
+    method in place of the raw list of JSON objects.  The indexes are built on
+    the first look-up and are discarded whenever the catalog is modified.
+
+    Example:
+        import pyEGAF as egaf
+        e = egaf.EGAF()
+        edata = e.load_egaf()
+        edata.find_residual("Si29")
+        edata.find_residual(14, 29)
+        edata.find_target("Si28")
+    """
+
+    def __init__(self, datasets=()):
+        super().__init__(datasets)
+        self._indexes = None
+        self._gamma_table = None
+        self._nucleus_tables = {}
+        # Modification count, used to invalidate cached analysis results
+        self._version = 0
+
+    def _build_indexes(self):
+        """Internal function: Builds the residual and target hash indexes
+        mapping each key to the position of the data set in the catalog."""
+        residual, target = {}, {}
+        residual_ZA, target_ZA = {}, {}
+        for pos, jdict in enumerate(self):
+            residual.setdefault(jdict["nucleusID"], pos)
+            target.setdefault(jdict["nucleusTargetID"], pos)
+            residual_ZA.setdefault((jdict["nucleusZ"], jdict["nucleusA"]), pos)
+            target_ZA.setdefault((jdict["nucleusTargetZ"], jdict["nucleusTargetA"]), pos)
+        self._indexes = (residual, target, residual_ZA, target_ZA)
+        return self._indexes
+
+    def _lookup(self, args, target):
+        """Internal function: Returns the catalog position of the data set
+        matching the nucleus ID or (Z,A) arguments, or None.  Raises ValueError
+        if the (Z,A) arguments cannot be cast to integers."""
+        indexes = self._indexes
+        if indexes is None:
+            indexes = self._build_indexes()
+        if len(args) == 1:
+            return indexes[1 if target else 0].get(str(args[0]))
+        elif len(args) == 2:
+            return indexes[3 if target else 2].get((int(args[0]), int(args[1])))
+        return None
+
+    def find_residual(self, *args):
+        """Finds the data set of a residual compound nucleus.
+
+        Arguments:
+            args: Either the residual ID (str) or the atomic number (int) and
+                  mass (int) of the residual compound nucleus.
+
+        Returns:
+            The JSON object (dict) of the matching (n,g) data set or None.
+
+        Example:
+            find_residual("Si29")
+            find_residual(14, 29)
+        """
+        try:
+            pos = self._lookup(args, False)
+        except (ValueError, TypeError):
+            return None
+        return None if pos is None else self[pos]
+
+    def find_target(self, *args):
+        """Finds the data set of an (n,g) target nucleus.
+
+        Arguments:
+            args: Either the target ID (str) or the atomic number (int) and
+                  mass (int) of the target nucleus.
+
+        Returns:
+            The JSON object (dict) of the matching (n,g) data set or None.
+
+        Example:
+            find_target("Si28")
+            find_target(14, 28)
+        """
+        try:
+            pos = self._lookup(args, True)
+        except (ValueError, TypeError):
+            return None
+        return None if pos is None else self[pos]
+
+    def candidates(self, args, target=False):
+        """Internal function: Returns the data sets that can match the nucleus
+        arguments passed to a pyEGAF method.  Arguments that cannot be resolved
+        through the indexes return the full catalog so that the calling method
+        performs (and reports on) its usual linear search."""
+        if len(args) not in (1, 2):
+            return self
+        try:
+            pos = self._lookup(args, target)
+        except (ValueError, TypeError):
+            return self
+        return [] if pos is None else [self[pos]]
+
+    def gamma_table(self):
+        """Columnar table of all gamma rays in the catalog, built once on 
+        first use.
+
+        Returns:
+            A GammaTable object whose `residual` column holds the position of 
+            each data set in the catalog.
+
+        Example:
+            table = edata.gamma_table()
+            table.energy, table.intensity("isotopic")
+        """
+        if self._gamma_table is None:
+            self._gamma_table = GammaTable.from_datasets(self)
+        return self._gamma_table
+
+    def dataset_values(self, key, record=None):
+        """Values of a top-level key of every data set in the catalog, e.g. 
+        "nucleusID", or of a key of the record returned by `record(jdict)`,
+        e.g. the Q-value record (list).
+
+        Example:
+            edata.dataset_values("nucleusTargetID")
+            edata.dataset_values("energyNeutronSeparationEGAF", lambda jdict: jdict["recordQ"][-1])
+        """
+        if record is None:
+            return [jdict[key] for jdict in self]
+        return [record(jdict)[key] for jdict in self]
+
+    def nucleus_gamma_table(self, jdict):
+        """Internal function: Columnar table of the gamma rays of a single 
+        data set of the catalog.  This is a slice of the full gamma table if 
+        that has been built; otherwise the table of the data set is built on 
+        its own and memoized."""
+        pos = self._lookup((jdict["nucleusID"],), False)
+        if pos is None or list.__getitem__(self, pos) is not jdict:
+            return GammaTable.from_datasets([jdict])
+        if self._gamma_table is not None:
+            return self._gamma_table.nucleus(pos)
+        table = self._nucleus_tables.get(pos)
+        if table is None:
+            table = GammaTable.from_datasets([jdict], first_index=pos)
+            self._nucleus_tables[pos] = table
+        return table
+
+    def _invalidate(self):
+        """Internal function: Discards the indexes and gamma tables before a
+        modification."""
+        self._version += 1
+        self._indexes = None
+        self._gamma_table = None
+        self._nucleus_tables = {}
+
+    # Any modification of the catalog invalidates the indexes.
+    def __setitem__(self, *args):
+        self._invalidate()
+        return super().__setitem__(*args)
+
+    def __delitem__(self, *args):
+        self._invalidate()
+        return super().__delitem__(*args)
+
+    def __iadd__(self, other):
+        self._invalidate()
+        return super().__iadd__(other)
+
+    def append(self, jdict):
+        self._invalidate()
+        return super().append(jdict)
+
+    def extend(self, datasets):
+        self._invalidate()
+        return super().extend(datasets)
+
+    def insert(self, pos, jdict):
+        self._invalidate()
+        return super().insert(pos, jdict)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def remove(self, jdict):
+        self._invalidate()
+        return super().remove(jdict)
+
+    def clear(self):
+        self._invalidate()
+        return super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._invalidate()
+        return super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._invalidate()
+        return super().reverse()
+
+
+class LazyEGAFCatalog(EGAFCatalog):
+    __doc__="""EGAF catalog whose data sets are parsed on first access.
+
+    The residual and target IDs and (Z,A) indexes are resolved from the JSON 
+    file names, `j_EGAF_<target>_NG_<residual>.json`, without opening the 
+    files.  A data set is parsed the first time it is accessed, by index, 
+    look-up or iteration, and is memoized thereafter.  Queries that only touch 
+    one or two nuclei therefore only parse the corresponding files.
+
+    Any modification of the catalog first parses all remaining data sets, 
+    after which it behaves as an ordinary EGAFCatalog.
+
+    Example:
+        import pyEGAF as egaf
+        e = egaf.EGAF()
+        edata = e.load_egaf(lazy=True)
+        e.capgam(edata, "Si29")
+        edata.num_loaded()
+    """
+
+    def __init__(self, json_files):
+        json_files = [str(f) for f in json_files]
+        super().__init__([None]*len(json_files))
+        self._paths = json_files
+
+    def _resolve(self, pos):
+        """Internal function: Parses and memoizes the data set at `pos`."""
+        jdict = list.__getitem__(self, pos)
+        if jdict is None and self._paths is not None:
+            jdict = parse_json_file(self._paths[pos])
+            list.__setitem__(self, pos, jdict)
+        return jdict
+
+    def _build_indexes(self):
+        """Internal function: Builds the indexes from the JSON file names."""
+        if self._paths is None:
+            return super()._build_indexes()
+        residual, target = {}, {}
+        residual_ZA, target_ZA = {}, {}
+        for pos, path in enumerate(self._paths):
+            match = JSON_FILENAME.match(os.path.basename(path))
+            if match is None:
+                # Unconventional file name: fall back to the parsed contents.
+                return super()._build_indexes()
+            t_symbol, t_A, r_symbol, r_A = match.groups()
+            residual.setdefault(r_symbol + r_A, pos)
+            target.setdefault(t_symbol + t_A, pos)
+            if r_symbol in ELEMENT_Z:
+                residual_ZA.setdefault((ELEMENT_Z[r_symbol], int(r_A)), pos)
+            if t_symbol in ELEMENT_Z:
+                target_ZA.setdefault((ELEMENT_Z[t_symbol], int(t_A)), pos)
+        self._indexes = (residual, target, residual_ZA, target_ZA)
+        return self._indexes
+
+    def num_loaded(self):
+        """Number of data sets parsed so far (int)."""
+        return sum(1 for jdict in list.__iter__(self) if jdict is not None)
+
+    def load_all(self):
+        """Parses all data sets that have not been accessed yet.
+
+        Returns:
+            The catalog itself.
+        """
+        for pos in range(len(self)):
+            self._resolve(pos)
+        return self
+
+    def _invalidate(self):
+        """Internal function: Parses all data sets and drops the file 
+        references before the catalog is modified."""
+        self.load_all()
+        self._paths = None
+        EGAFCatalog._invalidate(self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._resolve(pos) for pos in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("list index out of range")
+        return self._resolve(index)
+
+    def __iter__(self):
+        for pos in range(len(self)):
+            yield self._resolve(pos)
+
+    def __reversed__(self):
+        for pos in reversed(range(len(self))):
+            yield self._resolve(pos)
+
+    # Operations implemented on the underlying list require every data set.
+    def __contains__(self, jdict):
+        return super(LazyEGAFCatalog, self.load_all()).__contains__(jdict)
+
+    def __eq__(self, other):
+        return super(LazyEGAFCatalog, self.load_all()).__eq__(other)
+
+    def __ne__(self, other):
+        return super(LazyEGAFCatalog, self.load_all()).__ne__(other)
+
+    def __repr__(self):
+        return super(LazyEGAFCatalog, self.load_all()).__repr__()
+
+    def __add__(self, other):
+        return super(LazyEGAFCatalog, self.load_all()).__add__(other)
+
+    def __reduce_ex__(self, protocol):
+        return (EGAFCatalog, (list(self),))
+
+    def copy(self):
+        return EGAFCatalog(self)
+
+    def count(self, jdict):
+        return super(LazyEGAFCatalog, self.load_all()).count(jdict)
+
+    def index(self, jdict, *args):
+        return super(LazyEGAFCatalog, self.load_all()).index(jdict, *args)
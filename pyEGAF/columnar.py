@@ -0,0 +1,433 @@
+"""Columnar export of the JSON-formatted EGAF data sets.
+
+The nested `levelScheme`/`gammaDecay` structure of the data sets is flattened
+into normalized tables, one row per data set, level, spin assignment, isomer
+record, gamma ray, gamma-ray intensity record and atomic-shell conversion
+record.  Every table has the integer key `dataset` (position of the data set
+in the exported list); the level tables add `level` (position in the
+`levelScheme`) and the gamma tables `gamma` (position of the gamma ray among
+all gamma rays of the data set, the row order of `GammaTable`).  The other
+columns keep the JSON keys; the single-element `recordQ` and
+`neutronCaptureNormalization` arrays are flattened into the datasets table.
+JSON null values are stored as NaN (numbers) or null (strings).  Data sets
+that the tables cannot hold without loss, i.e. with more than one `recordQ`
+or normalization record or with `reducedTransitionProbabilities`, raise a
+ValueError.
+
+The tables are written with the optional `pyarrow` package as Parquet files
+(one row group per data set) or Feather (Arrow IPC) files, or with the
+optional `tables` package to a single HDF5 file through pandas.  The data
+sets are streamed one at a time, so that only the rows of one data set are
+held in memory while writing.  `read_tables` reads the tables back as pandas
+DataFrames, e.g. for Spark or DuckDB, and `tables_to_datasets` rebuilds the
+JSON objects from them.
+"""
+import os
+import numpy as np
+from .catalog import gc_paused
+
+# Supported formats and the file name extension of their tables.
+COLUMNAR_FORMATS = {"parquet": ".parquet", "feather": ".feather", "hdf5": ".h5"}
+
+# Name of the HDF5 file holding all tables (one key per table).
+HDF5_FILENAME = "egaf.h5"
+
+# Minimum width (bytes) of the string columns of the HDF5 tables; columns
+# with longer strings are sized from the data.
+HDF5_STRING_SIZE = 32
+
+# Columns of the normalized tables as (name, type) pairs, type being one of
+# 'int', 'float', 'bool' or 'str'.
+RECORD_Q_COLUMNS = (
+    ("energyNeutronSeparationAME2020", "float"), ("dEnergyNeutronSeparationAME2020", "float"),
+    ("energyProtonSeparationAME2020", "float"), ("dEnergyProtonSeparationAME2020", "float"),
+    ("energyNeutronSeparationENSDF", "float"), ("energyProtonSeparationENSDF", "float"),
+    ("energyNeutronSeparationEGAF", "float"), ("dEnergyNeutronSeparationEGAF", "float"),
+)
+NORMALIZATION_COLUMNS = (
+    ("multiplierIsotopicCorrection", "float"), ("dMultiplierIsotopicCorrection", "float"),
+    ("naturalIsotopicAbundance", "float"), ("dNaturalIsotopicAbundance", "float"),
+    ("adoptedTotalThermalCaptureCrossSection", "float"), ("dAdoptedTotalThermalCaptureCrossSection", "float"),
+    ("unitAdoptedCrossSection", "str"), ("keyNumber", "str"),
+)
+DATASET_COLUMNS = (
+    ("nucleusID", "str"), ("datasetType", "str"), ("nucleusZ", "int"), ("nucleusA", "int"),
+    ("nucleusN", "int"), ("nucleusTargetZ", "int"), ("nucleusTargetA", "int"),
+    ("nucleusTargetN", "int"), ("nucleusTargetElement", "str"), ("nucleusTargetID", "str"),
+    ("numberPrimaryGammas", "int"), ("numberSecondaryGammas", "int"),
+    ("totalNumberLevels", "int"), ("totalNumberGammas", "int"), ("unitEnergy", "str"),
+)
+LEVEL_COLUMNS = (
+    ("levelIndex", "int"), ("levelEnergy", "float"), ("dLevelEnergy", "float"),
+    ("levelIsIsomer", "bool"), ("numberOfSpins", "int"), ("numberOfGammas", "int"),
+)
+SPIN_COLUMNS = (
+    ("spinIndex", "int"), ("spinReal", "float"), ("spinIsTentative", "bool"),
+    ("spinIsLimit", "bool"), ("spinLimits", "str"), ("parity", "int"),
+    ("paritySign", "str"), ("parityIsTentative", "bool"),
+)
+ISOMER_COLUMNS = (
+    ("halfLifeBest", "float"), ("dHalfLifeBest", "float"), ("unitHalfLifeBest", "str"),
+    ("halfLifeConverted", "float"), ("dHalfLifeConverted", "float"), ("unitHalfLifeConverted", "str"),
+)
+GAMMA_COLUMNS = (
+    ("gammaEnergy", "float"), ("dGammaEnergy", "float"), ("levelIndexInitial", "int"),
+    ("levelIndexFinal", "int"), ("levelEnergyInitial", "float"), ("levelEnergyFinal", "float"),
+    ("gammaTransitionType", "str"), ("gammaFeedsGroundState", "bool"),
+    ("multipolarity", "str"), ("multipolarityIsTentative", "bool"),
+    ("multipolarityIsAssumed", "bool"), ("mixingRatio", "float"), ("dMixingRatio", "float"),
+    ("mixingRatioSign", "str"), ("calculatedTotalInternalConversionCoefficient", "float"),
+    ("dCalculatedTotalInternalConversionCoefficient", "float"),
+)
+INTENSITY_COLUMNS = (
+    ("partialElementalCrossSection", "float"), ("dPartialElementalCrossSection", "float"),
+    ("partialIsotopicCrossSection", "float"), ("dPartialIsotopicCrossSection", "float"),
+    ("populationPerNeutronCapture", "float"), ("dPopulationPerNeutronCapture", "float"),
+)
+CONVERSION_COLUMNS = tuple((key, "float") for shell in "KLMNOPQ" for key in ("calculatedInternalConversionCoefficientAtomicShell" + shell, "dCalculatedInternalConversionCoefficientAtomicShell" + shell))
+
+# The normalized tables and their columns, in the order they are written.
+COLUMNAR_TABLES = {
+    "datasets": (("dataset", "int"),) + DATASET_COLUMNS + RECORD_Q_COLUMNS + NORMALIZATION_COLUMNS,
+    "levels": (("dataset", "int"), ("level", "int")) + LEVEL_COLUMNS,
+    "spins": (("dataset", "int"), ("level", "int")) + SPIN_COLUMNS,
+    "isomers": (("dataset", "int"), ("level", "int")) + ISOMER_COLUMNS,
+    "gammas": (("dataset", "int"), ("level", "int"), ("gamma", "int")) + GAMMA_COLUMNS,
+    "intensities": (("dataset", "int"), ("gamma", "int")) + INTENSITY_COLUMNS,
+    "conversion_coefficients": (("dataset", "int"), ("gamma", "int")) + CONVERSION_COLUMNS,
+}
+
+NUMPY_TYPES = {"int": np.int64, "float": np.float64, "bool": np.bool_, "str": object}
+
+
+def dataset_rows(jdict, dataset):
+    """Rows of the normalized tables for one data set.  A ValueError is 
+    raised if the data set holds records that the tables do not represent, 
+    which would otherwise be lost in the export.
+
+    Arguments:
+        jdict: JSON object of one EGAF data set.
+        dataset: Value of the `dataset` key of the rows (int).
+
+    Returns:
+        A dictionary of lists of row tuples, keyed by table name, in the
+        column order of COLUMNAR_TABLES.
+    """
+    rows = {table: [] for table in COLUMNAR_TABLES}
+    single = [("recordQ", jdict["recordQ"]), ("neutronCaptureNormalization", jdict["neutronCaptureNormalization"])]
+    if len(jdict["neutronCaptureNormalization"]) == 1:
+        single.append(("normalizationRecord", jdict["neutronCaptureNormalization"][0]["normalizationRecord"]))
+    for key, records in single:
+        if len(records) != 1:
+            raise ValueError("Data set {0} has {1} {2} records; the columnar tables hold exactly one.".format(jdict["nucleusID"], len(records), key))
+    q = jdict["recordQ"][0]
+    norm = jdict["neutronCaptureNormalization"][0]["normalizationRecord"][0]
+    rows["datasets"].append((dataset,) + tuple(jdict[key] for key, _ in DATASET_COLUMNS) + tuple(q[key] for key, _ in RECORD_Q_COLUMNS) + tuple(norm[key] for key, _ in NORMALIZATION_COLUMNS))
+    gamma = 0
+    for level, ldict in enumerate(jdict["levelScheme"]):
+        rows["levels"].append((dataset, level) + tuple(ldict[key] for key, _ in LEVEL_COLUMNS))
+        for sdict in ldict["spins"]:
+            rows["spins"].append((dataset, level) + tuple(sdict[key] for key, _ in SPIN_COLUMNS))
+        for idict in ldict["isomerDecay"]:
+            rows["isomers"].append((dataset, level) + tuple(idict[key] for key, _ in ISOMER_COLUMNS))
+        for gdict in ldict["gammaDecay"]:
+            if len(gdict["reducedTransitionProbabilities"]) > 0:
+                raise ValueError("Data set {0} has reducedTransitionProbabilities, which the columnar tables do not hold.".format(jdict["nucleusID"]))
+            rows["gammas"].append((dataset, level, gamma) + tuple(gdict[key] for key, _ in GAMMA_COLUMNS))
+            for adict in gdict["gammaAbsoluteIntensities"]:
+                rows["intensities"].append((dataset, gamma) + tuple(adict[key] for key, _ in INTENSITY_COLUMNS))
+            for cdict in gdict["calculatedAtomicShellConversionCoefficients"]:
+                rows["conversion_coefficients"].append((dataset, gamma) + tuple(cdict[key] for key, _ in CONVERSION_COLUMNS))
+            gamma += 1
+    return rows
+
+
+def rows_frame(table, rows):
+    """Internal function: DataFrame of rows of a table with the column types
+    of COLUMNAR_TABLES; null numbers become NaN."""
+    import pandas as pd
+    columns = COLUMNAR_TABLES[table]
+    values = list(zip(*rows)) if len(rows) > 0 else [()] * len(columns)
+    return pd.DataFrame({name: np.array(column, dtype=NUMPY_TYPES[kind]) for (name, kind), column in zip(columns, values)})
+
+
+def dataset_frames(jdict, dataset):
+    """DataFrames of the normalized tables for one data set, keyed by table
+    name; see `dataset_rows`."""
+    return {table: rows_frame(table, rows) for table, rows in dataset_rows(jdict, dataset).items()}
+
+
+def datasets_to_tables(datasets):
+    """DataFrames of the normalized tables of many data sets, keyed by table
+    name, built in memory."""
+    rows = {table: [] for table in COLUMNAR_TABLES}
+    for n, jdict in enumerate(datasets):
+        for table, table_rows in dataset_rows(jdict, n).items():
+            rows[table].extend(table_rows)
+    return {table: rows_frame(table, table_rows) for table, table_rows in rows.items()}
+
+
+def string_sizes(datasets):
+    """Internal function: Widths (bytes) of the string columns of the HDF5 
+    tables, keyed by table and column name: the longest UTF-8 encoded string
+    of the column in `datasets`, and at least HDF5_STRING_SIZE."""
+    sizes = {table: {name: HDF5_STRING_SIZE for name, kind in columns if kind == "str"} for table, columns in COLUMNAR_TABLES.items()}
+    for n, jdict in enumerate(datasets):
+        for table, rows in dataset_rows(jdict, n).items():
+            for pos, (name, kind) in enumerate(COLUMNAR_TABLES[table]):
+                if kind == "str":
+                    longest = max([len(row[pos].encode("utf-8")) for row in rows if row[pos] is not None], default=0)
+                    sizes[table][name] = max(sizes[table][name], longest)
+    return sizes
+
+
+def require(module, format):
+    """Internal function: Imports the optional package needed by a format."""
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError:
+        raise ImportError("The {0} format requires the optional package '{1}'.".format(format, module.split(".")[0]))
+
+
+def arrow_schema(pa, table):
+    """Internal function: Arrow schema of a normalized table."""
+    types = {"int": pa.int64(), "float": pa.float64(), "bool": pa.bool_(), "str": pa.string()}
+    return pa.schema([(name, types[kind]) for name, kind in COLUMNAR_TABLES[table]])
+
+
+def table_paths(path, format):
+    """Paths of the files of the normalized tables written by
+    `export_tables`, keyed by table name."""
+    if format == "hdf5":
+        return {table: os.path.join(path, HDF5_FILENAME) for table in COLUMNAR_TABLES}
+    return {table: os.path.join(path, table + COLUMNAR_FORMATS[format]) for table in COLUMNAR_TABLES}
+
+
+def export_tables(datasets, path, format="parquet"):
+    """Writes the normalized tables of EGAF data sets, streaming one data set
+    at a time.
+
+    Arguments:
+        datasets: Iterable of EGAF data set JSON objects, e.g. the catalog
+                  returned by `load_egaf` (a LazyEGAFCatalog is parsed one
+                  data set at a time).
+        path: Output directory (str); created if needed.
+        format: 'parquet' (default), 'feather' or 'hdf5'.  The HDF5 
+                export reads `datasets` twice, first to size the string 
+                columns; an iterator is therefore collected into a list.
+
+    Returns:
+        A sorted list of the paths of the written files.
+
+    Example:
+        export_tables(edata, "egaf_parquet")
+        export_tables(edata, "egaf_hdf5", format="hdf5")
+    """
+    import pandas as pd
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError("Unknown columnar format: {0}; accepted formats are {1}.".format(format, ", ".join(COLUMNAR_FORMATS)))
+    os.makedirs(path, exist_ok=True)
+    paths = table_paths(path, format)
+
+    if format == "hdf5":
+        require("tables", format)
+        # The width of the string columns is fixed by the first append of a
+        # table, so that it is taken from all data sets beforehand
+        if iter(datasets) is datasets:
+            datasets = list(datasets)
+        sizes = string_sizes(datasets)
+        with pd.HDFStore(paths["datasets"], mode="w") as store:
+            for n, jdict in enumerate(datasets):
+                for table, frame in dataset_frames(jdict, n).items():
+                    if len(frame) > 0:
+                        store.append(table, frame, format="table", index=False, min_itemsize=sizes[table])
+        return sorted(set(paths.values()))
+
+    pa = require("pyarrow", format)
+    schemas = {table: arrow_schema(pa, table) for table in COLUMNAR_TABLES}
+    if format == "parquet":
+        pq = require("pyarrow.parquet", format)
+        writers = {table: pq.ParquetWriter(paths[table], schemas[table]) for table in COLUMNAR_TABLES}
+    else:
+        ipc = require("pyarrow.ipc", format)
+        writers = {table: ipc.new_file(paths[table], schemas[table]) for table in COLUMNAR_TABLES}
+    try:
+        for n, jdict in enumerate(datasets):
+            for table, frame in dataset_frames(jdict, n).items():
+                if len(frame) > 0:
+                    writers[table].write_table(pa.Table.from_pandas(frame, schema=schemas[table], preserve_index=False))
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return sorted(paths.values())
+
+
+def columnar_format(path):
+    """Internal function: Format of the tables found in a directory."""
+    if os.path.isfile(os.path.join(path, HDF5_FILENAME)):
+        return "hdf5"
+    for format, extension in COLUMNAR_FORMATS.items():
+        if os.path.isfile(os.path.join(path, "datasets" + extension)):
+            return format
+    return None
+
+
+def read_tables(path, format=None, tables=None):
+    """Reads normalized tables written by `export_tables`.
+
+    Arguments:
+        path: Directory of the tables (str).
+        format: 'parquet', 'feather' or 'hdf5'; by default it is inferred
+                from the files in `path`.
+        tables: Names of the tables to read; by default all tables of
+                COLUMNAR_TABLES.
+
+    Returns:
+        A dictionary of pandas DataFrames keyed by table name.
+
+    Example:
+        tables = read_tables("egaf_parquet", tables=["datasets", "gammas"])
+    """
+    import pandas as pd
+    format = format or columnar_format(path)
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError("No columnar EGAF tables found in {0}.".format(path))
+    paths = table_paths(path, format)
+    frames = {}
+    for table in (tables or COLUMNAR_TABLES):
+        if format == "parquet":
+            require("pyarrow", format)
+            frame = pd.read_parquet(paths[table])
+        elif format == "feather":
+            require("pyarrow", format)
+            frame = pd.read_feather(paths[table])
+        else:
+            require("tables", format)
+            with pd.HDFStore(paths[table], mode="r") as store:
+                frame = store.select(table) if "/" + table in store.keys() else rows_frame(table, [])
+            frame = frame.reset_index(drop=True)
+        frames[table] = frame
+    return frames
+
+
+def python_values(values, kind, null=None):
+    """Internal function: Column of a table as a list of Python objects,
+    with NaN numbers and null strings (or the rows flagged by the boolean
+    array `null`) restored to None."""
+    values = np.asarray(values)
+    if kind in ("float", "str"):
+        if null is None:
+            import pandas as pd
+            null = pd.isna(values)
+        values = values.astype(object)
+        values[null] = None
+    elif kind == "int":
+        values = values.astype(np.int64)
+    else:
+        values = values.astype(bool)
+    return values.tolist()
+
+
+def frame_columns(frame, table):
+    """Internal function: Columns of a DataFrame of a table as lists of
+    Python objects; see `python_values`."""
+    return {name: python_values(frame[name].to_numpy(), kind) for name, kind in COLUMNAR_TABLES[table]}
+
+
+def group_bounds(keys, num_groups):
+    """Internal function: Start and stop rows of each group of a table
+    sorted by group, `keys` being the group number of each row."""
+    bounds = np.searchsorted(np.asarray(keys, dtype=np.int64), np.arange(num_groups + 1))
+    return bounds[:-1].tolist(), bounds[1:].tolist()
+
+
+def table_objects(columns, table, skip=("dataset", "level", "gamma")):
+    """Internal function: JSON objects of the rows of a table, without the
+    key columns."""
+    names = [name for name, _ in COLUMNAR_TABLES[table] if name not in skip]
+    return [dict(zip(names, row)) for row in zip(*[columns[name] for name in names])]
+
+
+def tables_to_datasets(tables):
+    """Rebuilds the JSON objects of the EGAF data sets from the normalized
+    tables.
+
+    Arguments:
+        tables: Dictionary of DataFrames of all COLUMNAR_TABLES, e.g. from
+                `read_tables`.
+
+    Returns:
+        A list of data set JSON objects equal to the exported ones, with the
+        keys in the order of the JSON files.
+
+    Example:
+        datasets = tables_to_datasets(read_tables("egaf_parquet"))
+    """
+    columns = {table: frame_columns(sort_table(tables[table], table), table) for table in COLUMNAR_TABLES}
+    return columns_to_datasets(columns)
+
+
+def sort_table(frame, table):
+    """Internal function: DataFrame of a table with the rows sorted by data
+    set, level and gamma ray."""
+    # Rows may come back in any order, e.g. from Spark; the spins of a level
+    # are ordered by spinIndex and the other records of a level or gamma ray
+    # keep their order in the table
+    keys = [name for name, _ in COLUMNAR_TABLES[table] if name in ("dataset", "level", "gamma", "spinIndex")]
+    return frame.sort_values(keys, kind="stable")
+
+
+def columns_to_datasets(columns):
+    """Internal function: JSON objects of the data sets from the columns of
+    the normalized tables, given as lists of Python objects keyed by table
+    and column name, with the rows sorted by data set, level and gamma ray
+    and the `dataset` keys numbered from 0."""
+    num_datasets = len(columns["datasets"]["dataset"])
+
+    # Row numbers of the first level and gamma ray of each data set
+    level_first = np.searchsorted(np.asarray(columns["levels"]["dataset"], dtype=np.int64), np.arange(num_datasets + 1))
+    gamma_first = np.searchsorted(np.asarray(columns["gammas"]["dataset"], dtype=np.int64), np.arange(num_datasets + 1))
+
+    def bounds(table, key, first):
+        # Rows of a table for each level or gamma ray
+        rows = np.asarray(columns[table][key], dtype=np.int64) + first[np.asarray(columns[table]["dataset"], dtype=np.int64)]
+        return group_bounds(rows, first[-1])
+
+    spin_start, spin_stop = bounds("spins", "level", level_first)
+    isomer_start, isomer_stop = bounds("isomers", "level", level_first)
+    gamma_start, gamma_stop = bounds("gammas", "level", level_first)
+    intensity_start, intensity_stop = bounds("intensities", "gamma", gamma_first)
+    conversion_start, conversion_stop = bounds("conversion_coefficients", "gamma", gamma_first)
+
+    # The nested arrays are inserted at their positions in the JSON objects
+    with gc_paused():
+        spins = table_objects(columns["spins"], "spins")
+        isomers = table_objects(columns["isomers"], "isomers")
+        intensities = table_objects(columns["intensities"], "intensities")
+        conversions = table_objects(columns["conversion_coefficients"], "conversion_coefficients")
+
+        head = [name for name, _ in GAMMA_COLUMNS[:8]]
+        tail = [name for name, _ in GAMMA_COLUMNS[8:]]
+        gammas = []
+        for h, t, i0, i1, c0, c1 in zip(zip(*[columns["gammas"][name] for name in head]), zip(*[columns["gammas"][name] for name in tail]), intensity_start, intensity_stop, conversion_start, conversion_stop):
+            gdict = dict(zip(head, h))
+            gdict["gammaAbsoluteIntensities"] = intensities[i0:i1]
+            gdict.update(zip(tail, t))
+            gdict["calculatedAtomicShellConversionCoefficients"] = conversions[c0:c1]
+            gdict["reducedTransitionProbabilities"] = []
+            gammas.append(gdict)
+
+        level_columns = [columns["levels"][name] for name, _ in LEVEL_COLUMNS]
+        levels = [{"levelIndex": index, "levelEnergy": energy, "dLevelEnergy": d_energy, "levelIsIsomer": isomer, "isomerDecay": isomers[m0:m1], "numberOfSpins": num_spins, "spins": spins[s0:s1], "numberOfGammas": num_gammas, "gammaDecay": gammas[g0:g1]}
+                  for index, energy, d_energy, isomer, num_spins, num_gammas, m0, m1, s0, s1, g0, g1 in zip(*level_columns, isomer_start, isomer_stop, spin_start, spin_stop, gamma_start, gamma_stop)]
+
+        datasets = []
+        q_stop = len(DATASET_COLUMNS) + len(RECORD_Q_COLUMNS)
+        for n, ddict in enumerate(table_objects(columns["datasets"], "datasets")):
+            items = list(ddict.items())
+            jdict = dict(items[:len(DATASET_COLUMNS)])
+            jdict["recordQ"] = [dict(items[len(DATASET_COLUMNS):q_stop])]
+            jdict["neutronCaptureNormalization"] = [{"normalizationRecord": [dict(items[q_stop:])]}]
+            jdict["levelScheme"] = levels[level_first[n]:level_first[n+1]]
+            datasets.append(jdict)
+    return datasets
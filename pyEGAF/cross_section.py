@@ -1,15 +1,16 @@
 from .base_egaf import *
 from .separation import Separation
 
+# Columns and dtype of the table returned by `CrossSection.get_all_nuclei`.
+NUCLEI_COLUMNS = ('Target', 'Residual (CN)', 'Z', 'A', 'sigma0 (b)', 'dsigma0 (b)', 'Reference', 'Abundance', 'dAbundance', 'Sn AME2020 (keV)', 'dSn AME2020 (keV)', 'Sp AME2020 (keV)', 'dSp AME2020 (keV)', 'Sn EGAF (keV)', 'dSn EGAF (keV)', 'Primaries', 'Secondaries', 'Gammas', 'Levels')
+NUCLEI_DTYPE = np.dtype(list(zip(NUCLEI_COLUMNS, ['U8', 'U8', 'i8', 'i8', 'f8', 'f8', 'U16', 'f8', 'f8', 'f8', 'f8', 'f8', 'f8', 'f8', 'f8', 'i8', 'i8', 'i8', 'i8'])))
+
 class CrossSection(Separation):
     __doc__="""Class to handle adopted total thermal-neutron capture 
     cross section data and natural abundances"""
 
-    def __init__(self):
-        BaseEGAF.__init__(self)
-        Meta.__init__(self)
-        Uncertainties.__init__(self)
-        Separation.__init__(self)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
 
     def get_total_cross_section(self,list,*args):
         """Adopted total radiative thermal neutron-capture cross sections for a 
@@ -68,7 +69,7 @@ class CrossSection(Separation):
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True
             
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args, target=True):
             try:
                 if (len(self.args) == 1 and str(args[0]) == jdict["nucleusTargetID"]) or (len(self.args) == 2 and int(args[0]) == jdict["nucleusTargetZ"] and int(args[1]) == jdict["nucleusTargetA"]):
                     for each_n in jdict["neutronCaptureNormalization"]:
@@ -77,14 +78,14 @@ class CrossSection(Separation):
             except ValueError:
                 WRONG_INPUTS = True
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_total_cross_section(edata,\"Si28\")")
-            print("or:")
-            print(" get_total_cross_section(edata,14,28)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_total_cross_section(edata,\"Si28\")\n"
+                                           "or:\n"
+                                           " get_total_cross_section(edata,14,28)")
             return                        
         if total_capture_cs == None:
-            print("No target nucleus in EGAF file for defined input.")
+            report_error(NucleusNotFound, "No target nucleus in EGAF file for defined input.")
             return None
         else:
             return total_capture_cs
@@ -125,7 +126,7 @@ class CrossSection(Separation):
         WRONG_INPUTS = False
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True        
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args, target=True):
             try:
                 if (len(self.args) == 1 and str(args[0]) == jdict["nucleusTargetID"]) or (len(self.args) == 2 and int(args[0]) == jdict["nucleusTargetZ"] and int(args[1]) == jdict["nucleusTargetA"]):
                     for each_n in jdict["neutronCaptureNormalization"]:
@@ -134,14 +135,14 @@ class CrossSection(Separation):
             except ValueError:
                 WRONG_INPUTS = True
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_abundance(edata,\"Al27\")")
-            print("or:")
-            print(" get_abundance(edata,13,27)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_abundance(edata,\"Al27\")\n"
+                                           "or:\n"
+                                           " get_abundance(edata,13,27)")
             return                              
         if abundance == None:
-            print("No target nucleus in EGAF file for defined input.")
+            report_error(NucleusNotFound, "No target nucleus in EGAF file for defined input.")
             return None
         else:
             return abundance
@@ -189,17 +190,11 @@ class CrossSection(Separation):
             get_all_total_cross_sections(edata)
         """
         self.list = list
-        egaf_targets = BaseEGAF.egaf_target_list(self,self.list)
+        targets, residuals = [self.dataset_values(self.list, key) for key in ("nucleusTargetID", "nucleusID")]
+        records = [self.dataset_values(self.list, key, CrossSection.normalization_record) for key in ("adoptedTotalThermalCaptureCrossSection", "dAdoptedTotalThermalCaptureCrossSection", "unitAdoptedCrossSection", "keyNumber")]
         all_cs_dict = {}
-        for target in egaf_targets:
-            regex_symbol = re.compile(r'\D+')
-            regex_target_mass = re.compile(r'\d+')
-            symbol = regex_symbol.findall(target)[0]
-            target_mass = regex_target_mass.findall(target)[0]
-            residual_mass = str(int(target_mass)+1)
-            residual = symbol+residual_mass
-            sigma_0 = CrossSection.get_total_cross_section(self,self.list,target)
-            all_cs_dict.update({target: (residual, sigma_0[0], sigma_0[1], sigma_0[2], sigma_0[3])})
+        for pos in self.sorted_positions(targets):
+            all_cs_dict.update({targets[pos]: (residuals[pos],) + tuple(values[pos] for values in records)})
         return all_cs_dict
 
     def get_all_abundances(self,list):
@@ -221,9 +216,69 @@ class CrossSection(Separation):
             get_all_abundances(edata)
         """
         self.list = list
-        egaf_targets = BaseEGAF.egaf_target_list(self,self.list)
+        targets = self.dataset_values(self.list, "nucleusTargetID")
+        abundances, d_abundances = [self.dataset_values(self.list, key, CrossSection.normalization_record) for key in ("naturalIsotopicAbundance", "dNaturalIsotopicAbundance")]
         all_abundances = {}
-        for target in egaf_targets:
-            abundance = CrossSection.get_abundance(self,self.list,target)
-            all_abundances.update({target: (abundance[0], abundance[1])})
+        for pos in self.sorted_positions(targets):
+            all_abundances.update({targets[pos]: (abundances[pos], d_abundances[pos])})
         return all_abundances
+
+    def get_all_nuclei(self,list,array=False):
+        """Thermal-capture data and decay-scheme statistics for all (n,g) 
+        data sets, gathered in a single pass over the EGAF data.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            array: Returns a NumPy structured array instead of a DataFrame if 
+                   True (bool); by default False.
+
+        Returns:
+            A pandas DataFrame (or NumPy structured array) with one row per 
+            (n,g) data set, sorted alphabetically by target, and the columns 
+            given in NUCLEI_COLUMNS:
+
+            Target, Residual (CN): Target and residual compound nucleus IDs;
+            Z, A: Atomic and mass numbers of the residual compound nucleus;
+            sigma0, dsigma0 (b): Adopted total radiative thermal 
+                                 neutron-capture cross section and its 
+                                 uncertainty;
+            Reference: Cross section reference keynumber;
+            Abundance, dAbundance: Natural isotopic abundance of the target;
+            Sn AME2020, dSn AME2020 (keV): Neutron-separation energy of the 
+                                           compound nucleus from AME2020;
+            Sp AME2020, dSp AME2020 (keV): Proton-separation energy of the 
+                                           compound nucleus from AME2020;
+            Sn EGAF, dSn EGAF (keV): Neutron-separation energy from EGAF;
+            Primaries, Secondaries, Gammas, Levels: Decay-scheme statistics 
+                                                    as in get_stats.
+
+            Missing values are NaN.
+
+        Examples:
+            get_all_nuclei(edata)
+            get_all_nuclei(edata, array=True)
+        """
+        import pandas as pd
+        self.list = list
+        # Column by column, so that a MappedEGAFCatalog reads them from its 
+        # datasets table without rebuilding the data sets
+        columns = [self.dataset_values(self.list, key) for key in ("nucleusTargetID", "nucleusID", "nucleusZ", "nucleusA")]
+        columns += [self.dataset_values(self.list, key, CrossSection.normalization_record) for key in ("adoptedTotalThermalCaptureCrossSection", "dAdoptedTotalThermalCaptureCrossSection", "keyNumber", "naturalIsotopicAbundance", "dNaturalIsotopicAbundance")]
+        columns += [self.dataset_values(self.list, key, Separation.q_record) for key in ("energyNeutronSeparationAME2020", "dEnergyNeutronSeparationAME2020", "energyProtonSeparationAME2020", "dEnergyProtonSeparationAME2020", "energyNeutronSeparationEGAF", "dEnergyNeutronSeparationEGAF")]
+        columns += [self.dataset_values(self.list, key) for key in ("numberPrimaryGammas", "numberSecondaryGammas", "totalNumberGammas", "totalNumberLevels")]
+        rows = [tuple(np.nan if values[pos] is None else values[pos] for values in columns) for pos in self.sorted_positions(columns[0])]
+        nuclei = np.array(rows, dtype=NUCLEI_DTYPE)
+        if array == True:
+            return nuclei
+        return pd.DataFrame.from_records(nuclei)
+
+    @staticmethod
+    def normalization_record(jdict):
+        """Internal function: Neutron-capture normalization record of an 
+        EGAF data set, as used by get_total_cross_section and get_abundance:
+        the last `normalizationRecord` of the last `neutronCaptureNormalization`
+        entry, or an empty dict if there is none."""
+        normalizations = jdict["neutronCaptureNormalization"]
+        if len(normalizations) == 0 or len(normalizations[-1]["normalizationRecord"]) == 0:
+            return {}
+        return normalizations[-1]["normalizationRecord"][-1]
@@ -1,17 +1,15 @@
 from .base_egaf import *
 from .separation import Separation
 from .cross_section import CrossSection
+from .gamma_table import TRANSITION_TYPES, INTENSITY_COLUMNS
+from .peak_id import PeakIdentifier, peak_columns
 
 
 class Levels(CrossSection):
     __doc__="""Class to handle levels in EGAF data sets."""
 
-    def __init__(self):
-        BaseEGAF.__init__(self)
-        Meta.__init__(self)
-        Uncertainties.__init__(self)
-        Separation.__init__(self)
-        CrossSection.__init__(self)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
 
     def get_residual_levels(self,list,*args):
         """Levels and associated properties of the residual compound nucleus 
@@ -65,7 +63,7 @@ class Levels(CrossSection):
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True
             
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
                     for each_l in jdict["levelScheme"]:
@@ -115,15 +113,15 @@ class Levels(CrossSection):
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_residual_levels(edata,\"Na24\")")
-            print("or:")
-            print(" get_residual_levels(edata,11,24)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_residual_levels(edata,\"Na24\")\n"
+                                           "or:\n"
+                                           " get_residual_levels(edata,11,24)")
             return
         
         if level_scheme == []:
-            print("No decay-scheme data available for defined compound nucleus.")
+            report_error(NucleusNotFound, "No decay-scheme data available for defined compound nucleus.")
             return
         else:
             return level_scheme
@@ -173,7 +171,7 @@ class Levels(CrossSection):
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True
             
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
                     for each_l in jdict["levelScheme"]:
@@ -193,15 +191,15 @@ class Levels(CrossSection):
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" find_multiple_jpi(edata,\"Na24\")")
-            print("or:")
-            print(" find_multiple_jpi(edata,11,24)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " find_multiple_jpi(edata,\"Na24\")\n"
+                                           "or:\n"
+                                           " find_multiple_jpi(edata,11,24)")
             return
                             
         if level_scheme == []:
-            print("No levels with multiple spin-parity assignments.")
+            report_error(DataNotFound, "No levels with multiple spin-parity assignments.")
             return
         else:
             return level_scheme
@@ -251,7 +249,7 @@ class Levels(CrossSection):
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True
             
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
                     for each_l in jdict["levelScheme"]:
@@ -272,15 +270,15 @@ class Levels(CrossSection):
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" find_unique_jpi(edata,\"Na24\")")
-            print("or:")
-            print(" find_unique_jpi(edata,11,24)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " find_unique_jpi(edata,\"Na24\")\n"
+                                           "or:\n"
+                                           " find_unique_jpi(edata,11,24)")
             return
                             
         if level_scheme == []:
-            print("No levels with unique spin-parity assignments.")
+            report_error(DataNotFound, "No levels with unique spin-parity assignments.")
             return
         else:
             return level_scheme                                
@@ -338,7 +336,7 @@ class Levels(CrossSection):
             WRONG_INPUTS = True
         
         level_scheme = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
                     for each_l in jdict["levelScheme"]:
@@ -367,28 +365,28 @@ class Levels(CrossSection):
                 WRONG_INPUTS = True
                                     
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired halflife units.")
-            print("Please pass one of the following arguments:")
-            print("units='best'")
-            print("units='seconds'")
-            print("units='s'")
+            report_error(InvalidArguments, "A keyword argument is required for the desired halflife units.\n"
+                                           "Please pass one of the following arguments:\n"
+                                           "units='best'\n"
+                                           "units='seconds'\n"
+                                           "units='s'")
         if UNSPECIFIED_UNIT == True:
-            print("Inavlid units for halflife.")
-            print("Only the following keyword arguments are accepted:")
-            print("units='best'")
-            print("units='seconds'")
-            print("units='s'")
+            report_error(InvalidArguments, "Inavlid units for halflife.\n"
+                                           "Only the following keyword arguments are accepted:\n"
+                                           "units='best'\n"
+                                           "units='seconds'\n"
+                                           "units='s'")
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" find_isomers(edata,\"Na24\",units=<str>)")
-            print("or:")
-            print(" find_isomers(edata,11,24,units=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " find_isomers(edata,\"Na24\",units=<str>)\n"
+                                           "or:\n"
+                                           " find_isomers(edata,11,24,units=<str>)")
             return
                             
         if level_scheme == []:
-            print("No isomeric levels in decay scheme.")
+            report_error(DataNotFound, "No isomeric levels in decay scheme.")
             return
         else:
             return level_scheme 
@@ -480,107 +478,62 @@ class Gammas(Levels):
             WRONG_INPUTS = True
 
         gamma_spec = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):        
 
                     DECAY_SCHEME_EXISTS = True
-                    residual = jdict["nucleusID"]
-                    
-                    g = Gammas()
-                    
-                    for each_l in jdict["levelScheme"]:
-                        if each_l["numberOfGammas"] > 0:                            
-                            for each_g in each_l["gammaDecay"]:
-                                initial_index = each_g["levelIndexInitial"]
-                                final_index = each_g["levelIndexFinal"]
-                                initial_energy = each_g["levelEnergyInitial"]
-                                final_energy = each_g["levelEnergyFinal"]
-                                gamma_energy = each_g["gammaEnergy"]
-                                d_gamma_energy = each_g["dGammaEnergy"]
-                                alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                for intensity in kwargs.values():
-                                    if intensity.lower() == str("elemental"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialElementalCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-
-                                            gamma_spec.append([initial_index, final_index, initial_energy, final_energy, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity, alpha, d_alpha])
-                                    elif intensity.lower() == str("isotopic"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialIsotopicCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialIsotopicCrossSection"]
-
-                                            gamma_spec.append([initial_index, final_index, initial_energy, final_energy, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity, alpha, d_alpha])
-                                    elif intensity.lower() == str("population"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["populationPerNeutronCapture"]
-                                            d_gamma_intensity = each_i["dPopulationPerNeutronCapture"]
-
-                                            gamma_spec.append([initial_index, final_index, initial_energy, final_energy, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity, alpha, d_alpha])
-                                            
-                                    elif intensity.lower() == str("relative"):
-                                        # Call method recursively assuming elemental intensities
-                                        spe = g.get_gammas(self.list, residual, intensity = 'elemental')
-                                        df = pd.DataFrame({'I':spe[:,6], 'dI':spe[:,7]})
-                                        max_I = df['I'].loc[df['I'].idxmax()]
-                                        dI_at_max_I = df['dI'].loc[df['I'].idxmax()]
-                                        
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialElementalCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-                                            
-                                            rel_gamma_intensity = (gamma_intensity/max_I) * 100
-                                            if d_gamma_intensity > 0.0:
-                                                d_rel_gamma_intensity = rel_gamma_intensity * (d_gamma_intensity/gamma_intensity)
-                                            else:
-                                                d_rel_gamma_intensity = 0.0
-                                                
-                                            gamma_intensity = rel_gamma_intensity
-                                            d_gamma_intensity = d_rel_gamma_intensity
-
-                                            gamma_spec.append([int(initial_index), int(final_index), initial_energy, final_energy, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity, alpha, d_alpha])
-                                    else:
-                                        UNSPECIFIED_INTENSITY = True
+                    table = self.nucleus_gamma_table(self.list, jdict)
+
+                    if len(table) > 0:
+                        for intensity in kwargs.values():
+                            if intensity.lower() == str("relative"):
+                                gamma_spec.append(table.spectrum(*table.relative_intensity()))
+                            elif table.intensity(intensity) != None:
+                                gamma_spec.append(table.spectrum(*table.intensity(intensity)))
+                            else:
+                                UNSPECIFIED_INTENSITY = True
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_gammas(edata, \"Y90\", intensity=<str>)")
-            print("or:")
-            print(" get_gammas(edata, 39, 90, intensity=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_gammas(edata, \"Y90\", intensity=<str>)\n"
+                                           "or:\n"
+                                           " get_gammas(edata, 39, 90, intensity=<str>)")
             return
         
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
-            print("intensity='population'")
-            print("intensity='relative'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'\n"
+                                               "intensity='relative'")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
-            print("intensity='population'")
-            print("intensity='relative'")
+            report_error(InvalidIntensityMode, "Incorrect intensity specified.\n"
+                                               "Only the following keyword arguments are accepted:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'\n"
+                                               "intensity='relative'")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return            
         
         if gamma_spec == []:
-            print("No gammas in decay scheme")
+            report_error(DataNotFound, "No gammas in decay scheme")
             return
+        elif len(gamma_spec) == 1:
+            return gamma_spec[0]
         else:
-            return np.array(gamma_spec)
+            # Interleave the rows for each intensity keyword gamma by gamma
+            return np.stack(gamma_spec, axis=1).reshape(-1, gamma_spec[0].shape[1])
 
     
     def find_all_gammas_feeding_gs(self,list,*args,**kwargs):
@@ -659,73 +612,58 @@ class Gammas(Levels):
             WRONG_INPUTS = True
 
         feeding_gs = []            
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     DECAY_SCHEME_EXISTS = True
-                    for each_l in jdict["levelScheme"]:
-                        if each_l["numberOfGammas"] > 0:
-                            for each_g in each_l["gammaDecay"]:
-                                if each_g["gammaFeedsGroundState"] == True:
-                                    DIRECT_FEEDING_GS = True
-
-                                    initial_index = each_g["levelIndexInitial"]
-                                    final_index = each_g["levelIndexFinal"]
-                                    initial_energy = each_g["levelEnergyInitial"]
-                                    final_energy = each_g["levelEnergyFinal"]
-                                    gamma_energy = each_g["gammaEnergy"]
-                                    d_gamma_energy = each_g["dGammaEnergy"]
-                                    alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                    d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                    cs, d_cs = None, None
-                                    for each_i in each_g["gammaAbsoluteIntensities"]:
-                                        for intensity in kwargs.values():
-                                            if intensity.lower() == str("isotopic"):
-                                                cs = each_i["partialIsotopicCrossSection"]
-                                                d_cs = each_i["dPartialIsotopicCrossSection"]
-
-                                            elif intensity.lower() == str("population"):
-                                                cs = each_i["populationPerNeutronCapture"]
-                                                d_cs = each_i["dPopulationPerNeutronCapture"]
-                                            else:
-                                                UNSPECIFIED_INTENSITY = True
-
-                                    feeding_gs.append([initial_index, final_index, initial_energy, final_energy, gamma_energy, d_gamma_energy, cs, d_cs, alpha, d_alpha])
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    feeding = table.select(table.feeds_gs)
+                    if len(feeding) > 0:
+                        DIRECT_FEEDING_GS = True
+                        cs = None
+                        for intensity in kwargs.values():
+                            if intensity.lower() == str("isotopic") or intensity.lower() == str("population"):
+                                cs = feeding.intensity(intensity)
+                            else:
+                                UNSPECIFIED_INTENSITY = True
+
+                        if cs != None:
+                            feeding_gs.extend(feeding.rows(*cs))
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" find_all_gammas_feeding_gs(edata, \"C13\", intensity=\"isotopic\")")
-            print("or:")
-            print(" find_all_gammas_feeding_gs(edata, 6, 13, intensity=\"isotopic\")")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " find_all_gammas_feeding_gs(edata, \"C13\", intensity=\"isotopic\")\n"
+                                           "or:\n"
+                                           " find_all_gammas_feeding_gs(edata, 6, 13, intensity=\"isotopic\")")
             return
 
         if kwargs == {} or kwargs == None:
-            print("A keyword argument is required for the desired intensity units.")
-            print("Please pass one of the following arguments:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "A keyword argument is required for the desired intensity units.\n"
+                                               "Please pass one of the following arguments:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("intensity='isotopic'")
-            print("intensity='population'")
+            report_error(InvalidIntensityMode, "Incorrect intensity specified.\n"
+                                               "Only the following keyword arguments are accepted:\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'")
             return
                                 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
         
         if DIRECT_FEEDING_GS == False:
-            print("No transitions feeding ground state directly.")
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
 
         if feeding_gs == []:
-            print("No transitions feeding ground state directly.")
+            report_error(DataNotFound, "No transitions feeding ground state directly.")
             return
         else:
             return feeding_gs
@@ -820,7 +758,7 @@ class Gammas(Levels):
             WRONG_INPUTS = True        
         
         gammas = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     DECAY_SCHEME_EXISTS = True
@@ -830,128 +768,84 @@ class Gammas(Levels):
                         if (kwarg.lower() == "elemental") or (kwarg.lower() == "isotopic") or (kwarg.lower() == "population") or (kwarg.lower() == "relative"):
                             intensity_type = str(kwarg.lower())
 
-                    for each_l in jdict["levelScheme"]:
-                        if each_l["numberOfGammas"] > 0:
-                            for each_g in each_l["gammaDecay"]:
-                                if each_g["gammaTransitionType"] == gamma_type:
-
-                                    if gamma_type.lower() == 'primary':
-                                        PRIMARIES = True
-                                    elif gamma_type.lower() == 'secondary':
-                                        SECONDARIES = True
-                                    else:
-                                        NO_GAMMAS = True
-
-                                    initial_index = each_g["levelIndexInitial"]
-                                    final_index = each_g["levelIndexFinal"]
-                                    initial_energy = each_g["levelEnergyInitial"]
-                                    final_energy = each_g["levelEnergyFinal"]
-                                    gamma_energy = each_g["gammaEnergy"]
-                                    d_gamma_energy = each_g["dGammaEnergy"]
-                                    alpha = each_g["calculatedTotalInternalConversionCoefficient"]
-                                    d_alpha = each_g["dCalculatedTotalInternalConversionCoefficient"]
-                                    cs, d_cs = None, None
-
-                                    # Find maximum intensity 
-                                    g = Gammas()
-                                    residual = jdict["nucleusID"]
-                                    spe = g.get_gammas(self.list, residual, intensity = 'elemental')
-                                    df = pd.DataFrame({'I':spe[:,6], 'dI':spe[:,7]})
-                                    max_I = df['I'].loc[df['I'].idxmax()]
-                                    dI_at_max_I = df['dI'].loc[df['I'].idxmax()]
-                                    
-                                    #for intensity in kwargs.values():
-                                    #    if intensity == "isotopic":
-                                    if intensity_type != None:
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            if intensity_type.lower() == 'elemental':
-                                                cs = each_i["partialElementalCrossSection"]
-                                                d_cs = each_i["dPartialElementalCrossSection"]
-                                            elif intensity_type.lower() == 'isotopic':
-                                                cs = each_i["partialIsotopicCrossSection"]
-                                                d_cs = each_i["dPartialIsotopicCrossSection"]
-                                            elif intensity_type.lower() == 'population':
-                                                cs = each_i["populationPerNeutronCapture"]
-                                                d_cs = each_i["dPopulationPerNeutronCapture"]
-                                            elif intensity_type.lower() == 'relative':
-                                                gamma_intensity = each_i["partialElementalCrossSection"]
-                                                d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-                                            
-                                                rel_gamma_intensity = (gamma_intensity/max_I) * 100
-                                                if d_gamma_intensity > 0.0:
-                                                    d_rel_gamma_intensity = rel_gamma_intensity * (d_gamma_intensity/gamma_intensity)
-                                                else:
-                                                    d_rel_gamma_intensity = 0.0
-                                                
-                                                cs = rel_gamma_intensity
-                                                d_cs = d_rel_gamma_intensity
-                                                
-                                            else:
-                                                UNSPECIFIED_INTENSITY = True
-                                    else:
-                                        UNSPECIFIED_INTENSITY = True
-
-                                    gammas.append([initial_index, final_index, initial_energy, final_energy, gamma_energy, d_gamma_energy, cs, d_cs, alpha, d_alpha, gamma_type])
+                    table = self.nucleus_gamma_table(self.list, jdict)
+                    if gamma_type in TRANSITION_TYPES:
+                        of_type = table.transition_type == TRANSITION_TYPES[gamma_type]
+                        if of_type.any():
+                            if gamma_type.lower() == 'primary':
+                                PRIMARIES = True
+                            elif gamma_type.lower() == 'secondary':
+                                SECONDARIES = True
+
+                            selected = table.select(of_type)
+                            if intensity_type == 'relative':
+                                # Relative to the strongest transition in the nucleus
+                                rel_I, d_rel_I = table.relative_intensity()
+                                gammas.extend(selected.rows(rel_I[of_type], d_rel_I[of_type], gamma_type))
+                            elif intensity_type != None:
+                                gammas.extend(selected.rows(*selected.intensity(intensity_type), gamma_type))
+                            else:
+                                UNSPECIFIED_INTENSITY = True
             except ValueError:
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_gamma_types(edata, \"C13\", intensity=<str>, gammas=<str>)")
-            print("or:")
-            print(" get_gamma_types(edata, 6, 13, intensity=<str>, gammas=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_gamma_types(edata, \"C13\", intensity=<str>, gammas=<str>)\n"
+                                           "or:\n"
+                                           " get_gamma_types(edata, 6, 13, intensity=<str>, gammas=<str>)")
             return
                                 
         if kwargs == {} or kwargs == None:
-            print("Two keyword arguments are required.\n")
-            print("Please pass one of the following arguments for the required intensity units:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
-            print("intensity='population'")
-            print("intensity='relative'")
-            print("\nPlease pass one of the following arguments for the required gamma-ray types:")
-            print("gammas='primary'")
-            print("gammas='secondary'")
+            report_error(InvalidArguments, "Two keyword arguments are required.\n\n"
+                                           "Please pass one of the following arguments for the required intensity units:\n"
+                                           "intensity='elemental'\n"
+                                           "intensity='isotopic'\n"
+                                           "intensity='population'\n"
+                                           "intensity='relative'\n"
+                                           "\nPlease pass one of the following arguments for the required gamma-ray types:\n"
+                                           "gammas='primary'\n"
+                                           "gammas='secondary'")
             return
 
         if len(kwargs)==1 or len(kwargs)>2:
-            print("Two keyword arguments are required.\n")
-            print("Please pass one of the following arguments for the required intensity units:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
-            print("intensity='population'")
-            print("intensity='relative'")
-            print("\nPlease pass one of the following arguments for the required gamma-ray types:")
-            print("gammas='primary'")
-            print("gammas='secondary'")
+            report_error(InvalidArguments, "Two keyword arguments are required.\n\n"
+                                           "Please pass one of the following arguments for the required intensity units:\n"
+                                           "intensity='elemental'\n"
+                                           "intensity='isotopic'\n"
+                                           "intensity='population'\n"
+                                           "intensity='relative'\n"
+                                           "\nPlease pass one of the following arguments for the required gamma-ray types:\n"
+                                           "gammas='primary'\n"
+                                           "gammas='secondary'")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("Incorrect intensity specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("intensity='elemental'")
-            print("intensity='isotopic'")
-            print("intensity='population'")
-            print("intensity='relative'")
+            report_error(InvalidIntensityMode, "Incorrect intensity specified.\n"
+                                               "Only the following keyword arguments are accepted:\n"
+                                               "intensity='elemental'\n"
+                                               "intensity='isotopic'\n"
+                                               "intensity='population'\n"
+                                               "intensity='relative'")
             return
         
         if gamma_type == "primary" and NO_GAMMAS == True:
-            print("No primary gamma rays in decay scheme.")
+            report_error(DataNotFound, "No primary gamma rays in decay scheme.")
         elif gamma_type == "secondary" and NO_GAMMAS == True:
-            print("No secondary gamma rays in decay scheme.")
+            report_error(DataNotFound, "No secondary gamma rays in decay scheme.")
         elif gamma_type == None:
-            print("Incorrect gamma-type specified.")
-            print("Only the following keyword arguments are accepted:")
-            print("gammas='primary'") 
-            print("gammas='secondary'")
+            report_error(InvalidArguments, "Incorrect gamma-type specified.\n"
+                                           "Only the following keyword arguments are accepted:\n"
+                                           "gammas='primary'\n"
+                                           "gammas='secondary'")
             
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments.")
             return
 
         if gammas == []:
-            print("No gammas of the required type found in decay scheme.")
+            report_error(DataNotFound, "No gammas of the required type found in decay scheme.")
             return
         else:
             return gammas
@@ -1009,102 +903,50 @@ class Gammas(Levels):
             find_gamma(edata, 1273, 2.5, intensity='population')
             find_gamma(edata, 1273, 2.5, intensity='relative')
         """
+        import pandas as pd
         self.list = list
         self.float = float
 
         if kwargs == {} or kwargs == None:
             # Assign default keyword argument for gamma-ray intensities
             kwargs = {'intensity': 'relative'}
-            print("No intensity keyword argument provided.")
-            print("Default \"relative\" intensities will be adopted.")
+            report_warning("No intensity keyword argument provided.\n"
+                           "Default \"relative\" intensities will be adopted.")
 
         NO_INTENSITY_OPTION = False
         isotope_list = []
-        for jdict in self.list:
-            if jdict["datasetType"] == "evaluatedGammarayActivationFile":
-                for each_l in jdict["levelScheme"]:
-                    if each_l["numberOfGammas"] > 0:
-                        for each_g in each_l["gammaDecay"]:
-                            gamma_energy = each_g["gammaEnergy"]
+        table = self.gamma_table(self.list)
+        rows = table.energy_window(self.float - tolerance, self.float + tolerance)
+        if len(rows) > 0:
+            # Relative intensities use the strongest (elemental) transition of
+            # each nucleus, precomputed once for the whole table.
+            rel_I, d_rel_I = table.relative_intensity()
+            for row in rows.tolist():
+                jdict = self.list[int(table.residual[row])]
+                if jdict["datasetType"] == "evaluatedGammarayActivationFile":
+                    target = jdict["nucleusTargetID"]
+                    residual = jdict["nucleusID"]
 
-                            if gamma_energy >= (self.float - tolerance) and gamma_energy <= (self.float + tolerance):
+                    residual_Z = jdict["nucleusZ"]
+                    residual_A = jdict["nucleusA"]
 
-                                target = jdict["nucleusTargetID"]
-                                residual = jdict["nucleusID"]
+                    gamma_energy = table.energy[row].item()
+                    d_gamma_energy = table.d_energy[row].item()
 
-                                residual_Z = jdict["nucleusZ"]
-                                residual_A = jdict["nucleusA"]
-                                
-                                d_gamma_energy = each_g["dGammaEnergy"]
-                                gamma_intensity = None
-                                d_gamma_intensity = None
-
-                                # Find maximum intensity
-                                g = Gammas()
-                                spe = g.get_gammas(self.list, residual, intensity = 'elemental')
-                                df = pd.DataFrame({'I':spe[:,6], 'dI':spe[:,7]})
-                                max_I = df['I'].loc[df['I'].idxmax()]
-                                dI_at_max_I = df['dI'].loc[df['I'].idxmax()]
-                                
-                                for intensity in kwargs.values():
-                                    if intensity == str("elemental"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialElementalCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-
-                                            isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity])
-                                            
-                                    elif intensity == str("isotopic"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialIsotopicCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialIsotopicCrossSection"]
-
-                                            isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity])
-                                            
-                                    elif intensity == str("population"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["populationPerNeutronCapture"]
-                                            d_gamma_intensity = each_i["dPopulationPerNeutronCapture"]
-
-                                            isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity])
-                                            
-                                    elif intensity == str("relative"):
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialElementalCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-                                            
-                                            rel_gamma_intensity = (gamma_intensity/max_I) * 100
-                                            if d_gamma_intensity > 0.0:
-                                                d_rel_gamma_intensity = rel_gamma_intensity * (d_gamma_intensity/gamma_intensity)
-                                            else:
-                                                d_rel_gamma_intensity = 0.0
-                                                
-                                            gamma_intensity = rel_gamma_intensity
-                                            d_gamma_intensity = d_rel_gamma_intensity
-                                            
-                                            isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity])
-                                            
-                                    else:
-                                        NO_INTENSITY_OPTION = True
-                                        # Defaults to "isotopic" intensities
-                                        for each_i in each_g["gammaAbsoluteIntensities"]:
-                                            gamma_intensity = each_i["partialElementalCrossSection"]
-                                            d_gamma_intensity = each_i["dPartialElementalCrossSection"]
-                                            
-                                            rel_gamma_intensity = (gamma_intensity/max_I) * 100
-                                            if d_gamma_intensity > 0.0:
-                                                d_rel_gamma_intensity = rel_gamma_intensity * (d_gamma_intensity/gamma_intensity)
-                                            else:
-                                                d_rel_gamma_intensity = 0.0
-                                                
-                                            gamma_intensity = rel_gamma_intensity
-                                            d_gamma_intensity = d_rel_gamma_intensity
-                                
-                                            isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity, d_gamma_intensity])
+                    for intensity in kwargs.values():
+                        if intensity in INTENSITY_COLUMNS:
+                            gamma_intensity, d_gamma_intensity = table.intensity(intensity)
+                        else:
+                            if intensity != str("relative"):
+                                NO_INTENSITY_OPTION = True
+                            # Defaults to "relative" intensities
+                            gamma_intensity, d_gamma_intensity = rel_I, d_rel_I
+
+                        isotope_list.append([target, residual, residual_Z, residual_A, gamma_energy, d_gamma_energy, gamma_intensity[row].item(), d_gamma_intensity[row].item()])
 
         if NO_INTENSITY_OPTION == True:
-            print("I didn't understand the intensity keyword-argument provided.")
-            print("Default \"relative\" intensities will be adopted.")
+            report_warning("I didn't understand the intensity keyword-argument provided.\n"
+                           "Default \"relative\" intensities will be adopted.")
 
         try:
             isotope_list_s = sorted(isotope_list, key=lambda x: (x[2], x[3]))
@@ -1127,12 +969,157 @@ class Gammas(Levels):
         except IndexError:
 
             if (isotope_list == []) or len(isotope_list) == 0:
-                print("No gammas in EGAF database match specified search criterion: {0} \xb1 {1} keV.\nTry a different energy or expand the search window.".format(self.float,tolerance))
+                report_error(DataNotFound, "No gammas in EGAF database match specified search criterion: %s \xb1 %s keV.\nTry a different energy or expand the search window.", self.float, tolerance)
                 return
 
             else:
                 raise
     
+    def find_gammas(self, list, energies, tolerance=0.5, **kwargs):
+        """Searches for all gamma rays at each of several energies, e.g. the 
+        peak energies of a measured spectrum, in a single vectorized look-up 
+        of the energy-sorted gamma-ray table.  By default the search will find
+        all gamma rays within +/- 0.5 keV of each energy.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            energies: Sequence or NumPy array of gamma-ray energies in keV.
+            tolerance: Limit of the energy search; by default +/- 0.5 keV.  
+                       Either a single value or one value per energy.
+            kwargs: The function takes one of the following keyword arguments 
+                    according to the desired intensity output:
+
+                    intensity='elemental' : Elemental partial gamma-ray cross 
+                                            section.
+                    intensity='isotopic'  : Isotopic partial gamma-ray cross 
+                                            section.
+                    intensity='population': Population per neutron capture.
+                    intensity='relative'  : Relative intensity (%) to the 
+                                            strongest transition in the same
+                                            nucleus.
+
+                    If no keyword argument is provided "relative" intensities 
+                    will be adopted by default.
+
+        Returns: 
+            A DataFrame object containing the searched energy, target isotope,
+            residual (n,g) compound-nucleus isotope, gamma-ray energy and its 
+            uncertainty, gamma-ray intensity and its uncertainty.  Matches are 
+            listed in the order of the searched energies and, for each energy,
+            in the same order as `find_gamma`.  Energies without a match do not
+            appear in the DataFrame.
+
+        Example:
+            Find all isotopes containing gamma rays within +/- 1 keV of the 
+            peaks at 1273, 2223 and 4934 keV:
+            
+            find_gammas(edata, [1273, 2223, 4934], 1.0, intensity='isotopic')
+        """
+        import pandas as pd
+        self.list = list
+        energies = np.atleast_1d(np.asarray(energies))
+        if energies.dtype.kind not in "iuf":
+            raise TypeError("Gamma-ray energies must be numbers: {0}".format(energies))
+        energies = energies.astype(np.float64).ravel()
+
+        if kwargs == {} or kwargs == None:
+            # Assign default keyword argument for gamma-ray intensities
+            kwargs = {'intensity': 'relative'}
+            report_warning("No intensity keyword argument provided.\n"
+                           "Default \"relative\" intensities will be adopted.")
+
+        table = self.gamma_table(self.list)
+        window, rows = table.energy_windows(energies - tolerance, energies + tolerance)
+
+        # Per-nucleus properties, indexed by the `residual` column
+        is_egaf = np.array(self.dataset_values(self.list, "datasetType"), dtype=object) == "evaluatedGammarayActivationFile"
+        residual_Z = np.array(self.dataset_values(self.list, "nucleusZ"), dtype=np.int64)
+        residual_A = np.array(self.dataset_values(self.list, "nucleusA"), dtype=np.int64)
+
+        nucleus = table.residual[rows]
+        keep = is_egaf[nucleus]
+        window, rows, nucleus = window[keep], rows[keep], nucleus[keep]
+        # Order by searched energy, then residual (Z,A), then table order
+        order = np.lexsort((rows, residual_A[nucleus], residual_Z[nucleus], window))
+        window, rows, nucleus = window[order], rows[order], nucleus[order]
+
+        if len(rows) == 0:
+            report_error(DataNotFound, "No gammas in EGAF database match specified search criteria: %s \xb1 %s keV.\nTry different energies or expand the search windows.", energies.tolist(), tolerance)
+            return
+
+        NO_INTENSITY_OPTION = False
+        gamma_intensity, d_gamma_intensity = [], []
+        for intensity in kwargs.values():
+            if intensity in INTENSITY_COLUMNS:
+                I, dI = table.intensity(intensity)
+            else:
+                if intensity != str("relative"):
+                    NO_INTENSITY_OPTION = True
+                # Defaults to "relative" intensities
+                I, dI = table.relative_intensity()
+            gamma_intensity.append(I[rows])
+            d_gamma_intensity.append(dI[rows])
+
+        if NO_INTENSITY_OPTION == True:
+            report_warning("I didn't understand the intensity keyword-argument provided.\n"
+                           "Default \"relative\" intensities will be adopted.")
+
+        # One row per match and intensity keyword, as in `find_gamma`
+        n_kw = len(gamma_intensity)
+        window, rows, nucleus = np.repeat(window, n_kw), np.repeat(rows, n_kw), np.repeat(nucleus, n_kw)
+        target = np.array(self.dataset_values(self.list, "nucleusTargetID"), dtype=object)
+        residual = np.array(self.dataset_values(self.list, "nucleusID"), dtype=object)
+
+        return pd.DataFrame({'Search (keV)': energies[window], 'Target (n,g)': target[nucleus], 'Residual (CN)': residual[nucleus], 'Energy (keV)': table.energy[rows], 'dE (keV)': table.d_energy[rows], 'Intensity': np.stack(gamma_intensity, axis=1).ravel(), 'dI': np.stack(d_gamma_intensity, axis=1).ravel()})
+
+    def identify_peaks(self, list, peaks, n_sigma=3.0, strong_lines=10, sigma=1.0):
+        """Identifies the nuclei contributing to a measured prompt-gamma 
+        spectrum from a list of fitted peaks.  Every peak is matched against 
+        the strongest gamma rays of all residual nuclei in EGAF (ranked by 
+        elemental partial gamma-ray cross section) within the combined energy 
+        uncertainty, and each nucleus is scored by the fraction of its 
+        strong-line intensity found in the spectrum.
+
+        Arguments:
+            list: A list of EGAF-data JSON objects.
+            peaks: The measured peaks as an array-like of energies in keV, or 
+                   of rows (energy, sigma) or (energy, sigma, area).
+            n_sigma: Width of the match window in combined standard 
+                     deviations; by default 3.
+            strong_lines: Number of strongest gamma rays considered for each
+                          nucleus; by default 10.
+            sigma: Peak-energy uncertainty in keV adopted when `peaks` only 
+                   holds energies; by default 1 keV.
+
+        Returns:
+            A DataFrame object of the candidate nuclei ranked by decreasing 
+            score and number of strong lines found, containing the target 
+            isotope, residual (n,g) compound-nucleus isotope, score (matched 
+            fraction of the strong-line intensity), number of strong lines 
+            found and considered, whether the strongest line was found, number 
+            of matched peaks and their summed area.
+
+        Examples:
+            identify_peaks(edata, [[1951.1, 0.1, 4.2e4], [1959.3, 0.1, 3.1e4], [6110.8, 0.2, 2.5e4]])
+            identify_peaks(edata, [1951.1, 1959.3, 6110.8], sigma=0.2)
+        """
+        import pandas as pd
+        self.list = list
+        energy, sigma, area = peak_columns(peaks, sigma)
+
+        table = self.gamma_table(self.list)
+        ranked = PeakIdentifier(table, strong_lines, n_sigma).rank(energy, sigma, area)
+        if len(ranked["residual"]) == 0:
+            report_error(DataNotFound, "No gammas in EGAF database match the peaks provided.\nTry expanding the search windows.")
+            return
+
+        targets = self.dataset_values(self.list, "nucleusTargetID")
+        residuals = self.dataset_values(self.list, "nucleusID")
+        target = [targets[n] for n in ranked["residual"].tolist()]
+        residual = [residuals[n] for n in ranked["residual"].tolist()]
+
+        return pd.DataFrame({'Target (n,g)': target, 'Residual (CN)': residual, 'Score': ranked["score"], 'Lines found': ranked["lines_found"], 'Strong lines': ranked["lines"], 'Strongest found': ranked["strongest_found"], 'Peaks': ranked["peaks"], 'Area': ranked["area"]})
+
     def get_strongest_gammas(self, list, *args, **kwargs):
         """Finds up to the three strongest gamma-ray transitions in the 
         residual compound nucleus.
@@ -1183,14 +1170,15 @@ class Gammas(Levels):
             For populations per neutron capture:
             get_strongest_gammas(edata, "Si29", intensity='population')
         """
+        import pandas as pd
         self.list = list
         self.args = args
 
         if kwargs == {} or kwargs == None:
             # Assign default keyword argument for gamma-ray intensities
             kwargs = {'intensity': 'relative'}
-            print("No intensity keyword argument provided.")
-            print("Default \"relative\" intensities will be adopted.")
+            report_warning("No intensity keyword argument provided.\n"
+                           "Default \"relative\" intensities will be adopted.")
         
         DECAY_SCHEME_EXISTS = False
         UNSPECIFIED_INTENSITY = False
@@ -1199,14 +1187,14 @@ class Gammas(Levels):
             WRONG_INPUTS = True
 
         gamma_list = []
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(args)==1 and str(args[0]) == jdict["nucleusID"]) or (len(args)==2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
 
                     DECAY_SCHEME_EXISTS = True
                     residual = jdict["nucleusID"]
 
-                    g = Gammas()
+                    g = self.service(Gammas)
 
                     try:
                         intensity = [i for i in kwargs.values()][0]
@@ -1226,24 +1214,24 @@ class Gammas(Levels):
                 WRONG_INPUTS = True
                 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_gammas(edata, \"Y90\", intensity=<str>)")
-            print("or:")
-            print(" get_gammas(edata, 39, 90, intensity=<str>)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_gammas(edata, \"Y90\", intensity=<str>)\n"
+                                           "or:\n"
+                                           " get_gammas(edata, 39, 90, intensity=<str>)")
             return
         
         if UNSPECIFIED_INTENSITY == True:
-            print("I did not understand intensity-keyword argument.\n")
-            print("Default \"relative\" intensities will be adopted.")
+            report_error(InvalidIntensityMode, "I did not understand intensity-keyword argument.\n\n"
+                                               "Default \"relative\" intensities will be adopted.")
             return
 
         if DECAY_SCHEME_EXISTS == False:
-            print("No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
+            report_error(NucleusNotFound, "No residual compound-nucleus decay scheme in EGAF for input arguments provided.")
             return
 
         if gamma_list == []:
-            print("No gammas in decay scheme")
+            report_error(DataNotFound, "No gammas in decay scheme")
             return
         else:
             gamma_array = np.array(gamma_list)
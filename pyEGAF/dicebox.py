@@ -0,0 +1,171 @@
+import os
+import glob
+import numpy as np
+
+
+def dicebox_numbers(line):
+    """Internal function: Numbers of a DICEBOX output line (list of float);
+    the "+-" and "+/-" separators are skipped."""
+    return [float(value) for value in line.split() if value not in ("+-", "+/-")]
+
+
+def symmetric_matrix(rows):
+    """Internal function: Symmetric NumPy array from the rows of the lower
+    triangle of a DICEBOX correlation matrix."""
+    if len(rows) == 0:
+        return np.zeros((0, 0))
+    lower = np.tril(np.array(rows, dtype=np.float64))
+    return lower + np.tril(lower, -1).T
+
+
+class DiceboxOutput(object):
+    __doc__="""Results of a DICEBOX statistical-model calculation read from
+    the `DICE.PRO` output file and, when present, the `DICE_EV.DAT` input file
+    of a DICEBOX run directory.
+
+    The populations of the low-lying levels below the critical energy are
+    NumPy arrays indexed by level index, i.e. the DICEBOX level number minus
+    one, with energies converted from MeV to keV.  The uncertainties are the
+    spreads over the nuclear realizations quoted by DICEBOX.
+
+    Attributes:
+        directory: Run directory (str).
+        title: Reaction title from DICE_EV.DAT (str, or None).
+        realization, realizations: Last reported and total number of nuclear
+                                   realizations (int).
+        events: Number of cascades per realization (int).
+        width, d_width: Total radiative width of the capture state and its
+                        spread over the realizations in MeV (float).
+        dead_ends: Number of cascades terminating at a dead end (int).
+        level: Level indices (int array).
+        energy: Level energies in keV (float array).
+        spin, parity: Level spins (float array) and parities (int array;
+                      0 for positive, 1 for negative parity).
+        population, d_population: Population per neutron capture of each
+                                  level and uncertainty (float arrays).
+        direct, d_direct: Direct population of each level from the
+                          quasicontinuum and uncertainty (float arrays).
+        population_correlation, sidefeeding_correlation: Correlation
+                matrices of the populations and of the sidefeeding over the
+                realizations (symmetric float arrays).
+        p0, d_p0: Population per neutron capture feeding the ground state
+                  from the quasicontinuum and uncertainty (float).
+        ecrit: Critical energy in keV (float); from DICE_EV.DAT, otherwise
+               the energy of the highest low-lying level.
+        ecrit_index: Level index of the highest level below the critical
+                     energy (int), as used by `modeled_sigma0_ecrit`.
+
+    Example:
+        run = DiceboxOutput("notebook/dicebox_results/Ecrit_levels_12")
+        run.p0, run.d_p0
+        run.population
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.title = None
+        self.realization = None
+        self.realizations = None
+        self.events = None
+        self.width = np.nan
+        self.d_width = np.nan
+        self.dead_ends = None
+        self.ecrit = None
+        ev_file = os.path.join(directory, "DICE_EV.DAT")
+        if os.path.isfile(ev_file):
+            self.read_dice_ev(ev_file)
+        self.read_dice_pro(os.path.join(directory, "DICE.PRO"))
+
+    def read_dice_pro(self, path):
+        """Internal function: Streams the DICE.PRO output file line by line,
+        keeping the results of the last realization block."""
+        sections = {"population": [], "direct": [], "population_correlation": [], "sidefeeding_correlation": []}
+        section = None
+        with open(path, 'r') as df:
+            for line in df:
+                text = line.strip()
+                if text == "":
+                    section = None
+                elif text.startswith("Realization #"):
+                    numbers = dicebox_numbers(text.replace("Realization #", "").replace("of", ""))
+                    self.realization, self.realizations = int(numbers[0]), int(numbers[1])
+                    for rows in sections.values():
+                        del rows[:]
+                elif text.startswith("Number of events"):
+                    self.events = int(text.split()[-1])
+                elif text.startswith("Capt.state tot.rad.width"):
+                    self.width, self.d_width = dicebox_numbers(text.split(":")[1])
+                elif text.startswith("Number of cascades terminating at a dead end"):
+                    self.dead_ends = int(text.split(":")[1])
+                elif text.startswith("Direct population of low-lying states"):
+                    section = "direct"
+                elif text.startswith("Population of low-lying states"):
+                    section = "population"
+                elif text.startswith("Population - covariance matrix"):
+                    section = "population_correlation"
+                elif text.startswith("Sidefeeding - covariance matrix"):
+                    section = "sidefeeding_correlation"
+                elif section is not None:
+                    sections[section].append(dicebox_numbers(text))
+
+        population = np.array(sections["population"], dtype=np.float64).reshape(-1, 6)
+        direct = np.array(sections["direct"], dtype=np.float64).reshape(-1, 6)
+        self.level = population[:,0].astype(np.int64) - 1
+        self.energy = np.round(population[:,1] * 1000.0, 6)
+        self.population = population[:,2]
+        self.d_population = population[:,3]
+        self.spin = population[:,4]
+        self.parity = population[:,5].astype(np.int64)
+        self.direct = direct[:,2]
+        self.d_direct = direct[:,3]
+        self.population_correlation = symmetric_matrix(sections["population_correlation"])
+        self.sidefeeding_correlation = symmetric_matrix(sections["sidefeeding_correlation"])
+        self.p0 = float(self.direct[0]) if len(self.direct) > 0 else np.nan
+        self.d_p0 = float(self.d_direct[0]) if len(self.d_direct) > 0 else np.nan
+        self.ecrit_index = int(self.level[-1]) if len(self.level) > 0 else -1
+        if self.ecrit is None and len(self.energy) > 0:
+            self.ecrit = float(self.energy[-1])
+
+    def read_dice_ev(self, path):
+        """Internal function: Reads the title and the critical energy from
+        the DICE_EV.DAT input file."""
+        with open(path, 'r') as df:
+            ECRIT = False
+            for i, line in enumerate(df):
+                if i == 0:
+                    self.title = line.strip()
+                elif ECRIT == True:
+                    self.ecrit = round(dicebox_numbers(line)[0] * 1000.0, 6)
+                    break
+                elif line.startswith("* Ecrit"):
+                    ECRIT = True
+
+    def __len__(self):
+        return len(self.level)
+
+
+def read_dicebox(path):
+    """Reads the DICEBOX runs found at `path`.
+
+    Arguments:
+        path: A DICEBOX run directory holding a DICE.PRO file, a directory
+              whose subdirectories are run directories (e.g. one per critical
+              energy), or a list of run directories or DiceboxOutput objects.
+
+    Returns:
+        A list of DiceboxOutput objects in order of increasing critical
+        energy.
+
+    Example:
+        runs = read_dicebox("notebook/dicebox_results")
+        [(run.ecrit_index, run.p0, run.d_p0) for run in runs]
+    """
+    if isinstance(path, (str, os.PathLike)):
+        if os.path.isfile(os.path.join(path, "DICE.PRO")):
+            paths = [path]
+        else:
+            paths = [os.path.dirname(p) for p in glob.glob(os.path.join(path, "*", "DICE.PRO"))]
+    else:
+        paths = path
+    runs = [p if isinstance(p, DiceboxOutput) else DiceboxOutput(p) for p in paths]
+    return sorted(runs, key=lambda run: (run.ecrit_index, str(run.directory)))
@@ -0,0 +1,291 @@
+import os
+import re
+import glob
+import numpy as np
+
+# Directory of the ENSDF-formatted EGAF data sets bundled with the package.
+ENSDF_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'EGAF_ENSDF')
+
+# Names of the bundled ENSDF files, e.g. `EGAF_03_28SI_ng_29SI.ens`; the
+# groups are the target and residual (mass number, element) pairs.
+ENSDF_FILENAME = re.compile(r'EGAF_\d+_(\d+)([A-Z]+)_ng_(\d+)([A-Z]+)\.ens$')
+
+# Residual IDs accepted by the index in any letter case, with the element
+# symbol before or after the mass number, e.g. "Si29", "SI29", "29si".
+RESIDUAL_ID = re.compile(r'^\s*(?:([A-Za-z]+)(\d+)|(\d+)([A-Za-z]+))\s*$')
+
+# Numbers of the ENSDF value fields, with an optional decimal exponent.
+ENSDF_NUMBER = re.compile(r'^[+-]?(\d*)(?:\.(\d*))?(?:E([+-]?\d+))?$')
+
+# Record types tabulated by `ensdf_records`, in the order of the ENSDF
+# manual.  Each record keeps the data set it belongs to (`dataset`, counted
+# from 0 by identification record) and its 0-based line number (`line`).
+ENSDF_RECORD_TYPES = ('identification', 'comment', 'normalization', 'level', 'gamma')
+
+# Structured-array layouts of the record types.  Values are converted to
+# float (NaN when blank or not numeric, e.g. "13.5+X"); the uncertainties
+# are converted from the ENSDF notation in units of the last digit of the
+# value to absolute uncertainties (NaN for limits and asymmetric values).
+# Fields without a numeric value (spins, half-lives with units,
+# multipolarities, flags) are kept as stripped strings.
+ENSDF_DTYPES = {
+    'identification': np.dtype([('dataset', np.int64), ('line', np.int64), ('nucid', 'U5'), ('dsid', 'U30'), ('dsref', 'U26'), ('pub', 'U9'), ('date', 'U6')]),
+    'comment': np.dtype([('dataset', np.int64), ('line', np.int64), ('nucid', 'U5'), ('continuation', 'U1'), ('flag', 'U1'), ('record_type', 'U1'), ('symbol', 'U1'), ('text', 'U71')]),
+    'normalization': np.dtype([('dataset', np.int64), ('line', np.int64), ('nucid', 'U5'), ('production', bool), ('nr', np.float64), ('d_nr', np.float64), ('nt', np.float64), ('d_nt', np.float64), ('br', np.float64), ('d_br', np.float64), ('nb', np.float64), ('d_nb', np.float64), ('np', np.float64), ('d_np', np.float64)]),
+    'level': np.dtype([('dataset', np.int64), ('line', np.int64), ('nucid', 'U5'), ('level', np.int64), ('energy', np.float64), ('d_energy', np.float64), ('jpi', 'U18'), ('half_life', 'U10'), ('d_half_life', 'U6'), ('l_transfer', 'U9'), ('s', 'U10'), ('d_s', 'U2'), ('comment_flag', 'U1'), ('metastable', 'U2'), ('questionable', 'U1')]),
+    'gamma': np.dtype([('dataset', np.int64), ('line', np.int64), ('nucid', 'U5'), ('level', np.int64), ('energy', np.float64), ('d_energy', np.float64), ('intensity', np.float64), ('d_intensity', np.float64), ('multipolarity', 'U10'), ('mixing_ratio', np.float64), ('d_mixing_ratio', np.float64), ('icc', np.float64), ('d_icc', np.float64), ('total_intensity', np.float64), ('d_total_intensity', np.float64), ('comment_flag', 'U1'), ('coincidence', 'U1'), ('questionable', 'U1')]),
+}
+
+
+def ensdf_value(field):
+    """Internal function: Float value of an ENSDF field, or NaN."""
+    text = field.strip()
+    if ENSDF_NUMBER.match(text.upper()) is None or text in ("", ".", "+", "-"):
+        return np.nan
+    return float(text)
+
+
+def ensdf_uncertainty(value, uncertainty):
+    """Absolute uncertainty of an ENSDF value.
+
+    ENSDF quotes uncertainties in units of the last significant digit of the
+    value, e.g. "1273.379 17" is 1273.379(17) and "2.1E-05 8" is
+    2.1(8)E-05.
+
+    Arguments:
+        value: Value field (str).
+        uncertainty: Uncertainty field (str).
+
+    Returns:
+        The uncertainty in the units of the value (float), or NaN when the
+        value is not numeric or the uncertainty is blank, a limit ("LT",
+        "GT", "AP", ...) or asymmetric ("+3-2").
+
+    Example:
+        ensdf_uncertainty("0.177", "5")
+    """
+    digits = uncertainty.strip()
+    match = ENSDF_NUMBER.match(value.strip().upper())
+    if not digits.isdigit() or match is None or not (match.group(1) or match.group(2)):
+        return np.nan
+    exponent = int(match.group(3) or 0) - len(match.group(2) or "")
+    return float("%se%d" % (digits, exponent))
+
+
+def ensdf_record_type(card):
+    """Internal function: Type of an 80-column ENSDF card image.
+
+    Returns one of ENSDF_RECORD_TYPES, 'end' for a blank card ending a data
+    set, 'continuation' for a continuation card of a non-comment record and
+    'other' for the record types not tabulated (parents, Q-values, decays,
+    ...).
+    """
+    card = card.rstrip('\r\n').ljust(8)
+    if card.strip() == "":
+        return 'end'
+    if card[6] in "cCdDtT":
+        return 'comment'
+    if card[5] not in " 1":
+        return 'continuation'
+    if card[5:9].strip() == "":
+        return 'identification'
+    if card[6:8] == "PN":
+        return 'normalization'
+    return {'L': 'level', 'G': 'gamma', 'N': 'normalization'}.get(card[7] if card[6] == " " else "", 'other')
+
+
+def iter_ensdf_records(cards):
+    """Lazily parses ENSDF card images into typed records.
+
+    The cards are consumed one at a time, so that an open file can be
+    streamed without holding it in memory.
+
+    Arguments:
+        cards: Iterable of 80-column card images (str), e.g. an open file.
+
+    Yields:
+        Tuples (record_type, record).  For the record types of
+        ENSDF_RECORD_TYPES, `record` is a tuple in the layout of the
+        corresponding ENSDF_DTYPES entry; for 'continuation' and 'other'
+        cards it is (dataset, line, card).  Blank cards ending a data set are
+        skipped.
+
+    Example:
+        with open(path) as ef:
+            for record_type, record in iter_ensdf_records(ef):
+                ...
+    """
+    dataset = -1
+    level = -1
+    for line, card in enumerate(cards):
+        card = card.rstrip('\r\n')
+        record_type = ensdf_record_type(card)
+        if record_type == 'end':
+            continue
+        card = card.ljust(80)
+        nucid = card[0:5].strip()
+        if record_type == 'identification':
+            dataset += 1
+            level = -1
+            record = (dataset, line, nucid, card[9:39].strip(), card[39:65].strip(), card[65:74].strip(), card[74:80].strip())
+        elif record_type == 'comment':
+            record = (dataset, line, nucid, card[5].strip(), card[6].lower(), card[7].strip(), card[8].strip(), card[9:80].rstrip())
+        elif record_type == 'normalization':
+            production = card[6:8] == "PN"
+            br = card[31:39] if not production else ""
+            record = (dataset, line, nucid, production, ensdf_value(card[9:19]), ensdf_uncertainty(card[9:19], card[19:21]), ensdf_value(card[21:29]), ensdf_uncertainty(card[21:29], card[29:31]), ensdf_value(br), ensdf_uncertainty(br, card[39:41] if not production else ""), ensdf_value(card[41:49]), ensdf_uncertainty(card[41:49], card[49:55]), ensdf_value(card[55:62]), ensdf_uncertainty(card[55:62], card[62:64]))
+        elif record_type == 'level':
+            level += 1
+            record = (dataset, line, nucid, level, ensdf_value(card[9:19]), ensdf_uncertainty(card[9:19], card[19:21]), card[21:39].strip(), card[39:49].strip(), card[49:55].strip(), card[55:64].strip(), card[64:74].strip(), card[74:76].strip(), card[76].strip(), card[77:79].strip(), card[79].strip())
+        elif record_type == 'gamma':
+            record = (dataset, line, nucid, level, ensdf_value(card[9:19]), ensdf_uncertainty(card[9:19], card[19:21]), ensdf_value(card[21:29]), ensdf_uncertainty(card[21:29], card[29:31]), card[31:41].strip(), ensdf_value(card[41:49]), ensdf_uncertainty(card[41:49], card[49:55]), ensdf_value(card[55:62]), ensdf_uncertainty(card[55:62], card[62:64]), ensdf_value(card[64:74]), ensdf_uncertainty(card[64:74], card[74:76]), card[76].strip(), card[77].strip(), card[79].strip())
+        else:
+            record = (dataset, line, card.rstrip())
+        yield (record_type, record)
+
+
+def ensdf_records(cards, record_types=ENSDF_RECORD_TYPES):
+    """Typed record arrays of ENSDF card images.
+
+    Arguments:
+        cards: Iterable of card images (str), e.g. an open file.
+        record_types: Record types to tabulate; by default all of
+                      ENSDF_RECORD_TYPES.
+
+    Returns:
+        A dictionary of structured NumPy arrays keyed by record type, with
+        the dtypes of ENSDF_DTYPES.  The `level` field of a gamma record is
+        the index of the level record it deexcites in its data set.
+
+    Example:
+        with open(path) as ef:
+            records = ensdf_records(ef)
+        records['gamma']['energy']
+    """
+    rows = {record_type: [] for record_type in record_types}
+    for record_type, record in iter_ensdf_records(cards):
+        if record_type in rows:
+            rows[record_type].append(record)
+    return {record_type: np.array(rows[record_type], dtype=ENSDF_DTYPES[record_type]) for record_type in record_types}
+
+
+def ensdf_residual_id(A, element):
+    """Internal function: EGAF residual ID (e.g. "Si29") of the mass number
+    and upper-case element symbol of an ENSDF file name."""
+    return "%s%d" % (element.capitalize(), int(A))
+
+
+def normalise_residual_id(residual):
+    """Internal function: Residual ID in the form of the EGAF data sets, 
+    e.g. "Si29" for "si29", "SI29" or "29Si"; other arguments are returned 
+    unchanged."""
+    match = RESIDUAL_ID.match(residual) if isinstance(residual, str) else None
+    if match is None:
+        return residual
+    element, A = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+    return ensdf_residual_id(A, element)
+
+
+class EnsdfIndex(object):
+    __doc__="""Index of the ENSDF-formatted EGAF data sets of a directory by
+    the ID of the residual compound nucleus (e.g. "Si29").
+
+    The bundled files hold one data set each and are indexed from their
+    names (`EGAF_03_28SI_ng_29SI.ens`) without being opened; other files
+    are ignored.  The index of a directory is built once per process by
+    `ensdf_index`.
+
+    Arguments:
+        path: Directory of the ENSDF files (str); by default the bundled
+              EGAF_ENSDF directory.
+
+    Example:
+        index = ensdf_index()
+        index.find("Si29")
+        index.find("si29")
+        for record_type, record in index.iter_records("Si29"):
+            ...
+    """
+
+    def __init__(self, path=ENSDF_PATH):
+        self.path = path
+        self.entries = {}
+        for ensdf_file in sorted(glob.glob(os.path.join(path, "*.ens"))):
+            match = ENSDF_FILENAME.search(os.path.basename(ensdf_file))
+            if match:
+                self.entries[ensdf_residual_id(match.group(3), match.group(4))] = ensdf_file
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, residual):
+        return normalise_residual_id(residual) in self.entries
+
+    def find(self, residual):
+        """Path of the data set of a residual (str), or None.  The residual
+        ID is matched regardless of letter case, e.g. "si29" or "SI29"."""
+        return self.entries.get(normalise_residual_id(residual))
+
+    def dataset_pattern(self, residual):
+        """Reaction of the data set of a residual as in its file name, e.g.
+        "28SI_ng_29SI", or None."""
+        path = self.find(residual)
+        if path is None:
+            return None
+        match = ENSDF_FILENAME.search(os.path.basename(path))
+        return "%s%s_ng_%s%s" % match.groups()
+
+    def cards(self, residual):
+        """Iterator over the card images of the data set of a residual,
+        streamed from its file (empty when it is not indexed)."""
+        path = self.find(residual)
+        if path is None:
+            return
+        with open(path, 'r') as ef:
+            for card in ef:
+                yield card
+
+    def read(self, residual):
+        """Lines of the data set of a residual (list of str, including the
+        newlines), or None when it is not indexed."""
+        path = self.find(residual)
+        if path is None:
+            return None
+        with open(path, 'r') as ef:
+            return ef.readlines()
+
+    def iter_records(self, residual):
+        """Typed records of the data set of a residual; see
+        `iter_ensdf_records`."""
+        return iter_ensdf_records(self.cards(residual))
+
+    def records(self, residuals, record_types=ENSDF_RECORD_TYPES):
+        """Typed record arrays of several data sets, streamed file by file.
+
+        Arguments:
+            residuals: Sequence of indexed residual IDs.
+            record_types: See `ensdf_records`.
+
+        Returns:
+            A dictionary of structured NumPy arrays keyed by record type; the
+            `dataset` field is the position of the residual in `residuals`
+            and `line` the line number in its file.
+        """
+        rows = {record_type: [] for record_type in record_types}
+        for n, residual in enumerate(residuals):
+            for record_type, record in self.iter_records(residual):
+                if record_type in rows:
+                    rows[record_type].append((n,) + record[1:])
+        return {record_type: np.array(rows[record_type], dtype=ENSDF_DTYPES[record_type]) for record_type in record_types}
+
+
+_ensdf_indexes = {}
+
+
+def ensdf_index(path=ENSDF_PATH):
+    """EnsdfIndex of a directory, built on first use and reused for the rest
+    of the process."""
+    path = os.path.abspath(path)
+    if path not in _ensdf_indexes:
+        _ensdf_indexes[path] = EnsdfIndex(path)
+    return _ensdf_indexes[path]
@@ -0,0 +1,118 @@
+"""Error handling and console messages of pyEGAF.
+
+By default the pyEGAF methods print a message to the console and return None
+when a nucleus is not in EGAF or the arguments cannot be understood ("print"
+mode).  For batch runs the library-wide error mode can be changed with
+`set_error_mode`:
+
+    "print" : Messages are printed to the console (default).
+    "quiet" : Nothing is printed; messages are passed to the "pyEGAF" logger
+              of the `logging` module and are only formatted if a handler
+              emits them.  Methods still return None on errors.
+    "strict": As "quiet", but errors raise an `EGAFError` subclass instead of
+              returning None.
+
+Example:
+    import pyEGAF as egaf
+    egaf.set_error_mode("strict")
+    try:
+        e.get_stats(edata, "Se70")
+    except egaf.NucleusNotFound:
+        pass
+"""
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger("pyEGAF")
+logger.addHandler(logging.NullHandler())
+
+ERROR_MODES = ("print", "quiet", "strict")
+_error_mode = "print"
+
+
+class EGAFError(Exception):
+    __doc__="""Base class of the exceptions raised in "strict" error mode."""
+
+
+class InvalidArguments(EGAFError, ValueError):
+    __doc__="""Arguments passed to a pyEGAF method cannot be understood."""
+
+
+class InvalidIntensityMode(InvalidArguments):
+    __doc__="""Missing or unknown intensity keyword argument."""
+
+
+class NucleusNotFound(EGAFError, LookupError):
+    __doc__="""No EGAF data set for the requested nucleus."""
+
+
+class DataNotFound(EGAFError, LookupError):
+    __doc__="""The EGAF data set holds no data of the requested kind."""
+
+
+def set_error_mode(mode):
+    """Sets the library-wide error mode.
+
+    Arguments:
+        mode: One of the case-insensitive strings "print", "quiet" or
+              "strict".
+
+    Returns:
+        The previous error mode (str).
+
+    Example:
+        set_error_mode("quiet")
+    """
+    global _error_mode
+    if str(mode).lower() not in ERROR_MODES:
+        raise ValueError("Unknown error mode: {0}; use one of {1}".format(mode, ERROR_MODES))
+    previous = _error_mode
+    _error_mode = str(mode).lower()
+    return previous
+
+
+def get_error_mode():
+    """Current library-wide error mode (str)."""
+    return _error_mode
+
+
+@contextmanager
+def error_mode(mode):
+    """Context manager setting the error mode for the enclosed block.
+
+    Example:
+        with error_mode("quiet"):
+            e.get_ripl(edata, "Si29")
+    """
+    previous = set_error_mode(mode)
+    try:
+        yield
+    finally:
+        set_error_mode(previous)
+
+
+def report_error(exception, message, *args):
+    """Reports an error: prints the message, logs it, or raises `exception`
+    according to the error mode.  The message is %-formatted with `args`."""
+    if _error_mode == "print":
+        print(message % args if args else message)
+    elif _error_mode == "strict":
+        raise exception(message % args if args else message)
+    else:
+        logger.warning(message, *args)
+
+
+def report_warning(message, *args):
+    """Reports a warning that does not interrupt the calculation."""
+    if _error_mode == "print":
+        print(message % args if args else message)
+    else:
+        logger.warning(message, *args)
+
+
+def report_info(message, *args):
+    """Reports an informational message or console output."""
+    if _error_mode == "print":
+        print(message % args if args else message)
+    else:
+        logger.info(message, *args)
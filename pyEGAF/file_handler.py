@@ -3,36 +3,20 @@ from .separation import Separation
 from .cross_section import CrossSection
 from .decay import Levels, Gammas
 from .cap_gam import CapGam
-
-from contextlib import contextmanager
-import sys, os
-
-@contextmanager
-def suppress_stdout():
-    with open(os.devnull, "w") as devnull:
-        old_stdout = sys.stdout
-        sys.stdout = devnull
-        try:  
-            yield
-        finally:
-            sys.stdout = old_stdout
+from .ripl import ripl_index
+from .ensdf import ensdf_index, ENSDF_RECORD_TYPES
 
 class RIPL(CapGam):
     __doc__="""Class to handle RIPL-formatted EGAF data sets."""
     
-    def __init__(self):
-        BaseEGAF.__init__(self)
-        Meta.__init__(self)
-        Uncertainties.__init__(self)
-        Separation.__init__(self)
-        CrossSection.__init__(self)
-        Levels.__init__(self)
-        Gammas.__init__(self)
-        CapGam.__init__(self)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         
-    def get_ripl(self,list,str,bool=False):
+    def get_ripl(self,list,str,bool=False,display=True,mmap=False):
         """Display RIPL-formatted EGAF data in the console.  The RIPL-formatted 
-        EGAF data set may also be written to file.
+        EGAF data set may also be written to file.  The data set is looked up
+        in the (A, Z) index of the RIPL files, built once per process, so that
+        only the file of the requested nucleus is read.
 
         Arguments:
             list: A list of EGAF (n,g) data JSON objects.
@@ -41,13 +25,18 @@ class RIPL(CapGam):
             bool: True: The corresponding RIPL file will be printed in the 
                         current working directory.
                   False: The RIPL will not be printed (default argument).
+            display: True: The RIPL data are displayed in the console 
+                           (default argument).
+                     False: Nothing is displayed.
+            mmap: True: The RIPL file is read through a memory map.
+                  False: The RIPL file is read directly (default argument).
 
         Returns: 
             A list object corresponding to the appropriate RIPL-formatted EGAF 
             data set; an ASCII text dump of the RIPL-formatted data is also 
-            displayed in the console.  The RIPL-formatted EGAF object may also 
-            be written to file according to the value of the boolean argument 
-            passed to the function.
+            displayed in the console unless `display` is False.  The 
+            RIPL-formatted EGAF object may also be written to file according to
+            the value of the boolean argument passed to the function.
 
         Example:
             To display the RIPL data for 28Si(n,g)29Si:
@@ -56,13 +45,10 @@ class RIPL(CapGam):
             To display the RIPL data for 28Si(n,g)29Si and write "EGAF_RIPL_Si29.dat"
             to file :
             get_ripl(edata, "Si29", True)
+
+            To get the RIPL data for 28Si(n,g)29Si without console output:
+            get_ripl(edata, "Si29", display=False)
         """
-        # Load the RIPL files to a list:
-        from . import get_data
-        EGAF_RIPL_PATH = get_data('EGAF_RIPL')
-        ripl_egaf_list = [r for r in glob.glob("%s/*.dat"%EGAF_RIPL_PATH)]
-        RIPL_COUNT = len(ripl_egaf_list)
-        
         self.list = list
         self.str = str
         self.bool = bool
@@ -71,28 +57,21 @@ class RIPL(CapGam):
         A_res = None
         res_ID = None
         targ_ID = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, (self.str,)):
             if self.str == jdict["nucleusID"]:
                 Z_res = jdict["nucleusZ"]
                 A_res = jdict["nucleusA"]
                 res_ID = jdict["nucleusID"]
                 targ_ID = jdict["nucleusTargetID"]
 
+        ripl_list = None
         if Z_res != None and A_res != None:
+            ripl_list = ripl_index().read(A_res, Z_res, mmap)
 
-            ripl_list = []
-            for ripl_file in ripl_egaf_list:
-                with open(ripl_file, 'r') as rf:
-                    RIPL_MATCH = False
-                    for i,line in enumerate(rf):
-                        if i == 0:
-                            line_cols = line.split()
-                            if int(A_res) == int(line_cols[1]) and int(Z_res) == int(line_cols[2]):
-                                RIPL_MATCH = True
-                        if RIPL_MATCH == True:
-                            print(line.strip('\n'))
-                            ripl_list.append(line)
-                    rf.close()
+        if ripl_list != None:
+
+            if display == True and len(ripl_list) > 0:
+                report_info("%s", "\n".join([line.strip('\n') for line in ripl_list]))
 
             if self.bool == True:
                 if len(ripl_list) > 0:
@@ -100,15 +79,65 @@ class RIPL(CapGam):
                     ripl_out = open(ripl_file, mode='w')
                     for line in ripl_list:
                         ripl_out.write("{0}".format(line))
-                    print("{0} written to current working directory.".format(ripl_file))
+                    report_info("%s written to current working directory.", ripl_file)
                     ripl_out.close()
 
-            with suppress_stdout():
-                return ripl_list
+            return ripl_list
 
         else:
-            print("No match found for RIPL-formatted EGAF data set.")
+            report_error(NucleusNotFound, "No match found for RIPL-formatted EGAF data set.")
             return
+
+    def get_ripl_records(self,list,*args,mmap=False):
+        """Parsed RIPL-formatted EGAF data of many residual compound nuclei 
+        at once, as structured NumPy arrays of header, level and gamma 
+        records.
+
+        Arguments:
+            list: A list of EGAF (n,g) data JSON objects.
+            args: IDs of the residual compound nuclei passed as string 
+                  arguments; all EGAF residuals in `list` if none are given.
+            mmap: True: The RIPL files are read through memory maps.
+                  False: The RIPL files are read directly (default argument).
+
+        Returns:
+            A tuple of structured NumPy arrays (headers, levels, gammas) with
+            one header per residual, in the order given, and the fields:
+
+            headers: nucleus, symbol, A, Z, num_levels, num_gammas, 
+                     max_level, num_complete, Sn, Sp (MeV);
+            levels: nucleus, level (level index), energy (MeV), spin, parity,
+                    half_life (s), num_gammas, flag, jpi, num_decays;
+            gammas: nucleus, level_i, level_f (level indices), energy (MeV),
+                    photon_branching, electron_branching, icc.
+
+            The `nucleus` field is the position of the residual in the 
+            headers array.
+
+        Examples:
+            headers, levels, gammas = get_ripl_records(edata, "Si29", "Cl36")
+            headers, levels, gammas = get_ripl_records(edata)
+        """
+        self.list = list
+        self.args = args
+
+        residuals = args
+        if len(args) == 0:
+            residuals = self.dataset_values(self.list, "nucleusID")
+
+        keys = []
+        index = ripl_index()
+        for residual in residuals:
+            key = None
+            for jdict in self.select_datasets(self.list, (residual,)):
+                if str(residual) == jdict["nucleusID"] and (jdict["nucleusA"], jdict["nucleusZ"]) in index:
+                    key = (jdict["nucleusA"], jdict["nucleusZ"])
+            if key is None:
+                report_error(NucleusNotFound, "No match found for RIPL-formatted EGAF data set: %s", residual)
+                return
+            keys.append(key)
+
+        return index.records(keys, mmap)
         
 
 class JSONFile(RIPL):
@@ -155,21 +184,21 @@ class JSONFile(RIPL):
 
         res_ID = None
         targ_ID = None
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, (self.str,)):
             if self.str == jdict["nucleusID"]:
                 res_ID = jdict["nucleusID"]
                 targ_ID = jdict["nucleusTargetID"]
 
                 if self.bool == True:
                     with open("EGAF_JSON_{0}_NG_{1}.json".format(targ_ID,res_ID), "w") as jf:
-                        json.dump(jdict, jf, indent=4, ensure_ascii=False)
+                        json.dump(jdict.as_dict() if isinstance(jdict, records.Record) else jdict, jf, indent=4, ensure_ascii=False)
                         jf.close()
-                        print("{0} written to current working directory.".format(jf.name))
+                        report_info("%s written to current working directory.", jf.name)
 
                 return jdict
             
         if res_ID == None and targ_ID == None:
-            print("No match found for JSON-formatted EGAF data set.")
+            report_error(NucleusNotFound, "No match found for JSON-formatted EGAF data set.")
             return
         
 
@@ -179,9 +208,11 @@ class ENSDF(JSONFile):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
-    def get_ensdf(self,list,str,bool=False):
+    def get_ensdf(self,list,str,bool=False,display=True):
         """Display ENSDF-formatted EGAF data in the console.  The 
-        ENSDF-formatted EGAF data set may also be written to file.
+        ENSDF-formatted EGAF data set may also be written to file.  The data
+        set is looked up in the residual-ID index of the ENSDF files, built
+        once per process.
 
         Arguments:
             list: A list of EGAF (n,g) data JSON objects.
@@ -190,6 +221,9 @@ class ENSDF(JSONFile):
             bool: True: The corresponding ENSDF file will be printed in the 
                         current working directory.
                   False: The ENSDF will not be printed (default argument).
+            display: True: The ENSDF data are displayed in the console 
+                           (default argument).
+                     False: Nothing is displayed.
 
         Returns: 
             A list object containing to the appropriate ENSDF-formatted EGAF 
@@ -205,45 +239,80 @@ class ENSDF(JSONFile):
             "EGAF_ENSDF_28SI_NG_29SI.ens" to file :
             get_ensdf(edata, "Si29", True)
         """
-        # Load the ENSDF files to a list:
-        from . import get_data
-        EGAF_ENSDF_PATH = get_data('EGAF_ENSDF')
-        ensdf_egaf_list = [j for j in glob.glob("%s/*.ens"%EGAF_ENSDF_PATH)]
-        ENSDF_COUNT = len(ensdf_egaf_list)
-
         self.list = list
         self.str = str
         self.bool = bool
 
-        chem_symb = re.search(r'\D+', self.str).group(0)
-        res_A = re.findall(re.compile(r'\d+'), self.str)[0]
-        targ_A = "{0}".format(int(res_A) - 1)
-
-        ds_pattern = targ_A+chem_symb.upper() + '_ng_' + res_A+chem_symb.upper()
-
-        filename = None
-        ensdf_data = None
-        ENSDF_MATCH = False
-        for egaf_file in ensdf_egaf_list:
-            if ds_pattern in egaf_file:
-                ENSDF_MATCH = True
-                filename = egaf_file
-                
-                with open(filename, mode='r') as rf:
-                    ensdf_data = rf.readlines()
-                    [print(line.strip('\n')) for line in ensdf_data]
-                    rf.close()
-                    
-                    if self.bool == True:
-                        with open("EGAF_ENSDF_{0}.ens".format(ds_pattern.upper()), mode="w") as wf:
-                            for line in ensdf_data:
-                                wf.write("{0}".format(line))
-                            print("{0} written to current working directory.".format(wf.name))
-                            wf.close()
-
-        if ENSDF_MATCH == False:
-            print("No match found for ENSDF-formatted EGAF data set.")
+        index = ensdf_index()
+        ensdf_data = index.read(self.str)
+
+        if ensdf_data == None:
+            report_error(NucleusNotFound, "No match found for ENSDF-formatted EGAF data set.")
             return
-        else:
-            return ensdf_data
-        
+
+        if display == True and len(ensdf_data) > 0:
+            report_info("%s", "\n".join([line.strip('\n') for line in ensdf_data]))
+
+        if self.bool == True:
+            with open("EGAF_ENSDF_{0}.ens".format(index.dataset_pattern(self.str).upper()), mode="w") as wf:
+                for line in ensdf_data:
+                    wf.write("{0}".format(line))
+                report_info("%s written to current working directory.", wf.name)
+                wf.close()
+
+        return ensdf_data
+
+    def get_ensdf_records(self,list,*args,record_types=ENSDF_RECORD_TYPES):
+        """Parsed ENSDF-formatted EGAF data of one or more residual compound
+        nuclei, as structured NumPy arrays of the identification, comment,
+        normalization, level and gamma records.  The ENSDF files are streamed
+        card by card.
+
+        Arguments:
+            list: A list of EGAF (n,g) data JSON objects.
+            args: IDs of the residual compound nuclei passed as string 
+                  arguments; all EGAF residuals in `list` if none are given.
+            record_types: Record types to return; by default all of 
+                          'identification', 'comment', 'normalization', 
+                          'level' and 'gamma'.
+
+        Returns:
+            A dictionary of structured NumPy arrays keyed by record type.  
+            Every record has the fields dataset (position of the residual in
+            the order given), line (line number in the ENSDF file) and nucid;
+            the other fields are:
+
+            identification: dsid, dsref, pub, date;
+            comment: continuation, flag, record_type, symbol, text;
+            normalization: production, nr, d_nr, nt, d_nt, br, d_br, nb, 
+                           d_nb, np, d_np;
+            level: level (level index), energy (keV), d_energy, jpi, 
+                   half_life, d_half_life, l_transfer, s, d_s, comment_flag,
+                   metastable, questionable;
+            gamma: level (index of the initial level), energy (keV), 
+                   d_energy, intensity, d_intensity, multipolarity, 
+                   mixing_ratio, d_mixing_ratio, icc, d_icc, total_intensity,
+                   d_total_intensity, comment_flag, coincidence, 
+                   questionable.
+
+            Numeric values are NaN when blank or not numeric and 
+            uncertainties are absolute.
+
+        Examples:
+            records = get_ensdf_records(edata, "Si29", "Cl36")
+            records['gamma']['energy']
+        """
+        self.list = list
+        self.args = args
+
+        residuals = args
+        if len(args) == 0:
+            residuals = self.dataset_values(self.list, "nucleusID")
+
+        index = ensdf_index()
+        for residual in residuals:
+            if residual not in index:
+                report_error(NucleusNotFound, "No match found for ENSDF-formatted EGAF data set: %s", residual)
+                return
+
+        return index.records(residuals, record_types)
@@ -0,0 +1,260 @@
+import numpy as np
+
+# Codes of the `transition_type` column.
+SECONDARY = 0
+PRIMARY = 1
+OTHER = -1
+TRANSITION_TYPES = {"secondary": SECONDARY, "primary": PRIMARY}
+
+# Intensity keyword arguments and the corresponding (intensity, uncertainty)
+# columns of the table.
+INTENSITY_COLUMNS = {
+    "elemental": ("elemental", "d_elemental"),
+    "isotopic": ("isotopic", "d_isotopic"),
+    "population": ("population", "d_population"),
+}
+
+
+def _number(value):
+    """Internal function: JSON number or NaN for null values."""
+    return np.nan if value is None else value
+
+
+class GammaTable(object):
+    __doc__="""Structure-of-arrays table of the gamma rays of one or more EGAF
+    data sets.
+
+    Each column is a NumPy array with one element per gamma ray, in the
+    order in which the gamma rays appear in the `levelScheme` of each data
+    set.  The gamma rays of data set `n` occupy the rows
+    `offsets[n]:offsets[n+1]`; JSON null values are stored as NaN.
+
+    Columns:
+        residual: Index of the data set (int);
+        level_i: Level index of the initial level (int);
+        level_f: Level index of the final level (int);
+        energy_i: Initial level energy in keV (float);
+        energy_f: Final level energy in keV (float);
+        energy: Gamma-ray energy in keV (float);
+        d_energy: Gamma-ray energy uncertainty (float);
+        elemental, d_elemental: Elemental partial gamma-ray cross section
+                                and uncertainty (float);
+        isotopic, d_isotopic: Isotopic partial gamma-ray cross section and
+                              uncertainty (float);
+        population, d_population: Population per neutron capture and
+                                  uncertainty (float);
+        icc, d_icc: BrIcc total internal-conversion coefficient and
+                    uncertainty (float);
+        transition_type: 1 for primary, 0 for secondary gamma rays (int);
+        feeds_gs: True for transitions feeding the ground state (bool).
+
+    Example:
+        table = GammaTable.from_datasets(edata)
+        si29 = table.nucleus(table.residual_ids.index("Si29"))
+        si29.energy, si29.intensity("isotopic")
+    """
+
+    COLUMNS = ("residual", "level_i", "level_f", "energy_i", "energy_f",
+               "energy", "d_energy", "elemental", "d_elemental", "isotopic",
+               "d_isotopic", "population", "d_population", "icc", "d_icc",
+               "transition_type", "feeds_gs")
+    INT_COLUMNS = ("residual", "level_i", "level_f")
+
+    def __init__(self, residual_ids, offsets, columns):
+        self.residual_ids = residual_ids
+        self.offsets = offsets
+        for name in GammaTable.COLUMNS:
+            setattr(self, name, columns[name])
+        self._max_intensity = None
+        self._energy_order = None
+
+    @classmethod
+    def from_datasets(cls, datasets, first_index=0):
+        """Builds the table from a list of JSON-formatted EGAF data sets in a
+        single pass over the nested `levelScheme` dictionaries.
+
+        Arguments:
+            datasets: A list of EGAF-data JSON objects.
+            first_index: Value of the `residual` column for the first data
+                         set (int); by default 0.
+
+        Returns:
+            A GammaTable object.
+        """
+        cols = {name: [] for name in GammaTable.COLUMNS}
+        residual_ids = []
+        offsets = [0]
+        for n, jdict in enumerate(datasets):
+            residual_ids.append(jdict["nucleusID"])
+            for each_l in jdict["levelScheme"]:
+                if each_l["numberOfGammas"] > 0:
+                    for each_g in each_l["gammaDecay"]:
+                        ttype = TRANSITION_TYPES.get(each_g["gammaTransitionType"], OTHER)
+                        for each_i in each_g["gammaAbsoluteIntensities"]:
+                            cols["residual"].append(first_index + n)
+                            cols["level_i"].append(each_g["levelIndexInitial"])
+                            cols["level_f"].append(each_g["levelIndexFinal"])
+                            cols["energy_i"].append(_number(each_g["levelEnergyInitial"]))
+                            cols["energy_f"].append(_number(each_g["levelEnergyFinal"]))
+                            cols["energy"].append(_number(each_g["gammaEnergy"]))
+                            cols["d_energy"].append(_number(each_g["dGammaEnergy"]))
+                            cols["elemental"].append(_number(each_i["partialElementalCrossSection"]))
+                            cols["d_elemental"].append(_number(each_i["dPartialElementalCrossSection"]))
+                            cols["isotopic"].append(_number(each_i["partialIsotopicCrossSection"]))
+                            cols["d_isotopic"].append(_number(each_i["dPartialIsotopicCrossSection"]))
+                            cols["population"].append(_number(each_i["populationPerNeutronCapture"]))
+                            cols["d_population"].append(_number(each_i["dPopulationPerNeutronCapture"]))
+                            cols["icc"].append(_number(each_g["calculatedTotalInternalConversionCoefficient"]))
+                            cols["d_icc"].append(_number(each_g["dCalculatedTotalInternalConversionCoefficient"]))
+                            cols["transition_type"].append(ttype)
+                            cols["feeds_gs"].append(each_g["gammaFeedsGroundState"] == True)
+            offsets.append(len(cols["residual"]))
+
+        columns = {}
+        for name, values in cols.items():
+            if name in GammaTable.INT_COLUMNS:
+                columns[name] = np.array(values, dtype=np.int64)
+            elif name == "transition_type":
+                columns[name] = np.array(values, dtype=np.int8)
+            elif name == "feeds_gs":
+                columns[name] = np.array(values, dtype=bool)
+            else:
+                columns[name] = np.array(values, dtype=np.float64)
+        return cls(residual_ids, np.array(offsets, dtype=np.int64), columns)
+
+    def __len__(self):
+        return len(self.energy)
+
+    def nucleus(self, n):
+        """Table of the gamma rays of the `n`-th data set.  The columns of
+        the returned table are views of this table's arrays (no copy).
+
+        Arguments:
+            n: Index of the data set in the table (int).
+
+        Returns:
+            A GammaTable object for a single data set.
+        """
+        start, stop = int(self.offsets[n]), int(self.offsets[n+1])
+        columns = {name: getattr(self, name)[start:stop] for name in GammaTable.COLUMNS}
+        return GammaTable([self.residual_ids[n]], np.array([0, stop-start], dtype=np.int64), columns)
+
+    def select(self, mask):
+        """Table of the rows where the boolean `mask` is True.  The returned
+        table has a single (empty) offset range and is meant for analysis
+        rather than per-nucleus slicing."""
+        columns = {name: getattr(self, name)[mask] for name in GammaTable.COLUMNS}
+        return GammaTable(self.residual_ids, np.array([0, len(columns["energy"])], dtype=np.int64), columns)
+
+    def intensity(self, intensity):
+        """Intensity columns for an intensity keyword.
+
+        Arguments:
+            intensity: One of 'elemental', 'isotopic' or 'population' (str).
+
+        Returns:
+            A tuple of NumPy arrays (intensity, uncertainty), or None if the
+            keyword is not recognized.
+        """
+        names = INTENSITY_COLUMNS.get(str(intensity).lower())
+        if names is None:
+            return None
+        return (getattr(self, names[0]), getattr(self, names[1]))
+
+    def max_intensity(self):
+        """Elemental intensity of the strongest gamma ray of each data set,
+        computed once.
+
+        Returns:
+            A NumPy array with one element per data set (0.0 for data sets 
+            without gamma rays).
+        """
+        if self._max_intensity is None:
+            counts = np.diff(self.offsets)
+            max_I = np.zeros(len(counts))
+            nonempty = counts > 0
+            if nonempty.any():
+                max_I[nonempty] = np.maximum.reduceat(self.elemental, self.offsets[:-1][nonempty])
+            self._max_intensity = max_I
+        return self._max_intensity
+
+    def energy_order(self):
+        """Energy index of the table, computed once.
+
+        Returns:
+            A tuple (order, energies) where `order` holds the row numbers 
+            sorted by increasing gamma-ray energy (rows of equal energy keep 
+            their table order) and `energies` the sorted energies.
+        """
+        if self._energy_order is None:
+            order = np.argsort(self.energy, kind='stable')
+            self._energy_order = (order, self.energy[order])
+        return self._energy_order
+
+    def energy_window(self, low, high):
+        """Rows of the gamma rays with `low` <= energy <= `high` (keV), in
+        table order.
+
+        Returns:
+            A NumPy array of row numbers (int).
+        """
+        order, energies = self.energy_order()
+        start = np.searchsorted(energies, low, side='left')
+        stop = np.searchsorted(energies, high, side='right')
+        return np.sort(order[start:stop])
+
+    def energy_windows(self, low, high):
+        """Rows of the gamma rays in each of several energy windows.
+
+        Arguments:
+            low: NumPy array of lower window limits (keV).
+            high: NumPy array of upper window limits (keV).
+
+        Returns:
+            A tuple of NumPy arrays (window, row) with one element per match: 
+            the index of the window and the row of the matching gamma ray.  
+            Matches are grouped by window and in order of energy within each 
+            window.
+        """
+        order, energies = self.energy_order()
+        start = np.searchsorted(energies, low, side='left')
+        stop = np.searchsorted(energies, high, side='right')
+        counts = np.maximum(stop - start, 0)
+        window = np.repeat(np.arange(len(counts)), counts)
+        first = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        return (window, order[np.arange(len(window)) + first])
+
+    def relative_intensity(self):
+        """Elemental intensities relative to the strongest gamma ray of each
+        data set (%), and their uncertainties.
+
+        Returns:
+            A tuple of NumPy arrays (intensity, uncertainty).
+        """
+        I, dI = self.elemental, self.d_elemental
+        max_I = np.repeat(self.max_intensity(), np.diff(self.offsets))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel_I = (I/max_I) * 100
+            d_rel_I = np.where(dI > 0.0, rel_I * (dI/I), 0.0)
+        return (rel_I, d_rel_I)
+
+    def spectrum(self, I, dI):
+        """Ten-column array in the layout returned by `Gammas.get_gammas`:
+
+        [0]: Level index corresponding to initial level (float);
+        [1]: Level index corresponding to final level (float);
+        [2]: Associated initial level energy in keV (float);
+        [3]: Associated final level energy in keV (float);
+        [4]: Deexcitation gamma-ray energy in keV (float);
+        [5]: Deexcitation gamma-ray energy uncertainty (float);
+        [6]: Gamma-ray intensity (float);
+        [7]: Gamma-ray intensity uncertainty (float);
+        [8]: BrIcc-calculated total internal-conversion coefficient (float);
+        [9]: Total internal-conversion coefficient uncertainty (float).
+        """
+        return np.column_stack((self.level_i, self.level_f, self.energy_i, self.energy_f, self.energy, self.d_energy, I, dI, self.icc, self.d_icc)).astype(np.float64)
+
+    def rows(self, I, dI, *extra):
+        """List of per-gamma lists with native Python values in the layout of
+        `spectrum`, with any `extra` values appended to each row."""
+        return [list(row) + list(extra) for row in zip(self.level_i.tolist(), self.level_f.tolist(), self.energy_i.tolist(), self.energy_f.tolist(), self.energy.tolist(), self.d_energy.tolist(), I.tolist(), dI.tolist(), self.icc.tolist(), self.d_icc.tolist())]
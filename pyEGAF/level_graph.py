@@ -0,0 +1,157 @@
+import numpy as np
+
+
+def csr_index(nodes, num_nodes):
+    """Internal function: Compressed sparse row index of the edges leaving
+    (or entering) each node.
+
+    Arguments:
+        nodes: NumPy array with the node of each edge (int).
+        num_nodes: Number of nodes (int).
+
+    Returns:
+        A tuple of NumPy arrays (ptr, edges): the edges of node `n` are
+        `edges[ptr[n]:ptr[n+1]]`, in their original order.
+    """
+    edges = np.argsort(nodes, kind='stable')
+    ptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(nodes, minlength=num_nodes), out=ptr[1:])
+    return (ptr, edges)
+
+
+class LevelGraph(object):
+    __doc__="""Decay schemes of residual compound nuclei as a directed graph
+    in compressed sparse row (CSR) form.
+
+    The nodes are the levels of the decay schemes and the edges are the gamma
+    rays of a GammaTable, so that edge `k` is row `k` of the table.  For a 
+    single-nucleus table node `n` is level index `n`; the levels of the
+    `m`-th nucleus of a multi-nucleus table are the nodes
+    `node_offsets[m]:node_offsets[m+1]`.  The gamma rays deexciting node `n`
+    are `out_edges[out_ptr[n]:out_ptr[n+1]]` and those feeding it are
+    `in_edges[in_ptr[n]:in_ptr[n+1]]`.  Per-level sums of edge weights (e.g.
+    conversion-corrected intensities) are computed for all levels at once in
+    O(edges).
+
+    Arguments:
+        table: GammaTable of one or more EGAF data sets.
+        num_levels: Number of levels of each nucleus (int or array-like); by
+                    default one more than the highest level index of each
+                    nucleus in the table.
+
+    Example:
+        graph = LevelGraph(edata.nucleus_gamma_table(edata.find_residual("Si29")))
+        total, d_total = e.intensity_conversions(graph.table.isotopic, graph.table.d_isotopic, graph.table.icc, graph.table.d_icc)
+        graph.balance(total, d_total)
+    """
+
+    def __init__(self, table, num_levels=None):
+        self.table = table
+        counts = np.diff(table.offsets)
+        nucleus = np.repeat(np.arange(len(counts)), counts)
+        if num_levels is None:
+            top = np.full(len(counts), -1, dtype=np.int64)
+            np.maximum.at(top, nucleus, np.maximum(table.level_i, table.level_f))
+            num_levels = top + 1
+        num_levels = np.broadcast_to(np.asarray(num_levels, dtype=np.int64), (len(counts),))
+        self.node_offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(num_levels, out=self.node_offsets[1:])
+        self.num_levels = int(self.node_offsets[-1])
+        self.node_nucleus = np.repeat(np.arange(len(counts)), num_levels)
+        self.node_level = np.arange(self.num_levels) - self.node_offsets[self.node_nucleus]
+        self.source = table.level_i + self.node_offsets[nucleus]
+        self.target = table.level_f + self.node_offsets[nucleus]
+        self.out_ptr, self.out_edges = csr_index(self.source, self.num_levels)
+        self.in_ptr, self.in_edges = csr_index(self.target, self.num_levels)
+
+    def __len__(self):
+        return self.num_levels
+
+    def num_edges(self):
+        """Number of gamma rays in the graph (int)."""
+        return len(self.source)
+
+    def out_degree(self):
+        """Number of gamma rays deexciting each level (NumPy array)."""
+        return np.diff(self.out_ptr)
+
+    def in_degree(self):
+        """Number of gamma rays feeding each level (NumPy array)."""
+        return np.diff(self.in_ptr)
+
+    def successors(self, level):
+        """Rows (edges) of the gamma rays deexciting a node (NumPy array)."""
+        return self.out_edges[self.out_ptr[level]:self.out_ptr[level+1]]
+
+    def predecessors(self, level):
+        """Rows (edges) of the gamma rays feeding a node (NumPy array)."""
+        return self.in_edges[self.in_ptr[level]:self.in_ptr[level+1]]
+
+    def level_sums(self, levels, weights, d_weights):
+        """Internal function: Sums of edge weights per level, with the
+        uncertainties combined in quadrature."""
+        sums = np.bincount(levels, weights=weights, minlength=self.num_levels)
+        d_sums = np.sqrt(np.bincount(levels, weights=np.asarray(d_weights)**2, minlength=self.num_levels))
+        return (sums, d_sums)
+
+    def depopulation(self, weights, d_weights):
+        """Summed weights of the gamma rays deexciting each level.
+
+        Arguments:
+            weights: NumPy array of edge weights, one per gamma ray.
+            d_weights: NumPy array of weight uncertainties.
+
+        Returns:
+            A tuple of NumPy arrays (sums, uncertainties) indexed by node.
+        """
+        return self.level_sums(self.source, weights, d_weights)
+
+    def feeding(self, weights, d_weights):
+        """Summed weights of the gamma rays feeding each level.
+
+        Arguments:
+            weights: NumPy array of edge weights, one per gamma ray.
+            d_weights: NumPy array of weight uncertainties.
+
+        Returns:
+            A tuple of NumPy arrays (sums, uncertainties) indexed by node.
+        """
+        return self.level_sums(self.target, weights, d_weights)
+
+    def balance(self, weights, d_weights):
+        """Intensity balance of every level.
+
+        Arguments:
+            weights: NumPy array of edge weights, one per gamma ray.
+            d_weights: NumPy array of weight uncertainties.
+
+        Returns:
+            A dictionary of NumPy arrays indexed by node: 'depopulation',
+            'd_depopulation', 'feeding', 'd_feeding', 'difference'
+            (feeding - depopulation), 'd_difference' and 'residual' (the
+            difference in units of its uncertainty; inf or NaN where the
+            uncertainty is zero).
+        """
+        depop, d_depop = self.depopulation(weights, d_weights)
+        pop, d_pop = self.feeding(weights, d_weights)
+        diff = pop - depop
+        d_diff = np.sqrt(d_depop**2 + d_pop**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            res = diff / d_diff
+        return {"depopulation": depop, "d_depopulation": d_depop, "feeding": pop, "d_feeding": d_pop, "difference": diff, "d_difference": d_diff, "residual": res}
+
+    def level_energies(self):
+        """Energy of each level taken from the last gamma ray deexciting the
+        level (initial-level energy) or, for levels that are not deexcited,
+        the last gamma ray feeding it (final-level energy).
+
+        Returns:
+            A NumPy array of level energies in keV (NaN for levels without
+            gamma rays).
+        """
+        level_energy = np.full(self.num_levels, np.nan)
+        fed = self.in_degree() > 0
+        level_energy[fed] = self.table.energy_f[self.in_edges[self.in_ptr[1:][fed] - 1]]
+        deexcited = self.out_degree() > 0
+        level_energy[deexcited] = self.table.energy_i[self.out_edges[self.out_ptr[1:][deexcited] - 1]]
+        return level_energy
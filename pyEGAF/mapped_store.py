@@ -0,0 +1,246 @@
+"""Memory-mapped columnar store of the parsed JSON-formatted EGAF data sets.
+
+The store is a directory of NumPy `.npy` files written next to the binary
+cache the first time the EGAF data sets are loaded with `mmap=True`:
+
+    manifest.json               Store version, manifest of the source JSON
+                                files and the number of rows of each table;
+    gamma_table.<column>.npy    Columns and offsets of the GammaTable of all
+                                data sets;
+    <table>.<column>.npy        Columns of the normalized tables of
+                                `pyEGAF.columnar` (strings as fixed-width
+                                unicode arrays, with a `<column>.null.npy`
+                                mask of the JSON null values);
+    <table>.offsets.npy         First row of each data set in the table.
+
+The files are opened read-only with `np.load(..., mmap_mode='r')`, so that
+every process using the store shares one copy of the data in the page
+cache.  The gamma tables used by the analysis methods are views of the
+mapped arrays; the JSON objects of a data set are only rebuilt from the
+mapped tables when the data set is accessed.
+"""
+import json
+import os
+import shutil
+import numpy as np
+from . import binary_cache
+from . import columnar
+from .catalog import LazyEGAFCatalog, EGAFCatalog
+from .gamma_table import GammaTable
+
+# Increment whenever the layout of the store changes.
+STORE_VERSION = 1
+
+
+def store_path(json_dir):
+    """Directory of the memory-mapped store associated with a directory of
+    JSON-formatted data sets, in the binary cache directory."""
+    cache_file = binary_cache.cache_path(json_dir)
+    tag = os.path.basename(cache_file).split("_")[-1].split(".")[0]
+    return os.path.join(binary_cache.cache_directory(), "egaf_store_v{0}_{1}".format(STORE_VERSION, tag))
+
+
+def column_file(path, table, column):
+    """Internal function: Path of the `.npy` file of a column."""
+    return os.path.join(path, "{0}.{1}.npy".format(table, column))
+
+
+def write_store(path, datasets, manifest=None):
+    """Writes the memory-mapped store of EGAF data sets.  The files are
+    written to a temporary directory that is moved into place, so that
+    concurrent readers never see a partial store.
+
+    Arguments:
+        path: Directory of the store (str).
+        datasets: List of EGAF data set JSON objects.
+        manifest: Manifest of the source JSON files, see
+                  `binary_cache.build_manifest`; optional.
+
+    Returns:
+        The path of the store (str), or None if it could not be written.
+    """
+    tmp = "{0}.{1}.tmp".format(path, os.getpid())
+    try:
+        os.makedirs(tmp, exist_ok=True)
+        table = GammaTable.from_datasets(datasets)
+        for name in GammaTable.COLUMNS:
+            np.save(column_file(tmp, "gamma_table", name), getattr(table, name))
+        np.save(column_file(tmp, "gamma_table", "offsets"), table.offsets)
+
+        rows = {}
+        tables = columnar.datasets_to_tables(datasets)
+        for name, frame in tables.items():
+            frame = columnar.sort_table(frame, name)
+            for column, kind in columnar.COLUMNAR_TABLES[name]:
+                values = frame[column].to_numpy()
+                if kind == "str":
+                    null = np.asarray(frame[column].isna(), dtype=bool)
+                    np.save(column_file(tmp, name, column + ".null"), null)
+                    values = np.array(["" if missing else value for value, missing in zip(values, null)], dtype=str)
+                np.save(column_file(tmp, name, column), values)
+            dataset = frame["dataset"].to_numpy()
+            np.save(column_file(tmp, name, "offsets"), np.searchsorted(dataset, np.arange(len(tables["datasets"]) + 1)))
+            rows[name] = len(frame)
+
+        header = {"version": STORE_VERSION, "manifest": manifest or [], "rows": rows, "residual_ids": table.residual_ids}
+        with open(os.path.join(tmp, "manifest.json"), mode="w") as f:
+            json.dump(header, f)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        return path
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return None
+
+
+def read_header(path):
+    """Internal function: Contents of the manifest.json file of a store, or
+    None if there is no readable store of the current version."""
+    try:
+        with open(os.path.join(path, "manifest.json"), mode="r") as f:
+            header = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if header.get("version") != STORE_VERSION:
+        return None
+    return header
+
+
+def store_is_current(path, json_files):
+    """Checks that a store exists and matches the JSON files on disk; see
+    `binary_cache.manifest_is_current`."""
+    header = read_header(path)
+    if header is None:
+        return False
+    return binary_cache.manifest_is_current([tuple(entry) for entry in header["manifest"]], json_files)
+
+
+class MappedEGAFCatalog(LazyEGAFCatalog):
+    __doc__="""EGAF catalog backed by the memory-mapped store written by
+    `write_store`.
+
+    The gamma table of the catalog, used by the analysis methods, consists
+    of read-only views of the mapped `.npy` files, and the residual and
+    target indexes are built from the mapped datasets table.  The JSON
+    object of a data set is rebuilt from the mapped tables the first time it
+    is accessed and memoized thereafter, as in a LazyEGAFCatalog.  Pickling
+    the catalog, e.g. to pass it to worker processes, only transfers the
+    path of the store; every process maps the same files.
+
+    Arguments:
+        path: Directory of the store (str).
+
+    Example:
+        import pyEGAF as egaf
+        e = egaf.EGAF()
+        edata = e.load_egaf(mmap=True)
+        edata.gamma_table().energy
+        e.normalise_intensities(edata, "Si29")
+    """
+
+    def __init__(self, path):
+        header = read_header(path)
+        if header is None:
+            raise FileNotFoundError("No EGAF store of version {0} in {1}".format(STORE_VERSION, path))
+        super().__init__([None]*len(header["residual_ids"]))
+        self._paths = None
+        self._store = path
+        self._rows = header["rows"]
+        self._residual_ids = header["residual_ids"]
+        self._arrays = {}
+
+    def array(self, table, column):
+        """Read-only memory map of a column of the store (NumPy array)."""
+        key = (table, column)
+        if key not in self._arrays:
+            self._arrays[key] = np.load(column_file(self._store, table, column), mmap_mode="r")
+        return self._arrays[key]
+
+    def table_columns(self, table, start, stop):
+        """Internal function: Rows start:stop of a normalized table as lists
+        of Python objects; see `columnar.python_values`."""
+        columns = {}
+        for name, kind in columnar.COLUMNAR_TABLES[table]:
+            null = self.array(table, name + ".null")[start:stop] if kind == "str" else None
+            columns[name] = columnar.python_values(self.array(table, name)[start:stop], kind, null)
+        return columns
+
+    def _resolve(self, pos):
+        """Internal function: Rebuilds and memoizes the data set at `pos`
+        from the mapped tables."""
+        jdict = list.__getitem__(self, pos)
+        if jdict is None and self._store is not None:
+            columns = {}
+            for table in columnar.COLUMNAR_TABLES:
+                offsets = self.array(table, "offsets")
+                columns[table] = self.table_columns(table, int(offsets[pos]), int(offsets[pos+1]))
+                columns[table]["dataset"] = [0]*len(columns[table]["dataset"])
+            jdict = columnar.columns_to_datasets(columns)[0]
+            list.__setitem__(self, pos, jdict)
+        return jdict
+
+    def _build_indexes(self):
+        """Internal function: Builds the indexes from the mapped datasets
+        table."""
+        if self._store is None:
+            return EGAFCatalog._build_indexes(self)
+        columns = self.table_columns("datasets", 0, self._rows["datasets"])
+        residual, target = {}, {}
+        residual_ZA, target_ZA = {}, {}
+        for pos, (r_ID, t_ID, r_Z, r_A, t_Z, t_A) in enumerate(zip(*[columns[name] for name in ("nucleusID", "nucleusTargetID", "nucleusZ", "nucleusA", "nucleusTargetZ", "nucleusTargetA")])):
+            residual.setdefault(r_ID, pos)
+            target.setdefault(t_ID, pos)
+            residual_ZA.setdefault((r_Z, r_A), pos)
+            target_ZA.setdefault((t_Z, t_A), pos)
+        self._indexes = (residual, target, residual_ZA, target_ZA)
+        return self._indexes
+
+    def dataset_values(self, key, record=None):
+        """Values of a top-level key of every data set in the catalog, or of
+        a key of its Q-value or normalization record, read from the mapped 
+        datasets table without rebuilding the data sets when the key is one
+        of its columns (list).  The datasets table holds the single 
+        `recordQ` and `normalizationRecord` of each data set, so that 
+        `record` is then not needed."""
+        kinds = dict(columnar.COLUMNAR_TABLES["datasets"])
+        if self._store is None or key not in kinds:
+            return EGAFCatalog.dataset_values(self, key, record)
+        null = self.array("datasets", key + ".null") if kinds[key] == "str" else None
+        return columnar.python_values(self.array("datasets", key), kinds[key], null)
+
+    def gamma_table(self):
+        """Columnar table of all gamma rays in the catalog, whose columns
+        are read-only views of the mapped store.
+
+        Returns:
+            A GammaTable object whose `residual` column holds the position of
+            each data set in the catalog.
+        """
+        if self._gamma_table is None and self._store is not None:
+            columns = {name: self.array("gamma_table", name) for name in GammaTable.COLUMNS}
+            self._gamma_table = GammaTable(list(self._residual_ids), self.array("gamma_table", "offsets"), columns)
+        return EGAFCatalog.gamma_table(self)
+
+    def nucleus_gamma_table(self, jdict):
+        """Internal function: Columnar table of the gamma rays of a single
+        data set of the catalog, sliced from the mapped gamma table."""
+        if self._store is not None:
+            pos = self._lookup((jdict["nucleusID"],), False)
+            if pos is not None and list.__getitem__(self, pos) is jdict:
+                return self.gamma_table().nucleus(pos)
+        return EGAFCatalog.nucleus_gamma_table(self, jdict)
+
+    def _invalidate(self):
+        """Internal function: Rebuilds all data sets and drops the store
+        before the catalog is modified."""
+        self.load_all()
+        self._store = None
+        self._arrays = {}
+        EGAFCatalog._invalidate(self)
+
+    def __reduce_ex__(self, protocol):
+        if self._store is None:
+            return (EGAFCatalog, (list(self),))
+        return (MappedEGAFCatalog, (self._store,))
+
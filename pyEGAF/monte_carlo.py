@@ -0,0 +1,159 @@
+import numpy as np
+
+# Percentiles of the median and of the central 68.27% interval (one standard
+# deviation of a normal distribution) quoted by the Monte Carlo methods.
+PERCENTILES = (15.865525393145708, 50.0, 84.13447460685429)
+
+
+def percentile_summary(draws, axis=0):
+    """Median and percentile-based uncertainties of Monte Carlo draws.
+
+    Arguments:
+        draws: NumPy array of draws.
+        axis: Axis running over the draws (int); by default 0.
+
+    Returns:
+        A tuple (median, lower, upper) where `lower` and `upper` are the
+        distances from the median to the 15.87th and 84.13th percentiles.
+    """
+    low, median, high = np.percentile(draws, PERCENTILES, axis=axis)
+    return (median, median - low, high - median)
+
+
+class MonteCarlo(object):
+    __doc__="""Monte Carlo propagation of the uncertainties of the partial
+    gamma-ray cross sections, internal-conversion coefficients and of P0 to
+    the total capture cross section and the normalised level populations of
+    one residual compound nucleus.
+
+    Each draw samples all gamma-ray intensities and ICCs from normal
+    distributions, optionally times a normalisation factor common to all
+    intensities of the draw.  The conversion-corrected intensities of a draw
+    are used both for the ground-state feeding that determines sigma0 and for
+    the level depopulations normalised to it, so that the correlations
+    between numerator and denominator, which the first-order quadrature of
+    `quad_error` neglects, are kept.  The draws are processed in chunks of
+    `chunk_size` rows, vectorized across draws and gamma rays, so that the
+    intermediate (draws x gamma rays) arrays stay bounded in memory.
+
+    Arguments:
+        graph: LevelGraph of one EGAF data set.
+        I: NumPy array of gamma-ray intensities, one per gamma ray.
+        dI: NumPy array of intensity uncertainties.
+        alpha: NumPy array of internal-conversion coefficients.
+        d_alpha: NumPy array of ICC uncertainties.
+        d_scale: Relative uncertainty of a normalisation common to all
+                 gamma-ray intensities (float); by default 0.
+        seed: Seed or NumPy Generator of the random numbers; by default
+              fresh entropy is used.
+        chunk_size: Number of draws processed at once (int); None processes
+                    all draws at once.
+
+    Example:
+        table = edata.nucleus_gamma_table(edata.find_residual("Si29"))
+        mc = MonteCarlo(LevelGraph(table), table.isotopic, table.d_isotopic, table.icc, table.d_icc, seed=1)
+        draws = mc.sample(100000, (table.level_f == 0) & (table.level_i <= 12), p0=0.02217, d_p0=0.00051)
+        percentile_summary(draws["sigma0"])
+    """
+
+    def __init__(self, graph, I, dI, alpha, d_alpha, d_scale=0.0, seed=None, chunk_size=10000):
+        self.graph = graph
+        I, dI, alpha, d_alpha = [np.where(np.isnan(v), 0.0, v) for v in [np.asarray(v, dtype=np.float64) for v in (I, dI, alpha, d_alpha)]]
+        # The draws are stored with the gamma rays in the CSR order of the
+        # graph out-edges, so that the level sums are contiguous reductions
+        order = graph.out_edges
+        self.column = np.empty(len(order), dtype=np.int64)
+        self.column[order] = np.arange(len(order))
+        self.I = I[order]
+        self.dI = dI[order]
+        self.conversion = 1.0 + alpha[order]
+        # Only the ICCs with an uncertainty are sampled
+        self.vary_alpha = np.flatnonzero(d_alpha[order] > 0.0)
+        self.d_alpha = d_alpha[order][self.vary_alpha]
+        self.d_scale = float(d_scale)
+        self.rng = np.random.default_rng(seed)
+        self.chunk_size = chunk_size
+
+    def chunks(self, samples):
+        """Internal function: Slices of the draws processed together."""
+        size = max(int(self.chunk_size or samples), 1)
+        for start in range(0, samples, size):
+            yield slice(start, min(start + size, samples))
+
+    def draw_totals(self, n):
+        """Conversion-corrected intensities of `n` draws.
+
+        Returns:
+            A NumPy array of shape (n, gamma rays), with the gamma rays in the
+            CSR order of the graph out-edges.
+        """
+        totals = self.rng.standard_normal((n, len(self.I)))
+        totals *= self.dI
+        totals += self.I
+        if self.d_scale > 0.0:
+            totals *= 1.0 + self.d_scale * self.rng.standard_normal((n, 1))
+        totals *= self.conversion
+        if len(self.vary_alpha) > 0:
+            d_conversion = self.d_alpha * self.rng.standard_normal((n, len(self.vary_alpha)))
+            totals[:, self.vary_alpha] *= 1.0 + d_conversion / self.conversion[self.vary_alpha]
+        return totals
+
+    def depopulation(self, totals):
+        """Summed intensities deexciting each level for each draw.
+
+        Arguments:
+            totals: NumPy array of shape (draws, gamma rays) returned by
+                    `draw_totals`.
+
+        Returns:
+            A NumPy array of shape (draws, levels).
+        """
+        graph = self.graph
+        sums = np.zeros((len(totals), graph.num_levels))
+        deexcited = np.flatnonzero(graph.out_degree() > 0)
+        if len(deexcited) > 0:
+            sums[:, deexcited] = np.add.reduceat(totals, graph.out_ptr[deexcited], axis=1)
+        return sums
+
+    def sample(self, samples, feeders, p0=None, d_p0=None, sigma0=None, d_sigma0=None):
+        """Draws the total capture cross section and the normalised level
+        populations.
+
+        Sigma0 is either modeled from the gamma rays `feeders` feeding the
+        ground state and P0, sigma0 = sum(feeders) / (1 - P0), or sampled
+        from an adopted value when `sigma0` is given.
+
+        Arguments:
+            samples: Number of draws (int).
+            feeders: Boolean mask or row indices of the gamma rays feeding the
+                     ground state below the critical energy.
+            p0, d_p0: Modeled population per neutron capture feeding the
+                      ground state from the quasicontinuum and uncertainty
+                      (float).
+            sigma0, d_sigma0: Adopted total capture cross section and
+                              uncertainty (float), used instead of P0.
+
+        Returns:
+            A dictionary of NumPy arrays: 'feeding_gs' and 'sigma0' with one
+            element per draw, 'depopulation' and 'populations' of shape
+            (draws, levels).
+        """
+        samples = int(samples)
+        feeders = np.asarray(feeders)
+        feeders = np.flatnonzero(feeders) if feeders.dtype == bool else feeders.astype(np.int64)
+        feeders = self.column[feeders]
+        draws = {"feeding_gs": np.empty(samples), "sigma0": np.empty(samples), "depopulation": np.empty((samples, self.graph.num_levels)), "populations": np.empty((samples, self.graph.num_levels))}
+        for rows in self.chunks(samples):
+            n = rows.stop - rows.start
+            totals = self.draw_totals(n)
+            feeding_gs = totals[:, feeders].sum(axis=1)
+            if sigma0 is not None:
+                s0 = float(sigma0) + float(d_sigma0 or 0.0) * self.rng.standard_normal(n)
+            else:
+                s0 = feeding_gs / (1.0 - (float(p0) + float(d_p0 or 0.0) * self.rng.standard_normal(n)))
+            depop = self.depopulation(totals)
+            draws["feeding_gs"][rows] = feeding_gs
+            draws["sigma0"][rows] = s0
+            draws["depopulation"][rows] = depop
+            np.divide(depop, s0[:, None], out=draws["populations"][rows])
+        return draws
@@ -0,0 +1,169 @@
+import numpy as np
+
+# Columns of the array returned by `PeakIdentifier.match`.
+MATCH_COLUMNS = ("peak", "line", "row", "residual", "rank", "delta", "z_score")
+
+
+def peak_columns(peaks, sigma=1.0):
+    """Internal function: Splits a list of measured peaks into energy, sigma
+    and area arrays.
+
+    Arguments:
+        peaks: Array-like of peak energies in keV, either 1-D or 2-D with the
+               columns (energy, sigma) or (energy, sigma, area).
+        sigma: Energy uncertainty (keV) used for 1-D input.
+
+    Returns:
+        A tuple of NumPy arrays (energy, sigma, area); the area is NaN when it
+        is not provided.
+    """
+    peaks = np.asarray(peaks)
+    if peaks.dtype.kind not in "iuf":
+        raise TypeError("Peaks must be numbers: {0}".format(peaks))
+    peaks = peaks.astype(np.float64)
+    if peaks.ndim == 1:
+        return (peaks, np.full(len(peaks), float(sigma)), np.full(len(peaks), np.nan))
+    if peaks.ndim != 2 or peaks.shape[1] not in (2, 3):
+        raise ValueError("Peaks must be passed as (energy, sigma[, area]) columns; got shape {0}".format(peaks.shape))
+    area = peaks[:,2] if peaks.shape[1] == 3 else np.full(len(peaks), np.nan)
+    return (peaks[:,0], peaks[:,1], area)
+
+
+class PeakIdentifier(object):
+    __doc__="""Peak-identification engine for prompt-gamma activation analysis
+    (PGAA) spectra built on the EGAF gamma-ray library.
+
+    The `strong_lines` strongest transitions of every residual nucleus, ranked
+    by elemental partial gamma-ray cross section as in `get_strongest_gammas`,
+    form the reference library.  The library is sorted by energy once, so that
+    the candidate lines of all peaks are found with two `np.searchsorted`
+    calls.  A line of energy E +/- dE matches a peak at Ep +/- sigma if
+
+        |E - Ep| <= n_sigma * sqrt(dE**2 + sigma**2).
+
+    Each nucleus is scored by the fraction of the intensity of its strong lines
+    that is matched by the spectrum.
+
+    Arguments:
+        table: GammaTable of the EGAF data sets.
+        strong_lines: Number of strongest lines per nucleus (int); by default
+                      10.
+        n_sigma: Width of the match window in standard deviations (float); by
+                 default 3.
+
+    Example:
+        pid = PeakIdentifier(edata.gamma_table())
+        energy, sigma, area = peak_columns([[1273.3, 0.2, 5.1e4], [2092.9, 0.3, 1.2e4]])
+        pid.rank(energy, sigma, area)
+    """
+
+    def __init__(self, table, strong_lines=10, n_sigma=3.0):
+        self.table = table
+        self.strong_lines = int(strong_lines)
+        self.n_sigma = float(n_sigma)
+
+        # Strongest lines of each nucleus: sort by nucleus, then decreasing
+        # intensity, keeping table order for equal intensities.
+        rows = np.arange(len(table))
+        order = np.lexsort((rows, -table.elemental, table.residual))
+        residual = table.residual[order]
+        first = np.searchsorted(residual, residual, side='left')
+        rank = np.arange(len(order)) - first
+        strong = rank < self.strong_lines
+
+        self.rows = order[strong]
+        self.rank_in_nucleus = rank[strong]
+        self.residual = residual[strong]
+        self.intensity = table.elemental[self.rows]
+        self.energy = table.energy[self.rows]
+        self.d_energy = table.d_energy[self.rows]
+        n_nuclei = len(table.offsets) - 1
+        self.total_intensity = np.bincount(self.residual, weights=self.intensity, minlength=n_nuclei)
+        self.num_lines = np.bincount(self.residual, minlength=n_nuclei)
+
+        # Energy index of the library
+        self._order = np.argsort(self.energy, kind='stable')
+        self._sorted_energy = self.energy[self._order]
+        self._max_d_energy = float(self.d_energy.max()) if len(self.d_energy) > 0 else 0.0
+
+    def match(self, energy, sigma):
+        """Library lines matching each peak.
+
+        Arguments:
+            energy: NumPy array of peak energies (keV).
+            sigma: NumPy array of peak-energy uncertainties (keV).
+
+        Returns:
+            A dictionary of NumPy arrays keyed by MATCH_COLUMNS with one
+            element per (peak, line) match: the index of the peak, the index
+            of the line in the library, the row of the line in the GammaTable,
+            the index of the nucleus, the rank of the line in the nucleus
+            (0 = strongest), the energy difference E - Ep (keV) and its value
+            in combined standard deviations.
+        """
+        energy = np.asarray(energy, dtype=np.float64)
+        sigma = np.asarray(sigma, dtype=np.float64)
+        # Widest window any line could need; narrowed per line below.
+        half_width = self.n_sigma * np.sqrt(sigma**2 + self._max_d_energy**2)
+        start = np.searchsorted(self._sorted_energy, energy - half_width, side='left')
+        stop = np.searchsorted(self._sorted_energy, energy + half_width, side='right')
+        counts = np.maximum(stop - start, 0)
+        peak = np.repeat(np.arange(len(energy)), counts)
+        line = self._order[np.arange(len(peak)) + np.repeat(start - (np.cumsum(counts) - counts), counts)]
+
+        delta = self.energy[line] - energy[peak]
+        width = np.sqrt(self.d_energy[line]**2 + sigma[peak]**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = np.where(width > 0.0, np.abs(delta)/width, np.where(delta == 0.0, 0.0, np.inf))
+        keep = z_score <= self.n_sigma
+        peak, line = peak[keep], line[keep]
+        return {"peak": peak, "line": line, "row": self.rows[line], "residual": self.residual[line], "rank": self.rank_in_nucleus[line], "delta": delta[keep], "z_score": z_score[keep]}
+
+    def rank(self, energy, sigma=None, area=None):
+        """Ranks the nuclei of the library by the strong lines present in a
+        list of peaks.
+
+        Arguments:
+            energy: NumPy array of peak energies (keV).
+            sigma: NumPy array of peak-energy uncertainties (keV).
+            area: NumPy array of peak areas; optional.
+
+        Returns:
+            A dictionary of NumPy arrays with one element per nucleus with at
+            least one matched line, in order of decreasing score:
+
+            residual: Index of the nucleus in the GammaTable (int);
+            score: Matched fraction of the strong-line intensity (float);
+            lines_found: Number of strong lines matched (int);
+            lines: Number of strong lines in the library (int);
+            strongest_found: True if the strongest line is matched (bool);
+            peaks: Number of peaks matched to the nucleus (int);
+            area: Summed area of the matched peaks (float).
+        """
+        energy = np.asarray(energy, dtype=np.float64)
+        if sigma is None:
+            sigma = np.zeros(len(energy))
+        if area is None:
+            area = np.full(len(energy), np.nan)
+        area = np.asarray(area, dtype=np.float64)
+        m = self.match(energy, sigma)
+        n_nuclei = len(self.total_intensity)
+
+        # A line matched by several peaks counts once.
+        lines = np.unique(m["line"])
+        found_I = np.bincount(self.residual[lines], weights=self.intensity[lines], minlength=n_nuclei)
+        lines_found = np.bincount(self.residual[lines], minlength=n_nuclei)
+        strongest_found = np.zeros(n_nuclei, dtype=bool)
+        strongest_found[self.residual[lines[self.rank_in_nucleus[lines] == 0]]] = True
+
+        # A peak matched by several lines of a nucleus counts once.
+        pairs = np.unique(np.column_stack((m["residual"], m["peak"])), axis=0).reshape(-1, 2)
+        peaks = np.bincount(pairs[:,0], minlength=n_nuclei)
+        matched_area = np.bincount(pairs[:,0], weights=area[pairs[:,1]], minlength=n_nuclei)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.where(self.total_intensity > 0.0, found_I/self.total_intensity, lines_found/np.maximum(self.num_lines, 1))
+        nuclei = np.nonzero(lines_found > 0)[0]
+        order = np.lexsort((nuclei, -lines_found[nuclei], -score[nuclei]))
+        nuclei = nuclei[order]
+        return {"residual": nuclei, "score": score[nuclei], "lines_found": lines_found[nuclei], "lines": self.num_lines[nuclei], "strongest_found": strongest_found[nuclei], "peaks": peaks[nuclei], "area": matched_area[nuclei]}
@@ -0,0 +1,263 @@
+"""Compact object model of the JSON-formatted EGAF data sets.
+
+The dictionaries returned by the JSON parser keep a hash table, with a
+reference to every key, in each of the ~100,000 level, spin and gamma-ray
+records of the database.  The record classes below store the same values in
+`__slots__` instead: one fixed attribute per JSON key, no per-record hash
+table, tuples in place of the JSON lists, and a single interned copy of each
+repeated string value (e.g. "positive", "secondary", "E2").
+
+The records are read-only mappings keyed by the JSON keys, so that
+`nucleus["levelScheme"][0]["gammaDecay"]` works exactly as it does for the
+parsed JSON and every pyEGAF method accepts them in place of the JSON
+objects.  The values are also available as attributes, e.g.
+`nucleus.levelScheme[0].gammaDecay`.
+
+Example:
+    import pyEGAF as egaf
+    e = egaf.EGAF()
+    edata = e.load_egaf(compact=True)
+    si29 = edata.find_residual("Si29")
+    si29.levelScheme[1].gammaDecay[0].gammaEnergy
+    e.get_gammas(edata, "Si29", intensity='isotopic')
+"""
+import sys
+from collections.abc import Mapping
+from .catalog import gc_paused
+
+# JSON keys of each record, in the order of the JSON files.
+NUCLEUS_KEYS = (
+    "nucleusID", "datasetType", "nucleusZ", "nucleusA", "nucleusN",
+    "nucleusTargetZ", "nucleusTargetA", "nucleusTargetN",
+    "nucleusTargetElement", "nucleusTargetID", "numberPrimaryGammas",
+    "numberSecondaryGammas", "totalNumberLevels", "totalNumberGammas",
+    "unitEnergy", "recordQ", "neutronCaptureNormalization", "levelScheme",
+)
+Q_RECORD_KEYS = (
+    "energyNeutronSeparationAME2020", "dEnergyNeutronSeparationAME2020",
+    "energyProtonSeparationAME2020", "dEnergyProtonSeparationAME2020",
+    "energyNeutronSeparationENSDF", "energyProtonSeparationENSDF",
+    "energyNeutronSeparationEGAF", "dEnergyNeutronSeparationEGAF",
+)
+NORMALIZATION_KEYS = ("normalizationRecord",)
+NORMALIZATION_RECORD_KEYS = (
+    "multiplierIsotopicCorrection", "dMultiplierIsotopicCorrection",
+    "naturalIsotopicAbundance", "dNaturalIsotopicAbundance",
+    "adoptedTotalThermalCaptureCrossSection",
+    "dAdoptedTotalThermalCaptureCrossSection", "unitAdoptedCrossSection",
+    "keyNumber",
+)
+LEVEL_KEYS = (
+    "levelIndex", "levelEnergy", "dLevelEnergy", "levelIsIsomer",
+    "isomerDecay", "numberOfSpins", "spins", "numberOfGammas", "gammaDecay",
+)
+SPIN_KEYS = (
+    "spinIndex", "spinReal", "spinIsTentative", "spinIsLimit", "spinLimits",
+    "parity", "paritySign", "parityIsTentative",
+)
+ISOMER_KEYS = (
+    "halfLifeBest", "dHalfLifeBest", "unitHalfLifeBest", "halfLifeConverted",
+    "dHalfLifeConverted", "unitHalfLifeConverted",
+)
+GAMMA_KEYS = (
+    "gammaEnergy", "dGammaEnergy", "levelIndexInitial", "levelIndexFinal",
+    "levelEnergyInitial", "levelEnergyFinal", "gammaTransitionType",
+    "gammaFeedsGroundState", "gammaAbsoluteIntensities", "multipolarity",
+    "multipolarityIsTentative", "multipolarityIsAssumed", "mixingRatio",
+    "dMixingRatio", "mixingRatioSign",
+    "calculatedTotalInternalConversionCoefficient",
+    "dCalculatedTotalInternalConversionCoefficient",
+    "calculatedAtomicShellConversionCoefficients",
+    "reducedTransitionProbabilities",
+)
+INTENSITY_KEYS = (
+    "partialElementalCrossSection", "dPartialElementalCrossSection",
+    "partialIsotopicCrossSection", "dPartialIsotopicCrossSection",
+    "populationPerNeutronCapture", "dPopulationPerNeutronCapture",
+)
+CONVERSION_KEYS = tuple(prefix + "InternalConversionCoefficientAtomicShell" + shell
+                        for shell in "KLMNOPQ" for prefix in ("calculated", "dCalculated"))
+
+
+def compact_value(value):
+    """Internal function: Compact form of a JSON value other than a list of
+    records; lists become tuples and strings are interned."""
+    if isinstance(value, list):
+        return tuple([compact_value(item) for item in value])
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def json_value(value):
+    """Internal function: JSON form of a compact value."""
+    if isinstance(value, Record):
+        return value.as_dict()
+    if isinstance(value, tuple):
+        return [json_value(item) for item in value]
+    return value
+
+
+class Record(Mapping):
+    __doc__="""Base class of the compact EGAF records: a read-only mapping of
+    the JSON keys in KEYS to the values held in `__slots__`.  Records whose
+    values are lists of JSON objects name the record class of the list items
+    in NESTED."""
+
+    __slots__ = ()
+    KEYS = ()
+    KEY_SET = frozenset()
+    NESTED = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.KEY_SET = frozenset(cls.KEYS)
+
+    @classmethod
+    def from_json(cls, jdict):
+        """Builds the record from a parsed JSON object.
+
+        Arguments:
+            jdict: JSON object (dict) with the keys in KEYS; a missing key
+                   raises a KeyError and an unknown key a ValueError.
+
+        Returns:
+            The record.
+        """
+        if len(jdict) != len(cls.KEYS):
+            # Missing keys raise a KeyError below
+            unknown = sorted(set(jdict) - cls.KEY_SET)
+            if len(unknown) > 0:
+                raise ValueError("Unexpected keys for {0} record: {1}".format(cls.__name__, unknown))
+        record = cls.__new__(cls)
+        for key in cls.KEYS:
+            value = jdict[key]
+            # Numbers, booleans and None are kept as they are
+            kind = value.__class__
+            if kind is str:
+                value = sys.intern(value)
+            elif kind is list:
+                nested = cls.NESTED.get(key)
+                value = compact_value(value) if nested is None else tuple([nested.from_json(item) for item in value])
+            setattr(record, key, value)
+        return record
+
+    def as_dict(self):
+        """JSON object of the record (dict), e.g. for `json.dump`."""
+        return {key: json_value(getattr(self, key)) for key in self.KEYS}
+
+    def __getitem__(self, key):
+        if key in self.KEY_SET:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self.KEY_SET
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.as_dict()
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return self.as_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1!r})".format(type(self).__name__, self.as_dict())
+
+
+class QRecord(Record):
+    __doc__="""Q-value record of an EGAF data set (`recordQ`)."""
+    __slots__ = KEYS = Q_RECORD_KEYS
+
+
+class NormalizationRecord(Record):
+    __doc__="""Capture cross-section normalization record
+    (`normalizationRecord`)."""
+    __slots__ = KEYS = NORMALIZATION_RECORD_KEYS
+
+
+class Normalization(Record):
+    __doc__="""Neutron-capture normalization of an EGAF data set
+    (`neutronCaptureNormalization`)."""
+    __slots__ = KEYS = NORMALIZATION_KEYS
+    NESTED = {"normalizationRecord": NormalizationRecord}
+
+
+class Spin(Record):
+    __doc__="""Spin and parity assignment of a level (`spins`)."""
+    __slots__ = KEYS = SPIN_KEYS
+
+
+class Isomer(Record):
+    __doc__="""Half-life of an isomeric level (`isomerDecay`)."""
+    __slots__ = KEYS = ISOMER_KEYS
+
+
+class Intensity(Record):
+    __doc__="""Absolute intensities of a gamma ray
+    (`gammaAbsoluteIntensities`)."""
+    __slots__ = KEYS = INTENSITY_KEYS
+
+
+class ConversionCoefficients(Record):
+    __doc__="""Atomic-shell internal-conversion coefficients of a gamma ray
+    (`calculatedAtomicShellConversionCoefficients`)."""
+    __slots__ = KEYS = CONVERSION_KEYS
+
+
+class Gamma(Record):
+    __doc__="""Gamma-ray transition de-exciting a level (`gammaDecay`).
+
+    Example:
+        gamma = si29.levelScheme[1].gammaDecay[0]
+        gamma.gammaEnergy, gamma["gammaAbsoluteIntensities"][0].partialIsotopicCrossSection
+    """
+    __slots__ = KEYS = GAMMA_KEYS
+    NESTED = {"gammaAbsoluteIntensities": Intensity,
+              "calculatedAtomicShellConversionCoefficients": ConversionCoefficients}
+
+
+class Level(Record):
+    __doc__="""Level of the residual compound nucleus (`levelScheme`).
+
+    Example:
+        level = si29.levelScheme[1]
+        level.levelEnergy, level.spins[0].spinReal, len(level.gammaDecay)
+    """
+    __slots__ = KEYS = LEVEL_KEYS
+    NESTED = {"isomerDecay": Isomer, "spins": Spin, "gammaDecay": Gamma}
+
+
+class Nucleus(Record):
+    __doc__="""EGAF thermal neutron-capture data set of a residual compound
+    nucleus, built once from its parsed JSON object.
+
+    Example:
+        si29 = Nucleus.from_json(e.get_json(edata, "Si29"))
+        si29.nucleusTargetID, si29.levelScheme[1].levelEnergy
+        si29.as_dict() == e.get_json(edata, "Si29")
+    """
+    __slots__ = KEYS = NUCLEUS_KEYS
+    NESTED = {"recordQ": QRecord, "neutronCaptureNormalization": Normalization,
+              "levelScheme": Level}
+
+
+def compact_datasets(datasets):
+    """Compact records of a list of EGAF data sets.
+
+    Arguments:
+        datasets: List of EGAF data set JSON objects.
+
+    Returns:
+        A list of Nucleus objects in the order of `datasets`.
+    """
+    with gc_paused():
+        return [jdict if isinstance(jdict, Nucleus) else Nucleus.from_json(jdict) for jdict in datasets]
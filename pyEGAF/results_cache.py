@@ -0,0 +1,95 @@
+"""Opt-in memoization of the results of the pyEGAF analysis methods.
+
+An EGAF instance holds no results cache by default.  After
+`EGAF.enable_results_cache()` the methods decorated with `cached_result` store
+their (non-None) return values in a least-recently-used cache keyed by the
+method name, the EGAF catalog and the remaining positional and keyword
+arguments (residual, intensity mode, numeric arguments).  Each hit returns a
+copy of the stored result, so callers may modify it freely.
+
+Entries are tied to the catalog object they were computed from and to its
+modification count, so modifying the catalog invalidates them; plain lists
+are never cached because they cannot be tracked.  Messages printed by a method
+are not repeated on a cache hit.
+"""
+import copy
+import functools
+from collections import OrderedDict, namedtuple
+from .catalog import EGAFCatalog
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class ResultsCache(object):
+    __doc__="""Least-recently-used cache of method results.
+
+    Arguments:
+        maxsize: Maximum number of stored results (int); by default 256.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, catalog):
+        """Stored result for `key`, or None.  Entries computed from another
+        catalog object that happened to have the same id are discarded."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not catalog:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, catalog, result):
+        """Stores a result, evicting the least recently used entries beyond
+        `maxsize`."""
+        self._entries[key] = (catalog, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, method=None):
+        """Removes all entries, or only those of the named method (str)."""
+        if method is None:
+            self._entries.clear()
+        else:
+            for key in [key for key in self._entries if key[0] == method]:
+                del self._entries[key]
+
+    def info(self):
+        """Hit and miss statistics as a CacheInfo named tuple."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+def cached_result(method):
+    """Decorator memoizing the result of an EGAF method taking the list of
+    EGAF data sets as its first argument, when the instance has a results
+    cache enabled."""
+    @functools.wraps(method)
+    def wrapper(self, list, *args, **kwargs):
+        cache = getattr(self, "_results_cache", None)
+        if cache is None or not isinstance(list, EGAFCatalog):
+            return method(self, list, *args, **kwargs)
+        key = (method.__name__, id(list), list._version, args, tuple(sorted(kwargs.items())))
+        try:
+            result = cache.get(key, list)
+        except TypeError:
+            # Unhashable arguments
+            return method(self, list, *args, **kwargs)
+        if result is None:
+            result = method(self, list, *args, **kwargs)
+            if result is not None:
+                cache.put(key, list, result)
+                result = copy.deepcopy(result)
+            return result
+        return copy.deepcopy(result)
+    return wrapper
@@ -0,0 +1,268 @@
+import os
+import re
+import glob
+import mmap
+import numpy as np
+
+# Directory of the RIPL-formatted EGAF data sets bundled with the package.
+RIPL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'EGAF_RIPL')
+
+# Names of the bundled RIPL files, one data set per file.
+RIPL_FILENAME = re.compile(r'z(\d+)_a(\d+)_ripl\.dat$')
+
+# Structured-array layouts of the RIPL header, level and gamma records.
+# Level indices are the RIPL level numbers minus one, as in the EGAF data
+# sets; energies are in MeV as in the RIPL files.
+RIPL_HEADER_DTYPE = np.dtype([('nucleus', np.int64), ('symbol', 'U5'), ('A', np.int64), ('Z', np.int64), ('num_levels', np.int64), ('num_gammas', np.int64), ('max_level', np.int64), ('num_complete', np.int64), ('Sn', np.float64), ('Sp', np.float64)])
+RIPL_LEVEL_DTYPE = np.dtype([('nucleus', np.int64), ('level', np.int64), ('energy', np.float64), ('spin', np.float64), ('parity', np.int64), ('half_life', np.float64), ('num_gammas', np.int64), ('flag', 'U1'), ('jpi', 'U24'), ('num_decays', np.int64)])
+RIPL_GAMMA_DTYPE = np.dtype([('nucleus', np.int64), ('level_i', np.int64), ('level_f', np.int64), ('energy', np.float64), ('photon_branching', np.float64), ('electron_branching', np.float64), ('icc', np.float64)])
+
+
+def is_ripl_header(line):
+    """Internal function: True for the header line of a RIPL data set, which
+    starts with the nuclide symbol (e.g. " 29Si")."""
+    return line[0:5].strip()[-1:].isalpha()
+
+
+def parse_ripl_lines(lines, nucleus=0):
+    """Parses the fixed-width records of one RIPL data set line by line.
+
+    Arguments:
+        lines: Lines of the data set (list of str), starting with the header.
+        nucleus: Value of the `nucleus` field of the records (int).
+
+    Returns:
+        A tuple of lists of record tuples (header, levels, gammas) in the
+        layouts of RIPL_HEADER_DTYPE, RIPL_LEVEL_DTYPE and RIPL_GAMMA_DTYPE;
+        the header is a single tuple.
+    """
+    header = None
+    levels = []
+    gammas = []
+    level = -1
+    for line in lines:
+        if line.strip() == "":
+            continue
+        if is_ripl_header(line):
+            header = (nucleus, line[0:5].strip(), int(line[5:10]), int(line[10:15]), int(line[15:20]), int(line[20:25]), int(line[25:30]), int(line[30:35]), float(line[35:47]), float(line[47:59]))
+        elif line[0:39].strip() == "":
+            gammas.append((nucleus, level, int(line[39:43]) - 1, float(line[43:54]), float(line[54:65]), float(line[65:76]), float(line[76:87])))
+        else:
+            level = int(line[0:3]) - 1
+            levels.append((nucleus, level, float(line[3:14]), float(line[14:20]), int(line[20:23]), float(line[23:34]), int(line[34:37]), line[38:39].strip(), line[39:63].strip(), int(line[63:66].strip() or 0)))
+    return (header, levels, gammas)
+
+
+def fixed_width_matrix(data):
+    """Internal function: Lines of a byte string as a NumPy array of ASCII
+    codes, one row per line, padded with spaces to the longest line."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newline = buf == 10
+    ends = np.flatnonzero(newline)
+    if len(buf) > 0 and (len(ends) == 0 or ends[-1] != len(buf) - 1):
+        ends = np.append(ends, len(buf))
+    lengths = np.diff(ends, prepend=-1) - 1
+    width = int(lengths.max()) if len(lengths) > 0 else 0
+    matrix = np.full((len(lengths), width), 32, dtype=np.uint8)
+    matrix[np.arange(width) < lengths[:,None]] = buf[~newline]
+    return matrix
+
+
+def fixed_width_field(matrix, rows, start, stop, dtype):
+    """Internal function: Column range [start, stop) of the selected rows of
+    a fixed-width matrix converted to `dtype`; blank integer fields are 0."""
+    field = np.full((len(rows), stop - start), 32, dtype=np.uint8)
+    width = max(min(stop, matrix.shape[1]) - start, 0)
+    field[:, :width] = matrix[rows, start:start+width]
+    if np.dtype(dtype).kind == 'i':
+        field[(field == 32).all(axis=1), -1] = ord('0')
+    strings = field.view('S%d' % (stop - start)).ravel()
+    if np.dtype(dtype).kind == 'U':
+        return np.char.strip(strings).astype(dtype)
+    return strings.astype(dtype)
+
+
+def parse_ripl_bytes(data):
+    """Vectorized reader of the fixed-width records of one or more RIPL data
+    sets.  The lines are laid out as rows of a NumPy array of character
+    codes, classified as header, level or gamma records in a single pass,
+    and each fixed-width column is converted for all records at once.
+
+    Arguments:
+        data: Contents of one or more RIPL data sets (bytes), e.g. the
+              concatenated byte ranges of a RiplIndex.
+
+    Returns:
+        A tuple of structured NumPy arrays (headers, levels, gammas) with the
+        dtypes RIPL_HEADER_DTYPE, RIPL_LEVEL_DTYPE and RIPL_GAMMA_DTYPE; the
+        `nucleus` field counts the data sets in order of appearance.  The
+        records are the same as those of `parse_ripl_lines`.
+    """
+    matrix = fixed_width_matrix(data)
+    rows = np.arange(len(matrix))
+    blank = (matrix == 32).all(axis=1) if matrix.shape[1] > 0 else np.ones(len(matrix), dtype=bool)
+
+    # Header lines end the nuclide symbol of columns 1-5 with a letter
+    symbol = matrix[:, :5]
+    symbol_chars = symbol != 32
+    last = 4 - np.argmax(symbol_chars[:, ::-1], axis=1) if symbol.shape[1] == 5 else np.zeros(len(matrix), dtype=np.int64)
+    letter = symbol[rows, last] | 32 if symbol.shape[1] == 5 else np.zeros(len(matrix), dtype=np.uint8)
+    is_header = ~blank & symbol_chars.any(axis=1) & (letter >= ord('a')) & (letter <= ord('z'))
+    is_gamma = ~blank & ~is_header & (matrix[:, :39] == 32).all(axis=1)
+    is_level = ~blank & ~is_header & ~is_gamma
+
+    nucleus = np.cumsum(is_header) - 1
+    header_rows = rows[is_header]
+    level_rows = rows[is_level]
+    gamma_rows = rows[is_gamma]
+
+    headers = np.empty(len(header_rows), dtype=RIPL_HEADER_DTYPE)
+    headers['nucleus'] = nucleus[header_rows]
+    for name, start, stop, dtype in [('symbol', 0, 5, 'U5'), ('A', 5, 10, np.int64), ('Z', 10, 15, np.int64), ('num_levels', 15, 20, np.int64), ('num_gammas', 20, 25, np.int64), ('max_level', 25, 30, np.int64), ('num_complete', 30, 35, np.int64), ('Sn', 35, 47, np.float64), ('Sp', 47, 59, np.float64)]:
+        headers[name] = fixed_width_field(matrix, header_rows, start, stop, dtype)
+
+    levels = np.empty(len(level_rows), dtype=RIPL_LEVEL_DTYPE)
+    levels['nucleus'] = nucleus[level_rows]
+    levels['level'] = fixed_width_field(matrix, level_rows, 0, 3, np.int64) - 1
+    for name, start, stop, dtype in [('energy', 3, 14, np.float64), ('spin', 14, 20, np.float64), ('parity', 20, 23, np.int64), ('half_life', 23, 34, np.float64), ('num_gammas', 34, 37, np.int64), ('flag', 38, 39, 'U1'), ('jpi', 39, 63, 'U24'), ('num_decays', 63, 66, np.int64)]:
+        levels[name] = fixed_width_field(matrix, level_rows, start, stop, dtype)
+
+    # Initial level of each gamma: the last level record before it in the
+    # same data set
+    line_level = np.full(len(matrix), -1, dtype=np.int64)
+    line_level[level_rows] = levels['level']
+    last_level = np.maximum.accumulate(np.where(is_level, rows, -1))
+    last_header = np.maximum.accumulate(np.where(is_header, rows, -1))
+    gammas = np.empty(len(gamma_rows), dtype=RIPL_GAMMA_DTYPE)
+    gammas['nucleus'] = nucleus[gamma_rows]
+    gammas['level_i'] = np.where(last_level[gamma_rows] > last_header[gamma_rows], line_level[np.maximum(last_level[gamma_rows], 0)], -1)
+    gammas['level_f'] = fixed_width_field(matrix, gamma_rows, 39, 43, np.int64) - 1
+    for name, start, stop in [('energy', 43, 54), ('photon_branching', 54, 65), ('electron_branching', 65, 76), ('icc', 76, 87)]:
+        gammas[name] = fixed_width_field(matrix, gamma_rows, start, stop, np.float64)
+    return (headers, levels, gammas)
+
+
+class RiplIndex(object):
+    __doc__="""Index of the RIPL-formatted data sets of a directory by the mass
+    and atomic numbers (A, Z) of the residual nucleus.
+
+    Each entry gives the file holding the data set and the byte offset and
+    length of the data set in the file, so that a lookup reads exactly one
+    byte range of one file.  The bundled files hold one data set each and
+    are indexed from their names (`z014_a29_ripl.dat`) without being opened;
+    any other file in the directory is scanned once for its RIPL headers.
+    The index of a directory is built once per process by `ripl_index`.
+
+    Arguments:
+        path: Directory of the RIPL files (str); by default the bundled
+              EGAF_RIPL directory.
+
+    Example:
+        index = ripl_index()
+        index.read(29, 14)
+    """
+
+    def __init__(self, path=RIPL_PATH):
+        self.path = path
+        self.entries = {}
+        for ripl_file in sorted(glob.glob(os.path.join(path, "*.dat"))):
+            match = RIPL_FILENAME.search(os.path.basename(ripl_file))
+            if match:
+                Z, A = int(match.group(1)), int(match.group(2))
+                self.entries[(A, Z)] = (ripl_file, 0, os.path.getsize(ripl_file))
+            else:
+                self.scan(ripl_file)
+
+    def scan(self, ripl_file):
+        """Internal function: Indexes every RIPL header of a file."""
+        headers = []
+        offset = 0
+        with open(ripl_file, 'rb') as rf:
+            for line in rf:
+                text = line.decode('ascii', 'replace')
+                if is_ripl_header(text):
+                    headers.append((int(text[5:10]), int(text[10:15]), offset))
+                offset += len(line)
+        for i, (A, Z, start) in enumerate(headers):
+            stop = headers[i+1][2] if i+1 < len(headers) else offset
+            self.entries[(A, Z)] = (ripl_file, start, stop - start)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def find(self, A, Z):
+        """Entry (path, offset, length) of a data set, or None."""
+        return self.entries.get((int(A), int(Z)))
+
+    def read_bytes(self, A, Z, use_mmap=False):
+        """Raw bytes of a data set, or None when it is not indexed.
+
+        Arguments:
+            A, Z: Mass and atomic numbers of the residual nucleus (int).
+            use_mmap: Read the byte range through a read-only memory map of
+                      the file (bool); by default the range is read directly.
+        """
+        entry = self.find(A, Z)
+        if entry is None:
+            return None
+        path, offset, length = entry
+        with open(path, 'rb') as rf:
+            if use_mmap and length > 0:
+                with mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return mm[offset:offset+length]
+            rf.seek(offset)
+            return rf.read(length)
+
+    def read(self, A, Z, use_mmap=False):
+        """Lines of a data set (list of str, including the newlines), or
+        None when it is not indexed."""
+        data = self.read_bytes(A, Z, use_mmap)
+        if data is None:
+            return None
+        return data.decode('ascii', 'replace').splitlines(keepends=True)
+
+    def records(self, keys, use_mmap=False):
+        """Parsed header, level and gamma records of several data sets,
+        read with the vectorized fixed-width reader `parse_ripl_bytes`.
+
+        Arguments:
+            keys: Sequence of (A, Z) tuples of indexed data sets.
+            use_mmap: See `read_bytes`.
+
+        Returns:
+            A tuple of structured NumPy arrays (headers, levels, gammas) with
+            the dtypes RIPL_HEADER_DTYPE, RIPL_LEVEL_DTYPE and
+            RIPL_GAMMA_DTYPE; the `nucleus` field is the position of the data
+            set in `keys`.
+        """
+        chunks = []
+        for A, Z in keys:
+            data = self.read_bytes(A, Z, use_mmap)
+            chunks.append(data if data.endswith(b"\n") else data + b"\n")
+        return parse_ripl_bytes(b"".join(chunks))
+
+    def records_by_line(self, keys, use_mmap=False):
+        """Line-by-line version of `records`, parsing each record with
+        `parse_ripl_lines`."""
+        headers, levels, gammas = [], [], []
+        for n, (A, Z) in enumerate(keys):
+            header, nucleus_levels, nucleus_gammas = parse_ripl_lines(self.read(A, Z, use_mmap), n)
+            headers.append(header)
+            levels.extend(nucleus_levels)
+            gammas.extend(nucleus_gammas)
+        return (np.array(headers, dtype=RIPL_HEADER_DTYPE), np.array(levels, dtype=RIPL_LEVEL_DTYPE), np.array(gammas, dtype=RIPL_GAMMA_DTYPE))
+
+
+_ripl_indexes = {}
+
+
+def ripl_index(path=RIPL_PATH):
+    """RiplIndex of a directory, built on first use and reused for the rest
+    of the process."""
+    path = os.path.abspath(path)
+    if path not in _ripl_indexes:
+        _ripl_indexes[path] = RiplIndex(path)
+    return _ripl_indexes[path]
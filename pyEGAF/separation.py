@@ -3,10 +3,8 @@ from .base_egaf import *
 class Separation(Uncertainties):    
     __doc__="""Class to handle neutron and proton separation energies."""
 
-    def __init__(self):
-        BaseEGAF.__init__(self)
-        Meta.__init__(self)
-        Uncertainties.__init__(self)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
 
     def get_residual_Sn_AME(self,list,*args):
         """Neutron-separation energy from the AME2020 Atomic Mass Evaluation.  
@@ -44,7 +42,7 @@ class Separation(Uncertainties):
         WRONG_INPUTS = False
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True        
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(self.args) == 1 and str(args[0]) == jdict["nucleusID"]) or (len(self.args) == 2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     for each_q in jdict["recordQ"]:
@@ -52,14 +50,14 @@ class Separation(Uncertainties):
             except ValueError:
                 WRONG_INPUTS = True
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_residual_Sn_AME(edata,\"Al28\")")
-            print("or:")
-            print(" get_residual_Sn_AME(edata,13,28)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_residual_Sn_AME(edata,\"Al28\")\n"
+                                           "or:\n"
+                                           " get_residual_Sn_AME(edata,13,28)")
             return                 
         if Sn_AME == None:
-            print("No residual nucleus in EGAF file for defined input.")
+            report_error(NucleusNotFound, "No residual nucleus in EGAF file for defined input.")
             return None
         else:
             return Sn_AME
@@ -100,7 +98,7 @@ class Separation(Uncertainties):
         WRONG_INPUTS = False
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True                
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(self.args) == 1 and str(args[0]) == jdict["nucleusID"]) or (len(self.args) == 2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     for each_q in jdict["recordQ"]:
@@ -109,14 +107,14 @@ class Separation(Uncertainties):
                 WRONG_INPUTS = True
                 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_residual_Sp_AME(edata,\"Al28\")")
-            print("or:")
-            print(" get_residual_Sp_AME(edata,13,28)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_residual_Sp_AME(edata,\"Al28\")\n"
+                                           "or:\n"
+                                           " get_residual_Sp_AME(edata,13,28)")
             return
         if Sp_AME == None:
-            print("No residual nucleus in EGAF file for defined input.")
+            report_error(NucleusNotFound, "No residual nucleus in EGAF file for defined input.")
             return None
         else:
             return Sp_AME        
@@ -158,7 +156,7 @@ class Separation(Uncertainties):
         WRONG_INPUTS = False
         if len(args) == 0 or len(args) > 2:
             WRONG_INPUTS = True        
-        for jdict in self.list:
+        for jdict in self.select_datasets(self.list, args):
             try:
                 if (len(self.args) == 1 and str(args[0]) == jdict["nucleusID"]) or (len(self.args) == 2 and int(args[0]) == jdict["nucleusZ"] and int(args[1]) == jdict["nucleusA"]):
                     for each_q in jdict["recordQ"]:
@@ -167,14 +165,14 @@ class Separation(Uncertainties):
                 WRONG_INPUTS = True
 
         if WRONG_INPUTS == True:
-            print("Incorrect input sequence.")
-            print("Pass arguments to function as:")
-            print(" get_residual_Sn_EGAF(edata,\"Al28\")")
-            print("or:")
-            print(" get_residual_Sn_EGAF(edata,13,28)")
+            report_error(InvalidArguments, "Incorrect input sequence.\n"
+                                           "Pass arguments to function as:\n"
+                                           " get_residual_Sn_EGAF(edata,\"Al28\")\n"
+                                           "or:\n"
+                                           " get_residual_Sn_EGAF(edata,13,28)")
             return                        
         if Sn_EGAF == None:
-            print("No residual nucleus in EGAF file for defined input.")
+            report_error(NucleusNotFound, "No residual nucleus in EGAF file for defined input.")
             return None
         else:
             return Sn_EGAF
@@ -218,28 +216,30 @@ class Separation(Uncertainties):
         """
         self.str = str
         self.list = list
-        egaf_residuals = BaseEGAF.egaf_residual_list(self,self.list)
+        fields = {"neutron": ("energyNeutronSeparationAME2020", "dEnergyNeutronSeparationAME2020"), "proton": ("energyProtonSeparationAME2020", "dEnergyProtonSeparationAME2020"), "egaf": ("energyNeutronSeparationEGAF", "dEnergyNeutronSeparationEGAF")}
         separation_dict = {}
-        if self.str.lower()=="neutron":
-            for residual in egaf_residuals:
-                SnAME = Separation.get_residual_Sn_AME(self,self.list,residual)
-                separation_dict.update({residual: (SnAME[0], SnAME[1])})
-        elif self.str.lower()=="proton":
-            for residual in egaf_residuals:
-                SpAME = Separation.get_residual_Sp_AME(self,self.list,residual)
-                separation_dict.update({residual: (SpAME[0], SpAME[1])})
-        elif self.str.lower()=="egaf":
-            for residual in egaf_residuals:
-                SnEGAF = Separation.get_residual_Sn_EGAF(self,self.list,residual)
-                separation_dict.update({residual: (SnEGAF[0], SnEGAF[1])})
+        if self.str.lower() in fields:
+            targets, residuals = [self.dataset_values(self.list, key) for key in ("nucleusTargetID", "nucleusID")]
+            energies, d_energies = [self.dataset_values(self.list, key, Separation.q_record) for key in fields[self.str.lower()]]
+            for pos in self.sorted_positions(targets):
+                separation_dict.update({residuals[pos]: (energies[pos], d_energies[pos])})
         else:
-            print("Parameter passed has no return value.")
-            print("Acceptable strings are: 'neutron', 'proton', or 'egaf'")
+            report_error(InvalidArguments, "Parameter passed has no return value.\n"
+                                           "Acceptable strings are: 'neutron', 'proton', or 'egaf'")
             separation_dict = None
 
         if separation_dict == {} or separation_dict == None:
-            print("No separation energy data available.")
+            report_error(DataNotFound, "No separation energy data available.")
             return
         else:
             return separation_dict
-        
+
+    @staticmethod
+    def q_record(jdict):
+        """Internal function: Q-value record of an EGAF data set, as used by
+        the separation-energy getters: the last `recordQ` entry, or an empty
+        dict if there is none."""
+        records = jdict["recordQ"]
+        if len(records) == 0:
+            return {}
+        return records[-1]
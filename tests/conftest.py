@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# The test modules load the EGAF data sets when they are collected; keep the
+# binary cache and memory-mapped store they write out of the user cache
+# directory.
+CACHE_DIR = tempfile.mkdtemp(prefix="pyEGAF_cache_")
+os.environ["PYEGAF_CACHE_DIR"] = CACHE_DIR
+
+def pytest_unconfigure(config):
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
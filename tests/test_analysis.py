@@ -12,6 +12,7 @@ class AnalysisTests(unittest.TestCase):
     doc = """Unit tests for the following methods of the `Analysis` class:
     
     `intensity_conversion`;
+    `intensity_conversions`;
     `modeled_sigma0`;
     `modeled_sigma0_ecrit`;
     `sum_feeding_gs`;
@@ -39,6 +40,20 @@ class AnalysisTests(unittest.TestCase):
         self.assertIsInstance(total_trans[0], float)
         self.assertIsInstance(total_trans[1], float)
 
+    def test_intensity_conversions_matches_intensity_conversion(self):
+        I, dI = np.array([0.00075, 0.5]), np.array([0.00012, 0.01])
+        alpha, d_alpha = np.array([0.000335, 0.02]), np.array([0.000005, 0.001])
+        totals, d_totals = e.intensity_conversions(I, dI, alpha, d_alpha)
+        for n in range(2):
+            total, d_total = e.intensity_conversion(I[n], dI[n], alpha[n], d_alpha[n])
+            self.assertAlmostEqual(totals[n], total, places=15)
+            self.assertAlmostEqual(d_totals[n], d_total, places=15)
+
+    def test_intensity_conversions_takes_missing_values_as_zero(self):
+        totals, d_totals = e.intensity_conversions([np.nan, 0.5], [np.nan, 0.01], [0.02, np.nan], [0.001, np.nan])
+        self.assertEqual(totals.tolist(), [0.0, 0.5])
+        self.assertEqual(d_totals.tolist(), [0.0, 0.01])
+
     # Tests for sigma0 determined using experimental cs and P0 from model
     def test_modeled_sigma0_returns_tuple(self):
         s0 = e.modeled_sigma0(0.187, 0.0033, 0.02314, 0.00080)
@@ -282,6 +297,14 @@ class AnalysisTests(unittest.TestCase):
         self.assertEqual(len(list_sum_primaries), len(res))
         self.assertIsInstance(list_sum_primaries, Iterable)
 
+    # Tests for normalising intensities to the adopted cross section
+    def test_normalise_intensities_with_adopted_sigma0_returns_list(self):
+        norm = e.normalise_intensities(edata, "Si29")
+        self.assertIsInstance(norm, list)
+        self.assertEqual(norm, e.normalise_intensities(edata, 14, 29))
+        self.assertIsNone(e.normalise_intensities(edata))
+        self.assertIsNone(e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12.5))
+
     # Tests for normalising intensities using P0 from model
     def test_normalise_intensities_returns_list(self):
         norm = e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12)
@@ -318,6 +341,17 @@ class AnalysisTests(unittest.TestCase):
         with self.assertRaises(KeyError):
             e.normalise_intensities(bad_dict_items_in_list, 14, 29, 0.02217, 0.00051, 12)
 
+    def test_normalise_intensities_returns_None_if_no_ground_state_feeding_below_Ecrit(self):
+        # The transitions feeding the ground state of 110Ag up to level 3 
+        # have no cross sections, so that sigma_0 would be zero
+        norm = e.normalise_intensities(edata, "Ag110", 0.05, 0.01, 3)
+        self.assertIsNone(norm)
+        norm = e.normalise_intensities(edata, 47, 110, 0.05, 0.01, 3)
+        self.assertIsNone(norm)
+        with egaf.error_mode("strict"):
+            with self.assertRaises(egaf.DataNotFound):
+                e.normalise_intensities(edata, "Ag110", 0.05, 0.01, 3)
+
     def test_normalise_intensities_returned_contents_of_list(self):
         norm = e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12)
         for n in norm:
@@ -683,3 +717,79 @@ class DeadEnds(unittest.TestCase):
                 self.assertIsInstance(de_e[11], float)
             except TypeError:
                 self.assertIsNone(de_e)
+
+
+class BalanceSweep(unittest.TestCase):
+
+    __doc__ = """Unit tests for the `balance_sweep` method of the Analysis 
+    class."""
+
+    sweep = e.balance_sweep(edata, intensity="isotopic")
+
+    def test_balance_sweep_returns_one_row_per_level_of_each_nucleus(self):
+        sweep = BalanceSweep.sweep
+        self.assertIsInstance(sweep, pd.DataFrame)
+        self.assertEqual(tuple(sweep.columns), egaf.analysis.SWEEP_COLUMNS)
+        self.assertEqual(sweep['Residual (CN)'].nunique(), 245)
+        self.assertEqual(len(sweep[sweep['Residual (CN)'] == "Si29"]), e.num_levels(edata, "Si29"))
+
+    def test_balance_sweep_matches_intensity_balance(self):
+        sweep = BalanceSweep.sweep
+        for residual in ["Si29", "S35", "Gd158"]:
+            balanced = sweep[(sweep['Residual (CN)'] == residual) & sweep['Residual (sigma)'].notna()]
+            ib = e.intensity_balance(edata, residual, intensity="isotopic")
+            np.testing.assert_array_equal(balanced[list(egaf.analysis.SWEEP_COLUMNS[2:11])].to_numpy(dtype=float), ib)
+
+    def test_balance_sweep_matches_dead_ends(self):
+        row = BalanceSweep.sweep[BalanceSweep.sweep['Residual (CN)'] == "S35"].iloc[0]
+        de = e.dead_ends(edata, "S35", intensity="isotopic")
+        self.assertEqual(row['GS feeding'], de[2])
+        self.assertEqual(row['CS depopulation'], de[6])
+        self.assertEqual(row['Dead-end (sigma)'], de[10])
+        self.assertEqual(row['Dead-end difference (%)'], de[11])
+
+    def test_balance_sweep_flags_levels_outside_threshold(self):
+        sweep = e.balance_sweep(edata, intensity="elemental", threshold=5.0)
+        flagged = sweep['Outside threshold']
+        self.assertTrue((sweep['Residual (sigma)'][flagged].abs() > 5.0).all())
+        self.assertFalse((sweep['Residual (sigma)'][~flagged].abs() > 5.0).any())
+
+    def test_balance_sweep_with_workers_matches_single_pass(self):
+        sweep = e.balance_sweep(list(edata), intensity="isotopic", workers=3)
+        pd.testing.assert_frame_equal(sweep, BalanceSweep.sweep)
+
+    def test_balance_sweep_for_wrong_intensity_returns_None(self):
+        self.assertIsNone(e.balance_sweep(edata, intensity="population"))
+        self.assertIsNone(e.balance_sweep(edata, workers=2, executor="XXX"))
+
+class EcritScan(unittest.TestCase):
+
+    __doc__ = """Unit tests for the `modeled_sigma0_ecrit_scan` method of the
+    Analysis class."""
+
+    P0 = [0.02893, 0.02574, 0.02490, 0.02314, 0.02256, 0.02217, 0.02197]
+    dP0 = [0.00102, 0.00093, 0.00088, 0.00080, 0.00064, 0.00051, 0.00050]
+
+    def test_ecrit_scan_matches_modeled_sigma0_ecrit(self):
+        scan = e.modeled_sigma0_ecrit_scan(edata, range(6,13), EcritScan.P0, EcritScan.dP0, "Si29")
+        self.assertIsInstance(scan, pd.DataFrame)
+        self.assertEqual(tuple(scan.columns), egaf.analysis.ECRIT_SCAN_COLUMNS)
+        self.assertEqual(scan['Level index'].tolist(), list(range(6,13)))
+        for level, P0, dP0, (_, row) in zip(range(6,13), EcritScan.P0, EcritScan.dP0, scan.iterrows()):
+            expected = e.modeled_sigma0_ecrit(edata, level, P0, dP0, 14, 29)
+            self.assertEqual([row['Ecrit (keV)'], row['GS feeding'], row['dGS feeding'], row['sigma0'], row['dsigma0']], expected)
+
+    def test_ecrit_scan_keeps_input_order_and_broadcasts_P0(self):
+        scan = e.modeled_sigma0_ecrit_scan(edata, [12, 6, 9], 0.02217, 0.00051, 14, 29)
+        self.assertEqual(scan['Level index'].tolist(), [12, 6, 9])
+        self.assertEqual(scan['P0'].tolist(), [0.02217]*3)
+        self.assertEqual(scan['sigma0'].iloc[0], e.modeled_sigma0_ecrit(edata, 12, 0.02217, 0.00051, "Si29")[3])
+
+    def test_ecrit_scan_for_invalid_arguments_returns_None(self):
+        self.assertIsNone(e.modeled_sigma0_ecrit_scan(edata, range(6,14), 0.02, 0.001, "Si29"))
+        self.assertIsNone(e.modeled_sigma0_ecrit_scan(edata, range(6,13), [0.02, 0.03], 0.001, "Si29"))
+        self.assertIsNone(e.modeled_sigma0_ecrit_scan(edata, range(6,13), 0.02, 0.001, "Se70"))
+        self.assertIsNone(e.modeled_sigma0_ecrit_scan(edata, [0, 6], 0.02, 0.001, "Si29"))
+        with egaf.error_mode("strict"):
+            with self.assertRaises(egaf.InvalidArguments):
+                e.modeled_sigma0_ecrit_scan(edata, range(6,14), 0.02, 0.001, "Si29")
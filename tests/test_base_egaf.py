@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from collections.abc import Iterable
 import pyEGAF as egaf
 e = egaf.EGAF()
@@ -7,10 +8,87 @@ edata = e.load_egaf()
 # Testing methods of the BaseEGAF class:
 
 def test_egaf_datasets_are_in_list_object():
-    assert type(e.load_egaf()) is list
+    assert isinstance(e.load_egaf(), list)
 def test_load_245_egaf_datasets_into_list():
     assert len(e.load_egaf()) == 245
 
+def test_load_egaf_with_workers_keeps_deterministic_order():
+    residuals = [jdict["nucleusID"] for jdict in edata]
+    threaded = e.load_egaf(workers=4, cache=False)
+    assert [jdict["nucleusID"] for jdict in threaded] == residuals
+    processed = e.load_egaf(workers=2, executor='process', cache=False)
+    assert [jdict["nucleusID"] for jdict in processed] == residuals
+    assert processed.find_residual("Si29") == edata.find_residual("Si29")
+def test_load_egaf_with_unknown_executor_returns_None():
+    assert e.load_egaf(workers=2, executor='XXX', cache=False) == None
+
+def test_egaf_constructor_runs_each_init_once(monkeypatch):
+    calls = []
+    init = egaf.BaseEGAF.__init__
+    monkeypatch.setattr(egaf.BaseEGAF, "__init__", lambda self, *args, **kwargs: calls.append(1) or init(self, *args, **kwargs))
+    instance = egaf.EGAF()
+    assert len(calls) == 1
+    assert instance._results_cache == None
+    assert instance._services == {}
+def test_service_returns_one_cached_instance_per_class():
+    instance = egaf.EGAF()
+    analysis = instance.service(egaf.Analysis)
+    assert isinstance(analysis, egaf.Analysis)
+    assert analysis is not instance
+    assert instance.service(egaf.Analysis) is analysis
+    assert isinstance(instance.service(egaf.Gammas), egaf.Gammas)
+    assert instance.service(egaf.Gammas) is not analysis
+def test_nested_service_calls_keep_caller_arguments():
+    instance = egaf.EGAF()
+    first = instance.modeled_sigma0_ecrit(edata, 11, 0.02256, 0.00064, "Si29")
+    assert (instance.float1, instance.float2) == (0.02256, 0.00064)
+    assert instance.modeled_sigma0_ecrit(edata, 11, 0.02256, 0.00064, "Si29") == first
+    assert e.modeled_sigma0_ecrit(edata, 11, 0.02256, 0.00064, 14, 29) == first
+
+# Testing the indexed EGAFCatalog returned by the loader:
+
+def test_egaf_datasets_are_in_catalog_object():
+    assert isinstance(edata, egaf.EGAFCatalog)
+def test_catalog_finds_residual_by_id_and_by_Z_A():
+    assert edata.find_residual("Si29")["nucleusTargetID"] == "Si28"
+    assert edata.find_residual(14, 29) is edata.find_residual("Si29")
+def test_catalog_finds_target_by_id_and_by_Z_A():
+    assert edata.find_target("Si28")["nucleusID"] == "Si29"
+    assert edata.find_target(14, 28) is edata.find_target("Si28")
+def test_catalog_returns_None_for_nucleus_not_in_EGAF():
+    assert edata.find_residual("Se70") == None
+    assert edata.find_residual(34, 70) == None
+    assert edata.find_residual("Si", "XX") == None
+    assert edata.find_target("THisIsB@LL@CK$") == None
+def test_catalog_indexes_follow_modifications():
+    cat = egaf.EGAFCatalog(edata)
+    assert cat.find_residual("Si29") is not None
+    cat.remove(cat.find_residual("Si29"))
+    assert cat.find_residual("Si29") == None
+    assert len(cat) == 244
+def test_gc_paused_restores_collector_state():
+    import gc
+    from pyEGAF.catalog import gc_paused
+    assert gc.isenabled()
+    with pytest.raises(RuntimeError):
+        with gc_paused():
+            assert not gc.isenabled()
+            raise RuntimeError
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+def test_catalog_and_plain_list_give_same_results():
+    plain = list(edata)
+    assert e.get_stats(plain, "La140") == e.get_stats(edata, "La140")
+    assert e.get_total_cross_section(plain, 14, 28) == e.get_total_cross_section(edata, 14, 28)
+    assert e.get_residual_Sn_AME(plain, "Al28") == e.get_residual_Sn_AME(edata, "Al28")
+
 def test_targets_are_in_list_object():
     assert type(e.egaf_target_list(edata)) is list    
 def test_first_target_element_is_Ag107():
@@ -140,4 +218,113 @@ def test_quad_error_float_least_required_precision():
     assert e.quad_error(21.0,3.0,0.1,7.0,0.4) == pytest.approx(1.389244)    
 def test_quad_error_float_3dp():
     assert e.quad_error(21.0,3.0,0.1,7.0,0.4) == pytest.approx(1.389, 0.001)
+def test_quad_errors_array_matches_quad_error():
+    f = np.array([21.0, 0.0, 6.0, 6.0, 0.0])
+    x = np.array([3.0, 0.0, 2.0, 0.0, -1.0])
+    dx = np.array([0.1, 0.2, 0.1, 0.1, 0.1])
+    y = np.array([7.0, 7.0, 0.0, 3.0, 0.0])
+    dy = np.array([0.4, 0.4, 0.2, 0.3, 0.3])
+    expected = [e.quad_error(*args) for args in zip(f, x, dx, y, dy)]
+    assert e.quad_errors(f, x, dx, y, dy).tolist() == pytest.approx(expected)
+def test_quad_errors_treats_NaN_as_missing_value():
+    assert e.quad_errors([np.nan, 6.0, 6.0, 6.0], [3.0, np.nan, 2.0, np.nan], 0.1, [7.0, 3.0, np.nan, np.nan], 0.3).tolist() == pytest.approx([0.0, 0.6, 0.3, 0.0])
+
+
+
+# Testing the LazyEGAFCatalog returned by the loader with lazy=True:
+
+def test_lazy_catalog_parses_nothing_on_load():
+    lazy = e.load_egaf(lazy=True)
+    assert isinstance(lazy, egaf.LazyEGAFCatalog)
+    assert len(lazy) == 245
+    assert lazy.num_loaded() == 0
+def test_lazy_catalog_parses_only_queried_nucleus():
+    lazy = e.load_egaf(lazy=True)
+    assert e.get_stats(lazy, "La140") == [187, 102, 289, 207]
+    assert e.get_stats(lazy, 57, 140) == [187, 102, 289, 207]
+    assert e.get_total_cross_section(lazy, "Si28") == e.get_total_cross_section(edata, "Si28")
+    assert lazy.num_loaded() == 2
+def test_lazy_catalog_returns_None_for_nucleus_not_in_EGAF():
+    lazy = e.load_egaf(lazy=True)
+    assert e.get_stats(lazy, "Se70") == None
+    assert lazy.find_target(34, 69) == None
+    assert lazy.num_loaded() == 0
+def test_lazy_catalog_iteration_matches_eager_catalog():
+    lazy = e.load_egaf(lazy=True)
+    assert e.egaf_residual_list(lazy) == e.egaf_residual_list(edata)
+    assert lazy.num_loaded() == 245
+    assert lazy[0] is lazy[0]
+    assert lazy[-1]["nucleusID"] == lazy[244]["nucleusID"]
+def test_lazy_catalog_modification_loads_all_datasets():
+    lazy = e.load_egaf(lazy=True)
+    si29 = lazy.find_residual("Si29")
+    lazy.remove(si29)
+    assert lazy.num_loaded() == 244
+    assert lazy.find_residual("Si29") == None
+    assert lazy.find_residual("Cl36")["nucleusTargetID"] == "Cl35"
+
+
+
+# Testing the MappedEGAFCatalog returned by the loader with mmap=True:
+
+@pytest.fixture(scope="module")
+def store_cache(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("cache"))
+
+@pytest.fixture
+def mapped(store_cache, monkeypatch):
+    monkeypatch.setenv("PYEGAF_CACHE_DIR", store_cache)
+    return e.load_egaf(mmap=True)
 
+def test_mapped_catalog_maps_gamma_table_without_parsing(mapped):
+    assert isinstance(mapped, egaf.MappedEGAFCatalog)
+    assert len(mapped) == 245
+    table = mapped.gamma_table()
+    assert isinstance(table.energy, np.memmap)
+    assert not table.energy.flags.writeable
+    assert table.residual_ids == edata.gamma_table().residual_ids
+    assert np.array_equal(table.energy, edata.gamma_table().energy, equal_nan=True)
+    assert mapped.num_loaded() == 0
+def test_mapped_catalog_rebuilds_only_queried_nucleus(mapped):
+    assert e.get_stats(mapped, "La140") == [187, 102, 289, 207]
+    assert e.normalise_intensities(mapped, "Si29", 0.02217, 0.00051, 12) == e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12)
+    assert isinstance(mapped.nucleus_gamma_table(mapped.find_residual("Si29")).energy, np.memmap)
+    assert mapped.num_loaded() == 2
+def test_mapped_catalog_searches_gammas_without_rebuilding_datasets(mapped):
+    assert mapped.dataset_values("nucleusID") == edata.dataset_values("nucleusID")
+    assert e.find_gammas(mapped, [1273.4, 6110.8], 1.0, intensity='elemental').equals(e.find_gammas(edata, [1273.4, 6110.8], 1.0, intensity='elemental'))
+    assert mapped.num_loaded() == 0
+def test_mapped_catalog_summaries_without_rebuilding_datasets(mapped):
+    assert e.get_all_nuclei(mapped).equals(e.get_all_nuclei(edata))
+    assert e.get_all_total_cross_sections(mapped) == e.get_all_total_cross_sections(edata)
+    assert e.get_all_abundances(mapped) == e.get_all_abundances(edata)
+    assert e.get_all_separation_energies(mapped, "egaf") == e.get_all_separation_energies(edata, "egaf")
+    assert e.egaf_residual_list(mapped) == e.egaf_residual_list(edata)
+    assert e.egaf_target_residual_dict(mapped) == e.egaf_target_residual_dict(edata)
+    assert mapped.num_loaded() == 0
+def test_mapped_catalog_datasets_match_json_files(mapped):
+    assert list(mapped) == list(edata)
+    assert mapped[0] is mapped[0]
+def test_mapped_catalog_pickles_as_store_path(mapped):
+    import pickle
+    copy = pickle.loads(pickle.dumps(mapped))
+    assert isinstance(copy, egaf.MappedEGAFCatalog)
+    assert len(pickle.dumps(mapped)) < 1000
+    assert copy.find_residual("Cl36") == edata.find_residual("Cl36")
+def test_mapped_catalog_modification_loads_all_datasets(mapped):
+    si29 = mapped.find_residual("Si29")
+    mapped.remove(si29)
+    assert mapped.num_loaded() == 244
+    assert mapped.find_residual("Si29") == None
+    assert not isinstance(mapped.gamma_table().energy, np.memmap)
+    assert len(mapped.gamma_table().residual_ids) == 244
+def test_mapped_store_is_stale_when_json_files_change(tmp_path):
+    from pyEGAF import mapped_store
+    json_file = tmp_path / "j_EGAF_Si28_NG_Si29.json"
+    json_file.write_text("{}")
+    store = mapped_store.write_store(str(tmp_path / "store"), [edata.find_residual("Si29")], egaf.binary_cache.build_manifest([str(json_file)]))
+    assert mapped_store.store_is_current(store, [str(json_file)])
+    assert egaf.MappedEGAFCatalog(store)[0] == edata.find_residual("Si29")
+    json_file.write_text("{ }")
+    assert not mapped_store.store_is_current(store, [str(json_file)])
+    assert not mapped_store.store_is_current(str(tmp_path / "missing"), [str(json_file)])
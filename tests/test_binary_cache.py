@@ -0,0 +1,86 @@
+import os
+import json
+import pickle
+import pytest
+import pyEGAF as egaf
+from pyEGAF import binary_cache
+
+# Testing the binary cache of the parsed JSON-formatted EGAF data sets:
+
+@pytest.fixture
+def json_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYEGAF_CACHE_DIR", str(tmp_path / "cache"))
+    data_dir = tmp_path / "EGAF_JSON"
+    data_dir.mkdir()
+    for residual in ("Si29", "Cl36"):
+        with open(data_dir / "j_EGAF_{0}.json".format(residual), "w") as jf:
+            json.dump({"nucleusID": residual, "levelScheme": []}, jf)
+    return str(data_dir)
+
+def json_files(json_dir):
+    return sorted(os.path.join(json_dir, f) for f in os.listdir(json_dir))
+
+def test_cache_directory_follows_environment(json_dir, tmp_path):
+    assert binary_cache.cache_directory() == str(tmp_path / "cache")
+    assert binary_cache.cache_path(json_dir).startswith(str(tmp_path / "cache"))
+
+def test_read_cache_returns_None_before_cache_is_built(json_dir):
+    assert binary_cache.read_cache(json_dir, json_files(json_dir)) == None
+
+def test_cache_round_trip_returns_datasets_in_order(json_dir):
+    files = json_files(json_dir)
+    datasets = [egaf.base_egaf.parse_json_file(f) for f in files]
+    assert binary_cache.write_cache(json_dir, files, datasets) != None
+    assert binary_cache.read_cache(json_dir, files) == datasets
+
+def test_cache_is_stale_when_a_file_changes(json_dir):
+    files = json_files(json_dir)
+    datasets = [egaf.base_egaf.parse_json_file(f) for f in files]
+    binary_cache.write_cache(json_dir, files, datasets)
+    with open(files[0], "w") as jf:
+        json.dump({"nucleusID": "Cl36", "levelScheme": [{"levelIndex": 0}]}, jf)
+    assert binary_cache.read_cache(json_dir, files) == None
+
+def test_cache_survives_touch_with_unchanged_contents(json_dir):
+    files = json_files(json_dir)
+    datasets = [egaf.base_egaf.parse_json_file(f) for f in files]
+    binary_cache.write_cache(json_dir, files, datasets)
+    st = os.stat(files[1])
+    os.utime(files[1], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert binary_cache.read_cache(json_dir, files) == datasets
+
+def test_cache_is_stale_when_a_file_is_added(json_dir):
+    files = json_files(json_dir)
+    datasets = [egaf.base_egaf.parse_json_file(f) for f in files]
+    binary_cache.write_cache(json_dir, files, datasets)
+    with open(os.path.join(json_dir, "j_EGAF_H2.json"), "w") as jf:
+        json.dump({"nucleusID": "H2", "levelScheme": []}, jf)
+    assert binary_cache.read_cache(json_dir, json_files(json_dir)) == None
+
+def test_clear_cache_removes_cache_file(json_dir):
+    files = json_files(json_dir)
+    binary_cache.write_cache(json_dir, files, [{}, {}])
+    binary_cache.clear_cache(json_dir)
+    assert not os.path.exists(binary_cache.cache_path(json_dir))
+
+def test_load_egaf_from_cache_matches_json(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYEGAF_CACHE_DIR", str(tmp_path))
+    e = egaf.EGAF()
+    parsed = e.load_egaf()
+    assert len(os.listdir(tmp_path)) == 1
+    cached = e.load_egaf()
+    assert isinstance(cached, egaf.EGAFCatalog)
+    assert len(cached) == 245
+    assert cached == parsed
+
+def test_write_cache_is_best_effort(json_dir, monkeypatch):
+    files = json_files(json_dir)
+    assert binary_cache.write_cache(json_dir, files, [lambda: None, {}]) == None
+    # Pickle protocol not supported by the interpreter, e.g. 5 on Python 3.7
+    monkeypatch.setattr(binary_cache, "PICKLE_PROTOCOL", pickle.HIGHEST_PROTOCOL + 1)
+    assert binary_cache.write_cache(json_dir, files, [{}, {}]) == None
+    assert not os.path.exists(binary_cache.cache_path(json_dir))
+    assert os.listdir(binary_cache.cache_directory()) == []
+
+def test_pickle_protocol_is_supported_by_interpreter():
+    assert binary_cache.PICKLE_PROTOCOL <= pickle.HIGHEST_PROTOCOL
@@ -0,0 +1,77 @@
+import pytest
+import unittest
+import numpy as np
+import pandas as pd
+import pyEGAF as egaf
+from pyEGAF.cascade import CascadeEngine, CASCADE_COLUMNS
+from pyEGAF.level_graph import LevelGraph
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+def all_cascades(engine, level, probability=1.0, path=()):
+    # Brute-force enumeration of every path down to the ground state
+    if level == 0:
+        yield (probability, path)
+        return
+    for edge in engine.graph.successors(level).tolist():
+        if engine.branching[edge] > 0.0:
+            yield from all_cascades(engine, int(engine.graph.target[edge]), probability*engine.branching[edge], path + (edge,))
+
+def engine_for(residual):
+    return e.cascade_engine(edata, edata.find_residual(residual))
+
+class CascadeTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the `CascadeEngine` and the `get_cascades` and
+    `level_populations` methods of the Analysis class."""
+
+    def test_branching_ratios_of_each_level_sum_to_one(self):
+        engine = engine_for("Cl36")
+        sums = np.bincount(engine.graph.source, weights=engine.branching, minlength=len(engine.graph))
+        deexcited = engine.graph.out_degree() > 0
+        np.testing.assert_allclose(sums[deexcited], 1.0)
+
+    def test_top_cascades_match_brute_force_enumeration(self):
+        for residual in ["Si29", "S35"]:
+            engine = engine_for(residual)
+            expected = sorted(all_cascades(engine, engine.start), key=lambda c: -c[0])
+            found = engine.top_cascades(10)
+            self.assertEqual(len(found), min(10, len(expected)))
+            for (p, edges), (p_ref, path) in zip(found, expected):
+                self.assertAlmostEqual(p, p_ref)
+                self.assertAlmostEqual(np.prod(engine.branching[edges]), p)
+
+    def test_ground_state_population_is_sum_of_all_cascades(self):
+        engine = engine_for("Si29")
+        total = sum(p for p, path in all_cascades(engine, engine.start))
+        self.assertAlmostEqual(engine.populations()[0], total)
+        self.assertEqual(engine.populations()[engine.start], 1.0)
+
+    def test_get_cascades_returns_DataFrame_of_ranked_cascades(self):
+        cascades = e.get_cascades(edata, "Si29", top=5)
+        self.assertIsInstance(cascades, pd.DataFrame)
+        self.assertEqual(tuple(cascades.columns), CASCADE_COLUMNS)
+        self.assertEqual(cascades['Rank'].tolist(), [1, 2, 3, 4, 5])
+        self.assertTrue((np.diff(cascades['Probability']) <= 0).all())
+        for levels, energies, m in zip(cascades['Levels'], cascades['Gamma energies (keV)'], cascades['Multiplicity']):
+            self.assertEqual(levels[-1], 0)
+            self.assertEqual(len(levels), m + 1)
+            self.assertEqual(len(energies), m)
+        self.assertTrue(e.get_cascades(edata, 14, 29, top=5).equals(cascades))
+
+    def test_level_populations_for_Si29(self):
+        populations = e.level_populations(edata, "Si29")
+        self.assertEqual(len(populations), e.num_levels(edata, "Si29"))
+        self.assertAlmostEqual(populations['Population'].iloc[0], 1.0)
+        self.assertAlmostEqual(populations['Population'].iloc[-1], 1.0)
+
+    def test_heavy_nuclei(self):
+        # The wall time is reported by benchmarks/bench_cascade.py
+        for residual in ["Au198", "Er168"]:
+            self.assertEqual(len(e.get_cascades(edata, residual, top=10)), 10)
+            self.assertIsNotNone(e.level_populations(edata, residual))
+
+    def test_cascades_for_nucleus_not_in_EGAF_returns_None(self):
+        self.assertIsNone(e.get_cascades(edata, "Se70"))
+        self.assertIsNone(e.level_populations(edata, 34, 70))
+        self.assertIsNone(e.get_cascades(edata, "Si29", 14, 29))
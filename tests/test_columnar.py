@@ -0,0 +1,116 @@
+import os
+import json
+import tempfile
+import pytest
+import unittest
+import numpy as np
+import pyEGAF as egaf
+from pyEGAF.columnar import COLUMNAR_TABLES, COLUMNAR_FORMATS, HDF5_STRING_SIZE, dataset_rows, dataset_frames, string_sizes, datasets_to_tables, tables_to_datasets, read_tables, export_tables
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+def installed(module):
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+class ColumnarTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the normalized columnar tables of the EGAF
+    data sets and the `export_egaf` and `load_egaf_tables` methods."""
+
+    def test_tables_have_one_row_per_record(self):
+        tables = datasets_to_tables(edata)
+        self.assertEqual(list(tables), list(COLUMNAR_TABLES))
+        for table, frame in tables.items():
+            self.assertEqual(list(frame.columns), [name for name, _ in COLUMNAR_TABLES[table]])
+        self.assertEqual(len(tables["datasets"]), 245)
+        self.assertEqual(len(tables["levels"]), sum(jdict["totalNumberLevels"] for jdict in edata))
+        self.assertEqual(len(tables["gammas"]), sum(jdict["totalNumberGammas"] for jdict in edata))
+        self.assertEqual(len(tables["intensities"]), len(tables["gammas"]))
+        self.assertEqual(len(tables["spins"]), sum(len(level["spins"]) for jdict in edata for level in jdict["levelScheme"]))
+        self.assertEqual(len(tables["isomers"]), sum(level["levelIsIsomer"] for jdict in edata for level in jdict["levelScheme"] if len(level["isomerDecay"]) > 0))
+
+    def test_dataset_frames_follow_gamma_table_order(self):
+        jdict = edata.find_residual("Si29")
+        frames = dataset_frames(jdict, 7)
+        table = e.nucleus_gamma_table(edata, jdict)
+        gammas = frames["gammas"]
+        self.assertTrue((gammas["dataset"] == 7).all())
+        np.testing.assert_array_equal(gammas["gamma"], np.arange(len(table)))
+        np.testing.assert_array_equal(gammas["gammaEnergy"], table.energy)
+        np.testing.assert_array_equal(gammas["levelIndexInitial"], table.level_i)
+        np.testing.assert_array_equal(frames["intensities"]["partialIsotopicCrossSection"], table.isotopic)
+        self.assertEqual(gammas["gammaFeedsGroundState"].dtype, bool)
+        self.assertEqual(frames["levels"]["levelIndex"].dtype, np.int64)
+        # JSON null values
+        self.assertTrue(gammas["multipolarity"].isna().all())
+        self.assertTrue(gammas["mixingRatio"].isna().all())
+
+    def test_tables_rebuild_the_JSON_objects(self):
+        datasets = tables_to_datasets(datasets_to_tables(edata))
+        self.assertEqual(datasets, list(edata))
+        for rebuilt, jdict in zip(datasets[:10], edata):
+            self.assertEqual(json.dumps(rebuilt), json.dumps(jdict))
+
+    def test_tables_rebuild_in_any_row_order(self):
+        nuclei = [edata.find_residual(r) for r in ("Cl36", "Si29", "U236")]
+        tables = {table: frame.iloc[::-1] for table, frame in datasets_to_tables(nuclei).items()}
+        self.assertEqual(tables_to_datasets(tables), nuclei)
+
+    def test_records_the_tables_cannot_hold_raise_ValueError(self):
+        jdict = json.loads(json.dumps(edata.find_residual("Si29")))
+        jdict["recordQ"].append(dict(jdict["recordQ"][0]))
+        with self.assertRaisesRegex(ValueError, "recordQ"):
+            dataset_rows(jdict, 0)
+        jdict = json.loads(json.dumps(edata.find_residual("Si29")))
+        jdict["neutronCaptureNormalization"][0]["normalizationRecord"] = []
+        with self.assertRaisesRegex(ValueError, "normalizationRecord"):
+            dataset_rows(jdict, 0)
+        jdict = json.loads(json.dumps(edata.find_residual("Si29")))
+        jdict["levelScheme"][1]["gammaDecay"][0]["reducedTransitionProbabilities"] = [{"B(E2)": 1.0}]
+        with self.assertRaisesRegex(ValueError, "reducedTransitionProbabilities"):
+            datasets_to_tables([jdict])
+
+    def test_hdf5_string_columns_are_sized_from_the_data(self):
+        sizes = string_sizes(edata)
+        self.assertEqual(set(sizes), set(COLUMNAR_TABLES))
+        self.assertEqual(sizes["datasets"]["datasetType"], HDF5_STRING_SIZE)
+        jdict = json.loads(json.dumps(edata.find_residual("Si29")))
+        jdict["datasetType"] = "x"*40
+        jdict["levelScheme"][1]["gammaDecay"][0]["multipolarity"] = "\u00b5"*20
+        sizes = string_sizes([edata[0], jdict])
+        self.assertEqual(sizes["datasets"]["datasetType"], 40)
+        self.assertEqual(sizes["gammas"]["multipolarity"], 40)
+        self.assertEqual(sizes["gammas"]["gammaTransitionType"], HDF5_STRING_SIZE)
+
+    def test_invalid_arguments(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(e.export_egaf(edata, tmp, format='csv'))
+            self.assertIsNone(e.load_egaf_tables(tmp))
+            with egaf.error_mode("strict"):
+                with self.assertRaises(egaf.InvalidArguments):
+                    e.export_egaf(edata, tmp, format='csv')
+                with self.assertRaises(egaf.DataNotFound):
+                    e.load_egaf_tables(tmp)
+
+    @unittest.skipIf(installed("pyarrow"), "pyarrow is installed")
+    def test_missing_optional_package(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(ImportError, "pyarrow"):
+                export_tables(edata[:1], tmp, "parquet")
+
+@pytest.mark.parametrize("format,module", [("parquet", "pyarrow"), ("feather", "pyarrow"), ("hdf5", "tables")])
+def test_export_and_load_round_trip(format, module):
+    pytest.importorskip(module)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = e.export_egaf(edata, tmp, format=format)
+        assert all(os.path.isfile(path) for path in paths)
+        tables = read_tables(tmp)
+        assert len(tables["gammas"]) == sum(jdict["totalNumberGammas"] for jdict in edata)
+        assert list(read_tables(tmp, tables=["levels"])) == ["levels"]
+        loaded = e.load_egaf_tables(tmp)
+        assert loaded == list(edata)
+        assert loaded.find_residual("Si29") == edata.find_residual("Si29")
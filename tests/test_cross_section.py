@@ -108,6 +108,30 @@ def test_all_abundances_dict_data_types():
         if i == 243:
             assert k == 'Zr94'            
 
+# Single-pass table of all data sets
+def test_all_nuclei_table_matches_per_nucleus_getters():
+    nuclei = e.get_all_nuclei(edata)
+    assert len(nuclei) == 245
+    assert tuple(nuclei.columns) == egaf.cross_section.NUCLEI_COLUMNS
+    assert list(nuclei['Target']) == e.egaf_target_list(edata)
+    si = nuclei[nuclei['Target'] == 'Si28'].iloc[0]
+    assert si['Residual (CN)'] == 'Si29'
+    assert (si['sigma0 (b)'], si['dsigma0 (b)'], 'b', si['Reference']) == e.get_total_cross_section(edata, "Si28")
+    assert (si['Abundance'], si['dAbundance']) == e.get_abundance(edata, "Si28")
+    assert (si['Sn AME2020 (keV)'], si['dSn AME2020 (keV)']) == e.get_residual_Sn_AME(edata, "Si29")
+    assert (si['Sp AME2020 (keV)'], si['dSp AME2020 (keV)']) == e.get_residual_Sp_AME(edata, "Si29")
+    assert (si['Sn EGAF (keV)'], si['dSn EGAF (keV)']) == e.get_residual_Sn_EGAF(edata, "Si29")
+    assert [si['Primaries'], si['Secondaries'], si['Gammas'], si['Levels']] == e.get_stats(edata, "Si29")
+
+def test_all_nuclei_structured_array_uses_NaN_for_missing_values():
+    nuclei = e.get_all_nuclei(edata, array=True)
+    assert isinstance(nuclei, np.ndarray)
+    assert nuclei.dtype.names == egaf.cross_section.NUCLEI_COLUMNS
+    assert nuclei['Gammas'].sum() == 37777
+    w = nuclei[nuclei['Target'] == 'W180'][0]
+    assert e.get_residual_Sn_EGAF(edata, "W181") == (None, None)
+    assert np.isnan(w['Sn EGAF (keV)'])
+
 # Test exception errors thrown by cross-section methods
 class CrossSectionTests(unittest.TestCase):
 
@@ -116,7 +140,8 @@ class CrossSectionTests(unittest.TestCase):
     `get_total_cross_section`;
     `get_abundance`;
     `get_all_total_cross_sections`;
-    `get_all_abundances`.
+    `get_all_abundances`;
+    `get_all_nuclei`.
     """
     
     # Throw TypeError exception if no parameters are passed
@@ -133,6 +158,8 @@ class CrossSectionTests(unittest.TestCase):
     # Throw TypeError exception if extra positional arguments are given
     def test_all_total_cross_section_throws_TypeError_with_extra_args(self):
         self.assertRaises(TypeError,e.get_all_total_cross_sections,6,12.0)
+    def test_all_nuclei_throws_TypeError_without_list(self):
+        self.assertRaises(TypeError,e.get_all_nuclei)
     def test_all_abundances_TypeError_with_extra_args(self):
         self.assertRaises(TypeError,e.get_all_abundances,"La139")    
     
@@ -184,3 +211,11 @@ class CrossSectionTests(unittest.TestCase):
     def test_all_abundances_throws_NameError_for_wrong_data_list(self):
         with self.assertRaises(NameError):
             e.get_all_abundances(this_data_list_does_not_exist)
+
+    def test_normalization_record_is_last_record_of_last_normalization(self):
+        jdict = edata.find_residual("Si29")
+        self.assertIs(egaf.CrossSection.normalization_record(jdict), jdict["neutronCaptureNormalization"][-1]["normalizationRecord"][-1])
+        first, last = {"keyNumber": "first"}, {"keyNumber": "last"}
+        self.assertIs(egaf.CrossSection.normalization_record({"neutronCaptureNormalization": [{"normalizationRecord": [first]}, {"normalizationRecord": [first, last]}]}), last)
+        self.assertEqual(egaf.CrossSection.normalization_record({"neutronCaptureNormalization": []}), {})
+        self.assertEqual(egaf.CrossSection.normalization_record({"neutronCaptureNormalization": [{"normalizationRecord": []}]}), {})
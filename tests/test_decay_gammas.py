@@ -15,6 +15,7 @@ class GammasTests(unittest.TestCase):
     `find_all_gammas_feeding_gs`;
     `get_gamma_types`;
     `find_gamma`;
+    `find_gammas`;
     `get_strongest_gammas`.
     """
 
@@ -347,6 +348,39 @@ class GammasTests(unittest.TestCase):
             e.find_gamma(bad_dict_items_in_list, 1273, 0.75, intensity="elemental")            
 
 
+    def test_find_gamma_with_plain_list_matches_catalog(self):
+        gamma_df = e.find_gamma(edata, 1273, 2.5, intensity="relative")
+        self.assertTrue(gamma_df.equals(e.find_gamma(list(edata), 1273, 2.5, intensity="relative")))
+
+    # Batched gamma searches
+    def test_find_gammas_matches_find_gamma_for_each_energy(self):
+        energies = [1273, 2223.2, 10000]
+        gamma_df = e.find_gammas(edata, energies, 1.0, intensity="isotopic")
+        self.assertIsInstance(gamma_df, pd.core.frame.DataFrame)
+        for energy in energies:
+            single_df = e.find_gamma(edata, energy, 1.0, intensity="isotopic")
+            batch_df = gamma_df[gamma_df['Search (keV)'] == energy]
+            if single_df is None:
+                self.assertEqual(len(batch_df), 0)
+                continue
+            self.assertEqual(list(batch_df['Residual (CN)']), list(single_df['Residual (CN)']))
+            np.testing.assert_allclose(batch_df['Energy (keV)'], single_df['Energy (keV)'].astype(float))
+            np.testing.assert_allclose(batch_df['Intensity'], single_df['Intensity'].astype(float))
+
+    def test_find_gammas_accepts_array_of_energies_and_tolerances(self):
+        energies = np.array([1273.0, 2223.2])
+        gamma_df = e.find_gammas(edata, energies, np.array([0.5, 2.5]))
+        self.assertEqual(set(gamma_df['Search (keV)']), {1273.0, 2223.2})
+        self.assertTrue(np.all(np.abs(gamma_df['Energy (keV)'] - gamma_df['Search (keV)']) <= 2.5))
+        self.assertEqual(gamma_df['Intensity'].max(), 100.0)
+
+    def test_find_gammas_returns_None_if_no_gammas_within_search_windows(self):
+        self.assertIsNone(e.find_gammas(edata, [10000, 12000], intensity="elemental"))
+
+    def test_find_gammas_raises_TypeError_for_string_energies(self):
+        with self.assertRaises(TypeError):
+            e.find_gammas(edata, ["1273"], intensity="population")
+
     # Strongest gammas
     def test_get_strongest_gammas_for_29Si_returns_array(self):
         all_gammas_str = e.get_strongest_gammas(edata, "Si29", intensity="isotopic")
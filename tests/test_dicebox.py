@@ -0,0 +1,98 @@
+import os
+import pytest
+import unittest
+import numpy as np
+import pandas as pd
+import pyEGAF as egaf
+from pyEGAF.dicebox import DiceboxOutput, read_dicebox
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+DICEBOX_RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "notebook", "dicebox_results")
+
+class DiceboxTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the DICEBOX output parser and the
+    `compare_dicebox` method of the Analysis class."""
+
+    def test_dice_pro_populations(self):
+        run = DiceboxOutput(os.path.join(DICEBOX_RESULTS, "Ecrit_levels_12"))
+        self.assertEqual(len(run), 12)
+        self.assertEqual(run.level.tolist(), list(range(12)))
+        self.assertEqual(run.energy[1], 1273.379)
+        self.assertEqual(run.population[1], 0.16614)
+        self.assertEqual(run.d_population[1], 0.00108)
+        self.assertEqual(run.parity[6], 1)
+        self.assertEqual(run.spin[2], 2.5)
+        self.assertEqual((run.p0, run.d_p0), (0.02256, 0.00064))
+        self.assertEqual(run.direct[6], 0.69375)
+
+    def test_dice_pro_realization_statistics(self):
+        run = DiceboxOutput(os.path.join(DICEBOX_RESULTS, "Ecrit_levels_12"))
+        self.assertEqual((run.realization, run.realizations, run.events, run.dead_ends), (10, 10, 100000, 0))
+        self.assertEqual((run.width, run.d_width), (1.53105850E-06, 2.66942516E-06))
+        self.assertEqual(run.population_correlation.shape, (12, 12))
+        np.testing.assert_array_equal(run.population_correlation, run.population_correlation.T)
+        np.testing.assert_array_equal(np.diag(run.sidefeeding_correlation), 1.0)
+        self.assertEqual(run.sidefeeding_correlation[1,0], -0.278803587)
+
+    def test_dice_ev_title_and_ecrit(self):
+        run = DiceboxOutput(os.path.join(DICEBOX_RESULTS, "Ecrit_levels_12"))
+        self.assertEqual(run.title, "Si-28(n,g)Si-29")
+        self.assertEqual(run.ecrit, 7523.13)
+        self.assertEqual(run.ecrit_index, 11)
+
+    def test_read_dicebox_orders_runs_by_ecrit(self):
+        runs = read_dicebox(DICEBOX_RESULTS)
+        self.assertEqual([run.ecrit_index for run in runs], list(range(5, 13)))
+        self.assertEqual([run.p0 for run in runs], [0.29201, 0.10600, 0.02619, 0.02564, 0.02390, 0.02314, 0.02256, 0.02217])
+        single = read_dicebox(os.path.join(DICEBOX_RESULTS, "Ecrit_levels_10"))
+        self.assertEqual(len(single), 1)
+        self.assertEqual(read_dicebox([runs[3], runs[1]]), [runs[1], runs[3]])
+
+    def test_compare_dicebox_matches_normalise_intensities(self):
+        comparison = e.compare_dicebox(edata, DICEBOX_RESULTS, "Si29")
+        self.assertIsInstance(comparison, pd.DataFrame)
+        self.assertEqual(tuple(comparison.columns), egaf.analysis.DICEBOX_COLUMNS)
+        self.assertEqual(len(comparison), sum(range(5, 13)))
+        for run in read_dicebox(DICEBOX_RESULTS):
+            rows = comparison[comparison['Ecrit index'] == run.ecrit_index]
+            self.assertEqual(rows['Level index'].tolist(), list(range(1, run.ecrit_index + 1)))
+            self.assertEqual(rows['Population'].tolist(), run.population[1:].tolist())
+            levels = e.normalise_intensities(edata, 14, 29, run.p0, run.d_p0, run.ecrit_index)
+            self.assertEqual(rows['Depopulation'].tolist(), [levels[i][5] for i in rows['Level index']])
+            self.assertEqual(rows['dDepopulation'].tolist(), [levels[i][6] for i in rows['Level index']])
+            sigma_0 = e.modeled_sigma0_ecrit(edata, run.ecrit_index, run.p0, run.d_p0, "Si29")
+            self.assertTrue((rows['sigma0'] == sigma_0[3]).all())
+
+    def test_compare_dicebox_residuals(self):
+        comparison = e.compare_dicebox(edata, [os.path.join(DICEBOX_RESULTS, "Ecrit_levels_12")], 14, 29)
+        row = comparison.iloc[0]
+        self.assertAlmostEqual(row['Residual (sigma)'], abs(row['Population'] - row['Depopulation'])/np.sqrt(row['dPopulation']**2 + row['dDepopulation']**2))
+
+    def test_compare_dicebox_for_missing_data_returns_None(self):
+        self.assertIsNone(e.compare_dicebox(edata, os.path.join(DICEBOX_RESULTS, "XXX"), "Si29"))
+        self.assertIsNone(e.compare_dicebox(edata, DICEBOX_RESULTS, "Se70"))
+        with egaf.error_mode("strict"):
+            with self.assertRaises(egaf.DataNotFound):
+                e.compare_dicebox(edata, os.path.join(DICEBOX_RESULTS, "XXX"), "Si29")
+
+def test_multiple_realization_blocks_keep_the_last(tmp_path):
+    block = (" Parameters of nuclear realizations:\n"
+             "  Realization #           {0}  of           2\n"
+             "  Number of events         500\n\n"
+             " Capt.state tot.rad.width (MeV):    1.0E-06  +/-   2.0E-07\n\n"
+             " Number of cascades terminating at a dead end:            {0}\n"
+             " Population of low-lying states\n"
+             "  1   0.000000   1.00000 +- 0.00000        0.5  0\n"
+             "  2   1.000000   0.{0}0000 +- 0.01000        1.5  1\n\n"
+             " Direct population of low-lying states from continuum\n"
+             "  1   0.000000   0.0{0}000 +- 0.00100        0.5  0\n"
+             "  2   1.000000   0.50000 +- 0.01000        1.5  1\n\n")
+    (tmp_path / "DICE.PRO").write_text(block.format(1) + block.format(2))
+    run = DiceboxOutput(str(tmp_path))
+    assert run.title is None
+    assert (run.realization, run.realizations, run.events, run.dead_ends) == (2, 2, 500, 2)
+    assert run.population.tolist() == [1.0, 0.2]
+    assert (run.p0, run.ecrit, run.ecrit_index) == (0.02, 1000.0, 1)
+    assert run.population_correlation.shape == (0, 0)
@@ -0,0 +1,48 @@
+import pytest
+import logging
+import pyEGAF as egaf
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+# Testing the library-wide error modes:
+
+def test_default_error_mode_prints_and_returns_None(capsys):
+    assert egaf.get_error_mode() == "print"
+    assert e.get_stats(edata, "Se70") == None
+    assert "No (n,g) data for input residual nucleus." in capsys.readouterr().out
+
+def test_quiet_mode_logs_instead_of_printing(capsys, caplog):
+    with caplog.at_level(logging.INFO, logger="pyEGAF"):
+        with egaf.error_mode("quiet"):
+            assert e.get_residual_Sn_AME(edata, "Se70") == None
+            assert e.num_levels(edata, "Si29") == 14
+    assert capsys.readouterr().out == ""
+    assert "No residual nucleus in EGAF file for defined input." in caplog.text
+    assert "Total number of levels = 14" in caplog.text
+    assert egaf.get_error_mode() == "print"
+
+def test_strict_mode_raises_typed_exceptions(capsys):
+    with egaf.error_mode("strict"):
+        with pytest.raises(egaf.NucleusNotFound):
+            e.get_total_cross_section(edata, "Se70")
+        with pytest.raises(egaf.InvalidArguments):
+            e.num_primaries(edata, "Si29", 14, 29)
+        with pytest.raises(egaf.InvalidIntensityMode):
+            e.get_gammas(edata, "Si29", intensity="XXX")
+        with pytest.raises(egaf.DataNotFound):
+            e.find_gamma(edata, 20000.0, 0.5, intensity="elemental")
+        assert e.get_abundance(edata, "Si28") == e.get_all_abundances(edata)["Si28"]
+    assert capsys.readouterr().out == ""
+
+def test_strict_mode_exceptions_derive_from_builtin_types():
+    assert issubclass(egaf.NucleusNotFound, LookupError)
+    assert issubclass(egaf.DataNotFound, LookupError)
+    assert issubclass(egaf.InvalidIntensityMode, ValueError)
+    assert issubclass(egaf.InvalidArguments, egaf.EGAFError)
+
+def test_set_error_mode_returns_previous_mode_and_rejects_unknown_modes():
+    assert egaf.set_error_mode("QUIET") == "print"
+    assert egaf.set_error_mode("print") == "quiet"
+    with pytest.raises(ValueError):
+        egaf.set_error_mode("loud")
+    assert egaf.get_error_mode() == "print"
@@ -1,9 +1,15 @@
+import os
+import io
+import contextlib
+import tempfile
 import pytest
 import unittest
 import numpy as np
 import pandas as pd
 from collections.abc import Iterable
 import pyEGAF as egaf
+from pyEGAF.ensdf import ensdf_index, iter_ensdf_records, ensdf_records, ensdf_uncertainty, ENSDF_DTYPES
+from pyEGAF.ripl import RiplIndex, ripl_index, parse_ripl_bytes, parse_ripl_lines, RIPL_HEADER_DTYPE
 e = egaf.EGAF()
 edata = e.load_egaf()
 
@@ -59,6 +65,191 @@ class FileHandlerTests(unittest.TestCase):
             assert len(ensdf) > 0
         self.assertEqual(len(res), len(list_ensdf_files))            
 
+    def test_get_ensdf_ignores_letter_case_of_residual(self):
+        ensdf = e.get_ensdf(edata, "Si29", display=False)
+        self.assertEqual(len(ensdf), 71)
+        self.assertEqual(e.get_ensdf(edata, "si29", display=False), ensdf)
+        self.assertEqual(e.get_ensdf(edata, "SI29", display=False), ensdf)
+
     def test_get_ensdf_returns_None_if_not_in_EGAF_residuals(self):
         ensdf = e.get_ensdf(edata, "Se70")
         self.assertIsNone(ensdf)        
+
+class RiplIndexTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the (A, Z) index of the RIPL files and the
+    `get_ripl_records` method of the RIPL class."""
+
+    def test_index_covers_all_RIPL_files_and_matches_headers(self):
+        index = ripl_index()
+        self.assertEqual(len(index), 245)
+        self.assertIs(ripl_index(), index)
+        for (A, Z), (path, offset, length) in index.entries.items():
+            self.assertEqual(offset, 0)
+            with open(path) as rf:
+                header = rf.readline().split()
+            self.assertEqual((int(header[1]), int(header[2])), (A, Z))
+
+    def test_index_reads_exactly_one_data_set(self):
+        index = ripl_index()
+        lines = index.read(29, 14)
+        self.assertEqual(lines[0].split()[0], "29Si")
+        self.assertEqual(lines, index.read(29, 14, use_mmap=True))
+        self.assertIsNone(index.read(70, 34))
+
+    def test_index_scans_files_with_several_data_sets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = ripl_index()
+            si29 = index.read_bytes(29, 14)
+            cl36 = index.read_bytes(36, 17)
+            with open(os.path.join(tmp, "combined.dat"), "wb") as wf:
+                wf.write(si29 + cl36)
+            combined = RiplIndex(tmp)
+            self.assertEqual(combined.find(36, 17), (os.path.join(tmp, "combined.dat"), len(si29), len(cl36)))
+            self.assertEqual(combined.read_bytes(29, 14), si29)
+            self.assertEqual(combined.read_bytes(36, 17, use_mmap=True), cl36)
+
+    def test_get_ripl_display_and_mmap(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            ripl = e.get_ripl(edata, "Si29", display=False)
+            ripl_mmap = e.get_ripl(edata, "Si29", display=False, mmap=True)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(ripl, ripl_mmap)
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            e.get_ripl(edata, "Si29")
+        self.assertEqual(stdout.getvalue(), "".join(ripl))
+
+    def test_get_ripl_records_of_several_nuclei(self):
+        headers, levels, gammas = e.get_ripl_records(edata, "Si29", "Cl36")
+        self.assertEqual(headers.dtype, RIPL_HEADER_DTYPE)
+        self.assertEqual(headers['symbol'].tolist(), ["29Si", "36Cl"])
+        for n in range(2):
+            self.assertEqual((levels['nucleus'] == n).sum(), headers['num_levels'][n])
+            self.assertEqual((gammas['nucleus'] == n).sum(), headers['num_gammas'][n])
+            self.assertEqual(levels['num_gammas'][levels['nucleus'] == n].sum(), headers['num_gammas'][n])
+        si29 = levels[levels['nucleus'] == 0]
+        self.assertEqual(si29['level'][1], 1)
+        self.assertEqual(si29['energy'][1], 1.273379)
+        self.assertEqual((si29['spin'][1], si29['parity'][1], si29['jpi'][1]), (1.5, 1, "3/2+"))
+        self.assertEqual(si29['half_life'][1], 2.90E-13)
+        first = gammas[0]
+        self.assertEqual((first['level_i'], first['level_f'], first['energy'], first['photon_branching']), (1, 0, 1.273, 1.0))
+        self.assertTrue((gammas['level_f'] < gammas['level_i']).all())
+
+    def test_get_ripl_records_of_all_nuclei(self):
+        headers, levels, gammas = e.get_ripl_records(edata)
+        self.assertEqual(len(headers), 245)
+        self.assertEqual(len(levels), headers['num_levels'].sum())
+        self.assertEqual(len(gammas), headers['num_gammas'].sum())
+        self.assertIsNone(e.get_ripl_records(edata, "Si29", "Se70"))
+
+    def test_vectorized_reader_matches_line_parser(self):
+        index = ripl_index()
+        keys = sorted(index.entries)
+        for fast, slow in zip(index.records(keys), index.records_by_line(keys)):
+            self.assertEqual(fast.dtype, slow.dtype)
+            self.assertEqual(len(fast), len(slow))
+            for name in fast.dtype.names:
+                np.testing.assert_array_equal(fast[name], slow[name])
+
+    def test_vectorized_reader_edge_cases(self):
+        headers, levels, gammas = parse_ripl_bytes(b"")
+        self.assertEqual((len(headers), len(levels), len(gammas)), (0, 0, 0))
+        # A data set without a final newline, followed by a blank line
+        si29 = ripl_index().read_bytes(29, 14)
+        for data in [si29.rstrip(b"\n"), si29 + b"\n"]:
+            records = parse_ripl_bytes(data)
+            expected = parse_ripl_lines(si29.decode().splitlines(True))
+            self.assertEqual(records[0].tolist(), [expected[0]])
+            self.assertEqual(records[1].tolist(), expected[1])
+            self.assertEqual(records[2].tolist(), expected[2])
+
+class EnsdfRecordTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the residual-ID index of the ENSDF files, the
+    ENSDF record parser and the `get_ensdf_records` method of the ENSDF
+    class."""
+
+    def test_index_covers_all_EGAF_residuals(self):
+        index = ensdf_index()
+        self.assertIs(ensdf_index(), index)
+        self.assertEqual(sorted(index.entries), sorted(e.egaf_residual_list(edata)))
+        self.assertTrue(index.find("Si29").endswith("EGAF_03_28SI_ng_29SI.ens"))
+        self.assertEqual(index.dataset_pattern("H2"), "1H_ng_2H")
+        self.assertIsNone(index.find("Se70"))
+        self.assertIsNone(index.read("Se70"))
+        self.assertEqual(index.find("si29"), index.find("Si29"))
+        self.assertEqual(index.find("29SI"), index.find("Si29"))
+        self.assertIn("cl36", index)
+        self.assertIsNone(index.find("si"))
+
+    def test_ensdf_uncertainty(self):
+        self.assertEqual(ensdf_uncertainty("1273.379", "17"), 0.017)
+        self.assertEqual(ensdf_uncertainty("0.177", " 5"), 0.005)
+        self.assertEqual(ensdf_uncertainty("2.1E-05", " 8"), 8e-06)
+        self.assertEqual(ensdf_uncertainty("37.6", "12"), 1.2)
+        self.assertEqual(ensdf_uncertainty("290", "10"), 10.0)
+        for value, uncertainty in [("0.177", ""), ("0.177", "LT"), ("0.177", "+3-2"), ("0.0+X", "5"), ("", "5")]:
+            self.assertTrue(np.isnan(ensdf_uncertainty(value, uncertainty)))
+
+    def test_records_of_one_data_set(self):
+        records = ensdf_records(ensdf_index().cards("Si29"))
+        for record_type, dtype in ENSDF_DTYPES.items():
+            self.assertEqual(records[record_type].dtype, dtype)
+        identification = records['identification']
+        self.assertEqual((len(identification), identification['nucid'][0], identification['dsid'][0]), (1, "29SI", "28SI(N,G) E=THERMAL: {~EGAF}"))
+        comments = records['comment']
+        self.assertEqual(comments['text'][0], "Evaluated Gamma-ray Activation File (EGAF).")
+        self.assertEqual(comments['continuation'][1], "2")
+        self.assertEqual(comments['record_type'][2:6].tolist(), ["", "G", "N", "N"])
+        normalization = records['normalization']
+        self.assertEqual(normalization['production'].tolist(), [False, True])
+        self.assertEqual((normalization['nr'][0], normalization['d_nr'][0]), (1.084249, 8e-06))
+        self.assertEqual((normalization['nt'][0], normalization['d_nt'][0]), (0.177, 0.005))
+        level = records['level'][1]
+        self.assertEqual((level['level'], level['energy'], level['d_energy'], level['jpi']), (1, 1273.379, 0.017, "3/2+"))
+        self.assertEqual((level['half_life'], level['d_half_life']), ("290 FS", "10"))
+        jdict = edata.find_residual("Si29")
+        gammas = records['gamma']
+        self.assertEqual(len(gammas), jdict["totalNumberGammas"])
+        self.assertEqual(len(records['level']), jdict["totalNumberLevels"])
+        self.assertEqual((gammas['level'][0], gammas['energy'][0], gammas['d_energy'][0]), (1, 1273.349, 0.017))
+        self.assertTrue((gammas['line'][1:] > gammas['line'][:-1]).all())
+
+    def test_records_are_parsed_lazily(self):
+        cards = iter(ensdf_index().read("Si29"))
+        records = iter_ensdf_records(cards)
+        self.assertEqual(next(records)[0], 'identification')
+        self.assertEqual(next(records)[0], 'comment')
+        # Only the two cards yielded have been consumed
+        self.assertEqual(len(list(cards)), len(ensdf_index().read("Si29")) - 2)
+
+    def test_get_ensdf_records_of_all_nuclei_match_JSON(self):
+        records = e.get_ensdf_records(edata)
+        self.assertEqual(len(records['identification']), 245)
+        for n, jdict in enumerate(edata):
+            levels = records['level'][records['level']['dataset'] == n]
+            gammas = records['gamma'][records['gamma']['dataset'] == n]
+            self.assertEqual(len(levels), jdict["totalNumberLevels"])
+            self.assertEqual(len(gammas), jdict["totalNumberGammas"])
+            energies = np.array([level["levelEnergy"] for level in jdict["levelScheme"]])
+            numeric = ~np.isnan(levels['energy'])
+            np.testing.assert_allclose(levels['energy'][numeric], energies[numeric])
+
+    def test_get_ensdf_records_selection_and_errors(self):
+        records = e.get_ensdf_records(edata, "Cl36", "Si29", record_types=('level',))
+        self.assertEqual(list(records), ['level'])
+        self.assertEqual(records['level']['nucid'][records['level']['dataset'] == 1][0], "29SI")
+        self.assertIsNone(e.get_ensdf_records(edata, "Si29", "Se70"))
+        with egaf.error_mode("strict"):
+            with self.assertRaises(egaf.NucleusNotFound):
+                e.get_ensdf_records(edata, "Se70")
+
+    def test_get_ensdf_display(self):
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            ensdf = e.get_ensdf(edata, "Si29", display=False)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(ensdf, ensdf_index().read("Si29"))
@@ -0,0 +1,71 @@
+import pytest
+import unittest
+import numpy as np
+import pyEGAF as egaf
+from pyEGAF.gamma_table import GammaTable, PRIMARY, SECONDARY
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+class GammaTableTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the columnar `GammaTable` of the EGAF gamma 
+    rays and the `gamma_table` method of the EGAFCatalog class.
+    """
+
+    def test_gamma_table_holds_all_37777_gammas(self):
+        table = edata.gamma_table()
+        self.assertEqual(len(table), 37777)
+        self.assertEqual(len(table.residual_ids), 245)
+        self.assertEqual(int(np.sum(table.transition_type == PRIMARY)), 8172)
+        self.assertEqual(int(np.sum(table.transition_type == SECONDARY)), 29605)
+
+    def test_gamma_table_is_built_once(self):
+        self.assertIs(edata.gamma_table(), edata.gamma_table())
+
+    def test_gamma_table_offsets_match_num_gammas(self):
+        table = edata.gamma_table()
+        for n, residual in enumerate(table.residual_ids):
+            self.assertEqual(len(table.nucleus(n)), e.num_gammas(edata, residual))
+            self.assertTrue(np.all(table.nucleus(n).residual == n))
+
+    def test_nucleus_slice_matches_get_gammas(self):
+        table = edata.gamma_table()
+        si29 = table.nucleus(table.residual_ids.index("Si29"))
+        spe = e.get_gammas(edata, "Si29", intensity="isotopic")
+        np.testing.assert_array_equal(si29.spectrum(*si29.intensity("isotopic")), spe)
+        self.assertEqual(int(np.sum(si29.feeds_gs)), len(e.find_all_gammas_feeding_gs(edata, "Si29", intensity="isotopic")))
+
+    def test_relative_intensity_maximum_is_100_for_each_nucleus(self):
+        table = edata.gamma_table()
+        rel_I, d_rel_I = table.relative_intensity()
+        self.assertEqual(np.maximum.reduceat(rel_I, table.offsets[:-1]).tolist(), [100.0]*245)
+        self.assertTrue(np.all(d_rel_I >= 0.0))
+
+    def test_intensity_returns_None_for_unknown_keyword(self):
+        self.assertIsNone(edata.gamma_table().intensity("relativistic"))
+
+    def test_from_datasets_of_plain_list_matches_catalog(self):
+        si29 = edata.find_residual("Si29")
+        table = GammaTable.from_datasets([si29])
+        np.testing.assert_array_equal(table.energy, edata.nucleus_gamma_table(si29).energy)
+
+    def test_get_gammas_with_plain_list_matches_catalog(self):
+        np.testing.assert_array_equal(e.get_gammas(list(edata), "Na24", intensity="relative"), e.get_gammas(edata, "Na24", intensity="relative"))
+
+    def test_energy_window_matches_linear_scan(self):
+        table = edata.gamma_table()
+        rows = table.energy_window(1272.5, 1273.5)
+        expected = np.nonzero((table.energy >= 1272.5) & (table.energy <= 1273.5))[0]
+        np.testing.assert_array_equal(rows, expected)
+
+    def test_energy_windows_groups_matches_by_window(self):
+        table = edata.gamma_table()
+        window, rows = table.energy_windows(np.array([1272.5, 9000.0, 2222.0]), np.array([1273.5, 9001.0, 2224.0]))
+        self.assertNotIn(1, window.tolist())
+        self.assertEqual(window.tolist(), sorted(window.tolist()))
+        np.testing.assert_array_equal(np.sort(rows[window == 0]), table.energy_window(1272.5, 1273.5))
+
+    def test_max_intensity_is_computed_once(self):
+        table = edata.gamma_table()
+        self.assertIs(table.max_intensity(), table.max_intensity())
+        self.assertEqual(len(table.max_intensity()), 245)
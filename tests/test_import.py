@@ -0,0 +1,46 @@
+import os
+import sys
+import subprocess
+import pyEGAF as egaf
+
+# Testing that `import pyEGAF` stays light: pandas is only imported by the
+# methods that build DataFrames.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(egaf.__file__)))
+
+def run_python(code):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([ROOT] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p])
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+def import_time(modules, repeat=3):
+    code = "import time; start = time.perf_counter(); import {0}; print(time.perf_counter() - start)".format(modules)
+    return min(float(run_python(code)) for _ in range(repeat))
+
+def test_import_does_not_load_pandas():
+    assert run_python("import sys, pyEGAF; print('pandas' in sys.modules)") == "False"
+
+def test_methods_without_DataFrames_do_not_load_pandas():
+    code = ("import sys, io, contextlib, pyEGAF\n"
+            "e = pyEGAF.EGAF()\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    edata = e.load_egaf(lazy=True)\n"
+            "    e.get_total_cross_section(edata, 'Si28')\n"
+            "    e.get_ensdf(edata, 'Si29')\n"
+            "print('pandas' in sys.modules)")
+    assert run_python(code) == "False"
+
+def test_DataFrame_methods_load_pandas():
+    code = ("import sys, io, contextlib, pyEGAF\n"
+            "e = pyEGAF.EGAF()\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    df = e.find_gamma(e.load_egaf(lazy=True), 1273, intensity='isotopic')\n"
+            "print(type(df).__name__)")
+    assert run_python(code) == "DataFrame"
+
+def test_import_time():
+    # Best-of-3 wall time of the import in a fresh interpreter
+    light = import_time("pyEGAF")
+    with_pandas = import_time("pyEGAF, pandas")
+    assert light < 0.8*with_pandas
@@ -0,0 +1,57 @@
+import pytest
+import unittest
+import numpy as np
+import pyEGAF as egaf
+from pyEGAF.level_graph import LevelGraph
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+def si29_graph():
+    return LevelGraph(edata.nucleus_gamma_table(edata.find_residual("Si29")))
+
+class LevelGraphTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the CSR decay-scheme graph `LevelGraph`."""
+
+    def test_graph_has_one_node_per_level_and_one_edge_per_gamma(self):
+        graph = si29_graph()
+        self.assertEqual(len(graph), e.num_levels(edata, "Si29"))
+        self.assertEqual(graph.num_edges(), e.num_gammas(edata, "Si29"))
+        self.assertEqual(int(graph.out_degree().sum()), graph.num_edges())
+        self.assertEqual(int(graph.in_degree().sum()), graph.num_edges())
+
+    def test_csr_edges_leave_and_enter_their_levels(self):
+        graph = si29_graph()
+        for level in range(len(graph)):
+            self.assertTrue(np.all(graph.source[graph.successors(level)] == level))
+            self.assertTrue(np.all(graph.target[graph.predecessors(level)] == level))
+            self.assertTrue(np.all(np.diff(graph.successors(level)) > 0))
+        self.assertEqual(len(graph.successors(0)), 0)
+        self.assertEqual(len(graph.predecessors(0)), len(e.find_all_gammas_feeding_gs(edata, "Si29", intensity="isotopic")))
+
+    def test_balance_matches_level_by_level_sums(self):
+        graph = si29_graph()
+        table = graph.table
+        w, dw = e.intensity_conversions(table.isotopic, table.d_isotopic, table.icc, table.d_icc)
+        b = graph.balance(w, dw)
+        for level in range(len(graph)):
+            self.assertAlmostEqual(b["depopulation"][level], w[table.level_i == level].sum())
+            self.assertAlmostEqual(b["feeding"][level], w[table.level_f == level].sum())
+        np.testing.assert_array_equal(b["difference"], b["feeding"] - b["depopulation"])
+
+    def test_intensity_balance_rows_agree_with_graph(self):
+        graph = si29_graph()
+        table = graph.table
+        w, dw = e.intensity_conversions(table.isotopic, table.d_isotopic, table.icc, table.d_icc)
+        b = graph.balance(w, dw)
+        energies = graph.level_energies()
+        for row in e.intensity_balance(edata, "Si29", intensity="isotopic"):
+            level = int(row[0])
+            self.assertEqual(row[1], energies[level])
+            self.assertEqual(row[8], b["residual"][level])
+
+    def test_empty_table_gives_empty_graph(self):
+        table = edata.nucleus_gamma_table(edata.find_residual("Si29"))
+        graph = LevelGraph(table.select(np.zeros(len(table), dtype=bool)))
+        self.assertEqual(len(graph), 0)
+        self.assertEqual(len(graph.level_energies()), 0)
@@ -0,0 +1,114 @@
+import pytest
+import unittest
+import numpy as np
+import pyEGAF as egaf
+from pyEGAF.monte_carlo import MonteCarlo, percentile_summary
+from pyEGAF.level_graph import LevelGraph
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+class MonteCarloTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the `MonteCarlo` sampler and the Monte Carlo
+    methods of the Analysis class."""
+
+    def test_percentile_summary_of_normal_draws(self):
+        draws = np.random.default_rng(1).normal(2.0, 0.5, 200000)
+        median, lower, upper = percentile_summary(draws)
+        self.assertAlmostEqual(median, 2.0, places=2)
+        self.assertAlmostEqual(lower, 0.5, places=2)
+        self.assertAlmostEqual(upper, 0.5, places=2)
+
+    def test_draws_without_uncertainties_reproduce_level_sums(self):
+        table = e.nucleus_gamma_table(edata, edata.find_residual("S33"))
+        graph = LevelGraph(table)
+        zeros = np.zeros(len(table))
+        mc = MonteCarlo(graph, table.isotopic, zeros, table.icc, zeros, seed=1, chunk_size=3)
+        draws = mc.sample(10, table.level_f == 0, sigma0=0.5)
+        total, d_total = e.intensity_conversions(table.isotopic, zeros, table.icc, zeros)
+        depop, _ = graph.depopulation(total, zeros)
+        for row in draws["depopulation"]:
+            np.testing.assert_allclose(row, depop)
+        np.testing.assert_allclose(draws["populations"], draws["depopulation"]/0.5)
+        np.testing.assert_allclose(draws["feeding_gs"], total[table.level_f == 0].sum())
+
+    def test_seed_reproduces_draws(self):
+        first = e.modeled_sigma0_ecrit_mc(edata, 11, 0.02256, 0.00064, "Si29", samples=1000, seed=7)
+        second = e.modeled_sigma0_ecrit_mc(edata, 11, 0.02256, 0.00064, "Si29", samples=1000, seed=7)
+        self.assertEqual(first, second)
+
+    def test_chunk_size_does_not_bias_draws(self):
+        table = e.nucleus_gamma_table(edata, edata.find_residual("Si29"))
+        graph = LevelGraph(table)
+        medians = []
+        for chunk_size in [None, 1000, 333]:
+            mc = MonteCarlo(graph, table.isotopic, table.d_isotopic, table.icc, table.d_icc, seed=1, chunk_size=chunk_size)
+            draws = mc.sample(20000, (table.level_f == 0) & (table.level_i <= 11), p0=0.02256, d_p0=0.00064)
+            self.assertEqual(draws["populations"].shape, (20000, len(graph)))
+            medians.append(percentile_summary(draws["sigma0"]))
+        for median in medians[1:]:
+            self.assertAlmostEqual(median[0], medians[0][0], places=3)
+            self.assertAlmostEqual(median[1], medians[0][1], places=3)
+
+    def test_modeled_sigma0_mc_agrees_with_quadrature(self):
+        sigma_0, d_sigma_0 = e.modeled_sigma0(0.1827, 0.0027, 0.02314, 0.00080)
+        median, lower, upper = e.modeled_sigma0_mc(0.1827, 0.0027, 0.02314, 0.00080, seed=1)
+        self.assertAlmostEqual(median, sigma_0, places=3)
+        self.assertAlmostEqual(lower/d_sigma_0, 1.0, places=1)
+        self.assertAlmostEqual(upper/d_sigma_0, 1.0, places=1)
+
+    def test_modeled_sigma0_ecrit_mc_agrees_with_quadrature(self):
+        expected = e.modeled_sigma0_ecrit(edata, 11, 0.02256, 0.00064, "Si29")
+        found = e.modeled_sigma0_ecrit_mc(edata, 11, 0.02256, 0.00064, 14, 29, seed=1)
+        self.assertEqual(len(found), 7)
+        self.assertEqual(found[0], expected[0])
+        self.assertAlmostEqual(found[1], expected[1], places=3)
+        self.assertAlmostEqual(found[4], expected[3], places=3)
+        for d_found in found[2:4]:
+            self.assertAlmostEqual(d_found/expected[2], 1.0, places=1)
+        for d_found in found[5:7]:
+            self.assertAlmostEqual(d_found/expected[4], 1.0, places=1)
+
+    def test_normalise_intensities_mc_agrees_with_quadrature(self):
+        for args in [("Si29",), (14, 29), ("Si29", 0.02217, 0.00051, 12)]:
+            expected = e.normalise_intensities(edata, *args)
+            found = e.normalise_intensities_mc(edata, *args, samples=20000, seed=1)
+            self.assertEqual(len(found), len(expected))
+            for f, x in zip(found, expected):
+                self.assertEqual(f[:3], x[:3])
+                self.assertEqual(len(f), 9)
+                # Medians within the statistical precision of 20000 draws
+                self.assertLessEqual(abs(f[3] - x[3]), 0.05*x[4])
+                self.assertLessEqual(abs(f[6] - x[5]), 0.05*x[6])
+
+    def test_correlated_normalisation_reduces_population_uncertainty(self):
+        # The 1273-keV level depopulation also enters sigma0 through the
+        # ground-state feeding, which first-order quadrature ignores
+        expected = e.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12)
+        found = e.normalise_intensities_mc(edata, "Si29", 0.02217, 0.00051, 12, samples=20000, seed=1)
+        self.assertLess(found[1][7], expected[1][6])
+        self.assertLess(found[1][8], expected[1][6])
+
+    def test_invalid_arguments_return_None(self):
+        self.assertIsNone(e.modeled_sigma0_ecrit_mc(edata, 5, 0.29201, 0.17387, "Se70"))
+        self.assertIsNone(e.modeled_sigma0_ecrit_mc(edata, 500, 0.29201, 0.17387, "Si29"))
+        self.assertIsNone(e.normalise_intensities_mc(edata, 34, 70))
+        self.assertIsNone(e.normalise_intensities_mc(edata, "Si29", 0.02217, 0.00051, 12.5))
+        # No transition feeding the ground state of 110Ag up to level 3 has a cross section
+        self.assertIsNone(e.normalise_intensities_mc(edata, "Ag110", 0.05, 0.01, 3))
+
+    def test_invalid_nucleus_raises_in_strict_mode(self):
+        with egaf.error_mode("strict"):
+            with self.assertRaises(egaf.NucleusNotFound):
+                e.normalise_intensities_mc(edata, 34, 70)
+
+def test_monte_carlo_draws_of_large_decay_scheme():
+    # Draws of the 393-gamma decay scheme of 36Cl over several chunks; the
+    # wall time is reported by benchmarks/bench_monte_carlo.py
+    jdict = edata.find_residual("Cl36")
+    mc = e.monte_carlo(edata, jdict, seed=1, chunk_size=1000)
+    table = mc.graph.table
+    assert len(table) > 350
+    draws = mc.sample(2500, table.level_f == 0, p0=0.05, d_p0=0.01)
+    assert draws["sigma0"].shape == (2500,)
+    assert np.isfinite(draws["sigma0"]).all()
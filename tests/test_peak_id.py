@@ -0,0 +1,73 @@
+import pytest
+import unittest
+import numpy as np
+import pandas as pd
+import pyEGAF as egaf
+from pyEGAF.peak_id import PeakIdentifier, peak_columns
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+class PeakIdentificationTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the `PeakIdentifier` engine and the 
+    `identify_peaks` method of the Gammas class.
+    """
+
+    def strong_lines_of(self, pid, residual):
+        n = edata.gamma_table().residual_ids.index(residual)
+        return pid.energy[pid.residual == n], pid.d_energy[pid.residual == n]
+
+    def test_library_holds_strongest_lines_of_each_nucleus(self):
+        pid = PeakIdentifier(edata.gamma_table(), strong_lines=3)
+        energy, d_energy = self.strong_lines_of(pid, "Si29")
+        strongest = e.get_strongest_gammas(edata, "Si29", intensity="elemental")
+        np.testing.assert_array_equal(np.sort(energy), np.sort(strongest['E (keV)'].to_numpy()))
+        self.assertTrue(np.all(pid.num_lines <= 3))
+
+    def test_match_agrees_with_linear_scan(self):
+        pid = PeakIdentifier(edata.gamma_table())
+        energy = np.random.default_rng(7).uniform(50.0, 9000.0, 500)
+        sigma = np.full(len(energy), 0.3)
+        m = pid.match(energy, sigma)
+        z = np.abs(pid.energy[None,:] - energy[:,None])/np.sqrt(pid.d_energy[None,:]**2 + sigma[:,None]**2)
+        peak, line = np.nonzero(z <= 3.0)
+        self.assertEqual(sorted(zip(peak.tolist(), line.tolist())), sorted(zip(m["peak"].tolist(), m["line"].tolist())))
+
+    def test_rank_scores_all_strong_lines_present_as_1(self):
+        pid = PeakIdentifier(edata.gamma_table())
+        energy, d_energy = self.strong_lines_of(pid, "Cl36")
+        ranked = pid.rank(energy, np.full(len(energy), 0.1))
+        n = edata.gamma_table().residual_ids.index("Cl36")
+        self.assertEqual(ranked["residual"][0], n)
+        self.assertEqual(ranked["score"][0], 1.0)
+        self.assertEqual(ranked["lines_found"][0], 10)
+        self.assertTrue(ranked["strongest_found"][0])
+
+    def test_peak_columns_accepts_1_2_and_3_columns(self):
+        energy, sigma, area = peak_columns([1273.0, 2223.2], 0.5)
+        self.assertEqual(sigma.tolist(), [0.5, 0.5])
+        self.assertTrue(np.all(np.isnan(area)))
+        energy, sigma, area = peak_columns([[1273.0, 0.2], [2223.2, 0.3]])
+        self.assertEqual(sigma.tolist(), [0.2, 0.3])
+        energy, sigma, area = peak_columns([[1273.0, 0.2, 10.0]])
+        self.assertEqual(area.tolist(), [10.0])
+
+    def test_peak_columns_raises_for_bad_input(self):
+        with self.assertRaises(TypeError):
+            peak_columns(["1273"])
+        with self.assertRaises(ValueError):
+            peak_columns(np.ones((3,4)))
+
+    def test_identify_peaks_ranks_chlorine_first(self):
+        pid = PeakIdentifier(edata.gamma_table())
+        energy, d_energy = self.strong_lines_of(pid, "Cl36")
+        peaks = np.column_stack((energy, np.full(len(energy), 0.1), np.full(len(energy), 100.0)))
+        df = e.identify_peaks(edata, peaks)
+        self.assertIsInstance(df, pd.core.frame.DataFrame)
+        self.assertEqual(df['Residual (CN)'].iloc[0], "Cl36")
+        self.assertEqual(df['Target (n,g)'].iloc[0], "Cl35")
+        self.assertEqual(df['Area'].iloc[0], 1000.0)
+        self.assertTrue(np.all(np.diff(df['Score']) <= 0.0))
+
+    def test_identify_peaks_returns_None_without_matches(self):
+        self.assertIsNone(e.identify_peaks(edata, [15000.0, 16000.0], sigma=0.1))
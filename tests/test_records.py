@@ -0,0 +1,121 @@
+import io
+import json
+import glob
+import pickle
+import contextlib
+import tracemalloc
+import pytest
+import unittest
+import numpy as np
+import pandas as pd
+import pyEGAF as egaf
+from pyEGAF.catalog import parse_json_file
+from pyEGAF.records import Nucleus, Level, Gamma, Spin, compact_datasets
+e = egaf.EGAF()
+edata = e.load_egaf()
+cdata = e.load_egaf(compact=True)
+
+class RecordTests(unittest.TestCase):
+
+    __doc__ = """Unit tests for the compact `__slots__` records of the EGAF
+    data sets."""
+
+    def test_compact_catalog_equals_json_datasets(self):
+        self.assertIsInstance(cdata, egaf.EGAFCatalog)
+        self.assertEqual(len(cdata), 245)
+        self.assertTrue(all(isinstance(nucleus, Nucleus) for nucleus in cdata))
+        self.assertTrue(cdata == edata)
+        si29 = cdata.find_residual("Si29")
+        self.assertEqual(json.dumps(si29.as_dict()), json.dumps(edata.find_residual("Si29")))
+
+    def test_records_are_mappings_of_json_keys(self):
+        si29 = cdata.find_residual("Si29")
+        jdict = edata.find_residual("Si29")
+        self.assertEqual(list(si29), list(jdict))
+        self.assertEqual(list(si29.keys()), list(jdict.keys()))
+        self.assertIn("levelScheme", si29)
+        self.assertNotIn("KEYS", si29)
+        self.assertEqual(si29.get("nucleusTargetID"), "Si28")
+        self.assertIsNone(si29.get("noSuchKey"))
+        with self.assertRaises(KeyError):
+            si29["noSuchKey"]
+        with self.assertRaises(KeyError):
+            si29["as_dict"]
+        with self.assertRaises(TypeError):
+            si29["nucleusID"] = "Si30"
+
+    def test_records_expose_values_as_attributes(self):
+        si29 = cdata.find_residual("Si29")
+        level = si29.levelScheme[1]
+        gamma = level.gammaDecay[0]
+        self.assertIsInstance(level, Level)
+        self.assertIsInstance(level.spins[0], Spin)
+        self.assertIsInstance(gamma, Gamma)
+        self.assertEqual(level.levelEnergy, si29["levelScheme"][1]["levelEnergy"])
+        self.assertEqual(gamma.gammaEnergy, edata.find_residual("Si29")["levelScheme"][1]["gammaDecay"][0]["gammaEnergy"])
+        self.assertIsInstance(si29.levelScheme, tuple)
+        self.assertFalse(hasattr(level, "__dict__"))
+
+    def test_repeated_strings_are_shared(self):
+        types = [gamma.gammaTransitionType for nucleus in cdata for level in nucleus.levelScheme for gamma in level.gammaDecay]
+        self.assertEqual(len(set(map(id, types))), len(set(types)))
+
+    def test_from_json_rejects_unknown_keys(self):
+        jdict = dict(edata.find_residual("Si29"))
+        jdict["extraKey"] = 0
+        with self.assertRaises(ValueError):
+            Nucleus.from_json(jdict)
+        del jdict["extraKey"], jdict["unitEnergy"]
+        with self.assertRaises(KeyError):
+            Nucleus.from_json(jdict)
+
+    def test_compact_datasets_keeps_records(self):
+        datasets = compact_datasets(cdata[:2] + edata[2:4])
+        self.assertIs(datasets[0], cdata[0])
+        self.assertEqual(datasets, edata[:4])
+
+    def test_records_pickle(self):
+        si29 = cdata.find_residual("Si29")
+        self.assertEqual(pickle.loads(pickle.dumps(si29)), si29)
+
+
+# Testing the Levels and Gammas methods against the compact records:
+
+@pytest.mark.parametrize("method, args, kwargs", [
+    ("get_residual_levels", ("Si29",), {}),
+    ("find_multiple_jpi", ("Na24",), {}),
+    ("find_unique_jpi", ("Cl36",), {}),
+    ("find_isomers", ("Na24",), {"units": "best"}),
+    ("get_gammas", ("Si29",), {"intensity": "isotopic"}),
+    ("find_all_gammas_feeding_gs", (14, 29), {"intensity": "population"}),
+    ("get_gamma_types", ("Si29",), {"gammas": "primary", "intensity": "isotopic"}),
+    ("get_strongest_gammas", ("Cl36",), {"intensity": "elemental"}),
+    ("find_gamma", (1273,), {"intensity": "isotopic"}),
+    ("normalise_intensities", ("Si29", 0.02217, 0.00051, 12), {}),
+    ("get_json", ("Si29", False), {}),
+])
+def test_methods_return_same_results_for_compact_records(method, args, kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = getattr(e, method)(edata, *args, **kwargs)
+        result = getattr(e, method)(cdata, *args, **kwargs)
+    assert expected is not None
+    if isinstance(expected, pd.DataFrame):
+        assert result.equals(expected)
+    elif isinstance(expected, np.ndarray):
+        assert np.array_equal(result, expected)
+    else:
+        assert result == expected
+
+def test_compact_records_take_less_than_half_the_memory_of_json():
+    json_files = sorted(glob.glob("%s/*.json" % egaf.get_data("EGAF_JSON")))[:40]
+    tracemalloc.start()
+    try:
+        datasets = [parse_json_file(f) for f in json_files]
+        json_memory = tracemalloc.get_traced_memory()[0]
+        records = compact_datasets(datasets)
+        del datasets
+        records_memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(records) == 40
+    assert records_memory < 0.5*json_memory
@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import pyEGAF as egaf
+from pyEGAF.results_cache import ResultsCache
+e = egaf.EGAF()
+edata = e.load_egaf()
+
+# Testing the opt-in results cache of the EGAF analysis methods:
+
+def test_results_cache_is_disabled_by_default():
+    assert egaf.EGAF().results_cache_info() == None
+
+def test_cached_results_equal_uncached_results():
+    c = egaf.EGAF()
+    expected = c.level_depopulations(edata, "Si29")
+    c.enable_results_cache()
+    assert c.level_depopulations(edata, "Si29") == expected
+    assert c.level_depopulations(edata, 14, 29) == expected
+    assert c.level_depopulations(edata, "Si29") == expected
+    info = c.results_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+
+def test_cached_result_is_returned_as_a_copy():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    balance = c.intensity_balance(edata, "S35", intensity="isotopic")
+    balance[:] = 0.0
+    assert np.any(c.intensity_balance(edata, "S35", intensity="isotopic") != 0.0)
+
+def test_cache_keys_include_intensity_mode_and_numeric_args():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    assert c.sum_feeding_gs(edata, True, "Fe57", intensity="isotopic") != c.sum_feeding_gs(edata, True, "Fe57", intensity="population")
+    assert c.normalise_intensities(edata, "Si29", 0.02217, 0.00051, 12) != c.normalise_intensities(edata, "Si29", 0.03, 0.00051, 12)
+    assert c.results_cache_info().hits == 0
+
+def test_None_results_are_not_cached():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    assert c.level_depopulations(edata, "Si42") == None
+    assert c.results_cache_info().currsize == 0
+
+def test_plain_lists_are_not_cached():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    c.level_depopulations(list(edata), "Si29")
+    assert c.results_cache_info().currsize == 0
+
+def test_catalog_modification_invalidates_cached_results():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    cat = egaf.EGAFCatalog(edata)
+    assert c.sum_primaries(cat, "C13", intensity="isotopic") != None
+    cat.remove(cat.find_residual("C13"))
+    assert c.sum_primaries(cat, "C13", intensity="isotopic") == None
+
+def test_clear_results_cache_by_method():
+    c = egaf.EGAF()
+    c.enable_results_cache()
+    c.level_depopulations(edata, "Si29")
+    c.dead_ends(edata, "Si29", intensity="elemental")
+    c.clear_results_cache("dead_ends")
+    assert c.results_cache_info().currsize == 1
+    c.clear_results_cache()
+    assert c.results_cache_info().currsize == 0
+    c.disable_results_cache()
+    assert c.results_cache_info() == None
+
+def test_results_cache_evicts_least_recently_used():
+    cache = ResultsCache(maxsize=2)
+    cache.put(("a",), edata, 1)
+    cache.put(("b",), edata, 2)
+    assert cache.get(("a",), edata) == 1
+    cache.put(("c",), edata, 3)
+    assert cache.get(("b",), edata) == None
+    assert cache.get(("a",), edata) == 1
+    assert len(cache) == 2
@@ -136,3 +136,10 @@ class SeparationEnergyTests(unittest.TestCase):
         else:
             raise
         
+
+    def test_q_record_is_last_recordQ_entry(self):
+        jdict = edata.find_residual("Si29")
+        self.assertIs(egaf.Separation.q_record(jdict), jdict["recordQ"][-1])
+        first, last = {"energyNeutronSeparationEGAF": 1.0}, {"energyNeutronSeparationEGAF": 2.0}
+        self.assertIs(egaf.Separation.q_record({"recordQ": [first, last]}), last)
+        self.assertEqual(egaf.Separation.q_record({"recordQ": []}), {})